@@ -6,6 +6,7 @@ and the ChordFactory class for creating chords.
 from .music_info import identify_applied_numeral, identify_chord_numeral_for_key
 from .music_info import get_chord_for_intervals
 from .note import NoteFactory
+from .set_classes import get_set_class
 
 
 class ChordFactory:
@@ -20,6 +21,19 @@ class ChordFactory:
 
         new_chord = None
 
+        chord_data = self.parse_chord(chord_info)
+
+        if chord_data['valid']:
+            new_chord = Chord(chord_data['notes'])
+
+        else:
+            raise ValueError(chord_data['error'])
+
+        return new_chord
+
+    def parse_chord(self, chord_info):
+        '''Parses the passed chord string or dict into its individual notes without identifying the chord.'''
+
         if isinstance(chord_info, str):
             chord_data = self.parse_chord_string(chord_info)
 
@@ -29,13 +43,7 @@ class ChordFactory:
         else:
             raise ValueError('Invalid chord format received. Accepted types: str and dict')
 
-        if chord_data['valid']:
-            new_chord = Chord(chord_data['notes'])
-
-        else:
-            raise ValueError(chord_data['error'])
-
-        return new_chord
+        return chord_data
 
     def parse_chord_dict(self, chord_dict):
         '''Parses the passed dict detailing this chord's notes into its individual notes.'''
@@ -276,6 +284,17 @@ class Chord:
 
         return applied_numeral
 
+    def get_set_class(self):
+        '''
+        Returns the pitch-class set class of this chord's notes, for chords of any quality.
+
+        Return:
+            set_class (dict): The 'normal_form', 'prime_form', 'forte_number', 'interval_vector' and 'z_partner'
+                of the chord's pitch classes, see set_classes.get_mask_set_class
+        '''
+
+        return get_set_class(self)
+
     def __identify_chord(self):
         '''Identifies the name and quality of this chord using its root index and position.'''
 
@@ -1,8 +1,10 @@
 '''This module exports the ChordProgression class and makes use of the SATB validator.'''
 
 from .chord import ChordFactory
+from .key_tracking import MODULATION_COST, track_keys
 from .music_info import get_chord_relation_for_key, get_lt_numeral_for_dim7, get_aug6_numeral
-from .satb_validator import validate_progression
+from .satb_validator import validate_progression, validate_progression_steps
+from .transposition import transpose_chords
 
 
 class ChordProgression():
@@ -44,63 +46,94 @@ class ChordProgression():
             else:
                 self.chords.append(new_chord)
 
-    def get_progression_chord_accidentals(self):
-        '''Returns accidentals for each chord in the progression based on the progression's key.'''
+    def get_progression_chord_accidentals(self, local_keys=None):
+        '''Returns accidentals for each chord in the progression's key, or in each chord's local key if passed.'''
 
         accidentals = []
 
-        if self.key:
+        if local_keys:
+            for chord, local_key in zip(self.chords, local_keys):
+                accidentals.append(chord.get_accidentals_for_key(local_key))
+
+        elif self.key:
             for chord in self.chords:
                 accidentals.append(chord.get_accidentals_for_key(self.key))
 
         return accidentals
 
-    def get_progression_chord_numerals(self, use_applied=True, use_satb=True):
+    def get_chord_numeral(self, index, use_applied=True, use_satb=True, key=None):
         '''
-        Returns the numerals for each chord within this progression.
-        
+        Returns the numeral for the chord at the passed index within this progression.
+
+        Only the chord and the chord following it are needed to identify the numeral, so
+        a single chord's numeral can be updated without identifying the full progression.
+
         Parameters:
+            index (int): The index of the chord in the progression
             use_applied (bool): If True, applied dominant numerals will be used where possible
             use_satb (bool): If True, chords will use more common names where possible
+            key (str): The chord's local key, or None to use the progression's key
 
         Return:
-            chord_numerals (array): The progression's chord numerals.
+            chord_numeral (str)
         '''
 
-        chord_numerals = []
+        key = key or self.key
+        chord = self.chords[index]
+        chord_numeral = chord.get_numeral_for_key(key)
 
-        if self.key:
+        #Convert o7 chords to be relative to the leading tone if applicable
+        if chord.quality == 'o7':
+            chord_numeral = get_lt_numeral_for_dim7(chord_numeral)
 
-            for i, chord in enumerate(self.chords):
-                chord_numeral = chord.get_numeral_for_key(self.key)
+        chord_relation = get_chord_relation_for_key(key, chord_numeral)
 
-                #Convert o7 chords to be relative to the leading tone if applicable
-                if chord.quality == 'o7':
-                    chord_numeral = get_lt_numeral_for_dim7(chord_numeral)
+        #Convert chromatic chords acting as applied dominants to the proceding chord to have an applied numeral
+        if use_applied and chord_relation == 'chromatic' or (chord_relation == 'mixture' and chord_numeral == 'I'):
+            
+            try:
+                applied_numeral = chord.get_applied_numeral(self.chords[index+1])
 
-                chord_relation = get_chord_relation_for_key(self.key, chord_numeral)
+                if applied_numeral != '':
+                    chord_numeral = applied_numeral + '/' + self.chords[index+1].get_numeral_for_key(key, False)
 
-                #Convert chromatic chords acting as applied dominants to the proceding chord to have an applied numeral
-                if use_applied and chord_relation == 'chromatic' or (chord_relation == 'mixture' and chord_numeral == 'I'):
-                    
-                    try:
-                        applied_numeral = chord.get_applied_numeral(self.chords[i+1])
+            except IndexError:
+                pass
 
-                        if applied_numeral != '':
-                            chord_numeral = applied_numeral + '/' + self.chords[i+1].get_numeral_for_key(self.key, False)
+        if use_satb:
 
-                    except IndexError:
-                        pass
+            #Convert augmented sixth numerals to their more common name
+            chord_numeral = get_aug6_numeral(chord_numeral, key, chord.get_note_names())
 
-                if use_satb:
+            if 'bII' in chord_numeral:
+                chord_numeral = chord_numeral.replace('bII', 'N')
 
-                    #Convert augmented sixth numerals to their more common name
-                    chord_numeral = get_aug6_numeral(chord_numeral, self.key, chord.get_note_names())
+        return chord_numeral
 
-                    if 'bII' in chord_numeral:
-                        chord_numeral = chord_numeral.replace('bII', 'N')
+    def get_progression_chord_numerals(self, use_applied=True, use_satb=True, local_keys=None):
+        '''
+        Returns the numerals for each chord within this progression.
+        
+        Parameters:
+            use_applied (bool): If True, applied dominant numerals will be used where possible
+            use_satb (bool): If True, chords will use more common names where possible
+            local_keys (list): The local key of each chord, or None to use the progression's key
+
+        Return:
+            chord_numerals (array): The progression's chord numerals.
+        '''
+
+        chord_numerals = []
 
-                chord_numerals.append(chord_numeral)
+        if local_keys:
+
+            for i, local_key in enumerate(local_keys):
+                chord_numerals.append(self.get_chord_numeral(i, use_applied, use_satb, local_key))
+
+        elif self.key:
+
+            for i in range(0, len(self.chords)):
+                chord_numerals.append(self.get_chord_numeral(i, use_applied, use_satb))
 
         return chord_numerals
 
@@ -123,7 +156,41 @@ class ChordProgression():
         else:
             raise IndexError('The index provided is out of range.')
 
-    def validate_progression(self):
-        '''Validates this chord progression using a SATB validator'''
+    def track_keys(self, modulation_cost=MODULATION_COST):
+        '''Returns the KeySegment for each span of this progression's chords in the same key, starting in its key.'''
+
+        return track_keys(self.chords, self.key, modulation_cost)
+
+    def transpose(self, target_key):
+        '''
+        Returns a new progression with this progression's chords transposed to the passed key.
+
+        Notes keep their degree and alteration in the key, and the chords are moved by octaves to
+        keep the voices within their SATB ranges, see transposition.transpose_chords.
+
+        Parameters:
+            target_key (str): The key to transpose the progression to, i.e. 'Eb' or 'f#'
+
+        Return:
+            transposed_progression (ChordProgression)
+        '''
+
+        if not self.key:
+            raise ValueError('The progression needs a key to be transposed.')
+
+        return ChordProgression(transpose_chords(self.chords, self.key, target_key), target_key)
+
+    def validate_progression(self, key_segments=None):
+        '''Validates this chord progression using a SATB validator, checking any key segments passed in their keys.'''
+
+        if not key_segments:
+            return validate_progression(self.chords, self.key)
+
+        progression_errors = []
+
+        for key_segment in key_segments:
+            for chord_errors in validate_progression_steps(self.chords, key_segment.key, key_segment.start,
+            key_segment.stop):
+                progression_errors.extend(chord_errors)
 
-        return validate_progression(self.chords, self.key)
+        return progression_errors
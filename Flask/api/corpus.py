@@ -0,0 +1,463 @@
+'''
+This module exports the corpus analysis command line for analyzing large collections of chord
+progressions outside of the web app.
+
+Progressions are read from CSV, JSON, JSON Lines, MusicXML and MIDI files, analyzed in batches
+across a pool of worker processes, and written with one row per chord to numbered output chunks.
+Chunks are written as Parquet files when pyarrow is installed, or as CSV files otherwise.
+
+A checkpoint is saved in the output directory after each chunk, so that an interrupted job can be
+continued with --resume, skipping the batches that were already written:
+    python main.py corpus/ --output results/ --workers 8
+    python main.py corpus/ --output results/ --workers 8 --resume
+
+Every progression can also be transposed to one key before it's analyzed, with --transpose.
+'''
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .csv_import import CSVProgressionReader
+from .key_detection import detect_key
+from .music_funcs import create_progression, format_satb_errors, parse_key_signature
+from .music_info import SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS, get_chord_relation_for_key, is_applied_numeral
+from .satb_validator import validate_progression_steps
+from .set_classes import get_forte_number
+from .voice_leading import get_progression_voice_leading
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+#The columns written for each chord, or for each progression that couldn't be analyzed
+OUTPUT_COLUMNS = ('source', 'progression', 'key', 'chord_index', 'chord', 'name', 'numeral', 'relation',
+'satb_errors', 'error', 'metadata', 'voice_leading', 'set_class')
+
+CHECKPOINT_FILE = 'checkpoint.json'
+
+#The file extensions read as each input format
+_INPUT_FORMATS = {
+    '.csv': 'csv', '.json': 'json', '.jsonl': 'jsonl', '.musicxml': 'musicxml', '.xml': 'musicxml',
+    '.mid': 'midi', '.midi': 'midi'
+}
+
+
+#### PRIVATE METHODS ####
+def __find_input_files(paths, excluded_dir=None):
+    '''Returns the sorted paths of the supported files in the passed files and directories.'''
+
+    input_files = set()
+    excluded_dir = os.path.abspath(excluded_dir) if excluded_dir else None
+
+    for path in paths:
+
+        if os.path.isdir(path):
+            for directory, directory_names, file_names in os.walk(path):
+                directory_names[:] = [directory_name for directory_name in directory_names
+                if os.path.abspath(os.path.join(directory, directory_name)) != excluded_dir]
+                input_files.update(os.path.join(directory, file_name) for file_name in file_names
+                if os.path.splitext(file_name)[1].lower() in _INPUT_FORMATS)
+
+        else:
+            input_files.add(path)
+
+    return sorted(input_files)
+
+
+def __iter_json_records(input_path, input_format):
+    '''Yields each {'chords', 'key', ...} progression object in a JSON or JSON Lines file.'''
+
+    with open(input_path, encoding='utf-8') as json_file:
+
+        if input_format == 'jsonl':
+            for line in json_file:
+                if line.strip():
+                    yield json.loads(line)
+
+        else:
+            records = json.load(json_file)
+            yield from records if isinstance(records, list) else [records]
+
+
+def __get_error_row(source, progression_id, error, metadata, key=''):
+    '''Returns the output row for a progression that couldn't be analyzed, with only its error filled in.'''
+
+    return (source, progression_id, key, None, '', '', '', '', '', error, metadata, '', '')
+
+
+def __get_chord_errors(step_errors):
+    '''
+    Returns the SATB errors of each chord from the errors found while checking each chord, placing
+    resolution and movement errors, which are found while checking the following chord, on the
+    chord they're reported for.
+    '''
+
+    chord_errors = [[] for _ in step_errors]
+
+    for errors in step_errors:
+        for error in errors:
+            details = error['details']
+            chord_errors[details.get('chord_index', details.get('prev_chord_index')) - 1].append(error)
+
+    return chord_errors
+
+
+def __analyze_item(item, validate, default_key, transpose_key=None):
+    '''
+    Returns the output rows for the passed item's progression, transposed to the transpose key if passed,
+    or an error row if it couldn't be analyzed so that one bad progression doesn't stop the job.
+    '''
+
+    try:
+        return __get_item_rows(item, validate, default_key, transpose_key)
+
+    except Exception as error:
+        source, progression_id, _, _, metadata = item
+        metadata = json.dumps(metadata) if metadata else ''
+
+        return [__get_error_row(source, progression_id, f'{type(error).__name__}: {error}', metadata)]
+
+
+def __get_item_rows(item, validate, default_key, transpose_key):
+    '''Returns the output rows for the passed item's progression, transposed to the transpose key if passed.'''
+
+    source, progression_id, item_format, payload, metadata = item
+    metadata = json.dumps(metadata) if metadata else ''
+
+    if item_format == 'progression':
+        progression = payload
+
+    elif item_format == 'chords':
+
+        if payload[1] is not None and not isinstance(payload[1], str):
+            return [__get_error_row(source, progression_id, 'INVALID_KEY', metadata)]
+
+        key = parse_key_signature(payload[1] or default_key or detect_key(payload[0] or [], default='C'))
+
+        if key not in SUPPORTED_MAJOR_KEYS and key not in SUPPORTED_MINOR_KEYS:
+            return [__get_error_row(source, progression_id, 'INVALID_KEY', metadata)]
+
+        progression = create_progression(payload[0], key)
+
+    elif item_format == 'midi':
+        from .midi_import import read_midi_progression
+        progression = read_midi_progression(payload, key=default_key)
+
+    elif item_format == 'musicxml':
+        from .musicxml import read_musicxml_chords
+        chords, key = read_musicxml_chords(payload)
+        progression = create_progression(chords, key or default_key or detect_key(chords, default='C'))
+
+    else:
+        return [__get_error_row(source, progression_id, payload, metadata)]
+
+    if progression is None or not progression.chords:
+        return [__get_error_row(source, progression_id, 'NO_VALID_CHORDS', metadata)]
+
+    if transpose_key:
+        try:
+            progression = progression.transpose(transpose_key)
+
+        except ValueError as error:
+            return [__get_error_row(source, progression_id, f'ValueError: {error}', metadata, progression.key)]
+
+    key = progression.key
+    chord_names = progression.get_progression_chord_names(True)
+    chord_numerals = progression.get_progression_chord_numerals(True)
+    chord_errors = __get_chord_errors(validate_progression_steps(progression.chords, key)) if validate else None
+    chord_voice_leading = get_progression_voice_leading(progression.chords)
+
+    rows = []
+
+    for i, chord in enumerate(progression.chords):
+        numeral = chord_numerals[i]
+        relation = 'applied' if is_applied_numeral(numeral) else get_chord_relation_for_key(key, numeral)
+        satb_errors = '; '.join(format_satb_errors(chord_errors[i])) if validate else ''
+        voice_leading = json.dumps(chord_voice_leading[i]) if chord_voice_leading[i] else ''
+
+        rows.append((source, progression_id, key, i, ','.join(str(note) for note in chord.notes), chord_names[i],
+        numeral, relation, satb_errors, '', metadata, voice_leading, get_forte_number(chord)))
+
+    return rows
+
+
+def __write_chunk(output_dir, chunk_index, rows, output_format):
+    '''Writes the passed rows to the numbered chunk file in the output directory.'''
+
+    chunk_path = os.path.join(output_dir, f'chunk-{chunk_index:05d}.{output_format}')
+    temp_path = chunk_path + '.tmp'
+
+    if output_format == 'parquet':
+        columns = {column: [row[i] for row in rows] for i, column in enumerate(OUTPUT_COLUMNS)}
+        pyarrow.parquet.write_table(pyarrow.Table.from_pydict(columns), temp_path)
+
+    else:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as chunk_file:
+            writer = csv.writer(chunk_file)
+            writer.writerow(OUTPUT_COLUMNS)
+            writer.writerows(rows)
+
+    os.replace(temp_path, chunk_path)
+
+
+def __save_checkpoint(output_dir, checkpoint):
+    '''Saves the passed checkpoint, replacing the previous checkpoint only once it's fully written.'''
+
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+
+    with open(checkpoint_path + '.tmp', 'w', encoding='utf-8') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file, indent=4)
+
+    os.replace(checkpoint_path + '.tmp', checkpoint_path)
+
+
+def iter_corpus_items(paths, default_key=None, output_dir=None):
+    '''
+    Yields an item for each progression in the passed files and directories.
+
+    Progressions in CSV and JSON files are read here, while MIDI and MusicXML files are read by the
+    worker analyzing them. Each item is a (source, progression_id, format, payload, metadata) tuple,
+    where an 'error' format item's payload is the error found reading it. Files in the output
+    directory are skipped.
+    '''
+
+    for input_path in __find_input_files(paths, output_dir):
+        input_format = _INPUT_FORMATS.get(os.path.splitext(input_path)[1].lower())
+
+        try:
+            if input_format == 'csv':
+                with open(input_path, newline='', encoding='utf-8-sig') as csv_file:
+                    reader = CSVProgressionReader(csv_file, default_key=default_key)
+
+                    for imported_progression in reader:
+                        yield (input_path, imported_progression.row_number, 'progression',
+                        imported_progression.progression, imported_progression.metadata)
+
+                    for error in reader.errors:
+                        yield (input_path, error['row'], 'error', error['error'], {'value': error['value']})
+
+            elif input_format in ('json', 'jsonl'):
+                for i, record in enumerate(__iter_json_records(input_path, input_format)):
+                    metadata = {name: value for name, value in record.items() if name not in ('chords', 'key')}
+                    yield (input_path, i, 'chords', (record.get('chords'), record.get('key')), metadata)
+
+            elif input_format in ('midi', 'musicxml'):
+                yield (input_path, 0, input_format, input_path, None)
+
+            else:
+                yield (input_path, 0, 'error', 'UNSUPPORTED_FORMAT', None)
+
+        except (ValueError, OSError, AttributeError) as error:
+            yield (input_path, None, 'error', f'{type(error).__name__}: {error}', None)
+
+
+def analyze_batch(batch, validate=True, default_key=None, transpose_key=None):
+    '''Returns the output rows for each progression in the passed batch of corpus items.'''
+
+    rows = []
+
+    for item in batch:
+        rows.extend(__analyze_item(item, validate, default_key, transpose_key))
+
+    return rows
+
+
+def iter_batches(items, batch_size):
+    '''Yields lists of up to the passed number of items.'''
+
+    batch = []
+
+    for item in items:
+        batch.append(item)
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def run_corpus_analysis(paths, output_dir, workers=None, batch_size=64, chunk_rows=100000, output_format='auto',
+validate=True, default_key=None, resume=False, progress_interval=5.0, progress_file=sys.stderr, transpose_key=None):
+    '''
+    Analyzes the progressions in the passed files and directories and writes their chords to chunks.
+
+    Parameters:
+        paths (list): The input files and directories
+        output_dir (str): The directory for the output chunks and checkpoint
+        workers (int): The number of worker processes, or 1 to analyze in this process
+        batch_size (int): The number of progressions sent to a worker at a time
+        chunk_rows (int): The number of rows after which a chunk is written
+        output_format (str): 'parquet', 'csv', or 'auto' to use Parquet when pyarrow is installed
+        validate (bool): Whether or not the progressions should be analyzed for SATB errors
+        default_key (str): The key used for progressions without one, or None to detect their keys from their notes
+        resume (bool): Whether to continue the job checkpointed in the output directory
+        progress_interval (float): The seconds between progress reports
+        progress_file (file): The file progress reports are written to, or None
+        transpose_key (str): The key every progression is transposed to before it's analyzed, or None
+
+    Return:
+        checkpoint (dict): The job's final checkpoint
+    '''
+
+    if default_key is not None:
+        default_key = parse_key_signature(default_key)
+
+        if default_key not in SUPPORTED_MAJOR_KEYS and default_key not in SUPPORTED_MINOR_KEYS:
+            raise ValueError(f'Unsupported key: {default_key}')
+
+    if transpose_key is not None:
+        transpose_key = parse_key_signature(transpose_key)
+
+        if transpose_key not in SUPPORTED_MAJOR_KEYS and transpose_key not in SUPPORTED_MINOR_KEYS:
+            raise ValueError(f'Unsupported key: {transpose_key}')
+
+    if output_format == 'auto':
+        output_format = 'parquet' if pyarrow is not None else 'csv'
+
+    elif output_format == 'parquet' and pyarrow is None:
+        raise ValueError('Parquet output requires pyarrow to be installed.')
+
+    job = {'paths': sorted(paths), 'output_format': output_format, 'validate': validate, 'default_key': default_key,
+    'transpose_key': transpose_key, 'batch_size': batch_size}
+    checkpoint = {'job': job, 'completed_batches': 0, 'num_chunks': 0, 'num_progressions': 0, 'num_rows': 0,
+    'num_errors': 0, 'finished': False}
+
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+
+    if os.path.exists(checkpoint_path):
+
+        if not resume:
+            raise ValueError(f'{output_dir} already holds a checkpoint, use --resume to continue it.')
+
+        with open(checkpoint_path, encoding='utf-8') as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        if checkpoint['job'] != job:
+            raise ValueError('The checkpoint was saved for a different job.')
+
+    start_time = last_report = time.perf_counter()
+    start_progressions = checkpoint['num_progressions']
+    pending_rows = []
+    pending_batches = 0
+
+    def report_progress(force=False):
+        nonlocal last_report
+
+        now = time.perf_counter()
+
+        if progress_file is not None and (force or now - last_report >= progress_interval):
+            rate = (checkpoint['num_progressions'] - start_progressions) / max(now - start_time, 1e-9)
+            print(f"{checkpoint['num_progressions']} progressions, {checkpoint['num_rows']} chords, "
+            f"{checkpoint['num_errors']} errors, {rate:.1f} progressions/s, {now - start_time:.0f}s elapsed",
+            file=progress_file, flush=True)
+            last_report = now
+
+    def write_pending_rows():
+        nonlocal pending_rows, pending_batches
+
+        __write_chunk(output_dir, checkpoint['num_chunks'], pending_rows, output_format)
+        checkpoint['num_chunks'] += 1
+        checkpoint['completed_batches'] += pending_batches
+        __save_checkpoint(output_dir, checkpoint)
+        pending_rows = []
+        pending_batches = 0
+
+    def process_rows(batch_rows):
+        nonlocal pending_batches
+
+        pending_rows.extend(batch_rows)
+        pending_batches += 1
+        checkpoint['num_rows'] += sum(1 for row in batch_rows if row[3] is not None)
+        checkpoint['num_errors'] += sum(1 for row in batch_rows if row[9])
+        checkpoint['num_progressions'] += len({(row[0], row[1]) for row in batch_rows})
+
+        #Chunks end on batch boundaries, so that a resumed job can skip every batch already written
+        if len(pending_rows) >= chunk_rows:
+            write_pending_rows()
+
+        report_progress()
+
+    batches = iter_batches(iter_corpus_items(paths, default_key, output_dir), batch_size)
+
+    for _ in range(checkpoint['completed_batches']):
+        next(batches, None)
+
+    if workers == 1:
+        for batch in batches:
+            process_rows(analyze_batch(batch, validate, default_key, transpose_key))
+
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            max_pending = (workers or os.cpu_count()) * 4
+            pending_futures = deque()
+
+            #Only a few batches are submitted ahead of the results being written, keeping memory bounded
+            for batch in batches:
+                pending_futures.append(executor.submit(analyze_batch, batch, validate, default_key, transpose_key))
+
+                if len(pending_futures) >= max_pending:
+                    process_rows(pending_futures.popleft().result())
+
+            while pending_futures:
+                process_rows(pending_futures.popleft().result())
+
+    if pending_rows:
+        write_pending_rows()
+
+    checkpoint['finished'] = True
+    __save_checkpoint(output_dir, checkpoint)
+    report_progress(True)
+
+    return checkpoint
+
+
+def main(args=None):
+    '''Runs the corpus analysis command line with the passed arguments or those of the process.'''
+
+    parser = argparse.ArgumentParser(description='Analyze a corpus of chord progressions.')
+    parser.add_argument('paths', nargs='*', help='Input files or directories (CSV, JSON, JSON Lines, MusicXML, MIDI)')
+    parser.add_argument('--file-list', help='A file listing an input path on each line')
+    parser.add_argument('--output', required=True, help='The directory for the output chunks and checkpoint')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='The number of worker processes')
+    parser.add_argument('--batch-size', type=int, default=64, help='The progressions sent to a worker at a time')
+    parser.add_argument('--chunk-rows', type=int, default=100000, help='The rows written to each output chunk')
+    parser.add_argument('--format', choices=('auto', 'csv', 'parquet'), default='auto', help='The output format')
+    parser.add_argument('--key', help='The key used for progressions without one, detected from their notes by default')
+    parser.add_argument('--transpose', help='A key to transpose every progression to before analyzing it')
+    parser.add_argument('--no-validate', action='store_true', help='Skip the SATB analysis')
+    parser.add_argument('--resume', action='store_true', help='Continue the job checkpointed in the output directory')
+    options = parser.parse_args(args)
+
+    paths = list(options.paths)
+
+    if options.file_list:
+        with open(options.file_list, encoding='utf-8') as file_list:
+            paths.extend(line.strip() for line in file_list if line.strip())
+
+    if not paths:
+        parser.error('No input paths were given.')
+
+    try:
+        checkpoint = run_corpus_analysis(paths, options.output, options.workers, options.batch_size, options.chunk_rows,
+        options.format, not options.no_validate, options.key, options.resume, transpose_key=options.transpose)
+
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    return 0 if checkpoint['finished'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+'''
+This module exports the CSVProgressionReader class for streaming chord progressions from CSV files.
+
+Files are read row by row in chunks, so that arbitrarily large files can be imported with bounded
+memory. Two row layouts are supported, chosen by the columns in the file's header row:
+
+    chords: Each row holds a full progression, with its chords separated by the chord delimiter.
+        key,chords,title
+        C,"C3,G3,E4,C5;G2,B3,D4,G4",Cadence
+
+    chord: Each row holds a single chord. Consecutive rows with the same 'progression' column value
+        make up a progression. Without a 'progression' column, every row belongs to one progression.
+        progression,key,chord
+        1,C,"C3,G3,E4,C5"
+        1,C,"G2,B3,D4,G4"
+
+The 'key' column is optional, and progressions without a key are analyzed in the key detected from
+their notes unless the reader is given a default key. Every other column is kept as the progression's metadata.
+Rows that can't be parsed are reported as errors without stopping the import.
+'''
+
+import csv
+
+from .chord import ChordFactory
+from .chord_progression import ChordProgression
+from .key_detection import detect_key
+from .music_funcs import parse_key_signature
+from .music_info import SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS
+
+
+class ImportedProgression:
+    '''
+    Class holding a chord progression read from a CSV file.
+
+    Attributes:
+        progression (ChordProgression): The progression made up of the valid chords read
+        metadata (dict): The values of the progression's other columns
+        row_number (int): The row number the progression starts at, counting the header as row 1
+    '''
+
+    def __init__(self, progression, metadata, row_number):
+        self.progression = progression
+        self.metadata = metadata
+        self.row_number = row_number
+
+
+class CSVProgressionReader:
+    '''
+    Class reading chord progressions from a CSV file one chunk of rows at a time.
+
+    Attributes:
+        csv_file (file): The text file to read, opened with newline=''
+        chunk_size (int): The number of rows parsed at a time
+        chord_delimiter (str): The delimiter between chords in the 'chords' column
+        default_key (str): The key used for progressions without a 'key' column value, or None to detect their keys
+        max_chords (int): The most chords read into one progression before it's split into another
+        max_errors (int): The most row errors kept, though every error is counted
+        errors (list): The row errors found, i.e. {'row': 3, 'error': 'INVALID_CHORD', 'value': 'X4,Y4'}
+        num_errors (int): The number of row errors found
+        num_rows (int): The number of rows read, not including the header
+    '''
+
+    _chord_factory = ChordFactory()
+    _supported_keys = frozenset(SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS)
+
+    def __init__(self, csv_file, chunk_size=1000, chord_delimiter=';', default_key=None, max_chords=100000,
+    max_errors=1000):
+        self.csv_file = csv_file
+        self.chunk_size = chunk_size
+        self.chord_delimiter = chord_delimiter
+        self.default_key = default_key
+        self.max_chords = max_chords
+        self.max_errors = max_errors
+        self.errors = []
+        self.num_errors = 0
+        self.num_rows = 0
+
+        #The progression being read from single chord rows, which may continue into the next chunk
+        self._open_progression = None
+
+    def __iter__(self):
+        '''Yields each progression read from the file.'''
+
+        for progression_chunk in self.iter_chunks():
+            yield from progression_chunk
+
+    def __add_error(self, row_number, error_code, value=''):
+        '''Records an error for the passed row.'''
+
+        self.num_errors += 1
+
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row_number, 'error': error_code, 'value': value})
+
+    def __create_chord(self, chord_string, row_number):
+        '''Returns the chord for the passed string or None, recording an error if it's invalid.'''
+
+        new_chord = None
+
+        try:
+            new_chord = self._chord_factory.create_chord(chord_string.strip())
+
+        except ValueError:
+            self.__add_error(row_number, 'INVALID_CHORD', chord_string)
+
+        return new_chord
+
+    def __get_key(self, row, row_number):
+        '''
+        Returns the key for the passed row, '' if it's to be detected from the progression's chords,
+        or None, recording an error, if it isn't supported.
+        '''
+
+        key_signature = (row.get('key') or '').strip() or self.default_key
+
+        if not key_signature:
+            return ''
+
+        key = parse_key_signature(key_signature)
+
+        if key not in self._supported_keys:
+            self.__add_error(row_number, 'INVALID_KEY', key_signature)
+            key = None
+
+        return key
+
+    def __get_metadata(self, row):
+        '''Returns the values of the passed row's columns other than its chords and key.'''
+
+        return {column: value for column, value in row.items() if column not in ('chords', 'chord', 'key') and column}
+
+    def iter_chunks(self):
+        '''Yields the list of progressions completed in each chunk of rows read from the file.'''
+
+        reader = csv.DictReader(self.csv_file)
+        columns = reader.fieldnames or []
+
+        if 'chords' in columns:
+            parse_chunk = self.__parse_progression_rows
+
+        elif 'chord' in columns:
+            parse_chunk = self.__parse_chord_rows
+
+        else:
+            self.__add_error(1, 'MISSING_CHORD_COLUMN')
+            return
+
+        row_chunk = []
+
+        #Row numbers count the header as row 1, and are the last line of rows spanning multiple lines
+        for row in reader:
+            row_chunk.append((reader.line_num, row))
+            self.num_rows += 1
+
+            if len(row_chunk) == self.chunk_size:
+                yield parse_chunk(row_chunk)
+                row_chunk = []
+
+        if row_chunk:
+            yield parse_chunk(row_chunk)
+
+        if self._open_progression is not None:
+            progression_chunk = []
+            self.__close_progression(progression_chunk)
+
+            if progression_chunk:
+                yield progression_chunk
+
+    def __parse_progression_rows(self, row_chunk):
+        '''Parses each of the passed rows holding a full progression.'''
+
+        progression_chunk = []
+
+        for row_number, row in row_chunk:
+            key = self.__get_key(row, row_number)
+
+            if key is None:
+                continue
+
+            chords = []
+
+            for chord_string in (row.get('chords') or '').split(self.chord_delimiter):
+
+                if chord_string.strip() and (new_chord := self.__create_chord(chord_string, row_number)):
+                    chords.append(new_chord)
+
+            if not chords:
+                self.__add_error(row_number, 'NO_VALID_CHORDS')
+
+            #Rows with more chords than the limit are split into consecutive progressions, as with single chord rows
+            for i in range(0, len(chords), self.max_chords):
+                progression_chords = chords[i:i + self.max_chords]
+                progression_key = key or detect_key(progression_chords, default='C')
+
+                progression_chunk.append(ImportedProgression(ChordProgression(progression_chords, progression_key),
+                self.__get_metadata(row), row_number))
+
+        return progression_chunk
+
+    def __close_progression(self, progression_chunk):
+        '''Adds the progression being read from single chord rows to the chunk if it has any chords.'''
+
+        open_progression = self._open_progression
+        self._open_progression = None
+
+        if open_progression.progression.chords:
+
+            #The key is only detected once every chord of the progression has been read
+            if open_progression.progression.key is None:
+                open_progression.progression.key = detect_key(open_progression.progression.chords, default='C')
+
+            progression_chunk.append(open_progression)
+
+        else:
+            self.__add_error(open_progression.row_number, 'NO_VALID_CHORDS')
+
+    def __parse_chord_rows(self, row_chunk):
+        '''Parses each of the passed rows holding a single chord of a progression.'''
+
+        progression_chunk = []
+
+        for row_number, row in row_chunk:
+            progression_id = row.get('progression')
+            open_progression = self._open_progression
+
+            #Start a new progression when the progression column changes or the current one is full
+            if open_progression is not None and (open_progression.metadata.get('progression') != progression_id or
+            len(open_progression.progression.chords) >= self.max_chords):
+                self.__close_progression(progression_chunk)
+                open_progression = None
+
+            if open_progression is None:
+                key = self.__get_key(row, row_number)
+
+                if key is None:
+                    continue
+
+                open_progression = ImportedProgression(ChordProgression([], key), self.__get_metadata(row), row_number)
+                self._open_progression = open_progression
+
+            if new_chord := self.__create_chord(row.get('chord') or '', row_number):
+                open_progression.progression.chords.append(new_chord)
+
+        return progression_chunk
+
+
+def read_progressions_csv(csv_path, **reader_options):
+    '''
+    Yields each progression read from the CSV file at the passed path.
+
+    Parameters:
+        csv_path (str): The path to the CSV file
+        reader_options: Options passed to the CSVProgressionReader, i.e. chunk_size
+
+    Return:
+        progressions (generator): The ImportedProgression for each progression read
+    '''
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as csv_file:
+        yield from CSVProgressionReader(csv_file, **reader_options)
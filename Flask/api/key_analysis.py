@@ -0,0 +1,187 @@
+'''
+This module exports the analysis of a progression in every supported key at once.
+
+A chord's name doesn't depend on the key, so the names are found once for the whole progression.
+A chord's numeral is the degree of its root in the key, decorated by its quality and inversion,
+and only the degree depends on the key. The degree of every note name in every key is looked up
+from a table built once, as is the accidental of every note name in every key. Everything else is
+identified once per chord: its quality and inversion strings, and whether it acts as an applied
+chord to the chord following it. Chords sharing their notes and following chord are grouped, so
+each key only looks up the numeral of each distinct group rather than of each chord.
+
+Asking for the numerals of the same chords in G, e and D is then one call:
+    key_analysis = analyze_all_keys(progression.chords, ('G', 'e', 'D'))
+    key_analysis['keys']['e']['numerals']
+'''
+
+from collections import namedtuple
+from functools import lru_cache
+
+from .music_info import (NOTE_INDICES, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS, get_aug6_numeral,
+get_chord_relation_for_key, get_lt_numeral_for_dim7, get_note_accidental_in_key, identify_chord_numeral_for_key)
+
+#The keys a progression is analyzed in when none are passed
+ANALYZED_KEYS = SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS
+
+#The chord qualities whose numerals can be augmented sixth chords, i.e. VI7 or II7b5
+_AUG6_QUALITIES = ('7', '7b5')
+
+#The degree numeral of each note name as a root, i.e. 'bVI', and its accidental in each analyzed key
+_DEGREE_TABLES = {key: {note_name: identify_chord_numeral_for_key(key, {'root': note_name, 'quality': '',
+'position': 0}) for note_name in NOTE_INDICES} for key in ANALYZED_KEYS}
+_ACCIDENTAL_TABLES = {key: {note_name: get_note_accidental_in_key(note_name, key) for note_name in NOTE_INDICES}
+for key in ANALYZED_KEYS}
+
+#The chords of a progression sharing the same analysis in every key, with what's identified once for them
+ChordGroup = namedtuple('ChordGroup', ('indices', 'chord', 'root_name', 'note_names', 'numeral_case', 'numeral_suffix',
+'next_chord', 'next_root_name', 'next_numeral_case', 'next_numeral_suffix'))
+
+
+#### PRIVATE METHODS ####
+@lru_cache(maxsize=256)
+def __get_numeral_decoration(quality, position):
+    '''
+    Returns how a chord's quality and inversion decorate the degree of its root in any key.
+
+    Return:
+        (numeral_case, numeral_suffix): The function giving the degree's case, and the string following the
+            degree, i.e. (str.lower, '6') for a first inversion minor triad, or (None, None) for unknown chords
+    '''
+
+    if quality == 'unknown':
+        return (None, None)
+
+    #The numeral of a chord on the tonic of C holds only the decoration after its numeral 'I' or 'i'
+    reference_numeral = identify_chord_numeral_for_key('C', {'root': 'C', 'quality': quality, 'position': position})
+
+    return (str.lower if reference_numeral[0] == 'i' else str, reference_numeral[1:])
+
+
+def __group_chords(chords):
+    '''Returns a ChordGroup for the passed chords sharing the same notes and following chord.'''
+
+    chord_groups = {}
+
+    for i, chord in enumerate(chords):
+        note_names = tuple(chord.get_note_names())
+        next_chord = chords[i + 1] if i + 1 < len(chords) else None
+        next_root_name = next_chord.get_root_name() if next_chord else None
+        group_key = (note_names, chord.quality, chord.position, next_root_name, next_chord and next_chord.quality)
+
+        if group_key in chord_groups:
+            chord_groups[group_key].indices.append(i)
+            continue
+
+        chord_info = ([i], chord, chord.get_root_name(), note_names,
+        *__get_numeral_decoration(chord.quality, chord.position))
+
+        if next_chord is None:
+            chord_groups[group_key] = ChordGroup(*chord_info, None, None, None, None)
+
+        else:
+            chord_groups[group_key] = ChordGroup(*chord_info, next_chord, next_root_name,
+            *__get_numeral_decoration(next_chord.quality, 0))
+
+    return list(chord_groups.values())
+
+
+def __get_group_numeral(chord_group, key, use_applied, use_satb, applied_numerals):
+    '''
+    Returns the numeral of the passed group's chords in the passed key, see ChordProgression.get_chord_numeral.
+
+    Parameters:
+        chord_group (ChordGroup): The chords to identify the numeral of
+        key (str): The key to identify the numeral in, one of ANALYZED_KEYS
+        use_applied (bool): If True, applied dominant numerals will be used where possible
+        use_satb (bool): If True, chords will use more common names where possible
+        applied_numerals (dict): The applied numeral of each group identified so far, which doesn't depend on the key
+
+    Return:
+        chord_numeral (str)
+        is_applied (bool): Whether or not the numeral is applied to the following chord
+    '''
+
+    degree_table = _DEGREE_TABLES[key]
+    chord = chord_group.chord
+    chord_numeral = ''
+    is_applied = False
+
+    if chord_group.numeral_suffix is not None:
+        chord_numeral = chord_group.numeral_case(degree_table[chord_group.root_name]) + chord_group.numeral_suffix
+
+    #Convert o7 chords to be relative to the leading tone if applicable
+    if chord.quality == 'o7':
+        chord_numeral = get_lt_numeral_for_dim7(chord_numeral)
+
+    chord_relation = get_chord_relation_for_key(key, chord_numeral)
+
+    #Convert chromatic chords acting as applied dominants to the proceding chord to have an applied numeral
+    if use_applied and chord_relation == 'chromatic' or (chord_relation == 'mixture' and chord_numeral == 'I'):
+
+        if chord_group.next_chord is not None:
+            group_index = chord_group.indices[0]
+
+            if group_index not in applied_numerals:
+                applied_numerals[group_index] = chord.get_applied_numeral(chord_group.next_chord)
+
+            if applied_numerals[group_index] != '':
+                next_numeral = ''
+
+                if chord_group.next_numeral_suffix is not None:
+                    next_numeral = chord_group.next_numeral_case(degree_table[chord_group.next_root_name]) + \
+                    chord_group.next_numeral_suffix
+
+                chord_numeral = applied_numerals[group_index] + '/' + next_numeral
+                is_applied = True
+
+    if use_satb:
+
+        #Convert augmented sixth numerals to their more common name
+        if chord.quality in _AUG6_QUALITIES:
+            chord_numeral = get_aug6_numeral(chord_numeral, key, chord_group.note_names)
+
+        if 'bII' in chord_numeral:
+            chord_numeral = chord_numeral.replace('bII', 'N')
+
+    return (chord_numeral, is_applied)
+
+
+#### PUBLIC METHODS ####
+def analyze_all_keys(chords, keys=ANALYZED_KEYS, use_applied=True, use_satb=True):
+    '''
+    Analyzes the passed chords in each of the passed keys.
+
+    Parameters:
+        chords (list): The progression's chords
+        keys (tuple): The keys to analyze the chords in, each one of ANALYZED_KEYS, i.e. ('C', 'a')
+        use_applied (bool): If True, applied dominant numerals will be used where possible
+        use_satb (bool): If True, chords will use more common names where possible
+
+    Return:
+        key_analysis (dict): The chord names shared by every key, and each key's chord numerals,
+            relations and accidentals, i.e. {'names': [...], 'keys': {'C': {'numerals': [...], ...}}}
+    '''
+
+    chord_groups = __group_chords(chords)
+    applied_numerals = {}
+    key_analysis = {'names': [chord.get_name(True) for chord in chords], 'keys': {}}
+
+    for key in keys:
+        accidental_table = _ACCIDENTAL_TABLES[key]
+        numerals = [''] * len(chords)
+        relations = [''] * len(chords)
+        accidentals = [None] * len(chords)
+
+        for chord_group in chord_groups:
+            numeral, is_applied = __get_group_numeral(chord_group, key, use_applied, use_satb, applied_numerals)
+            relation = 'applied' if is_applied else get_chord_relation_for_key(key, numeral) if numeral else ''
+            chord_accidentals = [accidental_table[note_name] for note_name in chord_group.note_names]
+
+            for i in chord_group.indices:
+                numerals[i] = numeral
+                relations[i] = relation
+                accidentals[i] = list(chord_accidentals)
+
+        key_analysis['keys'][key] = {'numerals': numerals, 'relations': relations, 'accidentals': accidentals}
+
+    return key_analysis
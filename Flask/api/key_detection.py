@@ -0,0 +1,204 @@
+'''
+This module exports the key detection for progressions imported without a key.
+
+A progression's notes are counted into a pitch-class histogram, weighted by each chord's duration,
+with the bass of each chord counted again as it defines the harmony more than the upper voices.
+The histogram is then correlated with the profile of every major and minor key in one product with
+the profile matrix. Each key's profile weighs the degrees of its scale in MAJOR_KEY_NOTES or
+MINOR_KEY_NOTES by how strongly they imply the key, after Krumhansl and Kessler's key profiles.
+
+Keys sharing the same pitch classes, i.e. C# and Db, are told apart by the spelling of the notes
+when it's known, and otherwise by their number of accidentals.
+'''
+
+from collections import namedtuple
+from functools import lru_cache
+from itertools import repeat
+from math import exp, sqrt
+from operator import attrgetter, mul
+
+from .music_info import (MAJOR_KEY_NOTES, MINOR_KEY_NOTES, NOTE_INDICES, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS,
+get_leading_tone_in_key, get_signature_for_key)
+
+#The weight of each degree of the major and minor scales, and of the notes outside of the scale
+MAJOR_DEGREE_WEIGHTS = (6.35, 3.48, 4.38, 4.09, 5.19, 3.66, 2.88)
+MINOR_DEGREE_WEIGHTS = (6.33, 3.52, 5.38, 3.53, 4.75, 3.98, 3.34)
+CHROMATIC_WEIGHT = 2.4
+
+#The weight of the raised leading tone in minor keys
+LEADING_TONE_WEIGHT = 3.17
+
+#The extra weight given to the bass of each chord, on top of its weight as one of the chord's notes
+BASS_WEIGHT = 1.0
+
+#How sharply confidence favours the keys correlating best, as the scale of the correlations' softmax
+CONFIDENCE_SCALE = 20.0
+
+#A key's estimate, with its correlation (-1 to 1) and its confidence (0 to 1, summing to 1 across keys)
+KeyEstimate = namedtuple('KeyEstimate', ('key', 'correlation', 'confidence'))
+
+
+#### PRIVATE METHODS ####
+def __get_key_notes(key):
+    '''Returns the note names of the passed key's scale, including the raised leading tone for minor keys.'''
+
+    if key[0].isupper():
+        return frozenset(MAJOR_KEY_NOTES[key])
+
+    return frozenset(MINOR_KEY_NOTES[key[0].upper() + key[1:]] + (get_leading_tone_in_key(key),))
+
+
+def __create_key_profiles():
+    '''
+    Creates the centered and normalized profile of each major and minor key, so that the product of a
+    profile and a histogram is proportional to their correlation.
+
+    Return:
+        key_profiles (tuple): The 12 pitch-class weights of each key
+        key_spellings (tuple): The supported keys for each profile with their note names, fewest accidentals first
+    '''
+
+    key_spellings = {}
+
+    for key in SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS:
+        profile_key = (NOTE_INDICES[key[0].upper() + key[1:]], key[0].isupper())
+        key_spellings.setdefault(profile_key, []).append(key)
+
+    key_profiles = []
+
+    for (tonic_index, is_major), keys in sorted(key_spellings.items()):
+        keys.sort(key=lambda key: abs(get_signature_for_key(key)))
+        profile = [CHROMATIC_WEIGHT] * 12
+
+        if is_major:
+            scale_notes, degree_weights = MAJOR_KEY_NOTES[keys[0]], MAJOR_DEGREE_WEIGHTS
+
+        else:
+            scale_notes, degree_weights = MINOR_KEY_NOTES[keys[0][0].upper() + keys[0][1:]], MINOR_DEGREE_WEIGHTS
+            profile[(tonic_index + 11) % 12] = LEADING_TONE_WEIGHT
+
+        for note_name, degree_weight in zip(scale_notes, degree_weights):
+            profile[NOTE_INDICES[note_name]] = degree_weight
+
+        mean = sum(profile) / 12
+        norm = sqrt(sum((weight - mean) ** 2 for weight in profile))
+        key_profiles.append(tuple((weight - mean) / norm for weight in profile))
+        key_spellings[(tonic_index, is_major)] = tuple((key, __get_key_notes(key)) for key in keys)
+
+    return (tuple(key_profiles), tuple(key_spellings[profile_key] for profile_key in sorted(key_spellings)))
+
+
+_KEY_PROFILES, _KEY_SPELLINGS = __create_key_profiles()
+
+
+@lru_cache(maxsize=4096)
+def __parse_chord_string(chord_string):
+    '''Returns the bass note name and the name of each note in the passed chord string, i.e. 'C3,G3,E4,C5'.'''
+
+    note_values = []
+
+    for note_string in chord_string.split(','):
+        note_string = note_string.strip()
+
+        if note_string[-1:].isdigit() and note_string[0:-1] in NOTE_INDICES:
+            note_values.append((NOTE_INDICES[note_string[0:-1]] + int(note_string[-1]) * 12, note_string[0:-1]))
+
+    if not note_values:
+        return (None, ())
+
+    return (min(note_values)[1], tuple(note_name for _, note_name in note_values))
+
+
+def __get_chord_notes(chord):
+    '''
+    Returns the bass note and each note of the passed chord, as note names when the chord is spelled or
+    as pitch classes otherwise.
+
+    Parameters:
+        chord: A chord string, i.e. 'C3,G3,E4,C5', a Chord, or a sequence of note values such as MIDI note numbers
+
+    Return:
+        (bass_note, chord_notes): The bass note, or None if the chord has no notes, and the tuple of its notes
+    '''
+
+    if isinstance(chord, str):
+        return __parse_chord_string(chord)
+
+    if hasattr(chord, 'notes'):
+        if not chord.notes:
+            return (None, ())
+
+        return (min(chord.notes, key=attrgetter('value')).name, tuple(note.name for note in chord.notes))
+
+    if not chord:
+        return (None, ())
+
+    return (min(chord) % 12, tuple(note_value % 12 for note_value in chord))
+
+
+#### PUBLIC METHODS ####
+def rank_keys(chords, durations=None):
+    '''
+    Ranks every major and minor key by how well it fits the notes of the passed chords.
+
+    Parameters:
+        chords (list): Each chord as a chord string, i.e. 'C3,G3,E4,C5', a Chord, or a sequence of note values
+        durations (list): The duration of each chord in any unit, or None to weigh each chord equally
+
+    Return:
+        key_estimates (list): A KeyEstimate for each of the 24 keys, best first, or an empty list if there are no notes
+    '''
+
+    #The weight of each note name, or of each pitch class for unspelled notes
+    note_weights = {}
+
+    for chord, chord_weight in zip(chords, repeat(1.0) if durations is None else durations):
+        bass_note, chord_notes = __get_chord_notes(chord)
+
+        if bass_note is not None:
+            note_weights[bass_note] = note_weights.get(bass_note, 0) + chord_weight * BASS_WEIGHT
+
+        for note in chord_notes:
+            note_weights[note] = note_weights.get(note, 0) + chord_weight
+
+    histogram = [0.0] * 12
+
+    for note, note_weight in note_weights.items():
+        histogram[NOTE_INDICES[note] if isinstance(note, str) else note] += note_weight
+
+    total_weight = sum(histogram)
+
+    if total_weight <= 0:
+        return []
+
+    #The profiles are centered, so the product only needs the histogram's deviation to give the correlation
+    deviation = sqrt(max(sum(weight * weight for weight in histogram) - total_weight * total_weight / 12, 0))
+    correlations = [sum(map(mul, profile, histogram)) / deviation if deviation else 0.0 for profile in _KEY_PROFILES]
+
+    best_correlation = max(correlations)
+    confidences = [exp((correlation - best_correlation) * CONFIDENCE_SCALE) for correlation in correlations]
+    total_confidence = sum(confidences)
+
+    key_estimates = []
+
+    for spellings, correlation, confidence in zip(_KEY_SPELLINGS, correlations, confidences):
+        key = spellings[0][0]
+
+        #Choose the spelling of the key whose scale holds the most of the notes' names
+        if len(spellings) > 1:
+            key = max(spellings, key=lambda spelling: sum(note_weights[note_name]
+            for note_name in spelling[1].intersection(note_weights)))[0]
+
+        key_estimates.append(KeyEstimate(key, correlation, confidence / total_confidence))
+
+    key_estimates.sort(key=lambda key_estimate: -key_estimate.correlation)
+
+    return key_estimates
+
+
+def detect_key(chords, durations=None, default=None):
+    '''Returns the key best fitting the notes of the passed chords, or the default if there are none, see rank_keys.'''
+
+    key_estimates = rank_keys(chords, durations)
+
+    return key_estimates[0].key if key_estimates else default
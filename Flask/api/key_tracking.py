@@ -0,0 +1,234 @@
+'''
+This module exports the key tracking analysis, finding where a progression modulates between keys.
+
+Each chord is given a cost in every supported key from its relation to the key: nothing for diatonic
+chords, less for tonic and dominant chords, and more for mixture and chromatic chords. The costs
+only depend on the chord's root and quality, so each chord's row of costs across the keys is looked
+up from a table built once for every root and quality. A Viterbi pass then chooses the key of each
+chord, minimizing the progression's total cost plus a cost for each modulation. As changing key costs
+the same from every key, each step only compares staying in a key with moving from the best key so
+far, so the pass takes linear time in both the number of chords and the number of keys.
+
+Chords acting as applied dominants are costed as their resolution, so tonicizations don't modulate:
+    segments = track_keys(progression.chords, progression.key)
+    local_keys = get_local_keys(segments)
+'''
+
+from collections import namedtuple
+from functools import lru_cache
+
+from .music_info import (MAJOR_KEY_NOTES, MINOR_KEY_NOTES, NOTE_INDICES, SUPPORTED_MAJOR_KEYS,
+SUPPORTED_MINOR_KEYS, get_chord_relation_for_key, get_leading_tone_in_key, get_lt_numeral_for_dim7,
+get_note_names_for_key, identify_chord_numeral_for_key)
+
+#The keys chords are tracked across, in the order of their costs
+TRACKED_KEYS = SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS
+
+#The chord qualities costed by their relation to each key, where chords of other qualities cost nothing in every key
+COSTED_QUALITIES = ('', 'm', 'o', '+', '7', 'maj7', 'm7', 'ø', 'o7', '7b5')
+
+#The cost of each chord relation to a key, and of the tonic and dominant chords of a key
+RELATION_COSTS = {'diatonic': 0.0, 'mixture': 1.0, 'chromatic': 3.0}
+TONIC_COST = -1.5
+DOMINANT_COST = -0.5
+
+#The cost of an applied chord, added to the cost of the chord it resolves to
+APPLIED_COST = 0.5
+
+#The cost of a chord whose root isn't spelled in the key, telling enharmonic keys apart, i.e. C# and Db
+SPELLING_COST = 0.01
+
+#The cost of each change of key
+MODULATION_COST = 4.0
+
+#The chords before a modulation searched for a pivot chord, diatonic to both keys
+PIVOT_WINDOW = 2
+
+#A span of chords in the same key, from start up to stop (0-indexed), and the pivot chord's index or None
+KeySegment = namedtuple('KeySegment', ('key', 'start', 'stop', 'pivot_index'))
+
+
+#### PRIVATE METHODS ####
+def __get_key_notes(key):
+    '''Returns the note names of the passed key's scale, including the raised leading tone for minor keys.'''
+
+    if key[0].isupper():
+        return frozenset(MAJOR_KEY_NOTES[key])
+
+    return frozenset(MINOR_KEY_NOTES[key[0].upper() + key[1:]] + (get_leading_tone_in_key(key),))
+
+
+def __create_cost_table():
+    '''
+    Returns the cost of a chord of each quality with its root at each number of semitones above the
+    tonic of a major and minor key, using the numeral relations of C major and C minor.
+
+    Return:
+        cost_table (dict): Each quality mapped to a (major_costs, minor_costs) tuple of 12 costs
+    '''
+
+    cost_table = {}
+
+    for quality in COSTED_QUALITIES:
+        mode_costs = []
+
+        for reference_key in ('C', 'c'):
+            note_names = get_note_names_for_key(reference_key)
+            costs = []
+
+            for semitones in range(12):
+                numeral = identify_chord_numeral_for_key(reference_key,
+                {'root': note_names[semitones], 'quality': quality, 'position': 0})
+
+                if quality == 'o7':
+                    numeral = get_lt_numeral_for_dim7(numeral)
+
+                #Tonic and dominant chords are costed the same in major and minor, i.e. V in a minor key
+                if semitones == 0 and numeral in ('I', 'IM7', 'i', 'i7') and \
+                get_chord_relation_for_key(reference_key, numeral) == 'diatonic':
+                    costs.append(TONIC_COST)
+
+                elif numeral in ('V', 'V7', 'viio', 'viiø', 'viio7'):
+                    costs.append(DOMINANT_COST)
+
+                else:
+                    costs.append(RELATION_COSTS[get_chord_relation_for_key(reference_key, numeral)])
+
+            mode_costs.append(tuple(costs))
+
+        cost_table[quality] = tuple(mode_costs)
+
+    return cost_table
+
+
+_COST_TABLE = __create_cost_table()
+_KEY_INFO = tuple((NOTE_INDICES[key[0].upper() + key[1:]], int(key[0].islower()), __get_key_notes(key))
+for key in TRACKED_KEYS)
+
+
+@lru_cache(maxsize=1024)
+def __get_chord_costs(root_name, quality):
+    '''Returns the cost of a chord with the passed root and quality in each of the tracked keys.'''
+
+    if quality not in _COST_TABLE:
+        return (0.0,) * len(TRACKED_KEYS)
+
+    quality_costs = _COST_TABLE[quality]
+    root_index = NOTE_INDICES[root_name]
+
+    return tuple(quality_costs[mode][(root_index - tonic_index) % 12] +
+    (0.0 if root_name in key_notes else SPELLING_COST) for tonic_index, mode, key_notes in _KEY_INFO)
+
+
+def __find_pivot(fitness, start, boundary, from_key, to_key):
+    '''Returns the index of the chord nearest before the boundary that fits both keys, or None.'''
+
+    for i in range(boundary, max(start, boundary - PIVOT_WINDOW) - 1, -1):
+        if fitness[i][from_key] <= 0 and fitness[i][to_key] <= 0:
+            return i
+
+    return None
+
+
+#### PUBLIC METHODS ####
+def get_key_fitness(chords):
+    '''
+    Returns the cost of each of the passed chords in each of the tracked keys, without applied chords.
+
+    Parameters:
+        chords (list): The progression's chords
+
+    Return:
+        fitness (list): A tuple of costs for each chord, in the order of TRACKED_KEYS
+    '''
+
+    return [__get_chord_costs(chord.get_root_name(), chord.quality) for chord in chords]
+
+
+def track_keys(chords, key=None, modulation_cost=MODULATION_COST):
+    '''
+    Finds the key of each of the passed chords, allowing the progression to modulate.
+
+    Parameters:
+        chords (list): The progression's chords
+        key (str): The key the progression starts in, which any other starting key costs a modulation
+            to replace, or None to choose the starting key from the chords
+        modulation_cost (float): The cost of each change of key, where lower costs modulate more readily
+
+    Return:
+        key_segments (list): The KeySegment for each span of chords in the same key, in order
+    '''
+
+    if not chords:
+        return []
+
+    fitness = get_key_fitness(chords)
+    num_keys = len(TRACKED_KEYS)
+
+    #Applied chords cost the same as the chord they resolve to, as they tonicize it in the same key
+    chord_costs = list(fitness)
+
+    for i in range(len(chords) - 2, -1, -1):
+        if chords[i].quality in _COST_TABLE and chords[i].get_applied_numeral(chords[i + 1], False) != '':
+            chord_costs[i] = tuple(min(cost, APPLIED_COST + next_cost) for cost, next_cost in
+            zip(fitness[i], chord_costs[i + 1]))
+
+    if key in TRACKED_KEYS:
+        key_index = TRACKED_KEYS.index(key)
+        path_costs = [cost + (0 if k == key_index else modulation_cost) for k, cost in enumerate(chord_costs[0])]
+
+    else:
+        path_costs = list(chord_costs[0])
+
+    #For each chord after the first, the best key of the chord before and whether each key was moved into from it
+    best_previous_keys = []
+    modulations = []
+
+    for costs in chord_costs[1:]:
+        best_previous = min(range(num_keys), key=path_costs.__getitem__)
+        modulation_path_cost = path_costs[best_previous] + modulation_cost
+        moved = bytearray(num_keys)
+
+        for k in range(num_keys):
+            if modulation_path_cost < path_costs[k]:
+                path_costs[k] = modulation_path_cost
+                moved[k] = 1
+
+            path_costs[k] += costs[k]
+
+        best_previous_keys.append(best_previous)
+        modulations.append(moved)
+
+    #Trace the cheapest path back from the last chord
+    current_key = min(range(num_keys), key=path_costs.__getitem__)
+    chord_keys = [current_key]
+
+    for i in range(len(chords) - 2, -1, -1):
+        if modulations[i][current_key]:
+            current_key = best_previous_keys[i]
+
+        chord_keys.append(current_key)
+
+    chord_keys.reverse()
+
+    key_segments = []
+    start = 0
+
+    for i in range(1, len(chords) + 1):
+        if i == len(chords) or chord_keys[i] != chord_keys[start]:
+            pivot_index = None
+
+            if key_segments:
+                pivot_index = __find_pivot(fitness, key_segments[-1].start, start, chord_keys[start - 1],
+                chord_keys[start])
+
+            key_segments.append(KeySegment(TRACKED_KEYS[chord_keys[start]], start, i, pivot_index))
+            start = i
+
+    return key_segments
+
+
+def get_local_keys(key_segments):
+    '''Returns the key of each chord in the passed key segments.'''
+
+    return [key_segment.key for key_segment in key_segments for _ in range(key_segment.start, key_segment.stop)]
@@ -0,0 +1,229 @@
+'''
+This module exports the LiveAnalysisChannel class for analyzing a progression as its chords are typed.
+
+Edits received in quick succession are combined and analyzed together once the client stops sending
+them for a short delay. If new edits arrive while an analysis is running, the analysis is cancelled
+at its next stage and the chords it didn't finish are analyzed along with the newer edits. Results
+of an analysis finished before newer edits arrived are held back and merged with the results for
+those edits, so the client is only sent the latest analysis.
+'''
+
+import threading
+import time
+
+from .music_funcs import parse_key_signature
+from .music_info import SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS
+from .progression_store import ProgressionSession
+
+
+class LiveAnalysisChannel:
+    '''
+    Class handling the messages for one client's live analysis connection.
+
+    Messages received from the client:
+        {'type': 'create', 'chords': [...], 'key': 'C', 'analyze_satb': True}
+        {'type': 'edit', 'chords': {slot: chord_string}, 'key': 'C', 'analyze_satb': True}
+
+    Messages sent to the client:
+        {'type': 'progression', 'progression': progression_update}
+        {'type': 'error', 'error': error_code}
+
+    Attributes:
+        send (function): The function called with each message to send to the client
+        debounce_delay (float): The time in seconds to wait for more edits before analyzing them
+        progression_session (ProgressionSession): The progression being analyzed or None if not created
+    '''
+
+    def __init__(self, send, debounce_delay=0.02):
+        self.send = send
+        self.debounce_delay = debounce_delay
+        self.progression_session = None
+
+        self._condition = threading.Condition()
+        self._pending_edits = None
+        self._last_edit_time = 0
+        self._held_update = None
+        self._closed = False
+        self._send_lock = threading.Lock()
+
+        self._worker = threading.Thread(target=self.__analyze_edits, daemon=True)
+        self._worker.start()
+
+    def receive(self, message):
+        '''Handles a message received from the client.'''
+
+        message_type = message.get('type') if isinstance(message, dict) else None
+
+        if message_type == 'create':
+            self.__create_progression(message)
+
+        elif message_type == 'edit' and not isinstance(message.get('chords', {}), dict):
+            self.__send({'type': 'error', 'error': 'INVALID_MESSAGE'})
+
+        elif message_type == 'edit' and message.get('key') and not self.__is_supported_key(message['key']):
+            self.__send({'type': 'error', 'error': 'INVALID_KEY'})
+
+        elif message_type == 'edit' and self.progression_session is not None:
+            self.__queue_edit(message)
+
+        elif message_type == 'edit':
+            self.__send({'type': 'error', 'error': 'PROGRESSION_NOT_FOUND'})
+
+        else:
+            self.__send({'type': 'error', 'error': 'INVALID_MESSAGE'})
+
+    def close(self):
+        '''Stops analyzing edits for the client, discarding any that haven't been analyzed.'''
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._worker.join()
+
+    def __send(self, message):
+        '''Sends the passed message to the client, one message at a time.'''
+
+        with self._send_lock:
+            self.send(message)
+
+    def __is_supported_key(self, key_signature):
+        '''Returns whether the passed key signature, i.e. 'C' or 'Am', is a supported key.'''
+
+        key = parse_key_signature(str(key_signature))
+
+        return key in SUPPORTED_MAJOR_KEYS or key in SUPPORTED_MINOR_KEYS
+
+    def __create_progression(self, message):
+        '''Creates the progression to analyze and sends its full analysis.'''
+
+        key_signature = str(message.get('key') or 'C')
+
+        if not self.__is_supported_key(key_signature):
+            self.__send({'type': 'error', 'error': 'INVALID_KEY'})
+            return
+
+        chords = message.get('chords')
+
+        if not isinstance(chords, list):
+            chords = []
+
+        try:
+            new_session = ProgressionSession([str(chord_string) for chord_string in chords], key_signature,
+            bool(message.get('analyze_satb')))
+
+        except Exception:
+            self.__send({'type': 'error', 'error': 'ANALYSIS_FAILED'})
+            return
+
+        #Edits for a previous progression no longer apply
+        with self._condition:
+            self._pending_edits = None
+            self._held_update = None
+            self.progression_session = new_session
+
+        self.__send({'type': 'progression', 'progression': new_session.get_state()})
+
+    def __queue_edit(self, message):
+        '''Combines the passed edit with any edits waiting to be analyzed.'''
+
+        with self._condition:
+
+            if self._pending_edits is None:
+                self._pending_edits = {'chords': {}, 'key': None, 'analyze_satb': None}
+
+            for slot, chord_string in (message.get('chords') or {}).items():
+
+                if str(slot).isdigit():
+                    self._pending_edits['chords'][int(slot)] = str(chord_string)
+
+            if message.get('key'):
+                self._pending_edits['key'] = str(message['key'])
+
+            if 'analyze_satb' in message:
+                self._pending_edits['analyze_satb'] = bool(message['analyze_satb'])
+
+            self._last_edit_time = time.monotonic()
+            self._condition.notify()
+
+    def __merge_update(self, update):
+        '''Merges the passed analysis update into the update held back from the client, if any.'''
+
+        held_update = self._held_update
+
+        if held_update is None:
+            return update
+
+        chord_updates = {chord_update['slot']: chord_update for chord_update in held_update['chords']}
+        chord_updates.update({chord_update['slot']: chord_update for chord_update in update['chords']})
+
+        error_updates = None
+
+        if update['satb_errors'] is not None:
+            error_updates = {error_update['index']: error_update for error_update in held_update['satb_errors'] or []}
+            error_updates.update({error_update['index']: error_update for error_update in update['satb_errors']})
+            error_updates = [error_updates[index] for index in sorted(error_updates) if index < update['num_chords']]
+
+        return {'chords': [chord_updates[slot] for slot in sorted(chord_updates) if slot < update['num_slots']],
+        'satb_errors': error_updates, 'num_slots': update['num_slots'], 'num_chords': update['num_chords']}
+
+    def __analyze_edits(self):
+        '''Worker loop analyzing queued edits once no new edits have arrived within the debounce delay.'''
+
+        while True:
+
+            with self._condition:
+
+                while self._pending_edits is None and not self._closed:
+                    self._condition.wait()
+
+                #Wait for the client to stop sending edits
+                while not self._closed:
+                    remaining_delay = self._last_edit_time + self.debounce_delay - time.monotonic()
+
+                    if remaining_delay <= 0:
+                        break
+
+                    self._condition.wait(remaining_delay)
+
+                if self._closed:
+                    return
+
+                #The pending edits were discarded for a new progression
+                if self._pending_edits is None:
+                    continue
+
+                edits = self._pending_edits
+                progression_session = self.progression_session
+                self._pending_edits = None
+
+            #The analysis is superseded by newer edits or a new progression
+            def cancelled():
+                return self._pending_edits is not None or progression_session is not self.progression_session
+
+            #A failed analysis is reported to the client so that later edits are still analyzed
+            try:
+                with progression_session.lock:
+                    update = progression_session.update(edits['chords'], edits['key'], edits['analyze_satb'],
+                    cancelled)
+
+            except Exception:
+                self.__send({'type': 'error', 'error': 'ANALYSIS_FAILED'})
+                continue
+
+            with self._condition:
+
+                #Discard the update if the progression was replaced while analyzing it, or if it was cancelled
+                if progression_session is not self.progression_session or update is None:
+                    continue
+
+                update = self.__merge_update(update)
+
+                #Hold the update back if newer edits arrived while analyzing
+                if self._pending_edits is not None:
+                    self._held_update = update
+                    continue
+
+                self._held_update = None
+
+            self.__send({'type': 'progression', 'progression': update})
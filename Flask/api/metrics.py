@@ -0,0 +1,233 @@
+'''
+This module exports the analysis engine's hot path metrics and their Prometheus text format.
+
+Each thread records its stage timings, rule timings and error code counts in its own counters, so
+that recording never takes a lock. The counters are only summed across threads when the metrics are
+collected, along with the hit and miss counts of the engine's lookup caches. Stages are timed on
+every analysis, while the SATB rules are only timed on one in every RULE_SAMPLE_INTERVAL validations
+per thread, as timing each rule for each chord would slow down validation noticeably.
+
+This module doesn't import the rest of the engine, so the metrics can be served before it's loaded.
+'''
+
+import sys
+import threading
+import weakref
+from time import perf_counter
+
+#The number of validations per thread for each one with its rules timed
+RULE_SAMPLE_INTERVAL = 64
+
+_local = threading.local()
+
+#The metrics of each thread, and the summed counters of threads that have finished
+_thread_metrics = []
+_finished_counters = {}
+_metrics_lock = threading.Lock()
+
+
+class _ThreadMetrics:
+    '''
+    Class holding the metrics recorded by a single thread.
+
+    Attributes:
+        stage_totals (dict): The total time of each stage and the number of times they were run, for each
+            tuple of stage names recorded together, i.e. {('parse', 'identify'): [0.5, 0.2, 100]}
+        rule_totals (dict): The total time and number of calls of each timed rule, i.e. {'voice_range': [0.1, 200]}
+        error_counts (dict): The number of errors found for each error code
+        num_validations (int): The number of validations run, for sampling those with their rules timed
+    '''
+
+    __slots__ = ('stage_totals', 'rule_totals', 'error_counts', 'num_validations')
+
+    def __init__(self):
+        self.stage_totals = {}
+        self.rule_totals = {}
+        self.error_counts = {}
+        self.num_validations = 0
+
+    def get_counters(self):
+        '''Returns this thread's metrics as (metric, label) counters.'''
+
+        counters = {}
+
+        #Copying each dict first keeps it from changing while it's read
+        for stage_names, stage_totals in self.stage_totals.copy().items():
+            for stage_name, stage_time in zip(stage_names, stage_totals):
+                counters[('stage_seconds', stage_name)] = counters.get(('stage_seconds', stage_name), 0) + stage_time
+                counters[('stage_count', stage_name)] = counters.get(('stage_count', stage_name), 0) + stage_totals[-1]
+
+        for rule_name, (rule_time, num_calls) in self.rule_totals.copy().items():
+            counters[('rule_seconds', rule_name)] = rule_time
+            counters[('rule_count', rule_name)] = num_calls
+
+        for error_code, num_errors in self.error_counts.copy().items():
+            counters[('error_count', error_code)] = num_errors
+
+        return counters
+
+
+#### PRIVATE METHODS ####
+def __get_thread_metrics():
+    '''Returns the current thread's metrics, creating and registering them on first use.'''
+
+    try:
+        return _local.metrics
+
+    except AttributeError:
+        thread_metrics = _local.metrics = _ThreadMetrics()
+
+        with _metrics_lock:
+            _thread_metrics.append((weakref.ref(threading.current_thread()), thread_metrics))
+
+        return thread_metrics
+
+
+def __add_counts(totals, counters):
+    '''Adds the passed counters to the totals.'''
+
+    for counter_key, count in counters.items():
+        totals[counter_key] = totals.get(counter_key, 0) + count
+
+
+#### PUBLIC METHODS ####
+def record_stages(stage_names, stage_times):
+    '''
+    Records the time spent in each of the passed analysis stages.
+
+    Parameters:
+        stage_names (tuple): The name of each stage, i.e. ('parse', 'identify')
+        stage_times (list): The perf_counter time before the first stage and after each stage
+    '''
+
+    stage_totals = __get_thread_metrics().stage_totals
+
+    #Times are summed for the whole tuple of stages, so that no key is built for each stage
+    if (totals := stage_totals.get(stage_names)) is None:
+        totals = stage_totals[stage_names] = [0] * (len(stage_names) + 1)
+
+    for i in range(len(stage_names)):
+        totals[i] += stage_times[i + 1] - stage_times[i]
+
+    totals[-1] += 1
+
+
+def record_errors(step_errors):
+    '''Counts the code of each error in the passed lists of errors found for each chord.'''
+
+    error_counts = __get_thread_metrics().error_counts
+
+    for chord_errors in step_errors:
+        for error in chord_errors:
+            error_counts[error['code']] = error_counts.get(error['code'], 0) + 1
+
+
+def should_time_rules():
+    '''Returns whether the current thread's validation should time its rules, once every RULE_SAMPLE_INTERVAL calls.'''
+
+    thread_metrics = __get_thread_metrics()
+    thread_metrics.num_validations += 1
+
+    return (thread_metrics.num_validations - 1) % RULE_SAMPLE_INTERVAL == 0
+
+
+def time_rule(rule_name, rule_function):
+    '''Returns the passed rule function wrapped to record the time spent in each of its calls.'''
+
+    rule_totals = __get_thread_metrics().rule_totals
+    totals = rule_totals.setdefault(rule_name, [0, 0])
+
+    def timed_rule(*args):
+        start_time = perf_counter()
+
+        try:
+            return rule_function(*args)
+
+        finally:
+            totals[0] += perf_counter() - start_time
+            totals[1] += 1
+
+    return timed_rule
+
+
+def collect_metrics():
+    '''
+    Returns the counters summed across every thread, along with the engine's cache statistics.
+
+    Return:
+        metrics (dict): Each counter's (metric, label) key mapped to its value, where the cache
+            statistics are keyed as ('cache_hits', function_name), ('cache_misses', ...) and ('cache_size', ...)
+    '''
+
+    with _metrics_lock:
+
+        #Fold the metrics of finished threads into a single total, so they aren't kept per thread
+        for thread_entry in [thread_entry for thread_entry in _thread_metrics if thread_entry[0]() is None]:
+            _thread_metrics.remove(thread_entry)
+            __add_counts(_finished_counters, thread_entry[1].get_counters())
+
+        metrics = dict(_finished_counters)
+
+        for _, thread_metrics in _thread_metrics:
+            __add_counts(metrics, thread_metrics.get_counters())
+
+    #Only caches in the engine's modules that have already been imported are reported
+    for module_name, module in list(sys.modules.items()):
+        if module_name.startswith('api.') and module is not None:
+
+            for function_name, function in list(vars(module).items()):
+                if hasattr(function, 'cache_info') and getattr(function, '__module__', None) == module_name:
+                    cache_info = function.cache_info()
+                    metrics[('cache_hits', function_name)] = cache_info.hits
+                    metrics[('cache_misses', function_name)] = cache_info.misses
+                    metrics[('cache_size', function_name)] = cache_info.currsize
+
+    return metrics
+
+
+def reset_metrics():
+    '''
+    Clears the counters recorded by every thread, i.e. those of analyses run while warming up. The cache
+    statistics aren't reset, as they describe the caches' contents.
+    '''
+
+    with _metrics_lock:
+        _finished_counters.clear()
+
+        for _, thread_metrics in _thread_metrics:
+            thread_metrics.stage_totals = {}
+            thread_metrics.rule_totals = {}
+            thread_metrics.error_counts = {}
+
+
+def format_metrics(metrics=None):
+    '''Returns the passed metrics, or those collected now, in the Prometheus text exposition format.'''
+
+    metrics = collect_metrics() if metrics is None else metrics
+
+    #Each metric's Prometheus name, type, label name, help text and the counters making up its samples
+    metric_formats = (
+        ('analysis_stage_seconds', 'summary', 'stage', 'Time spent in each stage of progression analysis.',
+        (('_sum', 'stage_seconds'), ('_count', 'stage_count'))),
+        ('analysis_rule_seconds', 'summary', 'rule',
+        f'Time spent in each SATB rule, sampled on one in {RULE_SAMPLE_INTERVAL} validations per thread.',
+        (('_sum', 'rule_seconds'), ('_count', 'rule_count'))),
+        ('analysis_errors_total', 'counter', 'code', 'SATB errors found, by error code.', (('', 'error_count'),)),
+        ('analysis_cache_hits_total', 'counter', 'cache', 'Lookup cache hits, by cached function.', (('', 'cache_hits'),)),
+        ('analysis_cache_misses_total', 'counter', 'cache', 'Lookup cache misses, by cached function.',
+        (('', 'cache_misses'),)),
+        ('analysis_cache_size', 'gauge', 'cache', 'Entries held by each lookup cache.', (('', 'cache_size'),))
+    )
+
+    lines = []
+
+    for metric_name, metric_type, label_name, help_text, samples in metric_formats:
+        lines.append(f'# HELP {metric_name} {help_text}')
+        lines.append(f'# TYPE {metric_name} {metric_type}')
+
+        for sample_suffix, counter_name in samples:
+            for (metric_key, label), value in sorted(metrics.items()):
+                if metric_key == counter_name:
+                    lines.append(f'{metric_name}{sample_suffix}{{{label_name}="{label}"}} {value}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,320 @@
+'''
+This module exports functions for reading chord progressions from Standard MIDI Files.
+
+Note on and off events are read from every track, and the notes sounding together are grouped
+into chord slices by sweeping through the events in time order. Each slice holding three or more
+different notes becomes a Chord, with its notes spelled for the key declared by the caller, the file's key
+signature, or C major otherwise, and then respelled as the chord they're identified as, i.e. Ab as G# in E major.
+
+MIDI note numbers map directly onto note values, as MIDI note 60 is C4 and a note's value is
+its index plus its octave times 12:
+    note_value = midi_note - 12
+'''
+
+from itertools import chain, groupby
+
+from .chord import Chord
+from .chord_progression import ChordProgression
+from .key_detection import detect_key
+from .music_funcs import parse_key_signature
+from .music_info import SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS, get_key_for_signature, get_note_names_for_key
+from .note import Note
+from .respelling import respell_chord
+
+#The channel reserved for percussion, whose notes are ignored by default
+DRUM_CHANNEL = 9
+
+#The number of data bytes following each channel message's status byte, by its upper 4 bits
+_CHANNEL_MESSAGE_LENGTHS = {0x8: 2, 0x9: 2, 0xA: 2, 0xB: 2, 0xC: 1, 0xD: 1, 0xE: 2}
+
+#The MIDI note numbers of the notes in octaves 0-8, the range of octaves a note can be defined in
+_MIDI_NOTE_RANGE = range(12, 120)
+
+
+class MidiFile:
+    '''
+    Class holding the note events read from a MIDI file.
+
+    Attributes:
+        ticks_per_beat (int): The number of ticks in a quarter note
+        note_events (list): The (tick, is_note_on, midi_note) tuple for each note event, sorted by tick
+        key_signature (str): The file's first key signature, i.e. 'Eb' or 'c', or None if it has none
+        end_tick (int): The tick of the latest event in the file
+    '''
+
+    def __init__(self, ticks_per_beat, note_events, key_signature, end_tick):
+        self.ticks_per_beat = ticks_per_beat
+        self.note_events = note_events
+        self.key_signature = key_signature
+        self.end_tick = end_tick
+
+
+#### PRIVATE METHODS ####
+def __read_variable_length(midi_data, position):
+    '''Returns the variable-length quantity starting at the passed position and the position after it.'''
+
+    value = 0
+
+    while True:
+        byte = midi_data[position]
+        position += 1
+        value = (value << 7) | (byte & 0x7F)
+
+        if byte < 0x80:
+            return (value, position)
+
+
+def __read_track(midi_data, position, track_end, note_events, ignored_channels):
+    '''
+    Reads the events of the track between the passed positions, adding its note events to the
+    passed list. Returns the track's first key signature event as (tick, key) or None and the
+    tick of its last event.
+    '''
+
+    tick = 0
+    running_status = 0
+    key_signature = None
+
+    while position < track_end:
+        delta_ticks, position = __read_variable_length(midi_data, position)
+        tick += delta_ticks
+        status = midi_data[position]
+
+        #Data bytes without a status byte reuse the previous channel message's status
+        if status < 0x80:
+            status = running_status
+
+            if status == 0:
+                raise ValueError('MIDI data byte received without a status byte.')
+
+        else:
+            position += 1
+
+        if status == 0xFF:
+            meta_type = midi_data[position]
+            length, position = __read_variable_length(midi_data, position + 1)
+
+            if meta_type == 0x59 and length == 2 and key_signature is None:
+                num_accidentals = midi_data[position] - 256 if midi_data[position] > 127 else midi_data[position]
+                key = get_key_for_signature(num_accidentals, midi_data[position+1] == 1)
+
+                if key is not None:
+                    key_signature = (tick, key)
+
+            elif meta_type == 0x2F:
+                position += length
+                break
+
+            position += length
+            running_status = 0
+
+        elif status in (0xF0, 0xF7):
+            length, position = __read_variable_length(midi_data, position)
+            position += length
+            running_status = 0
+
+        else:
+            message_type = status >> 4
+            running_status = status
+
+            if message_type in (0x8, 0x9):
+                midi_note = midi_data[position]
+                velocity = midi_data[position+1]
+
+                if (status & 0x0F) not in ignored_channels:
+                    note_events.append((tick, message_type == 0x9 and velocity > 0, midi_note))
+
+            position += _CHANNEL_MESSAGE_LENGTHS.get(message_type, 0)
+
+    return (key_signature, tick)
+
+
+def read_midi(midi_data, ignored_channels=(DRUM_CHANNEL,)):
+    '''
+    Reads the note events and key signature from the passed Standard MIDI File data.
+
+    Parameters:
+        midi_data (bytes): The contents of the MIDI file
+        ignored_channels (tuple): The channels (0-15) whose notes are skipped
+
+    Return:
+        midi_file (MidiFile)
+    '''
+
+    if midi_data[0:4] != b'MThd' or len(midi_data) < 14:
+        raise ValueError('Invalid MIDI file header.')
+
+    header_length = int.from_bytes(midi_data[4:8], 'big')
+    ticks_per_beat = int.from_bytes(midi_data[12:14], 'big')
+
+    if ticks_per_beat & 0x8000:
+        raise ValueError('SMPTE time divisions are not supported.')
+
+    note_events = []
+    key_signatures = []
+    end_tick = 0
+    position = 8 + header_length
+
+    try:
+        while position + 8 <= len(midi_data):
+            chunk_type = midi_data[position:position+4]
+            chunk_end = position + 8 + int.from_bytes(midi_data[position+4:position+8], 'big')
+
+            if chunk_end > len(midi_data):
+                raise ValueError('MIDI file ended in the middle of a chunk.')
+
+            #Skip any chunks other than tracks, as the file format allows
+            if chunk_type == b'MTrk':
+                key_signature, track_end_tick = __read_track(midi_data, position + 8, chunk_end, note_events,
+                ignored_channels)
+                end_tick = max(end_tick, track_end_tick)
+
+                if key_signature is not None:
+                    key_signatures.append(key_signature)
+
+            position = chunk_end
+
+    except IndexError as error:
+        raise ValueError('MIDI file ended in the middle of an event.') from error
+
+    #Sort note offs before note ons at the same tick so that repeated notes aren't cut short
+    note_events.sort()
+
+    return MidiFile(ticks_per_beat, note_events, min(key_signatures)[1] if key_signatures else None, end_tick)
+
+
+def slice_note_events(note_events, end_tick, min_ticks=0):
+    '''
+    Groups the notes sounding together into slices by sweeping through the passed note events.
+
+    Slices shorter than the minimum length, i.e. from notes played slightly apart, are skipped,
+    and consecutive slices of the same notes are merged.
+
+    Parameters:
+        note_events (list): The (tick, is_note_on, note) tuple for each note event sorted by tick,
+            where each note is a sortable value such as a MIDI note number
+        end_tick (int): The tick at which any notes still sounding end
+        min_ticks (float): The shortest slice to keep in ticks
+
+    Return:
+        chord_slices (list): The (start_tick, end_tick, notes) tuple for each slice, with its notes sorted
+    '''
+
+    sounding_notes = {}
+    chord_slices = []
+    previous_tick = 0
+
+    #The events at each tick, followed by the end of the notes still sounding
+    tick_groups = chain(groupby(note_events, key=lambda note_event: note_event[0]), [(end_tick, ())])
+
+    for tick, tick_events in tick_groups:
+
+        if sounding_notes and tick - previous_tick >= min_ticks and tick > previous_tick:
+            slice_notes = tuple(sorted(sounding_notes))
+
+            if chord_slices and chord_slices[-1][2] == slice_notes:
+                chord_slices[-1] = (chord_slices[-1][0], tick, slice_notes)
+
+            else:
+                chord_slices.append((previous_tick, tick, slice_notes))
+
+        #Count overlapping notes of the same pitch so that each note off only ends one of them
+        for _, is_note_on, note in tick_events:
+
+            if is_note_on:
+                sounding_notes[note] = sounding_notes.get(note, 0) + 1
+
+            elif note in sounding_notes:
+                sounding_notes[note] -= 1
+
+                if sounding_notes[note] == 0:
+                    del sounding_notes[note]
+
+        previous_tick = tick
+
+    return chord_slices
+
+
+def get_chord_slices(midi_file, min_duration=0.125):
+    '''
+    Groups the notes sounding together in the passed MIDI file into slices, see slice_note_events.
+
+    Parameters:
+        midi_file (MidiFile): The MIDI file's note events
+        min_duration (float): The shortest slice to keep in beats
+
+    Return:
+        chord_slices (list): The (start_tick, end_tick, midi_notes) tuple for each slice, with its notes sorted
+    '''
+
+    return slice_note_events(midi_file.note_events, midi_file.end_tick, min_duration * midi_file.ticks_per_beat)
+
+
+def create_chord_for_midi_notes(midi_notes, key):
+    '''
+    Creates a chord from the passed MIDI note numbers with its notes spelled for the passed key, and
+    respelled as the chord they're identified as.
+
+    Notes outside of octaves 0-8 are dropped, and None is returned if the notes remaining have
+    fewer than 3 different names.
+    '''
+
+    note_names = get_note_names_for_key(key)
+    chord_notes = []
+
+    for midi_note in midi_notes:
+
+        if midi_note in _MIDI_NOTE_RANGE:
+            note_index = midi_note % 12
+            chord_notes.append(Note(note_names[note_index], midi_note // 12 - 1, midi_note - 12, note_index))
+
+    if len({note.index for note in chord_notes}) < 3:
+        return None
+
+    return respell_chord(Chord(chord_notes), key)
+
+
+def create_midi_progression(midi_data, key=None, min_duration=0.125, ignored_channels=(DRUM_CHANNEL,)):
+    '''
+    Reads the chord progression from the passed Standard MIDI File data.
+
+    Parameters:
+        midi_data (bytes): The contents of the MIDI file
+        key (str): The key to spell and analyze the chords in, or None to use the file's key signature,
+            or the key detected from its notes if it has none
+        min_duration (float): The shortest chord slice to keep in beats
+        ignored_channels (tuple): The channels (0-15) whose notes are skipped
+
+    Return:
+        progression (ChordProgression)
+    '''
+
+    midi_file = read_midi(midi_data, ignored_channels)
+    chord_slices = get_chord_slices(midi_file, min_duration)
+
+    if key:
+        key = parse_key_signature(key)
+
+    #Without a key signature, the key is detected from the notes of each slice, weighted by its length
+    else:
+        key = midi_file.key_signature or detect_key([midi_notes for _, _, midi_notes in chord_slices],
+        [end_tick - start_tick for start_tick, end_tick, _ in chord_slices], 'C')
+
+    if key not in SUPPORTED_MAJOR_KEYS and key not in SUPPORTED_MINOR_KEYS:
+        raise ValueError(f'Unsupported key: {key}')
+
+    progression_chords = []
+
+    for _, _, midi_notes in chord_slices:
+
+        if (new_chord := create_chord_for_midi_notes(midi_notes, key)) is not None:
+            progression_chords.append(new_chord)
+
+    return ChordProgression(progression_chords, key)
+
+
+def read_midi_progression(midi_path, **progression_options):
+    '''Reads the chord progression from the MIDI file at the passed path, see create_midi_progression.'''
+
+    with open(midi_path, 'rb') as midi_file:
+        return create_midi_progression(midi_file.read(), **progression_options)
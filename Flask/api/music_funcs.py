@@ -2,10 +2,25 @@
 This module acts as the access point for the Flask application to the music package functions.
 '''
 
-from .chord import ChordFactory
-from .chord_progression import ChordProgression
+from time import perf_counter
 
-def generate_progression(chords, key='C', validate=True):
+from .chord import Chord, ChordFactory
+from .chord_progression import ChordProgression
+from .key_analysis import ANALYZED_KEYS, analyze_all_keys
+from .key_tracking import get_local_keys
+from .metrics import record_stages
+from .progression_patterns import find_progression_patterns
+from .realization import realize_figured_bass, realize_numerals
+from .repair import REPAIR_TIME_BUDGET, suggest_repairs
+from .respelling import respell_chords
+from .serializer import serialize_progression_chords
+from .voice_leading import get_progression_voice_leading
+
+#The stages timed for the engine's metrics while analyzing a progression, with and without validation
+_ANALYSIS_STAGES = ('names', 'numerals', 'accidentals', 'voice_leading', 'format', 'patterns')
+_VALIDATION_STAGES = _ANALYSIS_STAGES + ('validate', 'errors')
+
+def generate_progression(chords, key='C', validate=True, track_modulations=False, respell=False):
     '''
     Main API function to analyze and return information about the received chord progression.
     
@@ -13,77 +28,244 @@ def generate_progression(chords, key='C', validate=True):
         chords (list): An array of the chords to be analyzed in a progression.
         key (str): The key that the chord progression is written for
         validate (bool): Whether or not the progression should be analyzed for SATB errors
+        track_modulations (bool): Whether or not the chords should be analyzed in the local key they modulate to
+        respell (bool): Whether or not the chords' notes should be respelled with the fewest accidentals in the key
 
     Return:
         progression_obj (dict)
     '''
 
-    #The progression info object to be returned
-    progression_obj = {}
-    progression_obj['chords'] = []
+    new_progression = create_progression(chords, key, respell)
+
+    if new_progression is None:
+        return {'error': 'NO_VALID_CHORDS'}
+
+    return analyze_progression(new_progression, validate, track_modulations)
+
+
+def generate_progression_keys(chords, keys=None):
+    '''
+    API function to analyze the received chords in each of the passed keys at once.
+
+    Parameters:
+        chords (list): An array of the chords to be analyzed in a progression.
+        keys (list): The key signatures to analyze the chords in, i.e. ['G', 'Em'], or None for every supported key
+
+    Return:
+        key_analysis (dict): The chord names, and the numerals, relations and accidentals in each key
+    '''
+
+    keys = ANALYZED_KEYS if not keys else tuple(parse_key_signature(key) for key in keys)
+
+    if any(key not in ANALYZED_KEYS for key in keys):
+        return {'error': 'INVALID_KEY'}
+
+    new_progression = create_progression(chords)
+
+    if new_progression is None:
+        return {'error': 'NO_VALID_CHORDS'}
+
+    return analyze_all_keys(new_progression.chords, keys)
+
+
+def generate_realization(numerals=None, key='C', figured_bass=None):
+    '''
+    API function to realize the received numerals or figured bass as a four-voice progression and analyze it.
+
+    Parameters:
+        numerals (list): The numeral of each chord, i.e. ['I', 'V6/5/V', 'V', 'I']
+        key (str): The key signature the numerals or figured bass are written in, i.e. 'C' or 'Am'
+        figured_bass (list): The bass note and figures of each chord to realize instead of numerals,
+            i.e. ['C3', 'F#2 6/5', 'G2', 'C3']
+
+    Return:
+        progression_obj (dict): The realized progression's analysis and SATB errors, with its chord strings
+    '''
+
+    key = parse_key_signature(key)
+
+    if key not in ANALYZED_KEYS:
+        return {'error': 'INVALID_KEY'}
+
+    if not numerals and not figured_bass:
+        return {'error': 'NO_VALID_CHORDS'}
+
+    try:
+        #Each bass note is followed by its figures, if it has any
+        if figured_bass:
+            chords = realize_figured_bass([tuple(bass_figures.split(None, 1) + [''])[0:2] for bass_figures in
+            figured_bass], key)
+
+        else:
+            chords = realize_numerals(numerals, key)
+
+    except ValueError:
+        return {'error': 'INVALID_REALIZATION'}
+
+    progression_obj = analyze_progression(ChordProgression(chords, key))
+    progression_obj['chord_strings'] = [','.join(str(note) for note in chord.notes) for chord in chords]
+
+    return progression_obj
+
+
+def generate_repairs(chords, key='C', time_budget=REPAIR_TIME_BUDGET):
+    '''
+    API function to suggest repairs for each SATB error found in the received chord progression.
+
+    Parameters:
+        chords (list): An array of the chords in the progression
+        key (str): The key that the chord progression is written for
+        time_budget (float): The seconds to spend searching for repairs
+
+    Return:
+        repairs_obj (dict): Each error's message and the note changes suggested to repair it, see repair.suggest_repairs
+    '''
+
+    new_progression = create_progression(chords, key)
+
+    if new_progression is None:
+        return {'error': 'NO_VALID_CHORDS'}
 
-    progression_chords = []
+    repairs = suggest_repairs(new_progression.chords, new_progression.key, time_budget)
+
+    for repair, message in zip(repairs, format_satb_errors([repair['error'] for repair in repairs])):
+        repair['message'] = message
+
+    return {'repairs': repairs}
+
+
+def create_progression(chords, key='C', respell=False):
+    '''
+    Creates a chord progression from the passed chord strings, skipping any invalid chords.
+
+    Parameters:
+        chords (list): An array of the chords in the progression
+        key (str): The key that the chord progression is written for, i.e. 'C' or 'Am'
+        respell (bool): Whether or not the chords' notes should be respelled with the fewest accidentals in the key
+
+    Return:
+        progression (ChordProgression): The progression, or None if none of the chords were valid
+    '''
+
+    chord_notes = []
 
     chord_factory = ChordFactory()
 
     if chords is None or len(chords) == 0:
-        return {'error': 'NO_VALID_CHORDS'}
+        return None
+
+    stage_times = [perf_counter()]
 
-    #Build each chord and add it to the progression
+    #Parse each chord's notes, skipping any invalid chords
     for chord_string in chords:
         try:
-            new_chord = chord_factory.create_chord(chord_string)
-            progression_chords.append(new_chord)
-            
+            chord_data = chord_factory.parse_chord(chord_string)
+
         except ValueError:
             continue
-        
+
+        if chord_data['valid']:
+            chord_notes.append(chord_data['notes'])
+
+    stage_times.append(perf_counter())
+
+    key = parse_key_signature(key)
+
+    #Identify each chord from its notes, respelling them as the chords they're identified as if requested
+    progression_chords = [Chord(notes) for notes in chord_notes]
+
+    if respell:
+        progression_chords = respell_chords(progression_chords, key)
+
+    stage_times.append(perf_counter())
+    record_stages(('parse', 'identify'), stage_times)
+
     if len(progression_chords) == 0:
-        return {'error': 'NO_VALID_CHORDS'}
+        return None
 
-    if 'm' in key:
-        key = key[0:-1]
-        key = key.lower()
-        
     #Create the chord progression using the gathered valid chords and the key passed
-    new_progression = ChordProgression(progression_chords, key)
+    return ChordProgression(progression_chords, key)
+
+
+def analyze_progression(progression, validate=True, track_modulations=False):
+    '''
+    Analyzes the passed chord progression and returns information about its chords.
+
+    Parameters:
+        progression (ChordProgression): The progression to analyze, with its chords and key
+        validate (bool): Whether or not the progression should be analyzed for SATB errors
+        track_modulations (bool): Whether or not the chords should be analyzed in the local key they modulate to,
+            returning the progression's key segments
+
+    Return:
+        progression_obj (dict)
+    '''
+
+    #The progression info object to be returned
+    progression_obj = {}
+
+    #The time before the first stage and after each stage of the analysis, for the engine's metrics
+    stage_times = [perf_counter()]
 
     #Get the names and numerals from the progression
-    chord_names = new_progression.get_progression_chord_names(True)
-    chord_numerals = new_progression.get_progression_chord_numerals(True)
+    chord_names = progression.get_progression_chord_names(True)
+    stage_times.append(perf_counter())
+
+    #Tracking the progression's keys is timed along with its numerals
+    key_segments = progression.track_keys() if track_modulations else None
+    local_keys = get_local_keys(key_segments) if key_segments else None
+
+    chord_numerals = progression.get_progression_chord_numerals(True, local_keys=local_keys)
+    stage_times.append(perf_counter())
 
     #Get any accidentals for the chords in this key
-    chord_accidentals = new_progression.get_progression_chord_accidentals()
+    chord_accidentals = progression.get_progression_chord_accidentals(local_keys)
+    stage_times.append(perf_counter())
+
+    #Get the voice leading into each chord
+    chord_voice_leading = get_progression_voice_leading(progression.chords)
+    stage_times.append(perf_counter())
 
     #Create the progression object to return
-    for i, (name, numeral, chord) in enumerate(zip(chord_names, chord_numerals, progression_chords)):
-        progression_obj['chords'].append({'name': name, 'numeral': numeral, 'notes': __format_chord(chord), 
-        'accidentals': chord_accidentals[i]})
+    progression_obj['chords'] = serialize_progression_chords(progression.chords, chord_names, chord_numerals, 
+    chord_accidentals, chord_voice_leading)
+
+    if key_segments is not None:
+        progression_obj['key_segments'] = [{'key': key_segment.key, 'start': key_segment.start,
+        'stop': key_segment.stop, 'pivot': key_segment.pivot_index} for key_segment in key_segments]
+
+    stage_times.append(perf_counter())
+
+    #Find the cadences and schemata in the progression's numerals
+    progression_obj['patterns'] = [{'name': pattern_match.name, 'kind': pattern_match.kind,
+    'start': pattern_match.start, 'stop': pattern_match.stop} for pattern_match in
+    find_progression_patterns(progression, chord_numerals, local_keys)]
+    stage_times.append(perf_counter())
 
     #If the user requested the SATB errors for the progression, retrieve and format them
     if validate:
-        progression_errors = new_progression.validate_progression()
-        progression_obj['satb_errors'] = __format_satb_errors(progression_errors)
+        progression_errors = progression.validate_progression(key_segments)
+        stage_times.append(perf_counter())
+
+        progression_obj['satb_errors'] = format_satb_errors(progression_errors)
+        stage_times.append(perf_counter())
+
+    record_stages(_VALIDATION_STAGES if validate else _ANALYSIS_STAGES, stage_times)
 
     return progression_obj
 
 
-def __format_chord(chord):
-    '''Function to format the set of chords to return to be suitable for VexFlow's expected format.'''
-    
-    formatted_notes = []
+def parse_key_signature(key):
+    '''Converts the passed key signature to the key format used by the music package, i.e. 'Am' -> 'a'.'''
 
-    notes = str(chord)
+    if 'm' in key:
+        key = key[0:-1]
+        key = key.lower()
 
-    for note in notes.split(','):
-        note = note.strip()
-        note = note.lower()
-        note = note[:-1] + '/' + note[-1]
-        formatted_notes.append(note)
+    return key
 
-    return formatted_notes
 
-def __format_satb_errors(satb_errors):
+def format_satb_errors(satb_errors):
     '''Converts retrieved errors in a SATB progression to user-friendly messages.'''
 
     satb_voice_indices = {0: 'Bass', 1: 'Tenor', 2: 'Alto', 3: 'Soprano'}
@@ -3,16 +3,18 @@ This module holds a series of constant values and functions used for calculating
 notes and chords according to musical notation rules. 
 '''
 
-from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
 
 #CONST file-scope values
+#Note: Lookup tables are read-only so that they are never written to after start-up, keeping their
+#memory pages shared between forked server workers.
 
 #The common accidentals that can precede a note
-ACCIDENTAL_STRINGS = ['bb', 'b', 'n', '#', 'x']
+ACCIDENTAL_STRINGS = ('bb', 'b', 'n', '#', 'x')
 
 #A mapping of chords of a certain quality to a string that decorates their numeral
-CHORD_QUALITY_STRINGS = defaultdict(lambda: '')
-CHORD_QUALITY_STRINGS.update({
+CHORD_QUALITY_STRINGS = MappingProxyType({
     'o': 'o',
     '+': '+',
     'sus2': 'sus2',
@@ -25,85 +27,96 @@ CHORD_QUALITY_STRINGS.update({
 })
 
 #Chord inversion strings to decorate a chord numeral
-INVERSION_TRIAD_STRINGS = ['','6','6/4']
-INVERSION_SEVENTH_STRINGS = ['7','6/5','4/3','4/2']
+INVERSION_TRIAD_STRINGS = ('','6','6/4')
+INVERSION_SEVENTH_STRINGS = ('7','6/5','4/3','4/2')
 
 #Index system mapping each note's letter name to a value based on the 12 semitones in an octave
-NOTE_INDICES = {
+NOTE_INDICES = MappingProxyType({
     'B#': 0, 'C': 0, 'Dbb': 0, 'Bx': 1, 'C#': 1, 'Db': 1, 'Cx': 2, 'D': 2, 'Ebb': 2, 'D#': 3,
     'Eb': 3, 'Fbb': 3,'Dx': 4, 'E': 4, 'Fb': 4, 'E#': 5, 'F': 5, 'Gbb': 5, 'Ex': 6, 'F#': 6,
     'Gb': 6, 'Fx': 7, 'G': 7, 'Abb': 7, 'G#': 8, 'Ab': 8, 'Gx': 9, 'A': 9, 'Bbb': 9, 'A#': 10,
     'Bb': 10, 'Cbb': 10, 'Ax': 11, 'B': 11, 'Cb': 11
-}
+})
+
+#The VexFlow key strings for each note name at each octave (0-8), i.e. VEXFLOW_NOTE_KEYS['F#'][3] = 'f#/3'
+VEXFLOW_NOTE_KEYS = MappingProxyType({
+    note_name: tuple(f'{note_name.lower()}/{octave}' for octave in range(0, 9)) for note_name in NOTE_INDICES
+})
 
 #The numeral strings used for denoting chords without decorations
-NUMERAL_STRINGS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII']
+NUMERAL_STRINGS = ('I', 'II', 'III', 'IV', 'V', 'VI', 'VII')
 
 #The lists of diatonic and modal mixture chord numerals in a major key
-MAJOR_KEY_NUMERALS = [
+MAJOR_KEY_NUMERALS = (
     'I','ii','iii','IV','V','vi','viio','IM7','ii7','iiim7','IVM7','V7','vi7','viiø','viio7'
-]
+)
 
-MAJOR_MIXTURE_NUMERALS = [
+MAJOR_MIXTURE_NUMERALS = (
     'i','iio','bIII','iv','v','bVI','bVII','i7','iiø','bIIIM7','iv7','v7','bVIM7','bVII7'
-]
+)
 
 #The lists of diatonic and modal mixture chord numerals in a minor key
-MINOR_KEY_NUMERALS = [
+MINOR_KEY_NUMERALS = (
     'i','iio','III','iv','v','VI','VII','i7','iiø','IIIM7','iv7','v7','VIM7','VII7'
-]
+)
 
-MINOR_MIXTURE_NUMERALS = [
+MINOR_MIXTURE_NUMERALS = (
     'I','ii','#iii','IV','V','#vi','viio','IM7','ii7','#iii7','IVM7','V7','#vi7','viiø', 'viio7'
-]
+)
 
 #The list of notes naturally found in a series of major scales
-MAJOR_KEY_NOTES = {
-    'Cb': ['Cb', 'Db', 'Eb', 'Fb', 'Gb', 'Ab', 'Bb'],
-    'C': ['C', 'D', 'E', 'F', 'G', 'A', 'B'],
-    'C#': ['C#', 'D#', 'E#', 'F#', 'G#', 'A#', 'B#'],
-    'Db': ['Db','Eb','F','Gb','Ab','Bb','C'],
-    'D': ['D','E','F#','G','A','B','C#'],
-    'D#': ['D#','E#','Fx','G#','A#','B#','Cx'],
-    'Eb': ['Eb','F','G','Ab','Bb','C','D'],
-    'E': ['E','F#','G#','A','B','C#','D#'],
-    'F': ['F','G','A','Bb','C','D','E'],
-    'F#': ['F#','G#','A#','B','C#','D#','E#'],
-    'Gb': ['Gb','Ab','Bb','Cb','Db','Eb','F'],
-    'G': ['G','A','B','C','D','E','F#'],
-    'G#': ['G#','A#','B#','C#','D#','E#','Fx'],
-    'Ab': ['Ab','Bb','C','Db','Eb','F','G'],
-    'A': ['A','B','C#','D','E','F#','G#'],
-    'A#': ['A#','B#','Cx','D#','E#','Fx','Gx'],
-    'Bb': ['Bb','C','D','Eb','F','G','A'],
-    'B': ['B','C#','D#','E','F#','G#','A#'],
-}
+MAJOR_KEY_NOTES = MappingProxyType({
+    'Cb': ('Cb', 'Db', 'Eb', 'Fb', 'Gb', 'Ab', 'Bb'),
+    'C': ('C', 'D', 'E', 'F', 'G', 'A', 'B'),
+    'C#': ('C#', 'D#', 'E#', 'F#', 'G#', 'A#', 'B#'),
+    'Db': ('Db','Eb','F','Gb','Ab','Bb','C'),
+    'D': ('D','E','F#','G','A','B','C#'),
+    'D#': ('D#','E#','Fx','G#','A#','B#','Cx'),
+    'Eb': ('Eb','F','G','Ab','Bb','C','D'),
+    'E': ('E','F#','G#','A','B','C#','D#'),
+    'F': ('F','G','A','Bb','C','D','E'),
+    'F#': ('F#','G#','A#','B','C#','D#','E#'),
+    'Gb': ('Gb','Ab','Bb','Cb','Db','Eb','F'),
+    'G': ('G','A','B','C','D','E','F#'),
+    'G#': ('G#','A#','B#','C#','D#','E#','Fx'),
+    'Ab': ('Ab','Bb','C','Db','Eb','F','G'),
+    'A': ('A','B','C#','D','E','F#','G#'),
+    'A#': ('A#','B#','Cx','D#','E#','Fx','Gx'),
+    'Bb': ('Bb','C','D','Eb','F','G','A'),
+    'B': ('B','C#','D#','E','F#','G#','A#'),
+})
 
 #The list of notes naturally found in a series of minor scales
-MINOR_KEY_NOTES = {
-    'Cb': ['Db','Ebb','Fb','Gb','Abb','Bbb','Cb'],
-    'C': ['C','D','Eb','F','G','Ab','Bb'],
-    'C#': ['C#','D#','E','F#','G#','A','B'],
-    'Db': ['Db','Eb','Fb','Gb','Ab','Bbb','Cb'],
-    'D': ['D','E','F','G','A','Bb','C'],
-    'D#': ['D#','E#','F#','G#','A#','B','C#'],
-    'Eb': ['Eb','Fb','Gb','Ab','Bb','Cb','Db'],
-    'E': ['E','F#','G','A','B','C','D'],
-    'F': ['F','G','Ab','Bb','C','Db','Eb'],
-    'F#': ['F#','G#','A','B','C#','D','E'],
-    'Gb': ['Db','Ebb','Fb','Gb','Ab','Bbb','Cb'],
-    'G': ['G','A','Bb','C','D','Eb','F'],
-    'G#': ['G#','A#','B','C#','D#','E','F#'],
-    'Ab': ['Ab','Bb','Cb','Db','Eb','Fb','Gb'],
-    'A': ['A','B','C','D','E','F','G'],
-    'A#': ['A#','B#','C#','D#','E#','F#','G#'],
-    'Bb': ['Bb','C','Db','Eb','F','Gb','Ab'],
-    'B': ['B','C#','D','E','F#','G','A'],
-}
-
-#The mapping of interval strings to a matching chord quality and chord inversion
-INTERVAL_STRINGS = defaultdict(lambda: {'root_index': 0, 'quality': 'unknown', 'position': 0})
-INTERVAL_STRINGS.update({
+MINOR_KEY_NOTES = MappingProxyType({
+    'Cb': ('Db','Ebb','Fb','Gb','Abb','Bbb','Cb'),
+    'C': ('C','D','Eb','F','G','Ab','Bb'),
+    'C#': ('C#','D#','E','F#','G#','A','B'),
+    'Db': ('Db','Eb','Fb','Gb','Ab','Bbb','Cb'),
+    'D': ('D','E','F','G','A','Bb','C'),
+    'D#': ('D#','E#','F#','G#','A#','B','C#'),
+    'Eb': ('Eb','Fb','Gb','Ab','Bb','Cb','Db'),
+    'E': ('E','F#','G','A','B','C','D'),
+    'F': ('F','G','Ab','Bb','C','Db','Eb'),
+    'F#': ('F#','G#','A','B','C#','D','E'),
+    'Gb': ('Db','Ebb','Fb','Gb','Ab','Bbb','Cb'),
+    'G': ('G','A','Bb','C','D','Eb','F'),
+    'G#': ('G#','A#','B','C#','D#','E','F#'),
+    'Ab': ('Ab','Bb','Cb','Db','Eb','Fb','Gb'),
+    'A': ('A','B','C','D','E','F','G'),
+    'A#': ('A#','B#','C#','D#','E#','F#','G#'),
+    'Bb': ('Bb','C','Db','Eb','F','Gb','Ab'),
+    'B': ('B','C#','D','E','F#','G','A'),
+})
+
+#The keys that can be selected for a progression, excluding theoretical keys, i.e. G#+
+SUPPORTED_MAJOR_KEYS = ('C','G','D','A','E','B','F#','C#','F','Bb','Eb','Ab','Db','Gb','Cb')
+SUPPORTED_MINOR_KEYS = ('a','e','b','f#','c#','g#','d#','a#','d','g','c','f','bb','eb','ab')
+
+#The mapping of interval strings to a matching chord quality and chord inversion, where each chord's info
+#is read-only as well
+UNKNOWN_CHORD = MappingProxyType({'root_index': 0, 'quality': 'unknown', 'position': 0})
+
+INTERVAL_STRINGS = MappingProxyType({interval_string: MappingProxyType(chord_info) for interval_string, chord_info in {
    '3': {'root_index': 0, 'quality': 'm', 'position': 0},
     '4': {'root_index': 0, 'quality': '', 'position': 0},
     '5': {'root_index': 1, 'quality': 'add5', 'position': 0},
@@ -301,7 +314,7 @@ INTERVAL_STRINGS.update({
     '9810': {'root_index': 2, 'quality': '7', 'position': 2},
     '9910': {'root_index': 2, 'quality': 'ø', 'position': 2},
     '10810': {'root_index': 0, 'quality': '7b5', 'position': 0},
-})
+}.items()})
 
 
 #### PRIVATE METHODS ####
@@ -320,6 +333,14 @@ def __get_notes_for_key(key):
     return key_notes
 
 
+def __alter_note_name(name, semitones):
+    '''Returns the passed note name raised or lowered by the passed number of semitones, i.e. Bb + 1 = B.'''
+
+    note_accidentals = ('bb', 'b', '', '#', 'x')
+
+    return name[0] + note_accidentals[note_accidentals.index(name[1:]) + semitones]
+
+
 def __strip_inversion_string(numeral):
     '''
     Strips the passed numeral of its inversion string if present.
@@ -338,8 +359,11 @@ def __strip_inversion_string(numeral):
         if 'ø' not in numeral:
             stripped_numeral += '7'
 
-    #Remove inversion strings from triads
-    elif '6' in numeral or '6/4' in numeral:
+    #Remove inversion strings from triads, where '6/4' is checked before '6'
+    elif '6/4' in numeral:
+        stripped_numeral = numeral[0:-3]
+
+    elif '6' in numeral:
         stripped_numeral = numeral[0:-1]
 
     return stripped_numeral
@@ -400,6 +424,7 @@ def get_aug6_numeral(numeral, key, note_names):
     return aug6_numeral
 
 
+@lru_cache(maxsize=4096)
 def get_chord_relation_for_key(key, search_numeral):
     '''Returns the relation of a chord numeral relative to the passed key.'''
 
@@ -435,10 +460,21 @@ def get_chord_relation_for_key(key, search_numeral):
     return chord_relation
 
 
+def is_applied_numeral(numeral):
+    '''
+    Returns whether or not the passed numeral is applied to another chord, i.e. 'V7/V', where numerals
+    like 'V4/2' or 'I6/4' only have an inversion string after their last slash.
+    '''
+
+    applied_numeral, _, base_numeral = numeral.rpartition('/')
+
+    return bool(applied_numeral and base_numeral and not base_numeral[0].isdigit())
+
+
 def get_chord_for_intervals(interval_string):
     '''Returns a chord's identification information based on its intervals.'''
 
-    return INTERVAL_STRINGS[interval_string]
+    return INTERVAL_STRINGS.get(interval_string, UNKNOWN_CHORD)
 
 
 def get_lt_numeral_for_dim7(diminished_numeral):
@@ -482,6 +518,53 @@ def get_note_name_for_degree(key, degree):
     return key_notes[degree-1]
 
 
+def get_key_for_signature(num_accidentals, is_minor=False):
+    '''
+    Returns the supported key with the passed key signature, or None if there isn't one.
+
+    Parameters:
+        num_accidentals (int): The number of sharps (positive) or flats (negative) in the signature
+        is_minor (bool): Whether the key is minor or major
+    '''
+
+    key_index = num_accidentals if num_accidentals >= 0 else 7 - num_accidentals
+    supported_keys = SUPPORTED_MINOR_KEYS if is_minor else SUPPORTED_MAJOR_KEYS
+
+    return supported_keys[key_index] if 0 <= key_index < len(supported_keys) else None
+
+
+def get_signature_for_key(key):
+    '''Returns the number of sharps (positive) or flats (negative) in the passed key's signature.'''
+
+    supported_keys = SUPPORTED_MAJOR_KEYS if key[0].isupper() else SUPPORTED_MINOR_KEYS
+    key_index = supported_keys.index(key)
+
+    return key_index if key_index <= 7 else 7 - key_index
+
+
+@lru_cache(maxsize=64)
+def get_note_names_for_key(key):
+    '''
+    Returns the name used to spell each of the 12 note indices (C=0 -> B=11) in the passed key.
+
+    Notes are spelled using the harmonic chromatic scale of the key's tonic, which lowers every
+    chromatic degree except the raised 4th, i.e. 1 b2 2 b3 3 4 #4 5 b6 6 b7 7. Both C major and
+    C minor spell index 1 as Db and index 6 as F#.
+    '''
+
+    #The scale degree of the tonic's major key and its alteration for each semitone above the tonic
+    chromatic_degrees = ((1, 0), (2, -1), (2, 0), (3, -1), (3, 0), (4, 0), (4, 1), (5, 0), (6, -1), (6, 0), (7, -1), (7, 0))
+
+    major_key_notes = MAJOR_KEY_NOTES[key[0].upper() + key[1:]]
+    tonic_index = NOTE_INDICES[major_key_notes[0]]
+    note_names = [None] * 12
+
+    for semitones, (degree, alteration) in enumerate(chromatic_degrees):
+        note_names[(tonic_index + semitones) % 12] = __alter_note_name(major_key_notes[degree-1], alteration)
+
+    return tuple(note_names)
+
+
 def get_note_degree_in_key(name, key):
     '''
     Returns the index of the passed note in the given key if it exists within the key.
@@ -500,6 +583,7 @@ def get_note_degree_in_key(name, key):
     return -1
 
 
+@lru_cache(maxsize=4096)
 def get_note_accidental_in_key(search_name, key):
     '''
     Searches for the given note in the passed key and returns its accidental string 
@@ -623,7 +707,7 @@ def identify_chord_numeral_for_key(key, chord_info):
     if quality in ['m', 'm7', 'ø', 'o', 'o7']:
         chord_numeral = chord_numeral.lower()
 
-    chord_numeral += CHORD_QUALITY_STRINGS[quality]
+    chord_numeral += CHORD_QUALITY_STRINGS.get(quality, '')
 
     #4) Append the appropriate inversion string to the numeral
     if quality in ['', 'm', 'o', '+']:
@@ -0,0 +1,258 @@
+'''
+This module exports functions for importing chord progressions from MusicXML scores and exporting
+analyzed progressions as MusicXML.
+
+Scores are read incrementally, with each element discarded once it has been read, so that large
+scores are never held in memory as a full document tree. The notes sounding together across all
+of a score's parts are grouped into chords, which are analyzed with generate_progression.
+
+Exported progressions are written one measure at a time, with each chord as a whole note on a
+grand staff. Chord numerals and names are added as lyrics below the lowest staff, and any SATB
+errors found for a chord are added as comments in its measure.
+'''
+
+from fractions import Fraction
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape
+
+from .key_detection import detect_key
+from .midi_import import slice_note_events
+from .music_funcs import format_satb_errors, generate_progression
+from .music_info import NOTE_INDICES, get_key_for_signature, get_signature_for_key
+from .satb_validator import validate_progression_steps
+
+MUSICXML_MIMETYPE = 'application/vnd.recordare.musicxml+xml'
+
+#The accidental strings for each MusicXML alter value from -2 to 2
+_ALTER_ACCIDENTALS = ('bb', 'b', '', '#', 'x')
+
+#The lowest note value written on the treble staff when exporting, C4
+_TREBLE_STAFF_LOWEST_VALUE = 48
+
+
+#### PRIVATE METHODS ####
+def __get_tag(element):
+    '''Returns the passed element's tag without its namespace.'''
+
+    return element.tag.rsplit('}', 1)[-1]
+
+
+def __parse_note_string(note_element):
+    '''Returns the note string for the passed note element's pitch, i.e. 'Bb3', or None if it can't be used.'''
+
+    step = note_element.findtext('pitch/step', '').strip()
+    alter = note_element.findtext('pitch/alter', '0').strip()
+    octave = note_element.findtext('pitch/octave', '').strip()
+
+    try:
+        alter = float(alter)
+        octave = int(octave)
+
+    except ValueError:
+        return None
+
+    #Microtonal alters have no note string
+    if not alter.is_integer():
+        return None
+
+    alter = int(alter)
+
+    if step not in ('C', 'D', 'E', 'F', 'G', 'A', 'B') or not -2 <= alter <= 2 or not 0 <= octave <= 8:
+        return None
+
+    return step + _ALTER_ACCIDENTALS[alter + 2] + str(octave)
+
+
+def __parse_duration(duration_text):
+    '''Returns the passed duration or divisions text as a fraction, as MusicXML allows decimal values, i.e. '2.5'.'''
+
+    return Fraction((duration_text or '0').strip())
+
+
+def __write_staff_notes(notes, staff, lyrics):
+    '''Returns the MusicXML for the passed notes written as a whole note chord on the passed staff.'''
+
+    if not notes:
+        return f'<note><rest measure="yes"/><duration>4</duration><voice>{staff}</voice><staff>{staff}</staff></note>'
+
+    note_strings = []
+
+    for i, note in enumerate(notes):
+        alter = _ALTER_ACCIDENTALS.index(note.name[1:]) - 2
+        note_string = '<note>' + ('<chord/>' if i > 0 else '')
+        note_string += f'<pitch><step>{note.name[0]}</step>' + (f'<alter>{alter}</alter>' if alter else '')
+        note_string += f'<octave>{note.octave}</octave></pitch><duration>4</duration><voice>{staff}</voice>'
+        note_string += f'<type>whole</type><staff>{staff}</staff>'
+
+        if i == 0:
+            for lyric_number, lyric in enumerate(lyrics, start=1):
+                note_string += f'<lyric number="{lyric_number}"><syllabic>single</syllabic>'
+                note_string += f'<text>{escape(lyric)}</text></lyric>'
+
+        note_strings.append(note_string + '</note>')
+
+    return ''.join(note_strings)
+
+
+def read_musicxml_chords(xml_file, min_duration=0.125):
+    '''
+    Reads the chords sounding in the passed partwise MusicXML score.
+
+    Parameters:
+        xml_file (file or str): The MusicXML file or its path
+        min_duration (float): The shortest chord to keep in quarter notes
+
+    Return:
+        chords (list): The chord string for each chord with at least 3 different notes, i.e. 'C3,G3,E4,C5'
+        key (str): The key of the score's first key signature, i.e. 'Eb' or 'c', or None if it has none
+    '''
+
+    note_events = []
+    key = None
+    end_time = 0
+
+    #The read position and timing of the part being read
+    position = last_onset = Fraction(0)
+    divisions = 1
+
+    for event, element in iterparse(xml_file, events=('start', 'end')):
+        tag = __get_tag(element)
+
+        if event == 'start':
+            if tag == 'score-timewise':
+                raise ValueError('Timewise MusicXML scores are not supported.')
+
+            if tag == 'part':
+                position = last_onset = Fraction(0)
+                divisions = 1
+
+            continue
+
+        if tag == 'divisions':
+            divisions = __parse_duration(element.text) or 1
+
+        elif tag == 'key' and key is None and element.findtext('fifths') is not None:
+            key = get_key_for_signature(int(element.findtext('fifths')), element.findtext('mode', '').strip() == 'minor')
+
+        elif tag == 'backup':
+            position -= __parse_duration(element.findtext('duration')) / divisions
+
+        elif tag == 'forward':
+            position += __parse_duration(element.findtext('duration')) / divisions
+
+        #Grace and cue notes don't take up time in the score
+        elif tag == 'note' and element.find('grace') is None and element.find('cue') is None:
+            duration = __parse_duration(element.findtext('duration')) / divisions
+
+            #Notes in a chord start with the note before them
+            onset = last_onset if element.find('chord') is not None else position
+            position = onset + duration
+            last_onset = onset
+
+            if element.find('pitch') is not None and duration > 0:
+                note_string = __parse_note_string(element)
+
+                if note_string is not None:
+                    note_value = NOTE_INDICES[note_string[0:-1]] + int(note_string[-1]) * 12
+                    note_events.append((onset, True, (note_value, note_string)))
+                    note_events.append((onset + duration, False, (note_value, note_string)))
+
+            end_time = max(end_time, position)
+
+        #Discard each element's contents once it has been read
+        if tag in ('note', 'backup', 'forward', 'attributes', 'measure', 'part'):
+            element.clear()
+
+    note_events.sort()
+
+    chords = []
+
+    for _, _, notes in slice_note_events(note_events, end_time, Fraction(min_duration)):
+        note_strings = [note_string for _, note_string in notes]
+
+        if len({note_string[0:-1] for note_string in note_strings}) >= 3:
+            chords.append(','.join(note_strings))
+
+    return (chords, key)
+
+
+def import_musicxml(xml_file, key=None, validate=True, min_duration=0.125):
+    '''
+    Reads and analyzes the chord progression in the passed MusicXML score.
+
+    Parameters:
+        xml_file (file or str): The MusicXML file or its path
+        key (str): The key to analyze the progression in, or None to use the score's key signature,
+            or the key detected from its notes if it has none
+        validate (bool): Whether or not the progression should be analyzed for SATB errors
+        min_duration (float): The shortest chord to keep in quarter notes
+
+    Return:
+        progression_obj (dict): The progression's analysis from generate_progression, and its key
+    '''
+
+    chords, score_key = read_musicxml_chords(xml_file, min_duration)
+    key = key or score_key or detect_key(chords, default='C')
+
+    return {**generate_progression(chords, key, validate), 'key': key}
+
+
+def iter_musicxml(progression, validate=True, title='Chord Progression'):
+    '''
+    Yields the MusicXML score for the passed progression one measure at a time.
+
+    Parameters:
+        progression (ChordProgression): The progression to write, with its chords and key
+        validate (bool): Whether or not the progression's SATB errors should be added as comments
+        title (str): The title of the score
+
+    Return:
+        musicxml (generator): The strings making up the score
+    '''
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 4.0 Partwise//EN" '
+    yield '"http://www.musicxml.org/dtds/partwise.dtd">\n'
+    yield f'<score-partwise version="4.0"><work><work-title>{escape(title)}</work-title></work>\n'
+    yield '<part-list><score-part id="P1"><part-name>Piano</part-name></score-part></part-list>\n<part id="P1">\n'
+
+    key = progression.key
+
+    for i, chord in enumerate(progression.chords):
+        measure = f'<measure number="{i+1}">'
+
+        if i == 0:
+            measure += '<attributes><divisions>1</divisions>'
+
+            if key:
+                mode = 'minor' if key[0].islower() else 'major'
+                measure += f'<key><fifths>{get_signature_for_key(key)}</fifths><mode>{mode}</mode></key>'
+
+            measure += '<time><beats>4</beats><beat-type>4</beat-type></time><staves>2</staves>'
+            measure += '<clef number="1"><sign>G</sign><line>2</line></clef>'
+            measure += '<clef number="2"><sign>F</sign><line>4</line></clef></attributes>'
+
+        #Comments can't hold '--', which may appear in a chord's notes, and each measure's check is left out of the
+        #engine's metrics
+        if validate and key:
+            for message in format_satb_errors(validate_progression_steps(progression.chords, key, i, i+1, False)[0]):
+                measure += f'<!-- {message.replace("--", "- -")} -->'
+
+        treble_notes = [note for note in chord.notes if note.value >= _TREBLE_STAFF_LOWEST_VALUE]
+        bass_notes = [note for note in chord.notes if note.value < _TREBLE_STAFF_LOWEST_VALUE]
+        lyrics = [progression.get_chord_numeral(i), chord.get_name(True)] if key else [chord.get_name(True)]
+
+        measure += __write_staff_notes(treble_notes, 1, [] if bass_notes else lyrics)
+        measure += '<backup><duration>4</duration></backup>'
+        measure += __write_staff_notes(bass_notes, 2, lyrics if bass_notes else [])
+
+        yield measure + '</measure>\n'
+
+    yield '</part>\n</score-partwise>\n'
+
+
+def write_musicxml(progression, xml_path, **musicxml_options):
+    '''Writes the MusicXML score for the passed progression to the passed path, see iter_musicxml.'''
+
+    with open(xml_path, 'w', encoding='utf-8') as xml_file:
+        xml_file.writelines(iter_musicxml(progression, **musicxml_options))
@@ -0,0 +1,279 @@
+'''
+This module exports the detection of cadences and common schemata in a progression's numerals.
+
+Patterns are written as space-separated numerals, i.e. 'ii6 V7 I', where each numeral can hold
+wildcards:
+    'V*'   - V in any inversion, with or without its seventh, i.e. V, V6, V7 or V4/3
+    'V*/V' - an applied numeral, here any dominant of V, while 'V7/*' is V7 applied to any chord
+    '*'    - any numeral
+    '$'    - the end of the progression, i.e. 'V $' for a half cadence
+
+Every pattern in the library is compiled into a single automaton over the numerals, like the
+Aho-Corasick automaton for matching many keywords at once, so each numeral is read once no matter
+how many patterns there are. As numerals can match several wildcards, the automaton's states are
+the sets of pattern prefixes matched so far, and each state's move for a numeral is only built the
+first time the numeral is read in that state. After that, each numeral is a single lookup:
+    find_patterns(['I', 'ii6', 'V7', 'I']) -> [PatternMatch('PAC', 'cadence', 2, 4),
+        PatternMatch('ii-V-I', 'schema', 1, 4)]
+'''
+
+import threading
+from collections import namedtuple
+
+from .music_info import INVERSION_SEVENTH_STRINGS, INVERSION_TRIAD_STRINGS
+
+Pattern = namedtuple('Pattern', ('name', 'kind', 'tokens'))
+PatternMatch = namedtuple('PatternMatch', ('name', 'kind', 'start', 'stop'))
+
+#The token matching the end of the progression
+END_TOKEN = '$'
+
+#The cadences and schemata detected in every progression, as (name, kind, pattern)
+PATTERN_LIBRARY = (
+    ('PAC', 'cadence', 'V I'), ('PAC', 'cadence', 'V7 I'), ('PAC', 'cadence', 'V i'), ('PAC', 'cadence', 'V7 i'),
+    ('IAC', 'cadence', 'V6 I'), ('IAC', 'cadence', 'V6/5 I'), ('IAC', 'cadence', 'V4/3 I'),
+    ('IAC', 'cadence', 'viio* I'), ('IAC', 'cadence', 'V6 i'), ('IAC', 'cadence', 'V6/5 i'),
+    ('IAC', 'cadence', 'V4/3 i'), ('IAC', 'cadence', 'viio* i'),
+    ('half', 'cadence', 'V $'),
+    ('deceptive', 'cadence', 'V* vi'), ('deceptive', 'cadence', 'V* VI'), ('deceptive', 'cadence', 'V* bVI'),
+    ('plagal', 'cadence', 'IV I'), ('plagal', 'cadence', 'iv I'), ('plagal', 'cadence', 'iv i'),
+    ('cadential 6/4', 'schema', 'I6/4 V*'), ('cadential 6/4', 'schema', 'i6/4 V*'),
+    ('passing 6/4', 'schema', 'I V6/4 I6'), ('passing 6/4', 'schema', 'I6 V6/4 I'),
+    ('passing 6/4', 'schema', 'i V6/4 i6'), ('passing 6/4', 'schema', 'i6 V6/4 i'),
+    ('passing 6/4', 'schema', 'IV I6/4 IV6'), ('passing 6/4', 'schema', 'iv i6/4 iv6'),
+    ('pedal 6/4', 'schema', 'I IV6/4 I'), ('pedal 6/4', 'schema', 'i iv6/4 i'),
+    ('ii-V-I', 'schema', 'ii* V* I'), ('ii-V-I', 'schema', 'iio* V* i'), ('ii-V-I', 'schema', 'iiø* V* i'),
+    ('I-IV-V-I', 'schema', 'I IV* V* I'), ('I-IV-V-I', 'schema', 'i iv* V* i'),
+    ('circle of fifths', 'schema', 'vi ii* V* I'), ('circle of fifths', 'schema', 'VI iio* V* i'),
+    ('Neapolitan', 'schema', 'N6 V*'), ('Neapolitan', 'schema', 'N6 i6/4 V*'),
+    ('augmented sixth', 'schema', 'It+6 V*'), ('augmented sixth', 'schema', 'Fr+6 V*'),
+    ('augmented sixth', 'schema', 'Ger+6 V*'),
+    ('tonicized V', 'schema', '*/V V*'),
+    ('Pachelbel', 'schema', 'I V vi iii IV I IV V'),
+    ('Andalusian', 'schema', 'i VII VI V'),
+    ('doo-wop', 'schema', 'I vi IV V')
+)
+
+#The inversion strings stripped by wildcards, longest first so that '6/4' is stripped before '6'
+_INVERSION_STRINGS = tuple(sorted(set(INVERSION_TRIAD_STRINGS + INVERSION_SEVENTH_STRINGS) - {''}, key=len,
+reverse=True))
+
+#The numerals that end in an inversion string without having one
+_AUG6_NUMERALS = ('It+6', 'Fr+6', 'Ger+6')
+
+
+class PatternAutomaton:
+    '''
+    Class holding the automaton compiled for a set of numeral patterns, see the module docstring.
+
+    Attributes:
+        patterns (tuple): The Pattern of each (name, kind, pattern string) passed
+        transitions (list): The moves built so far from each state, by numeral, as the next state's index and
+            the indices of the patterns matched
+        states (dict): The index of each state, by its set of (pattern index, tokens matched) prefixes
+    '''
+
+    def __init__(self, patterns=PATTERN_LIBRARY):
+        self.patterns = tuple(Pattern(name, kind, tuple(pattern_string.split())) for name, kind, pattern_string in
+        patterns)
+        self.transitions = [{}]
+        self.states = {frozenset(): 0}
+        self._state_prefixes = [frozenset()]
+        self._token_prefixes = {}
+        self._numeral_prefixes = {}
+        self._lock = threading.Lock()
+
+        #The prefixes each token continues, so that a numeral is only matched against each distinct token once
+        for pattern_index, pattern in enumerate(self.patterns):
+
+            if not pattern.tokens:
+                raise ValueError(f'Empty pattern: {pattern.name}')
+
+            for token_index, token in enumerate(pattern.tokens):
+                self._token_prefixes.setdefault(token, []).append((pattern_index, token_index))
+
+    def __split_numeral(self, numeral):
+        '''
+        Returns the (stem, applied target) of the passed numeral, where the stem is stripped of its inversion
+        and seventh, and the target is None if the numeral isn't applied, i.e. 'V6/5/V' -> ('V', 'V').
+        '''
+
+        applied_numeral, _, target = numeral.rpartition('/')
+
+        #Numerals like 'V4/2' only have an inversion string after their last slash
+        if not applied_numeral or not target or target[0].isdigit():
+            applied_numeral, target = numeral, None
+
+        if applied_numeral not in _AUG6_NUMERALS:
+            for inversion_string in _INVERSION_STRINGS:
+
+                if applied_numeral.endswith(inversion_string):
+                    applied_numeral = applied_numeral[0:-len(inversion_string)]
+                    break
+
+        #Major sevenths are marked by an 'M' before their inversion, i.e. 'IM7'
+        if applied_numeral.endswith('M') and len(applied_numeral) > 1:
+            applied_numeral = applied_numeral[0:-1]
+
+        return (applied_numeral, target)
+
+    def __match_token(self, token, numeral):
+        '''Returns whether or not the passed pattern token matches the passed numeral, see the module docstring.'''
+
+        if token == END_TOKEN or numeral == END_TOKEN:
+            return token == numeral
+
+        if token == '*' or token == numeral:
+            return True
+
+        if '*' not in token:
+            return False
+
+        token_numeral, _, token_target = token.partition('/') if token.startswith('*/') else token.rpartition('/')
+
+        if not token_numeral:
+            token_numeral, token_target = token, None
+
+        stem, target = self.__split_numeral(numeral)
+
+        if (token_target is None) != (target is None) or token_target not in ('*', target):
+            return False
+
+        if token_numeral == '*':
+            return True
+
+        if token_numeral.endswith('*'):
+            return token_numeral[0:-1] == stem
+
+        return token_numeral == numeral.rpartition('/')[0]
+
+    def __get_numeral_prefixes(self, numeral):
+        '''Returns the set of prefixes the passed numeral continues, matching it against each token once.'''
+
+        numeral_prefixes = self._numeral_prefixes.get(numeral)
+
+        if numeral_prefixes is None:
+            numeral_prefixes = frozenset(prefix for token, prefixes in self._token_prefixes.items()
+            if self.__match_token(token, numeral) for prefix in prefixes)
+            self._numeral_prefixes[numeral] = numeral_prefixes
+
+        return numeral_prefixes
+
+    def __add_transition(self, state, numeral):
+        '''Builds, stores and returns the move from the passed state for the passed numeral.'''
+
+        with self._lock:
+            return self.transitions[state].get(numeral) or self.__build_transition(state, numeral)
+
+    def __build_transition(self, state, numeral):
+        '''Builds and stores the move from the passed state for the passed numeral, see __add_transition.'''
+
+        numeral_prefixes = self.__get_numeral_prefixes(numeral)
+        next_prefixes = set()
+        matched_patterns = []
+
+        #Every pattern can start at any numeral, along with the prefixes already matched
+        for pattern_index, token_index in numeral_prefixes:
+
+            if token_index == 0 or (pattern_index, token_index) in self._state_prefixes[state]:
+
+                if token_index + 1 == len(self.patterns[pattern_index].tokens):
+                    matched_patterns.append(pattern_index)
+
+                else:
+                    next_prefixes.add((pattern_index, token_index + 1))
+
+        next_prefixes = frozenset(next_prefixes)
+        next_state = self.states.get(next_prefixes)
+
+        if next_state is None:
+            next_state = len(self._state_prefixes)
+            self.states[next_prefixes] = next_state
+            self._state_prefixes.append(next_prefixes)
+            self.transitions.append({})
+
+        transition = (next_state, tuple(sorted(matched_patterns)))
+        self.transitions[state][numeral] = transition
+
+        return transition
+
+    def find_matches(self, numerals):
+        '''
+        Returns every match of the automaton's patterns in the passed numerals, in one pass over them.
+
+        Parameters:
+            numerals (list): The numerals to search, i.e. from 'get_progression_chord_numerals'
+
+        Return:
+            pattern_matches (list): The PatternMatch of each match, ordered by where it ends then by pattern,
+                with the (0-indexed) start and stop of its span of chords
+        '''
+
+        pattern_matches = []
+        state = 0
+
+        for i, numeral in enumerate(list(numerals) + [END_TOKEN]):
+            transition = self.transitions[state].get(numeral) or self.__add_transition(state, numeral)
+            state = transition[0]
+
+            for pattern_index in transition[1]:
+                pattern = self.patterns[pattern_index]
+                stop = min(i + 1, len(numerals))
+                pattern_matches.append(PatternMatch(pattern.name, pattern.kind, i + 1 - len(pattern.tokens), stop))
+
+        return pattern_matches
+
+
+#The automaton compiled for the pattern library, built when it's first used
+_library_automaton = None
+
+
+#### PUBLIC METHODS ####
+def find_patterns(numerals, automaton=None):
+    '''
+    Returns the cadences and schemata found in the passed numerals.
+
+    Parameters:
+        numerals (list): The numerals to search, i.e. from 'get_progression_chord_numerals'
+        automaton (PatternAutomaton): The automaton of the patterns to find, or None for the pattern library
+
+    Return:
+        pattern_matches (list): The PatternMatch of each match, see PatternAutomaton.find_matches
+    '''
+
+    global _library_automaton
+
+    if automaton is None:
+        automaton = _library_automaton = _library_automaton or PatternAutomaton()
+
+    return automaton.find_matches(numerals)
+
+
+def find_progression_patterns(progression, chord_numerals=None, local_keys=None):
+    '''
+    Returns the cadences and schemata found in the passed progression, where perfect authentic cadences
+    without the tonic in the soprano are found as imperfect authentic cadences.
+
+    Parameters:
+        progression (ChordProgression): The progression to search
+        chord_numerals (list): The progression's numerals if they're already identified
+        local_keys (list): The local key of each chord, or None to use the progression's key
+
+    Return:
+        pattern_matches (list): The PatternMatch of each match, see PatternAutomaton.find_matches
+    '''
+
+    if chord_numerals is None:
+        chord_numerals = progression.get_progression_chord_numerals(True, local_keys=local_keys)
+
+    pattern_matches = find_patterns(chord_numerals)
+
+    for i, pattern_match in enumerate(pattern_matches):
+
+        if pattern_match.name == 'PAC':
+            key = local_keys[pattern_match.stop - 1] if local_keys else progression.key
+
+            if progression.chords[pattern_match.stop - 1].notes[-1].get_degree_in_key(key) != 0:
+                pattern_matches[i] = pattern_match._replace(name='IAC')
+
+    return pattern_matches
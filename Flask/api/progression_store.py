@@ -0,0 +1,374 @@
+'''
+This module exports the ProgressionSession class holding a client's analyzed chord progression
+between edits, and the ProgressionStore class keeping a bounded set of these sessions.
+
+Sessions keep each chord slot's parsed chord along with its analysis results, so that an edit to
+one chord slot only re-analyzes the chords around it rather than the full progression.
+'''
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from .chord import ChordFactory
+from .chord_progression import ChordProgression
+from .music_funcs import format_satb_errors, parse_key_signature
+from .satb_validator import validate_progression_steps
+from .serializer import serialize_chord
+from .voice_leading import get_progression_voice_leading, get_voice_leading
+
+
+class ProgressionSession:
+    '''
+    Class holding the chord slots of a client's progression and the analysis results for them.
+
+    Attributes:
+        slots (list): The chord strings entered for each of the progression's chord slots
+        positions (list): The index of each slot's chord in the progression or None if it's invalid
+        progression (ChordProgression): The progression made up of each valid chord slot
+        records (list): The chord record for each chord in the progression
+        step_errors (list): The SATB errors found when checking each chord or None if not validating
+        key_signature (str): The key signature the progression was created for
+        validate (bool): Whether or not the progression is analyzed for SATB errors
+        last_used (float): The time the session was last accessed
+    '''
+
+    _chord_factory = ChordFactory()
+
+    def __init__(self, chords, key_signature='C', validate=True, max_slots=24):
+        self.slots = []
+        self.positions = []
+        self.progression = ChordProgression([], parse_key_signature(key_signature))
+        self.records = []
+        self.step_errors = None
+        self.key_signature = key_signature
+        self.validate = validate
+        self.max_slots = max_slots
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+        #The slots, shift and validation change of an update cancelled before its analysis finished
+        self._deferred_slots = set()
+        self._deferred_shift = False
+        self._deferred_validate = False
+
+        self.__set_slots(chords)
+        self.__analyze_all()
+
+    def __create_chord(self, chord_string):
+        '''Returns the chord for the passed chord string or None if it's invalid.'''
+
+        new_chord = None
+
+        try:
+            new_chord = self._chord_factory.create_chord(chord_string)
+
+        except ValueError:
+            pass
+
+        return new_chord
+
+    def __set_slots(self, chords):
+        '''Parses each of the passed chord strings into the session's chord slots.'''
+
+        for chord_string in (chords or [])[0:self.max_slots]:
+            new_chord = self.__create_chord(chord_string)
+            self.slots.append(chord_string)
+
+            if new_chord:
+                self.positions.append(len(self.progression.chords))
+                self.progression.chords.append(new_chord)
+
+            else:
+                self.positions.append(None)
+
+    def __analyze_all(self):
+        '''Identifies and validates every chord in the progression.'''
+
+        progression = self.progression
+        chord_names = progression.get_progression_chord_names(True)
+        chord_numerals = progression.get_progression_chord_numerals(True)
+        chord_accidentals = progression.get_progression_chord_accidentals()
+        chord_voice_leading = get_progression_voice_leading(progression.chords)
+
+        self.records = [serialize_chord(*chord_info) for chord_info in
+        zip(progression.chords, chord_names, chord_numerals, chord_accidentals, chord_voice_leading)]
+
+        if self.validate:
+            self.step_errors = validate_progression_steps(progression.chords, progression.key)
+
+        else:
+            self.step_errors = None
+
+    def __analyze_chord(self, index):
+        '''Re-identifies the chord at the passed index in the progression and updates its record.'''
+
+        chord = self.progression.chords[index]
+        key = self.progression.key
+        voice_leading = get_voice_leading(self.progression.chords[index - 1], chord) if index else None
+
+        self.records[index] = serialize_chord(chord, chord.get_name(True), self.progression.get_chord_numeral(index),
+        chord.get_accidentals_for_key(key), voice_leading)
+
+    def __get_error_stop(self, index):
+        '''
+        Returns the index after the last chord whose errors depend on the chord at the passed index.
+
+        Chords are checked against the last four-voice chord before them, so errors depend on the chord
+        up to and including the next four-voice chord following it.
+        '''
+
+        chords = self.progression.chords
+
+        for next_index in range(index + 1, len(chords)):
+
+            if len(chords[next_index]) == 4:
+                return next_index + 1
+
+        return len(chords)
+
+    def __get_slot_position(self, slot):
+        '''Returns the position in the progression of the passed slot's chord, i.e. after the previous valid slot.'''
+
+        for prev_position in reversed(self.positions[0:slot]):
+
+            if prev_position is not None:
+                return prev_position + 1
+
+        return 0
+
+    def __update_slot(self, slot, chord_string):
+        '''
+        Replaces the chord string in the passed slot and updates the progression's chords.
+
+        Return:
+            shifted (bool): Whether or not the positions of the chords following the slot changed
+        '''
+
+        new_chord = self.__create_chord(chord_string)
+
+        #Add empty slots up to the slot being updated
+        while slot >= len(self.slots):
+            self.slots.append('')
+            self.positions.append(None)
+
+        self.slots[slot] = chord_string
+        old_position = self.positions[slot]
+        position = self.__get_slot_position(slot)
+        step = 0
+
+        if old_position is not None and new_chord:
+            self.progression.chords[position] = new_chord
+
+        elif old_position is not None:
+            self.progression.chords.pop(position)
+            self.records.pop(position)
+            self.positions[slot] = None
+            step = -1
+
+        elif new_chord:
+            self.progression.chords.insert(position, new_chord)
+            self.records.insert(position, None)
+            self.positions[slot] = position
+            step = 1
+
+        #Shift the positions of the chords following the slot
+        if step != 0:
+
+            for next_slot in range(slot + 1, len(self.positions)):
+
+                if self.positions[next_slot] is not None:
+                    self.positions[next_slot] += step
+
+        return step != 0
+
+    def get_state(self):
+        '''Returns the full analysis of the progression for every chord slot.'''
+
+        return self.__build_response(range(0, len(self.slots)), 0, len(self.progression.chords))
+
+    def update(self, chords=None, key_signature=None, validate=None, cancelled=None):
+        '''
+        Applies the passed edits to the progression and returns only the analysis results that changed.
+
+        The edits are always applied, but the analysis stops between its stages once cancelled returns
+        True, and the chords it didn't finish are analyzed by the next update.
+
+        Parameters:
+            chords (dict): The new chord strings for each updated slot, keyed by slot index
+            key_signature (str): The new key signature for the progression
+            validate (bool): Whether or not the progression should be analyzed for SATB errors
+            cancelled (function): Returns whether or not the analysis is superseded by newer edits, or None
+
+        Return:
+            progression_update (dict): The updated chord records by slot, and the updated SATB errors
+            by progression index, or None if the analysis was cancelled
+        '''
+
+        self.last_used = time.monotonic()
+
+        updated_slots = self._deferred_slots
+        shifted = self._deferred_shift
+        self._deferred_slots = set()
+        self._deferred_shift = False
+
+        for slot, chord_string in (chords or {}).items():
+
+            if 0 <= slot < self.max_slots and (slot >= len(self.slots) or self.slots[slot] != chord_string):
+                shifted = self.__update_slot(slot, chord_string) or shifted
+                updated_slots.add(slot)
+
+        validate_changed = self._deferred_validate
+        self._deferred_validate = False
+
+        if validate is not None:
+            validate_changed = validate != self.validate or validate_changed
+            self.validate = validate
+
+        #Changing the key affects every chord, so the progression is fully re-analyzed
+        if key_signature is not None and key_signature != self.key_signature:
+            self.key_signature = key_signature
+            self.progression.key = parse_key_signature(key_signature)
+            self.__analyze_all()
+
+            return self.get_state()
+
+        if cancelled is not None and cancelled():
+            self.__defer_update(updated_slots, shifted, validate_changed)
+            return None
+
+        num_chords = len(self.progression.chords)
+        changed_positions = set()
+        error_start = num_chords
+        error_stop = 0
+
+        for slot in updated_slots:
+            position = self.__get_slot_position(slot)
+
+            #The numeral of the preceding chord depends on this chord if it acts as an applied chord, and the
+            #voice leading into the following chord depends on this chord
+            changed_positions.update(range(max(position - 1, 0), min(position + 2, num_chords)))
+            error_start = min(error_start, max(position - 1, 0))
+
+            #Errors for the chords following an added or removed chord are reported for a new chord index
+            if shifted:
+                error_stop = num_chords
+
+            elif position < num_chords:
+                error_stop = max(error_stop, self.__get_error_stop(position))
+
+        for position in changed_positions:
+            self.__analyze_chord(position)
+            updated_slots.add(self.positions.index(position))
+
+        if cancelled is not None and cancelled():
+            self.__defer_update(updated_slots, shifted, validate_changed)
+            return None
+
+        if not self.validate:
+            self.step_errors = None
+
+        #Turning validation on adds an error list for every chord, where re-checked errors are left out of the
+        #engine's metrics as they were counted when the session was created
+        elif validate_changed:
+            self.step_errors = validate_progression_steps(self.progression.chords, self.progression.key, record=False)
+            error_start, error_stop = 0, num_chords
+
+        elif error_start < error_stop:
+            self.step_errors[error_start:error_stop] = validate_progression_steps(self.progression.chords,
+            self.progression.key, error_start, error_stop, False)
+
+            del self.step_errors[num_chords:]
+
+        return self.__build_response(sorted(updated_slots), error_start, error_stop)
+
+    def __defer_update(self, updated_slots, shifted, validate_changed):
+        '''Leaves the analysis of the passed update to the next update, see update.'''
+
+        self._deferred_slots = updated_slots
+        self._deferred_shift = shifted
+        self._deferred_validate = validate_changed
+
+    def __build_response(self, slots, error_start, error_stop):
+        '''Returns the response for the records of the passed slots and the errors for the passed chord range.'''
+
+        chord_updates = []
+        error_updates = None
+
+        for slot in slots:
+            position = self.positions[slot]
+            chord_updates.append({'slot': slot, 'chord': None if position is None else self.records[position]})
+
+        if self.step_errors is not None:
+            error_updates = []
+
+            for index in range(error_start, min(error_stop, len(self.step_errors))):
+                error_updates.append({'index': index, 'messages': format_satb_errors(self.step_errors[index])})
+
+        return {'chords': chord_updates, 'satb_errors': error_updates, 'num_slots': len(self.slots),
+        'num_chords': len(self.progression.chords)}
+
+
+class ProgressionStore:
+    '''
+    Class keeping a bounded set of progression sessions by their id.
+
+    Sessions that haven't been used within the idle timeout are evicted, and the least recently used
+    session is evicted when the store is full.
+    '''
+
+    def __init__(self, max_sessions=256, idle_timeout=1800):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __evict_sessions(self, now):
+        '''Removes idle sessions, and the least recently used sessions while the store is full.'''
+
+        while self._sessions:
+            session_id, progression_session = next(iter(self._sessions.items()))
+
+            if now - progression_session.last_used > self.idle_timeout or len(self._sessions) > self.max_sessions:
+                self._sessions.pop(session_id)
+
+            else:
+                break
+
+    def create(self, chords, key_signature='C', validate=True):
+        '''Creates and stores a new session for the passed progression, returning its id and the session.'''
+
+        progression_session = ProgressionSession(chords, key_signature, validate)
+        session_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._sessions[session_id] = progression_session
+            self.__evict_sessions(progression_session.last_used)
+
+        return (session_id, progression_session)
+
+    def get(self, session_id):
+        '''Returns the session with the passed id or None if it doesn't exist or was evicted.'''
+
+        progression_session = None
+
+        with self._lock:
+            now = time.monotonic()
+            self.__evict_sessions(now)
+
+            if session_id in self._sessions:
+                progression_session = self._sessions[session_id]
+                progression_session.last_used = now
+                self._sessions.move_to_end(session_id)
+
+        return progression_session
+
+    def remove(self, session_id):
+        '''Removes the session with the passed id from the store if it exists.'''
+
+        with self._lock:
+            self._sessions.pop(session_id, None)
@@ -0,0 +1,520 @@
+'''
+This module exports the realization of Roman numerals or figured bass as four-voice SATB chords.
+
+Each numeral, or bass note and its figures, is turned into the names of its chord tones and its
+bass. Every voicing of those names within the SATB voice ranges is then found once for each
+distinct chord, and the voicings breaking a rule on their own, like doubling the leading tone, are
+pruned by the satb_validator, so that only valid candidates are searched.
+
+The chords are realized with a beam search. Each of the cheapest realizations found so far is
+extended by the candidates of the next chord with the least voice leading from it, until enough
+are found that don't break a rule between the two chords. Parallel 5ths and 8ves are rejected by
+comparing bitsets of each voicing's perfect intervals, and the other rules between two voicings
+are validated once and memoized:
+    chords = realize_numerals(['I', 'IV', 'V7', 'I'], 'C')
+    chords = realize_figured_bass([('C3', ''), ('D3', '4/3'), ('E3', '6')], 'C')
+'''
+
+from collections import namedtuple
+from functools import lru_cache
+from heapq import nsmallest
+from itertools import combinations
+
+from .chord import Chord
+from .music_info import (MAJOR_KEY_NOTES, MINOR_KEY_NOTES, NOTE_INDICES, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS,
+get_aug6_numeral, get_leading_tone_in_key, get_lt_numeral_for_dim7, identify_chord_numeral_for_key)
+from .note import Note, NoteFactory
+from .satb_validator import _VALIDATION_SETTINGS, validate_progression_steps
+
+#The number of realizations kept at each chord while searching
+BEAM_WIDTH = 16
+
+#The cost added for each rule broken by a voicing, when no voicing can be found that breaks none
+_ERROR_COST = 1000
+
+#The letter names, in order
+_LETTERS = 'CDEFGAB'
+
+#The (semitones, letters) above the root of each chord tone of the qualities the validator accepts
+_QUALITY_TONES = {
+    '': ((0, 0), (4, 2), (7, 4)),
+    'm': ((0, 0), (3, 2), (7, 4)),
+    'o': ((0, 0), (3, 2), (6, 4)),
+    '+': ((0, 0), (4, 2), (8, 4)),
+    '7': ((0, 0), (4, 2), (7, 4), (10, 6)),
+    'maj7': ((0, 0), (4, 2), (7, 4), (11, 6)),
+    'm7': ((0, 0), (3, 2), (7, 4), (10, 6)),
+    'ø': ((0, 0), (3, 2), (6, 4), (10, 6)),
+    'o7': ((0, 0), (3, 2), (6, 4), (9, 6)),
+    '7b5': ((0, 0), (4, 2), (6, 4), (10, 6))
+}
+
+#The cost of doubling each chord tone (root, third, fifth, seventh) and of leaving out the fifth of a seventh chord
+_DOUBLING_COSTS = (0, 2, 1, 3)
+_OMITTED_FIFTH_COST = 1
+
+#The intervals above the bass of each set of figures, completed from their usual abbreviations
+_FIGURE_INTERVALS = {frozenset(figures): intervals for figures, intervals in (
+    ((), (3, 5)), ((3,), (3, 5)), ((5,), (3, 5)), ((5, 3), (3, 5)),
+    ((6,), (3, 6)), ((6, 3), (3, 6)), ((6, 4), (4, 6)),
+    ((7,), (3, 5, 7)), ((7, 3), (3, 5, 7)), ((7, 5), (3, 5, 7)), ((7, 5, 3), (3, 5, 7)),
+    ((6, 5), (3, 5, 6)), ((6, 5, 3), (3, 5, 6)), ((4, 3), (3, 4, 6)), ((6, 4, 3), (3, 4, 6)),
+    ((2,), (2, 4, 6)), ((4, 2), (2, 4, 6)), ((6, 4, 2), (2, 4, 6))
+)}
+
+#The change in semitones of each accidental in a figure from the note in the key signature
+_FIGURE_ACCIDENTALS = {'#': 1, 'b': -1, 'x': 2}
+
+#The chord tones to voice, in order from the root, with the bass, its value if fixed, and the chord's quality
+ChordSpec = namedtuple('ChordSpec', ('tone_names', 'bass_name', 'bass_value', 'quality'))
+
+#A candidate voicing of a chord, with the bitset of its voice pairs a perfect 8ve (bits 0-5) or 5th (bits 6-11) apart
+Voicing = namedtuple('Voicing', ('values', 'chord', 'perfect_mask', 'cost'))
+
+
+#### PRIVATE METHODS ####
+def __check_key(key):
+    '''Raises a ValueError if the passed key isn't supported.'''
+
+    if key not in SUPPORTED_MAJOR_KEYS and key not in SUPPORTED_MINOR_KEYS:
+        raise ValueError(f'Unsupported key: {key}')
+
+
+def __get_key_notes(key):
+    '''Returns the notes of the passed key's signature.'''
+
+    return MAJOR_KEY_NOTES[key] if key[0].isupper() else MINOR_KEY_NOTES[key[0].upper() + key[1:]]
+
+
+def __get_note_name(letter, note_index):
+    '''Returns the name spelling the passed note index with the passed letter, or None if it needs 3+ accidentals.'''
+
+    return next((note_name for note_name, index in NOTE_INDICES.items() if note_name[0] == letter and
+    index == note_index % 12), None)
+
+
+def __spell_chord_tones(root_name, quality, aug6=False):
+    '''
+    Returns the names of the chord tones of the passed root and quality, in order from the root, or None
+    if one of them can't be spelled. Augmented sixth chords spell their seventh as an augmented sixth.
+    '''
+
+    root_letter = _LETTERS.index(root_name[0])
+    tone_names = []
+
+    for semitones, letters in _QUALITY_TONES[quality]:
+
+        if aug6 and semitones == 10:
+            letters = 5
+
+        tone_names.append(__get_note_name(_LETTERS[(root_letter + letters) % 7], NOTE_INDICES[root_name] + semitones))
+
+    return None if None in tone_names else tuple(tone_names)
+
+
+@lru_cache(maxsize=64)
+def __get_numeral_table(key):
+    '''
+    Returns the chord of each numeral in the passed key, found by identifying the numeral of every chord
+    the validator accepts so that a realized chord is analyzed as the numeral it was realized from.
+
+    Return:
+        numeral_table (dict): Each numeral mapped to its ChordSpec, spelled with the fewest accidentals where
+            several chords share a numeral, i.e. 'V6/5' -> ChordSpec(('G', 'B', 'D', 'F'), 'B', None, '7')
+    '''
+
+    __check_key(key)
+
+    key_notes = set(__get_key_notes(key)) | {get_leading_tone_in_key(key)}
+    aug6_bass = MINOR_KEY_NOTES[key[0].upper() + key[1:]][5]
+    chord_numerals = []
+
+    for root_name in NOTE_INDICES:
+        for quality, chord_tones in _QUALITY_TONES.items():
+
+            #Dominant sevenths on the lowered 6th are also spelled as German and Italian augmented sixths
+            spellings = [(False, False)]
+
+            if quality == '7' and root_name == aug6_bass:
+                spellings += [(True, False), (True, True)]
+
+            for aug6, italian in spellings:
+                tone_names = __spell_chord_tones(root_name, quality, aug6)
+
+                if tone_names is None:
+                    continue
+
+                if italian:
+                    tone_names = tone_names[0:2] + tone_names[3:]
+
+                for position in range(0, 1 if aug6 else len(chord_tones)):
+                    numeral = identify_chord_numeral_for_key(key, {'root': root_name, 'quality': quality,
+                    'position': position})
+
+                    if quality == 'o7':
+                        numeral = get_lt_numeral_for_dim7(numeral)
+
+                    numeral = get_aug6_numeral(numeral, key, tone_names).replace('bII', 'N')
+
+                    #Augmented sixths are only realized with the lowered 6th in the bass, spelled as such
+                    if '+6' in numeral and (tone_names[position] != aug6_bass or (quality == '7' and not aug6)):
+                        continue
+
+                    spelling_cost = sum(1 for tone_name in tone_names if tone_name not in key_notes)
+                    chord_numerals.append(((spelling_cost, len(root_name)), numeral,
+                    ChordSpec(tone_names, tone_names[position], None, quality)))
+
+    numeral_table = {}
+
+    for _, numeral, chord_spec in sorted(chord_numerals, key=lambda chord_numeral: chord_numeral[0]):
+        numeral_table.setdefault(numeral, chord_spec)
+
+    return numeral_table
+
+
+def __parse_numeral(numeral, key):
+    '''
+    Returns the ChordSpec of the passed numeral in the passed key, where applied numerals like 'V7/V' are
+    found in the key of the chord they're applied to.
+    '''
+
+    applied_numeral, _, base_numeral = numeral.strip().rpartition('/')
+
+    #Numerals like 'V4/2' only have an inversion string after their last slash
+    if applied_numeral and base_numeral and not base_numeral[0].isdigit():
+        base_spec = __parse_numeral(base_numeral, key)
+        base_root = base_spec.tone_names[0]
+        key = base_root.lower() if base_spec.quality in ('m', 'm7') else base_root
+        numeral = applied_numeral
+
+        if key not in SUPPORTED_MAJOR_KEYS and key not in SUPPORTED_MINOR_KEYS:
+            raise ValueError(f'Unsupported key for applied numeral: {key}')
+
+    chord_spec = __get_numeral_table(key).get(numeral.strip())
+
+    if chord_spec is None:
+        raise ValueError(f'Unknown numeral: {numeral}')
+
+    return chord_spec
+
+
+def __parse_figured_bass(bass_string, figures, key):
+    '''
+    Returns the ChordSpec of the passed bass note and figures in the passed key.
+
+    Parameters:
+        bass_string (str): The bass note, i.e. 'D3'
+        figures (str): The figures above the bass separated by slashes, i.e. '6/5', '#' or '7/#', where an
+            accidental alone alters the third and every other note is spelled by the key signature
+        key (str): The key the bass line is written in
+
+    Return:
+        chord_spec (ChordSpec)
+    '''
+
+    bass_note = NoteFactory().create_note(bass_string.strip())
+    key_letters = {key_note[0]: key_note for key_note in __get_key_notes(key)}
+    bass_letter = _LETTERS.index(bass_note.name[0])
+
+    #Each figure's interval above the bass and its change from the key signature, if it's altered
+    alterations = {}
+
+    for figure in filter(None, figures.replace(' ', '').split('/')):
+        accidental = figure[0] if figure[0] in _FIGURE_ACCIDENTALS or figure[0] == 'n' else ''
+
+        if not (figure[len(accidental):].isdigit() or (accidental and len(figure) == 1)):
+            raise ValueError(f'Invalid figures: {figures}')
+
+        interval = int(figure[len(accidental):]) if len(figure) > len(accidental) else 3
+        alterations[interval] = accidental
+
+    intervals = _FIGURE_INTERVALS.get(frozenset(alterations))
+
+    if intervals is None:
+        raise ValueError(f'Unsupported figures: {figures}')
+
+    note_names = [bass_note.name]
+
+    for interval in intervals:
+        letter = _LETTERS[(bass_letter + interval - 1) % 7]
+        accidental = alterations.get(interval, '')
+        note_index = NOTE_INDICES[letter] if accidental == 'n' else \
+        NOTE_INDICES[key_letters[letter]] + _FIGURE_ACCIDENTALS.get(accidental, 0)
+        note_name = __get_note_name(letter, note_index)
+
+        if note_name is None:
+            raise ValueError(f'Invalid figures: {figures}')
+
+        note_names.append(note_name)
+
+    #The chord tones are ordered from the root, found by identifying the chord stacked above the bass
+    reference_chord = __create_chord([(note_name, NOTE_INDICES[note_name] + 12 * i)
+    for i, note_name in enumerate(note_names)])
+    root_letter = _LETTERS.index(reference_chord.get_root_name()[0])
+    tone_names = tuple(sorted(note_names, key=lambda note_name: (_LETTERS.index(note_name[0]) - root_letter) % 7))
+
+    return ChordSpec(tone_names, bass_note.name, bass_note.value, reference_chord.quality)
+
+
+def __create_chord(notes):
+    '''Returns the chord of the passed (name, value) of each note.'''
+
+    return Chord([Note(note_name, (note_value - NOTE_INDICES[note_name]) // 12, note_value, NOTE_INDICES[note_name])
+    for note_name, note_value in notes])
+
+
+@lru_cache(maxsize=256)
+def __get_reference_chord(chord_spec):
+    '''Returns a chord of the passed spec in close position above its bass, for identifying its relation to a key.'''
+
+    tone_names = sorted(chord_spec.tone_names, key=lambda note_name: note_name != chord_spec.bass_name)
+    bass_value = chord_spec.bass_value if chord_spec.bass_value is not None else NOTE_INDICES[chord_spec.bass_name] + 36
+
+    return __create_chord([(note_name, bass_value + (NOTE_INDICES[note_name] - bass_value) % 12)
+    for note_name in tone_names])
+
+
+def __get_voice_notes(tone_names, voice_range):
+    '''Returns the (name, value) of every note of the passed names within the passed voice range, lowest first.'''
+
+    return sorted(((note_name, octave * 12 + NOTE_INDICES[note_name]) for note_name in tone_names for octave in
+    range(0, 9) if voice_range[0] <= octave * 12 + NOTE_INDICES[note_name] <= voice_range[1]),
+    key=lambda note: note[1])
+
+
+def __get_voicing_cost(chord_spec, note_names):
+    '''
+    Returns the cost of the passed voicing's doubling, or None if it leaves out a chord tone other than the
+    fifth of a seventh chord, which may only be left out when the root is doubled.
+    '''
+
+    tone_names = chord_spec.tone_names
+    missing_names = [tone_name for tone_name in tone_names if tone_name not in note_names]
+
+    if not missing_names:
+        doubled_name = next((note_name for i, note_name in enumerate(note_names) if note_name in note_names[i + 1:]),
+        None)
+
+        return 0 if doubled_name is None else _DOUBLING_COSTS[tone_names.index(doubled_name)]
+
+    if len(tone_names) == 4 and missing_names == [tone_names[2]] and note_names.count(tone_names[0]) == 2:
+        return _OMITTED_FIFTH_COST
+
+    return None
+
+
+def __get_perfect_mask(values):
+    '''Returns the bitset of the voice pairs in the passed values a perfect 8ve (bits 0-5) or 5th (bits 6-11) apart.'''
+
+    perfect_mask = 0
+
+    for pair_index, (low_value, high_value) in enumerate(combinations(values, 2)):
+        interval = (high_value - low_value) % 12
+
+        if interval == 0:
+            perfect_mask |= 1 << pair_index
+
+        elif interval == 7:
+            perfect_mask |= 1 << (pair_index + 6)
+
+    return perfect_mask
+
+
+@lru_cache(maxsize=1024)
+def __get_candidates(key, chord_spec, next_spec):
+    '''
+    Returns the voicings of the passed chord that break none of the rules checked on a single chord.
+
+    Parameters:
+        key (str): The key the chords are realized in
+        chord_spec (ChordSpec): The chord to voice
+        next_spec (ChordSpec): The chord following it, which decides whether it's an applied chord, or None
+
+    Return:
+        candidates (list): The Voicing of each candidate, or every voicing with the cost of the rules it breaks
+            added if none of them are valid
+    '''
+
+    voice_ranges = _VALIDATION_SETTINGS['voice_range']
+    max_distances = _VALIDATION_SETTINGS['max_distance']
+    next_chord = [__get_reference_chord(next_spec)] if next_spec else []
+
+    if chord_spec.bass_value is not None:
+        bass_notes = [(chord_spec.bass_name, chord_spec.bass_value)]
+
+    else:
+        bass_notes = __get_voice_notes((chord_spec.bass_name,), voice_ranges[0])
+
+    upper_notes = [__get_voice_notes(chord_spec.tone_names, voice_range) for voice_range in voice_ranges[1:]]
+    voicings = []
+
+    #Voicings are pruned by the spacing between voices as they're built, unless the bass is too far below to allow it
+    for spacing in (max_distances[::-1], (float('inf'),) * 3):
+        for bass in bass_notes:
+            for tenor in upper_notes[0]:
+
+                if not bass[1] <= tenor[1] <= bass[1] + spacing[0]:
+                    continue
+
+                for alto in upper_notes[1]:
+
+                    if not tenor[1] <= alto[1] <= tenor[1] + spacing[1]:
+                        continue
+
+                    for soprano in upper_notes[2]:
+
+                        if not alto[1] <= soprano[1] <= alto[1] + spacing[2]:
+                            continue
+
+                        notes = (bass, tenor, alto, soprano)
+                        voicing_cost = __get_voicing_cost(chord_spec, [note_name for note_name, _ in notes])
+
+                        if voicing_cost is not None:
+                            voicings.append((notes, voicing_cost))
+
+        if voicings:
+            break
+
+    candidates = []
+    penalized_candidates = []
+
+    for notes, voicing_cost in voicings:
+        chord = __create_chord(notes)
+
+        #Skip voicings identified as a different chord, i.e. ones leaving out notes that identify it
+        if chord.quality != chord_spec.quality or chord.notes[0].name != chord_spec.bass_name:
+            continue
+
+        values = tuple(note_value for _, note_value in notes)
+        chord_errors = validate_progression_steps([chord] + next_chord, key, 0, 1, False)[0]
+        voicing = Voicing(values, chord, __get_perfect_mask(values), voicing_cost + _ERROR_COST * len(chord_errors))
+
+        (penalized_candidates if chord_errors else candidates).append(voicing)
+
+    if not candidates and not penalized_candidates:
+        raise ValueError(f'The chord {", ".join(chord_spec.tone_names)} cannot be voiced for four voices.')
+
+    return candidates or penalized_candidates
+
+
+def __get_movement(prev_voicing, voicing):
+    '''Returns the voice leading cost between two voicings, the total number of semitones moved by the voices.'''
+
+    return sum(abs(value - prev_value) for prev_value, value in zip(prev_voicing.values, voicing.values))
+
+
+def __realize_chord_specs(chord_specs, key, beam_width):
+    '''
+    Realizes the passed chords with the beam search, see the module docstring.
+
+    Parameters:
+        chord_specs (list): The ChordSpec of each chord
+        key (str): The key to realize the chords in
+        beam_width (int): The number of realizations kept at each chord
+
+    Return:
+        chords (list): The realized chords
+    '''
+
+    if not chord_specs:
+        return []
+
+    next_specs = chord_specs[1:] + [None]
+    transition_errors = {}
+
+    #Each realization is its total cost and voicings so far
+    beam = nsmallest(beam_width, ((voicing.cost, (voicing,)) for voicing in
+    __get_candidates(key, chord_specs[0], next_specs[0])), key=lambda realization: realization[0])
+
+    for chord_spec, next_spec in zip(chord_specs[1:], next_specs[1:]):
+        candidates = __get_candidates(key, chord_spec, next_spec)
+        next_chord = [__get_reference_chord(next_spec)] if next_spec else []
+        realizations = {}
+
+        for cost, voicings in beam:
+            prev_voicing = voicings[-1]
+            movements = sorted((__get_movement(prev_voicing, voicing) + voicing.cost, i) for i, voicing in
+            enumerate(candidates))
+            penalized_realizations = []
+            num_realizations = 0
+
+            for movement, i in movements:
+                voicing = candidates[i]
+
+                #Parallel 5ths and 8ves are perfect intervals between the same voices in both voicings
+                if prev_voicing.perfect_mask & voicing.perfect_mask:
+                    num_errors = 1
+
+                else:
+                    transition = (prev_voicing, voicing)
+
+                    if transition not in transition_errors:
+                        transition_errors[transition] = len(validate_progression_steps([prev_voicing.chord,
+                        voicing.chord] + next_chord, key, 1, 2, False)[0])
+
+                    num_errors = transition_errors[transition]
+
+                if num_errors:
+                    penalized_realizations.append((cost + movement + _ERROR_COST * num_errors, voicings + (voicing,)))
+                    continue
+
+                if voicing not in realizations or cost + movement < realizations[voicing][0]:
+                    realizations[voicing] = (cost + movement, voicings + (voicing,))
+
+                num_realizations += 1
+
+                if num_realizations == beam_width:
+                    break
+
+            #Without any valid voicing to move to, the voicings breaking the fewest rules are kept
+            if not realizations:
+                for realization in penalized_realizations[0:beam_width]:
+                    realizations.setdefault(realization[1][-1], realization)
+
+        beam = nsmallest(beam_width, realizations.values(), key=lambda realization: realization[0])
+
+    return [voicing.chord for voicing in beam[0][1]]
+
+
+#### PUBLIC METHODS ####
+def realize_numerals(numerals, key, beam_width=BEAM_WIDTH):
+    '''
+    Realizes the passed numerals as four-voice chords following the SATB rules, with the least voice leading.
+
+    Parameters:
+        numerals (list): The numeral of each chord, as they're analyzed, i.e. ['I', 'ii6', 'V7/V', 'I6/4']
+        key (str): The key of the numerals, i.e. 'C' or 'a'
+        beam_width (int): The number of realizations kept at each chord while searching
+
+    Return:
+        chords (list): The realized chords, with any rules that can't be followed broken as little as possible
+
+    Raises:
+        ValueError: If the key isn't supported or a numeral isn't known in the key
+    '''
+
+    __check_key(key)
+
+    return __realize_chord_specs([__parse_numeral(numeral, key) for numeral in numerals], key, beam_width)
+
+
+def realize_figured_bass(bass_line, key, beam_width=BEAM_WIDTH):
+    '''
+    Realizes the upper voices of the passed figured bass line following the SATB rules, with the least voice leading.
+
+    Parameters:
+        bass_line (list): The (bass note, figures) of each chord, i.e. [('C3', ''), ('B2', '6'), ('G2', '7/#')]
+        key (str): The key of the bass line, whose signature spells the notes that the figures don't alter
+        beam_width (int): The number of realizations kept at each chord while searching
+
+    Return:
+        chords (list): The realized chords, keeping each bass note as written
+
+    Raises:
+        ValueError: If the key isn't supported, or a bass note or its figures can't be read
+    '''
+
+    __check_key(key)
+
+    return __realize_chord_specs([__parse_figured_bass(bass_string, figures, key) for bass_string, figures in
+    bass_line], key, beam_width)
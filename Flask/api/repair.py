@@ -0,0 +1,194 @@
+'''
+This module exports repair suggestions for the SATB errors found in a progression.
+
+Each error is repaired by moving one or two voices of the chords it's found in, either to another
+octave of the same note or to another of the chord's notes, so the chord itself is unchanged. The
+bass only moves by octaves so that the chord keeps its inversion, and no voice moves past the
+voices beside it.
+
+Moves are tried from the smallest edit: single notes before pairs of notes, then the fewest
+semitones moved. A move repairs the error if it's no longer found and no new errors are, which is
+checked by only validating the chords around the ones changed, as a chord's errors only depend on
+the chords beside it. The search stops once the time budget for the request is spent:
+    repairs = suggest_repairs(progression.chords, 'C')
+    repairs[0]['suggestions'][0]['changes'] -> [{'chord_index': 2, 'voice_index': 3, 'note': 'D5'}]
+'''
+
+from itertools import combinations
+from time import perf_counter
+
+from .chord import Chord
+from .note import Note
+from .satb_validator import _VALIDATION_SETTINGS, validate_progression, validate_progression_steps
+
+#The seconds a request may spend searching for repairs, and the number of repairs suggested for each error
+REPAIR_TIME_BUDGET = 0.5
+MAX_SUGGESTIONS = 3
+
+#The errors that can't be repaired by moving voices, as the chord itself needs to change
+_UNREPAIRABLE_ERRORS = ('ERR_NUM_VOICES', 'ERR_UNKNOWN_CHORD')
+
+
+#### PRIVATE METHODS ####
+def __get_error_key(error):
+    '''Returns a hashable key identifying the passed error.'''
+
+    return (error['code'], tuple(sorted(error['details'].items())))
+
+
+def __get_error_indices(error):
+    '''
+    Returns the (0-indexed) positions of the chords that can be changed to repair the passed error, where
+    resolution errors can be repaired in the chord they're found for or the chord it resolves to.
+    '''
+
+    details = error['details']
+
+    if 'prev_chord_index' in details:
+        return (details['prev_chord_index'] - 1, details['curr_chord_index'] - 1)
+
+    if error['type'] == 'resolution':
+        return (details['chord_index'] - 1, details['chord_index'])
+
+    return (details['chord_index'] - 1,)
+
+
+def __get_voice_moves(chords, chord_index):
+    '''
+    Returns every move of a single voice in the chord at the passed index.
+
+    Return:
+        voice_moves (list): The (semitones, chord_index, voice_index, note) of each move, where the note is the
+            voice's new note, within its range and between the voices beside it
+    '''
+
+    chord = chords[chord_index]
+
+    if len(chord) != 4:
+        return []
+
+    voice_ranges = _VALIDATION_SETTINGS['voice_range']
+    note_names = list(dict.fromkeys(chord.get_note_names()))
+    voice_moves = []
+
+    for voice_index, note in enumerate(chord.notes):
+        low_value = max(voice_ranges[voice_index][0], chord.notes[voice_index - 1].value if voice_index else 0)
+        high_value = min(voice_ranges[voice_index][1], chord.notes[voice_index + 1].value if voice_index < 3 else 127)
+
+        for note_name in note_names if voice_index else [note.name]:
+            note_index = next(other.index for other in chord.notes if other.name == note_name)
+
+            for octave in range(0, 9):
+                note_value = note_index + octave * 12
+
+                if note_value != note.value and low_value <= note_value <= high_value:
+                    voice_moves.append((abs(note_value - note.value), chord_index, voice_index,
+                    Note(note_name, octave, note_value, note_index)))
+
+    return voice_moves
+
+
+def __apply_moves(chords, voice_moves):
+    '''Returns a copy of the passed chords with the voice moves applied, or None if voices would cross.'''
+
+    moved_chords = list(chords)
+    chord_notes = {}
+
+    for _, chord_index, voice_index, note in voice_moves:
+        notes = chord_notes.setdefault(chord_index, list(chords[chord_index].notes))
+
+        if notes[voice_index] is not chords[chord_index].notes[voice_index]:
+            return None
+
+        notes[voice_index] = note
+
+    for chord_index, notes in chord_notes.items():
+
+        if any(note.value > next_note.value for note, next_note in zip(notes, notes[1:])):
+            return None
+
+        moved_chords[chord_index] = Chord(notes)
+
+    return moved_chords
+
+
+def __get_window_errors(chords, key, start, stop):
+    '''Returns the keys of the errors found for the chords from start up to stop (0-indexed).'''
+
+    return {__get_error_key(error) for chord_errors in validate_progression_steps(chords, key, start, stop, False)
+    for error in chord_errors}
+
+
+def __find_repairs(chords, key, error, deadline, max_suggestions):
+    '''
+    Searches for the moves repairing the passed error, see the module docstring.
+
+    Parameters:
+        chords (list): The progression's chords
+        key (str): The key the progression is validated in
+        error (dict): The error to repair, as found by the validator
+        deadline (float): The perf_counter time when the search stops
+        max_suggestions (int): The number of repairs to return
+
+    Return:
+        suggestions (list): The changes and semitones moved of each repair, smallest first
+    '''
+
+    if error['code'] in _UNREPAIRABLE_ERRORS:
+        return []
+
+    error_indices = [chord_index for chord_index in __get_error_indices(error) if 0 <= chord_index < len(chords)]
+    voice_moves = sorted((voice_move for chord_index in error_indices for voice_move in
+    __get_voice_moves(chords, chord_index)), key=lambda voice_move: voice_move[0])
+
+    #A chord's errors depend on the chords beside it, so only those around the changed chords are validated again
+    start = max(min(error_indices) - 1, 0)
+    stop = min(max(error_indices) + 2, len(chords))
+    allowed_errors = __get_window_errors(chords, key, start, stop) - {__get_error_key(error)}
+
+    suggestions = []
+    single_moves = [(voice_move,) for voice_move in voice_moves]
+    paired_moves = sorted(combinations(voice_moves, 2), key=lambda move_set: move_set[0][0] + move_set[1][0])
+
+    for move_sets in (single_moves, paired_moves):
+        for move_set in move_sets:
+
+            if len(suggestions) >= max_suggestions or perf_counter() > deadline:
+                return suggestions
+
+            moved_chords = __apply_moves(chords, move_set)
+
+            if moved_chords is not None and __get_window_errors(moved_chords, key, start, stop) <= allowed_errors:
+                suggestions.append({'changes': [{'chord_index': chord_index + 1, 'voice_index': voice_index,
+                'note': str(note)} for _, chord_index, voice_index, note in move_set],
+                'semitones': sum(voice_move[0] for voice_move in move_set)})
+
+        #Pairs of moves are only suggested when moving a single voice can't repair the error
+        if suggestions:
+            break
+
+    return suggestions
+
+
+#### PUBLIC METHODS ####
+def suggest_repairs(chords, key, time_budget=REPAIR_TIME_BUDGET, max_suggestions=MAX_SUGGESTIONS):
+    '''
+    Validates the passed chords and suggests the smallest changes to the voices repairing each error found.
+
+    Parameters:
+        chords (list): The progression's chords
+        key (str): The key to validate the progression in
+        time_budget (float): The seconds to spend searching for repairs across every error, after which any
+            errors left are returned without suggestions
+        max_suggestions (int): The number of repairs to suggest for each error
+
+    Return:
+        repairs (list): Each error with its suggested repairs, smallest first, i.e. {'error': {...},
+            'suggestions': [{'changes': [{'chord_index': 2, 'voice_index': 3, 'note': 'D5'}], 'semitones': 2}]},
+            where chord indices start at 1 as they do in the errors
+    '''
+
+    deadline = perf_counter() + time_budget
+
+    return [{'error': error, 'suggestions': __find_repairs(chords, key, error, deadline, max_suggestions)}
+    for error in validate_progression(chords, key)]
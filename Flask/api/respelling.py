@@ -0,0 +1,181 @@
+'''
+This module exports the enharmonic respelling of chords whose notes are spelled awkwardly for their
+key, i.e. Gb in G major or Cb for B in C major.
+
+A chord's root and quality only depend on its pitch classes, so they're identified once for the
+chord, and each of its pitch classes is then given one of its names in NOTE_INDICES. The root is
+spelled first, and every other note is spelled as its chord tone above the root, i.e. as a third or
+a fifth, with the fewest accidentals in the key and without double accidentals where possible. The
+names chosen only depend on the key and the chord's pitch classes from the bass up, so they're
+memoized for each, and respelling a chord is usually a single lookup:
+    respelled_chord = respell_chord(chord, 'G')
+
+Notes that are already spelled as well as any other name are kept, so augmented sixths spelled
+as such aren't respelled as sevenths.
+'''
+
+from functools import lru_cache
+
+from .chord import Chord
+from .music_info import (MAJOR_KEY_NOTES, MINOR_KEY_NOTES, NOTE_INDICES, SUPPORTED_MINOR_KEYS, get_chord_for_intervals,
+get_leading_tone_in_key)
+from .note import Note
+
+#The letter names, in order
+_LETTERS = 'CDEFGAB'
+
+#The letter distances above the root that spell a chord tone for each number of semitones above it,
+#i.e. 7 semitones is a fifth, and 10 semitones is a seventh or an augmented sixth
+_CHORD_TONE_LETTERS = {0: (0,), 1: (1,), 2: (1,), 3: (2,), 4: (2,), 5: (3,), 6: (4, 3), 7: (4,), 8: (4,), 9: (6, 5),
+10: (6, 5), 11: (6,)}
+
+#The names of each pitch class (C=0 -> B=11)
+_PITCH_CLASS_NAMES = tuple(tuple(note_name for note_name, index in NOTE_INDICES.items() if index == pitch_class)
+for pitch_class in range(12))
+
+
+#### PRIVATE METHODS ####
+@lru_cache(maxsize=None)
+def __get_key_notes(key):
+    '''
+    Returns the note names written without an accidental in the passed key, including the leading tone of
+    minor keys, as it's expected in minor. Unsupported keys are spelled as C major.
+    '''
+
+    if key in SUPPORTED_MINOR_KEYS:
+        return frozenset(MINOR_KEY_NOTES[key[0].upper() + key[1:]] + (get_leading_tone_in_key(key),))
+
+    return frozenset(MAJOR_KEY_NOTES.get(key, MAJOR_KEY_NOTES['C']))
+
+
+def __get_spelling_cost(note_name, key, root_name=None, semitones=0):
+    '''
+    Returns the cost of spelling a note with the passed name in the key, as a tuple compared in order.
+
+    Parameters:
+        note_name (str): The name to spell the note with
+        key (str): The key the chord is in
+        root_name (str): The name of the chord's root, or None if the note is the root or the chord is unknown
+        semitones (int): The number of semitones the note is above the root
+
+    Return:
+        (is_misspelled, has_double_accidental, has_accidental, is_alternate): Whether the note isn't spelled as a
+            chord tone above the root, whether its name has two accidentals, whether it needs an accidental in the
+            key, and whether it's spelled as the less common of two chord tones, i.e. an augmented sixth
+    '''
+
+    is_misspelled = 0
+    is_alternate = 0
+
+    if root_name is not None:
+        letter_distance = (_LETTERS.index(note_name[0]) - _LETTERS.index(root_name[0])) % 7
+        chord_tone_letters = _CHORD_TONE_LETTERS[semitones]
+        is_misspelled = int(letter_distance not in chord_tone_letters)
+        is_alternate = int(letter_distance in chord_tone_letters[1:])
+
+    return (is_misspelled, int('x' in note_name or 'bb' in note_name), int(note_name not in __get_key_notes(key)),
+    is_alternate)
+
+
+def __get_tied_names(note_names, get_cost):
+    '''
+    Returns the passed names tied for the lowest cost and their cost, where names only differing in
+    being the less common chord tone are tied, and ordered with the more common one first.
+    '''
+
+    costs = {note_name: get_cost(note_name) for note_name in note_names}
+    best_cost = min(cost[0:3] for cost in costs.values())
+    tied_names = sorted((note_name for note_name in note_names if costs[note_name][0:3] == best_cost),
+    key=lambda note_name: (costs[note_name][3], len(note_name)))
+
+    return (tuple(tied_names), best_cost)
+
+
+@lru_cache(maxsize=4096)
+def __get_spellings(key, pitch_classes):
+    '''
+    Finds the best names for each of a chord's pitch classes in the passed key.
+
+    Parameters:
+        key (str): The key the chord is in
+        pitch_classes (tuple): The chord's distinct pitch classes, in order from its lowest note up
+
+    Return:
+        spellings (list): For each spelling of the root tied for the best, the names tied for the best
+            spelling of each pitch class, the more common chord tone first
+    '''
+
+    interval_string = ''.join(str((next_class - pitch_class) % 12) for pitch_class, next_class in
+    zip(pitch_classes, pitch_classes[1:]))
+    chord_info = get_chord_for_intervals(interval_string)
+
+    #Unknown chords have no root to spell their notes from, so each note only needs the fewest accidentals
+    if chord_info['quality'] == 'unknown':
+        return [tuple(__get_tied_names(_PITCH_CLASS_NAMES[pitch_class],
+        lambda note_name: __get_spelling_cost(note_name, key))[0] for pitch_class in pitch_classes)]
+
+    root_class = pitch_classes[chord_info['root_index']]
+    spellings = []
+
+    for root_name in _PITCH_CLASS_NAMES[root_class]:
+        spelling = []
+        spelling_cost = __get_spelling_cost(root_name, key)[0:3]
+
+        for pitch_class in pitch_classes:
+            semitones = (pitch_class - root_class) % 12
+
+            if semitones == 0:
+                spelling.append((root_name,))
+                continue
+
+            tied_names, note_cost = __get_tied_names(_PITCH_CLASS_NAMES[pitch_class],
+            lambda note_name, semitones=semitones: __get_spelling_cost(note_name, key, root_name, semitones))
+
+            spelling.append(tied_names)
+            spelling_cost = tuple(map(sum, zip(spelling_cost, note_cost)))
+
+        spellings.append((spelling_cost, len(root_name), tuple(spelling)))
+
+    best_cost = min(spelling_cost for spelling_cost, _, _ in spellings)
+
+    return [spelling for spelling_cost, _, spelling in sorted(spellings) if spelling_cost == best_cost]
+
+
+#### PUBLIC METHODS ####
+def respell_chord(chord, key):
+    '''
+    Respells the passed chord's notes with the names best identifying it in the passed key.
+
+    Parameters:
+        chord (Chord): The chord to respell
+        key (str): The key the chord is in, i.e. 'G' or 'e'
+
+    Return:
+        respelled_chord (Chord): A new chord with the respelled notes, or the passed chord if none were respelled
+    '''
+
+    pitch_classes = tuple(dict.fromkeys(note.index for note in sorted(chord.notes, key=lambda note: note.value)))
+
+    if not pitch_classes:
+        return chord
+
+    note_names = {note.name for note in chord.notes}
+
+    #Of the best spellings, keep the one with the most of the names already used
+    spelling = max(__get_spellings(key, pitch_classes), key=lambda spelling:
+    sum(1 for tied_names in spelling if note_names.intersection(tied_names)))
+
+    #Each pitch class keeps a name already used for it if it's one of its best, or else takes its best name
+    pitch_class_names = {pitch_class: next((note_name for note_name in tied_names if note_name in note_names),
+    tied_names[0]) for pitch_class, tied_names in zip(pitch_classes, spelling)}
+
+    if all(note.name == pitch_class_names[note.index] for note in chord.notes):
+        return chord
+
+    return Chord([Note(pitch_class_names[note.index], note.octave, note.value, note.index) for note in chord.notes])
+
+
+def respell_chords(chords, key):
+    '''Returns the passed chords respelled for the passed key, see respell_chord.'''
+
+    return [respell_chord(chord, key) for chord in chords]
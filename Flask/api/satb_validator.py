@@ -8,6 +8,8 @@ chords to be based on the leading tone: iio7, ivo7, vio7, bvio7.
 
 from .music_info import get_note_name_for_degree, get_leading_tone_in_key
 from .music_info import get_chord_relation_for_key, get_lt_numeral_for_dim7
+from .metrics import record_errors, should_time_rules, time_rule
+from . import trace
 
 #Set of validation parameters used for validating the SATB chord progression
 _VALIDATION_SETTINGS = {
@@ -261,7 +263,6 @@ def __identify_chord_relation(key, curr_chord, next_chord):
     if curr_chord.quality == 'o7':
         chord_numeral = get_lt_numeral_for_dim7(chord_numeral)
 
-    print(next_chord)
     chord_relation = get_chord_relation_for_key(key, chord_numeral)
 
     #Check for applied chords or special chromatic chords
@@ -286,25 +287,92 @@ def __identify_chord_relation(key, curr_chord, next_chord):
 
     return chord_relation
 
+def __get_previous_voiced_chord(progression, key, index):
+    '''
+    Returns the last four-voice chord preceding the passed (0-indexed) position in the progression 
+    and its relation to the key, or (None, None) if there isn't one.
+    '''
+
+    for prev_index in range(index - 1, -1, -1):
+        prev_chord = progression[prev_index]
+
+        if len(prev_chord) == 4:
+            return (prev_chord, __identify_chord_relation(key, prev_chord, progression[prev_index + 1]))
+
+    return (None, None)
+
+def __trace_chord(chord_index, chord, chord_relation, current_key, chord_errors):
+    '''Records the relation, local key and rules broken found while validating the passed chord.'''
+
+    #Resolution errors found for this chord are reported for the chord before it
+    trace.emit('chord', {'chord_index': chord_index, 'chord': repr(chord), 'relation': chord_relation,
+    'local_key': current_key, 'rules': [error['code'] for error in chord_errors]})
+
+def __get_rule_functions(record=True):
+    '''
+    Returns the rule functions to validate a progression with, timed for the engine's metrics on a sample
+    of validations only, as timing every rule for every chord would slow down validation.
+    '''
+
+    rule_functions = (__identify_chord_relation, __check_voice_spacing, __check_voice_in_range, __check_chord_doubling,
+    __check_voice_movement, __check_seventh_resolution, __check_leading_resolution)
+
+    if record and should_time_rules():
+        rule_names = ('chord_relation', 'voice_spacing', 'voice_range', 'chord_doubling', 'voice_movement',
+        'seventh_resolution', 'leading_resolution')
+        rule_functions = tuple(time_rule(*rule) for rule in zip(rule_names, rule_functions))
+
+    return rule_functions
+
 def validate_progression(progression, key):
     '''Central function to validate the passed chord progression according to SATB notation rules.'''
 
-    print('Validate')
     progression_errors = []
 
+    for chord_errors in validate_progression_steps(progression, key):
+        progression_errors.extend(chord_errors)
+
+    return progression_errors
+
+def validate_progression_steps(progression, key, start=0, stop=None, record=True):
+    '''
+    Validates the chords from start up to stop (0-indexed) in the passed progression and returns
+    the errors found while checking each of those chords as a separate list.
+
+    The errors for each chord match those found by validating the whole progression, so a changed 
+    chord can be re-checked along with its neighbours without re-validating every chord. Passing
+    record=False leaves the validation out of the engine's metrics and trace, for voicings that are
+    only being tried out, i.e. while realizing a progression.
+
+    Note: Resolution errors are found while checking the chord following the one they're reported for.
+    '''
+
+    if stop is None:
+        stop = len(progression)
+
+    step_errors = []
+    tracing = trace.enabled and record
+
+    if tracing:
+        trace.emit('validate', {'key': key, 'start': start, 'stop': stop})
+
+    (identify_chord_relation, check_voice_spacing, check_voice_in_range, check_chord_doubling, check_voice_movement,
+    check_seventh_resolution, check_leading_resolution) = __get_rule_functions(record)
+
     #Hold the previous chord while iterating for resolution errors
-    prev_chord = None
-    prev_relation = None
+    prev_chord, prev_relation = __get_previous_voiced_chord(progression, key, start)
 
-    for i, curr_chord in enumerate(progression, start=1):
+    for i, curr_chord in enumerate(progression[start:stop], start=start + 1):
         current_key = key
+        progression_errors = []
+        step_errors.append(progression_errors)
 
         #1) Get the relation of the chord for the current key
         if i < len(progression):
-            chord_relation = __identify_chord_relation(key, curr_chord, progression[i])
+            chord_relation = identify_chord_relation(key, curr_chord, progression[i])
 
         else:
-            chord_relation = __identify_chord_relation(key, curr_chord, None)
+            chord_relation = identify_chord_relation(key, curr_chord, None)
 
         #If this chord is an applied chord, adjust the key to be relative to the next chord
         if chord_relation == 'applied':
@@ -316,6 +384,10 @@ def validate_progression(progression, key):
         #2) Check for spelling errors or unknown chords
         if len(curr_chord) != 4:
             progression_errors.append({'type': 'spelling', 'code': 'ERR_NUM_VOICES', 'details': {'chord_index': i}})
+
+            if tracing:
+                __trace_chord(i, curr_chord, chord_relation, current_key, progression_errors)
+
             continue
 
         if curr_chord.quality not in _VALIDATION_SETTINGS['chord_types']:
@@ -325,47 +397,53 @@ def validate_progression(progression, key):
             progression_errors.append({'type': 'spelling', 'code': 'ERR_UNKNOWN_CHORD', 'details': {'chord_index': i}})
 
         #3) Get voice spacing errors
-        progression_errors.extend(__check_voice_spacing(curr_chord, i))
+        progression_errors.extend(check_voice_spacing(curr_chord, i))
 
         #4) Check for range errors between voices in the current chord
-        progression_errors.extend(__check_voice_in_range(curr_chord, i))
+        progression_errors.extend(check_voice_in_range(curr_chord, i))
 
         #5) Get tendancy tone doubling errors
-        if error := __check_chord_doubling(curr_chord, i, current_key, 'leading'): 
+        if error := check_chord_doubling(curr_chord, i, current_key, 'leading'): 
             progression_errors.append(error)
 
         if curr_chord.quality in _VALIDATION_SETTINGS['seventh_chords']:
-            if error := __check_chord_doubling(curr_chord, i, current_key, 'seventh'): 
+            if error := check_chord_doubling(curr_chord, i, current_key, 'seventh'): 
                 progression_errors.append(error)
 
         #6) Get movement and resolution errors between chords
         if prev_chord:
-            progression_errors.extend(__check_voice_movement(prev_chord, curr_chord, i))
+            progression_errors.extend(check_voice_movement(prev_chord, curr_chord, i))
 
             #If the previous chord was an applied chord, adjust the key to use
             if prev_relation == 'applied':
                 altered_key = curr_chord.get_root_name()
 
                 if prev_chord.quality in _VALIDATION_SETTINGS['seventh_chords']:
-                    if error := __check_seventh_resolution(prev_chord, curr_chord, altered_key, i): 
+                    if error := check_seventh_resolution(prev_chord, curr_chord, altered_key, i): 
                         progression_errors.append(error)
 
-                if error := __check_leading_resolution(prev_chord, curr_chord, altered_key, i-1): 
+                if error := check_leading_resolution(prev_chord, curr_chord, altered_key, i-1): 
                     progression_errors.append(error)
 
             #Else, check the chords for the progression key as normal
             else:
 
                 if prev_chord.quality in _VALIDATION_SETTINGS['seventh_chords']:
-                    if error := __check_seventh_resolution(prev_chord, curr_chord, current_key, i): 
+                    if error := check_seventh_resolution(prev_chord, curr_chord, current_key, i): 
                         progression_errors.append(error)
 
-                if error := __check_leading_resolution(prev_chord, curr_chord, current_key, i-1): 
+                if error := check_leading_resolution(prev_chord, curr_chord, current_key, i-1): 
                     progression_errors.append(error)
 
+        #The check is kept inline so that nothing is built for the trace while it's disabled
+        if tracing:
+            __trace_chord(i, curr_chord, chord_relation, current_key, progression_errors)
+
         #Save the current chord's information for validating cross-chord errors
         prev_chord = curr_chord
-        print(chord_relation)
         prev_relation = chord_relation
 
-    return progression_errors
+    if record:
+        record_errors(step_errors)
+
+    return step_errors
@@ -0,0 +1,37 @@
+'''
+This module exports functions for converting analyzed chords into the records returned to the
+client. Records are built directly from each chord's note data rather than its string form.
+'''
+
+from .music_info import VEXFLOW_NOTE_KEYS
+
+
+def format_chord_keys(chord):
+    '''Returns the VexFlow key strings for the passed chord's notes, i.e. ['c/4', 'e/4', 'g/4'].'''
+
+    return [VEXFLOW_NOTE_KEYS[note.name][note.octave] for note in chord.notes]
+
+
+def serialize_chord(chord, name, numeral, accidentals, voice_leading=None):
+    '''
+    Returns the record describing a single analyzed chord.
+
+    Parameters:
+        chord (Chord): The chord to serialize
+        name (str): The chord's name
+        numeral (str): The chord's numeral relative to the progression's key
+        accidentals (list): The accidental strings for each of the chord's notes
+        voice_leading (dict): The voice-leading metrics of the motion into the chord, or None for the first chord
+
+    Return:
+        chord_record (dict)
+    '''
+
+    return {'name': name, 'numeral': numeral, 'notes': format_chord_keys(chord), 'accidentals': accidentals,
+    'voice_leading': voice_leading}
+
+
+def serialize_progression_chords(chords, names, numerals, accidentals, voice_leading):
+    '''Returns the list of chord records for a progression's chords and their analysis results.'''
+
+    return [serialize_chord(*chord_info) for chord_info in zip(chords, names, numerals, accidentals, voice_leading)]
@@ -0,0 +1,217 @@
+'''
+This module exports the pitch-class set analysis of chords, for the post-tonal description of
+chords that INTERVAL_STRINGS doesn't identify.
+
+A chord's pitch classes are held as a 12-bit mask, with bit 0 for C up to bit 11 for B, and the
+normal form, prime form, Forte number, interval-class vector and Z-related partner of every one of
+the 4096 masks are computed once, the first time they're needed, so each lookup is an index into a
+table. Normal and prime forms follow Rahn's ordering, as in Straus's Introduction to Post-Tonal
+Theory, so 5-20 is [0, 1, 5, 6, 8] rather than Forte's [0, 1, 3, 7, 8]:
+    get_set_class(chord) -> {'normal_form': [11, 0, 2, 4], 'prime_form': [0, 1, 3, 5],
+        'forte_number': '4-11', 'interval_vector': [1, 2, 1, 1, 1, 0], 'z_partner': None}
+'''
+
+from collections import Counter
+from functools import lru_cache
+
+#The Forte number and a pitch-class set of each set class of 3 to 6 pitch classes, where the set classes of 7 to 9
+#pitch classes are numbered as their complements
+_FORTE_SET_CLASSES = (
+    ('3-1', '012'), ('3-2', '013'), ('3-3', '014'), ('3-4', '015'), ('3-5', '016'), ('3-6', '024'), ('3-7', '025'),
+    ('3-8', '026'), ('3-9', '027'), ('3-10', '036'), ('3-11', '037'), ('3-12', '048'),
+    ('4-1', '0123'), ('4-2', '0124'), ('4-3', '0134'), ('4-4', '0125'), ('4-5', '0126'), ('4-6', '0127'),
+    ('4-7', '0145'), ('4-8', '0156'), ('4-9', '0167'), ('4-10', '0235'), ('4-11', '0135'), ('4-12', '0236'),
+    ('4-13', '0136'), ('4-14', '0237'), ('4-Z15', '0146'), ('4-16', '0157'), ('4-17', '0347'), ('4-18', '0147'),
+    ('4-19', '0148'), ('4-20', '0158'), ('4-21', '0246'), ('4-22', '0247'), ('4-23', '0257'), ('4-24', '0248'),
+    ('4-25', '0268'), ('4-26', '0358'), ('4-27', '0258'), ('4-28', '0369'), ('4-Z29', '0137'),
+    ('5-1', '01234'), ('5-2', '01235'), ('5-3', '01245'), ('5-4', '01236'), ('5-5', '01237'), ('5-6', '01256'),
+    ('5-7', '01267'), ('5-8', '02346'), ('5-9', '01246'), ('5-10', '01346'), ('5-11', '02347'), ('5-Z12', '01356'),
+    ('5-13', '01248'), ('5-14', '01257'), ('5-15', '01268'), ('5-16', '01347'), ('5-Z17', '01348'),
+    ('5-Z18', '01457'), ('5-19', '01367'), ('5-20', '01568'), ('5-21', '01458'), ('5-22', '01478'),
+    ('5-23', '02357'), ('5-24', '01357'), ('5-25', '02358'), ('5-26', '02458'), ('5-27', '01358'),
+    ('5-28', '02368'), ('5-29', '01368'), ('5-30', '01468'), ('5-31', '01369'), ('5-32', '01469'),
+    ('5-33', '02468'), ('5-34', '02469'), ('5-35', '02479'), ('5-Z36', '01247'), ('5-Z37', '03458'),
+    ('5-Z38', '01258'),
+    ('6-1', '012345'), ('6-2', '012346'), ('6-Z3', '012356'), ('6-Z4', '012456'), ('6-5', '012367'),
+    ('6-Z6', '012567'), ('6-7', '012678'), ('6-8', '023457'), ('6-9', '012357'), ('6-Z10', '013457'),
+    ('6-Z11', '012457'), ('6-Z12', '012467'), ('6-Z13', '013467'), ('6-14', '013458'), ('6-15', '012458'),
+    ('6-16', '014568'), ('6-Z17', '012478'), ('6-18', '012578'), ('6-Z19', '013478'), ('6-20', '014589'),
+    ('6-21', '023468'), ('6-22', '012468'), ('6-Z23', '023568'), ('6-Z24', '013468'), ('6-Z25', '013568'),
+    ('6-Z26', '013578'), ('6-27', '013469'), ('6-Z28', '013569'), ('6-Z29', '023679'), ('6-30', '013679'),
+    ('6-31', '014579'), ('6-32', '024579'), ('6-33', '023579'), ('6-34', '013579'), ('6-35', '02468T'),
+    ('6-Z36', '012347'), ('6-Z37', '012348'), ('6-Z38', '012378'), ('6-Z39', '023458'), ('6-Z40', '012358'),
+    ('6-Z41', '012368'), ('6-Z42', '012369'), ('6-Z43', '012568'), ('6-Z44', '012569'), ('6-Z45', '023469'),
+    ('6-Z46', '012469'), ('6-Z47', '012479'), ('6-Z48', '012579'), ('6-Z49', '013479'), ('6-Z50', '014679')
+)
+
+#The digit of each pitch class in a pitch-class set, with T for 10 and E for 11
+_PITCH_CLASS_DIGITS = '0123456789TE'
+
+#The mask of all 12 pitch classes
+_ALL_PITCH_CLASSES = 0xFFF
+
+
+#### PRIVATE METHODS ####
+def __get_pitch_classes(mask):
+    '''Returns the sorted pitch classes in the passed mask.'''
+
+    return [pitch_class for pitch_class in range(0, 12) if mask >> pitch_class & 1]
+
+
+def __get_normal_form(pitch_classes):
+    '''
+    Returns the rotation of the passed sorted pitch classes spanning the smallest interval, with the smallest
+    intervals from the first pitch class to the last, then to the second to last and so on, breaking any
+    remaining ties by the lowest first pitch class.
+    '''
+
+    if not pitch_classes:
+        return ()
+
+    rotations = [pitch_classes[i:] + pitch_classes[0:i] for i in range(0, len(pitch_classes))]
+
+    return tuple(min(rotations, key=lambda rotation: tuple((pitch_class - rotation[0]) % 12
+    for pitch_class in reversed(rotation))))
+
+
+def __get_prime_form(pitch_classes):
+    '''Returns the normal form of the passed pitch classes or their inversion transposed to 0, packed to the left.'''
+
+    normal_form = __get_normal_form(pitch_classes)
+    inverted_form = __get_normal_form(sorted((12 - pitch_class) % 12 for pitch_class in pitch_classes))
+
+    return min(tuple((pitch_class - form[0]) % 12 for pitch_class in form) for form in (normal_form, inverted_form)
+    if form) if pitch_classes else ()
+
+
+def __get_mask(pitch_classes):
+    '''Returns the mask of the passed pitch classes.'''
+
+    return sum(1 << pitch_class for pitch_class in set(pitch_classes))
+
+
+def __get_interval_vector(pitch_classes):
+    '''Returns the number of each interval class, from 1 to 6, between the passed pitch classes.'''
+
+    interval_vector = [0] * 6
+
+    for i, pitch_class in enumerate(pitch_classes):
+        for other_pitch_class in pitch_classes[i + 1:]:
+            interval = (other_pitch_class - pitch_class) % 12
+            interval_vector[min(interval, 12 - interval) - 1] += 1
+
+    return tuple(interval_vector)
+
+
+def __get_forte_numbers():
+    '''Returns the Forte number of each set class by its prime form, numbering each complement as its set class.'''
+
+    forte_numbers = {(): '0-1', (0,): '1-1', tuple(range(0, 12)): '12-1', tuple(range(0, 11)): '11-1'}
+
+    for interval in range(1, 7):
+        forte_numbers[(0, interval)] = f'2-{interval}'
+        forte_numbers[__get_prime_form(__get_pitch_classes(_ALL_PITCH_CLASSES ^ (1 | 1 << interval)))] = \
+            f'10-{interval}'
+
+    for forte_number, pitch_class_string in _FORTE_SET_CLASSES:
+        pitch_classes = [_PITCH_CLASS_DIGITS.index(digit) for digit in pitch_class_string]
+        forte_numbers[__get_prime_form(pitch_classes)] = forte_number
+        cardinality, _, ordinal = forte_number.partition('-')
+
+        if cardinality != '6':
+            complement = __get_pitch_classes(_ALL_PITCH_CLASSES ^ __get_mask(pitch_classes))
+            forte_numbers[__get_prime_form(complement)] = f'{12 - int(cardinality)}-{ordinal}'
+
+    return forte_numbers
+
+
+@lru_cache(maxsize=None)
+def __get_set_class_tables():
+    '''
+    Returns the tables of the set class of every pitch-class mask, built once.
+
+    Return:
+        set_class_tables (tuple): The normal form, prime form, Forte number, interval-class vector and Z-related
+            partner's Forte number (or None) of each mask, each as a tuple indexed by the mask
+    '''
+
+    forte_numbers = __get_forte_numbers()
+    normal_forms = []
+    prime_forms = []
+    interval_vectors = []
+
+    for mask in range(0, 4096):
+        pitch_classes = __get_pitch_classes(mask)
+        normal_forms.append(__get_normal_form(pitch_classes))
+        prime_forms.append(__get_prime_form(pitch_classes))
+        interval_vectors.append(__get_interval_vector(pitch_classes))
+
+    #Z-related set classes share their interval-class vector with exactly one other set class of the same size
+    vector_numbers = {}
+
+    for prime_form, forte_number in forte_numbers.items():
+        vector_numbers.setdefault((len(prime_form), __get_interval_vector(list(prime_form))), []).append(forte_number)
+
+    z_partners = {forte_number: next(iter(set(vector_forte_numbers) - {forte_number}), None)
+    for vector_forte_numbers in vector_numbers.values() for forte_number in vector_forte_numbers}
+
+    mask_numbers = tuple(forte_numbers[prime_form] for prime_form in prime_forms)
+
+    return (tuple(normal_forms), tuple(prime_forms), mask_numbers, tuple(interval_vectors),
+    tuple(z_partners[forte_number] for forte_number in mask_numbers))
+
+
+#### PUBLIC METHODS ####
+def get_pitch_class_mask(chord):
+    '''Returns the 12-bit mask of the passed chord's pitch classes, with bit 0 for C up to bit 11 for B.'''
+
+    return __get_mask(note.index for note in chord.notes)
+
+
+def get_mask_set_class(mask):
+    '''
+    Returns the set class of the passed 12-bit pitch-class mask.
+
+    Return:
+        set_class (dict): The 'normal_form' and 'prime_form' pitch classes, the 'forte_number', the interval-class
+            vector ('interval_vector') and the Forte number of the Z-related set class ('z_partner') or None
+    '''
+
+    normal_forms, prime_forms, forte_numbers, interval_vectors, z_partners = __get_set_class_tables()
+
+    return {'normal_form': list(normal_forms[mask]), 'prime_form': list(prime_forms[mask]),
+    'forte_number': forte_numbers[mask], 'interval_vector': list(interval_vectors[mask]),
+    'z_partner': z_partners[mask]}
+
+
+def get_set_class(chord):
+    '''Returns the set class of the passed chord's pitch classes, see get_mask_set_class.'''
+
+    return get_mask_set_class(get_pitch_class_mask(chord))
+
+
+def get_forte_number(chord):
+    '''Returns the Forte number of the passed chord's set class, without building the rest of its set class.'''
+
+    return __get_set_class_tables()[2][get_pitch_class_mask(chord)]
+
+
+def get_set_classes(chords):
+    '''Returns the set class of each of the passed chords, see get_mask_set_class.'''
+
+    return [get_mask_set_class(get_pitch_class_mask(chord)) for chord in chords]
+
+
+def count_set_classes(progressions):
+    '''
+    Counts the set classes of the chords across the passed progressions, i.e. of a corpus.
+
+    Parameters:
+        progressions (iterable): The progressions, or lists of chords, to count the chords of
+
+    Return:
+        set_class_counts (Counter): The number of chords of each Forte number
+    '''
+
+    return Counter(get_forte_number(chord) for progression in progressions
+    for chord in getattr(progression, 'chords', progression))
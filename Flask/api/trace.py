@@ -0,0 +1,81 @@
+'''
+This module exports the analysis engine's trace facility, recording the decisions made while analyzing.
+
+Trace points in the engine are guarded by the module's 'enabled' flag, i.e. 'if trace.enabled:', so
+that no event is built while tracing is disabled. When enabled, each event is added to a bounded ring
+buffer along with the id of the trace started by the current thread, so the events of a single request
+can be dumped later, until they're pushed out by newer events:
+    trace_id = start_trace()
+    generate_progression(chords, key)
+    events = get_trace(trace_id)
+
+Tracing is disabled by default and can be enabled with the environment variable 'ANALYSIS_TRACE=1'.
+'''
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+#Whether trace points record their events, checked before building each event
+enabled = os.environ.get('ANALYSIS_TRACE', '0') == '1'
+
+#The number of events kept, across all traces
+TRACE_BUFFER_SIZE = 10000
+
+_buffer = deque(maxlen=TRACE_BUFFER_SIZE)
+_trace_ids = itertools.count(1)
+_local = threading.local()
+
+
+def set_enabled(is_enabled, buffer_size=None):
+    '''Enables or disables tracing, optionally resizing the ring buffer and discarding its events.'''
+
+    global enabled, _buffer
+
+    if buffer_size is not None:
+        _buffer = deque(maxlen=buffer_size)
+
+    enabled = is_enabled
+
+
+def start_trace():
+    '''Starts a new trace for the events recorded by the current thread and returns its id.'''
+
+    #Taking the next id from the counter is atomic, so ids are unique across threads
+    _local.trace_id = next(_trace_ids)
+
+    return _local.trace_id
+
+
+def end_trace():
+    '''Ends the current thread's trace, so that its later events aren't recorded under it.'''
+
+    _local.trace_id = None
+
+
+def emit(event, details):
+    '''
+    Records an event under the current thread's trace. Callers should check 'enabled' first.
+
+    Parameters:
+        event (str): The event's name, i.e. 'chord'
+        details (dict): The event's details, i.e. {'chord_index': 1, 'relation': 'diatonic'}
+    '''
+
+    #Appending to a deque is atomic, so events from separate threads don't need a lock
+    _buffer.append((getattr(_local, 'trace_id', None), time.time(), event, details))
+
+
+def get_trace(trace_id):
+    '''Returns the events still held in the ring buffer for the passed trace, oldest first.'''
+
+    return [{'time': event_time, 'event': event, **details} for event_trace_id, event_time, event, details
+    in list(_buffer) if event_trace_id == trace_id]
+
+
+def clear():
+    '''Discards every event held in the ring buffer.'''
+
+    _buffer.clear()
@@ -0,0 +1,238 @@
+'''
+This module exports the transposition of progressions and corpora from one key to another.
+
+Notes are mapped by their degree in the key: each note keeps its letter's degree of the source key's
+scale and its alteration from it, i.e. F# in C (a raised 4th) becomes C# in G and B in F, using
+doubled accidentals where the target key needs them. Minor keys use the harmonic minor scale, so
+the leading tone stays the leading tone when transposing between major and minor keys, and only the
+3rd and 6th degrees change with the mode. Chromatic notes keep their interval above the tonic when
+the mode changes, so the mixture 3rd Eb in C stays Eb in c rather than becoming Ebb.
+
+Every note name's spelling and change in semitones is found once for each pair of keys, so each
+note is transposed with a single lookup. The progression is then moved by whole octaves, as a
+whole so that its voice leading is unchanged, to keep as many SATB voices within their ranges as
+possible:
+    transposed_chords = transpose_chords(progression.chords, 'C', 'Eb')
+    transposed_strings = transpose_chord_strings(['C3,G3,E4,C5', 'G2,D4,B4,G4'], 'C', 'a')
+'''
+
+from collections import Counter
+from functools import lru_cache
+
+from .chord import Chord
+from .music_info import (MAJOR_KEY_NOTES, MINOR_KEY_NOTES, NOTE_INDICES, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS,
+get_leading_tone_in_key)
+from .note import Note
+from .satb_validator import _VALIDATION_SETTINGS
+
+#The accidental strings a note can be spelled with, from lowest to highest
+_ACCIDENTALS = ('bb', 'b', '', '#', 'x')
+
+#The octaves a note can be written in, and the whole octaves a transposed progression may be moved by
+_NOTE_OCTAVES = range(0, 9)
+_OCTAVE_SHIFTS = (0, -12, 12)
+
+
+#### PRIVATE METHODS ####
+def __get_scale_notes(key):
+    '''Returns the notes of the passed key's scale, using the harmonic minor scale for minor keys.'''
+
+    if key[0].isupper():
+        return MAJOR_KEY_NOTES[key]
+
+    return MINOR_KEY_NOTES[key[0].upper() + key[1:]][0:6] + (get_leading_tone_in_key(key),)
+
+
+def __get_enharmonic_name(note_index):
+    '''Returns the name with the fewest accidentals for the passed note index, for notes beyond double accidentals.'''
+
+    return min((note_name for note_name, index in NOTE_INDICES.items() if index == note_index), key=len)
+
+
+@lru_cache(maxsize=None)
+def __get_spelling_map(source_key, target_key):
+    '''
+    Returns the spelling of each note name of the source key in the target key.
+
+    Parameters:
+        source_key (str): The key the notes are written in
+        target_key (str): The key the notes are transposed to
+
+    Return:
+        spelling_map (dict): Each note name mapped to its (name, semitones) in the target key, where the
+            semitones are the change in pitch before the progression is moved by octaves
+    '''
+
+    for key in (source_key, target_key):
+        if key not in SUPPORTED_MAJOR_KEYS and key not in SUPPORTED_MINOR_KEYS:
+            raise ValueError(f'Unsupported key: {key}')
+
+    source_notes = __get_scale_notes(source_key)
+    target_notes = __get_scale_notes(target_key)
+    source_letters = [note_name[0] for note_name in source_notes]
+
+    #The change in pitch of the tonic, moving the shortest distance up or down
+    tonic_semitones = (NOTE_INDICES[target_notes[0]] - NOTE_INDICES[source_notes[0]] + 6) % 12 - 6
+
+    spelling_map = {}
+
+    for note_name, note_index in NOTE_INDICES.items():
+        degree = source_letters.index(note_name[0])
+        alteration = (note_index - NOTE_INDICES[source_notes[degree]] + 6) % 12 - 6
+        target_degree_name = target_notes[degree]
+
+        #Chromatic notes keep their interval above the tonic, so that they're altered from the target mode's degree
+        if alteration:
+            target_index = NOTE_INDICES[target_notes[0]] + note_index - NOTE_INDICES[source_notes[0]]
+            alteration = (target_index - NOTE_INDICES[target_degree_name] + 6) % 12 - 6
+        accidental_index = _ACCIDENTALS.index(target_degree_name[1:]) + alteration
+
+        if 0 <= accidental_index < len(_ACCIDENTALS):
+            target_name = target_degree_name[0] + _ACCIDENTALS[accidental_index]
+
+        else:
+            target_name = __get_enharmonic_name((NOTE_INDICES[target_degree_name] + alteration) % 12)
+
+        #Degrees differing between the modes move by a semitone more or less than the tonic
+        semitones = tonic_semitones + (NOTE_INDICES[target_name] - note_index - tonic_semitones + 6) % 12 - 6
+        spelling_map[note_name] = (target_name, semitones)
+
+    return spelling_map
+
+
+@lru_cache(maxsize=None)
+def __get_note_map(source_key, target_key):
+    '''
+    Returns the transposition of each note string in the source key to the target key.
+
+    Return:
+        note_map (dict): Each note string, i.e. 'C4', mapped to its transposed (name, value, note_strings), where
+            the note strings are the transposed note's string once moved by each of the octave shifts, or None if
+            the note would be outside of the supported octaves
+    '''
+
+    note_map = {}
+
+    for note_name, (target_name, semitones) in __get_spelling_map(source_key, target_key).items():
+        target_index = NOTE_INDICES[target_name]
+
+        for octave in _NOTE_OCTAVES:
+            target_value = NOTE_INDICES[note_name] + octave * 12 + semitones
+            note_strings = tuple(f'{target_name}{(target_value + octave_shift - target_index) // 12}'
+            if (target_value + octave_shift - target_index) // 12 in _NOTE_OCTAVES else None
+            for octave_shift in _OCTAVE_SHIFTS)
+
+            note_map[f'{note_name}{octave}'] = (target_name, target_value, note_strings)
+
+    return note_map
+
+
+def __choose_octave_shift(transposed_chords, target_key):
+    '''
+    Returns the index of the octave shift keeping the most SATB voices of the transposed chords within
+    their ranges, preferring not to move the progression.
+
+    Parameters:
+        transposed_chords (iterable): The transposed notes of each distinct chord, from the note map, and its count
+        target_key (str): The key the chords are transposed to
+
+    Return:
+        shift_index (int): The index of the shift in _OCTAVE_SHIFTS
+    '''
+
+    voice_ranges = _VALIDATION_SETTINGS['voice_range']
+    range_errors = [0] * len(_OCTAVE_SHIFTS)
+
+    for transposed_notes, count in transposed_chords:
+        for shift_index, octave_shift in enumerate(_OCTAVE_SHIFTS):
+
+            if range_errors[shift_index] is None:
+                continue
+
+            if any(note_strings[shift_index] is None for _, _, note_strings in transposed_notes):
+                range_errors[shift_index] = None
+
+            elif len(transposed_notes) == len(voice_ranges):
+                range_errors[shift_index] += count * sum(1 for (_, note_value, _), (low, high) in
+                zip(transposed_notes, voice_ranges) if not low <= note_value + octave_shift <= high)
+
+    if all(shift_errors is None for shift_errors in range_errors):
+        raise ValueError(f'The progression cannot be transposed to {target_key} within the supported octaves.')
+
+    return min((shift_index for shift_index, shift_errors in enumerate(range_errors) if shift_errors is not None),
+    key=range_errors.__getitem__)
+
+
+#### PUBLIC METHODS ####
+def transpose_chords(chords, source_key, target_key):
+    '''
+    Transposes the passed chords from the source key to the target key, see transpose_chord_strings.
+
+    Parameters:
+        chords (list): The chords to transpose
+        source_key (str): The key the chords are written in, i.e. 'C' or 'a'
+        target_key (str): The key to transpose the chords to
+
+    Return:
+        transposed_chords (list): The transposed chords, identified from their new notes
+    '''
+
+    note_map = __get_note_map(source_key, target_key)
+    chord_notes = [tuple(note_map[str(note)] for note in chord.notes) for chord in chords]
+    octave_shift = _OCTAVE_SHIFTS[__choose_octave_shift(Counter(chord_notes).items(), target_key)]
+
+    return [Chord([Note(note_name, (note_value + octave_shift - NOTE_INDICES[note_name]) // 12,
+    note_value + octave_shift, NOTE_INDICES[note_name]) for note_name, note_value, _ in notes])
+    for notes in chord_notes]
+
+
+def transpose_chord_strings(chord_strings, source_key, target_key):
+    '''
+    Transposes the passed chord strings from the source key to the target key without creating chords.
+
+    Each distinct chord string is transposed once with the note map, so that transposing a corpus
+    written with few distinct chords costs little more than looking up each chord's transposition.
+    Chords with notes that can't be parsed are returned unchanged, as they aren't analyzed.
+
+    Parameters:
+        chord_strings (list): The chords to transpose, i.e. ['C3,G3,E4,C5', 'G2,D4,B4,G4']
+        source_key (str): The key the chords are written in, i.e. 'C' or 'a'
+        target_key (str): The key to transpose the chords to
+
+    Return:
+        transposed_strings (list): The transposed chord strings
+    '''
+
+    note_map = __get_note_map(source_key, target_key)
+    chord_notes = {}
+
+    for chord_string, count in Counter(chord_strings).items():
+        try:
+            notes = tuple(note_map[note_string.strip()] for note_string in chord_string.split(','))
+
+        except KeyError:
+            continue
+
+        chord_notes[chord_string] = (notes, count)
+
+    shift_index = __choose_octave_shift(chord_notes.values(), target_key)
+    transposed_strings = {chord_string: ','.join(note_strings[shift_index] for _, _, note_strings in notes)
+    for chord_string, (notes, _) in chord_notes.items()}
+
+    return [transposed_strings.get(chord_string, chord_string) for chord_string in chord_strings]
+
+
+def transpose_corpus(progressions, target_key):
+    '''
+    Yields each of the passed progressions transposed to the target key, see transpose_chord_strings.
+
+    Parameters:
+        progressions (iterable): The (chord_strings, key) of each progression
+        target_key (str): The key to transpose every progression to
+
+    Return:
+        transposed_progressions (generator): The (chord_strings, target_key) of each progression
+    '''
+
+    for chord_strings, key in progressions:
+        yield (transpose_chord_strings(chord_strings, key, target_key), target_key)
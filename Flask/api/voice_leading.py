@@ -0,0 +1,158 @@
+'''
+This module exports the voice-leading metrics measuring how smoothly each chord of a progression
+moves to the next.
+
+Chords with the same number of notes move voice by voice, as their notes are sorted from the bass
+up. Otherwise, the notes of the chord with fewer notes are assigned to the other chord's notes with
+the least total motion, found with the Hungarian algorithm, and each note left over moves from or
+to its nearest note. The metrics only depend on the intervals between the two chords' notes, so
+they're memoized for each pair of chords transposed down to the first chord's bass, and a corpus
+only solves each shape of chord pair once, i.e. for C4,E4,G4 moving to B3,D4,G4:
+    get_voice_leading(chord, next_chord) -> {'motion': [-1, -2, 0], 'total_motion': 3, 'max_motion': 2, ...}
+'''
+
+from functools import lru_cache
+from itertools import combinations
+from math import inf
+
+
+#### PRIVATE METHODS ####
+def __solve_assignment(costs):
+    '''
+    Returns the assignment of rows to columns with the least total cost, using the Hungarian algorithm.
+
+    Parameters:
+        costs (list): The cost of assigning each row to each column, with at most as many rows as columns
+
+    Return:
+        assignment (list): The column assigned to each row
+    '''
+
+    num_rows = len(costs)
+    num_cols = len(costs[0])
+
+    #Potentials and assignments are indexed from 1, with column 0 holding the row being assigned
+    row_potentials = [0] * (num_rows + 1)
+    col_potentials = [0] * (num_cols + 1)
+    col_rows = [0] * (num_cols + 1)
+    prev_cols = [0] * (num_cols + 1)
+
+    for row in range(1, num_rows + 1):
+        col_rows[0] = row
+        col = 0
+        min_slacks = [inf] * (num_cols + 1)
+        visited = [False] * (num_cols + 1)
+
+        #Grow the alternating path from the row until it reaches an unassigned column
+        while col_rows[col]:
+            visited[col] = True
+            path_row = col_rows[col]
+            delta = inf
+            next_col = 0
+
+            for other_col in range(1, num_cols + 1):
+
+                if not visited[other_col]:
+                    slack = costs[path_row - 1][other_col - 1] - row_potentials[path_row] - col_potentials[other_col]
+
+                    if slack < min_slacks[other_col]:
+                        min_slacks[other_col] = slack
+                        prev_cols[other_col] = col
+
+                    if min_slacks[other_col] < delta:
+                        delta = min_slacks[other_col]
+                        next_col = other_col
+
+            for other_col in range(0, num_cols + 1):
+
+                if visited[other_col]:
+                    row_potentials[col_rows[other_col]] += delta
+                    col_potentials[other_col] -= delta
+
+                else:
+                    min_slacks[other_col] -= delta
+
+            col = next_col
+
+        #Flip the assignments along the path
+        while col:
+            prev_col = prev_cols[col]
+            col_rows[col] = col_rows[prev_col]
+            col = prev_col
+
+    assignment = [0] * num_rows
+
+    for col in range(1, num_cols + 1):
+        if col_rows[col]:
+            assignment[col_rows[col] - 1] = col - 1
+
+    return assignment
+
+
+def __get_voice_pairs(values, next_values):
+    '''Returns the (value, next_value) pair of each voice moving between the passed chords' note values.'''
+
+    if len(values) == len(next_values):
+        return list(zip(values, next_values))
+
+    #Assign the notes of the chord with fewer notes, then move every other note from or to its nearest note
+    swapped = len(values) > len(next_values)
+    fewer_values, more_values = (next_values, values) if swapped else (values, next_values)
+
+    assignment = __solve_assignment([[abs(more_value - value) for more_value in more_values] for value in fewer_values])
+    voice_pairs = list(zip(fewer_values, (more_values[i] for i in assignment)))
+
+    for i, more_value in enumerate(more_values):
+        if i not in assignment:
+            voice_pairs.append((min(fewer_values, key=lambda value: abs(more_value - value)), more_value))
+
+    if swapped:
+        voice_pairs = [(value, fewer_value) for fewer_value, value in voice_pairs]
+
+    return sorted(voice_pairs)
+
+
+@lru_cache(maxsize=4096)
+def __get_shape_voice_leading(values, next_values):
+    '''Returns the motion of each voice and the metrics for the passed chord pair shape, see get_voice_leading.'''
+
+    motion = tuple(next_value - value for value, next_value in __get_voice_pairs(values, next_values))
+    contrary_motion = 0
+    similar_motion = 0
+
+    for voice_motion, other_motion in combinations(motion, 2):
+        contrary_motion += voice_motion * other_motion < 0
+        similar_motion += voice_motion * other_motion > 0
+
+    return (motion, sum(map(abs, motion)), max(map(abs, motion)), motion.count(0), contrary_motion, similar_motion)
+
+
+#### PUBLIC METHODS ####
+def get_voice_leading(chord, next_chord):
+    '''
+    Returns the voice-leading metrics of the motion from the passed chord to the next chord.
+
+    Parameters:
+        chord (Chord): The chord moved from
+        next_chord (Chord): The chord moved to
+
+    Return:
+        voice_leading (dict): The semitones each voice moves ('motion', from the lowest voice up), their sum
+            ('total_motion') and largest ('max_motion'), the number of voices holding a common tone ('common_tones'),
+            and the number of pairs of voices moving in opposite directions ('contrary_motion') or the same
+            direction ('similar_motion')
+    '''
+
+    base_value = chord.notes[0].value
+    motion, total_motion, max_motion, common_tones, contrary_motion, similar_motion = __get_shape_voice_leading(
+    tuple(note.value - base_value for note in chord.notes), tuple(note.value - base_value for note in next_chord.notes))
+
+    return {'motion': list(motion), 'total_motion': total_motion, 'max_motion': max_motion,
+    'common_tones': common_tones, 'contrary_motion': contrary_motion, 'similar_motion': similar_motion}
+
+
+def get_progression_voice_leading(chords):
+    '''Returns the voice-leading metrics into each of the passed chords from the chord before it, None for the first.'''
+
+    return [None] * min(len(chords), 1) + [get_voice_leading(chord, next_chord) for chord, next_chord in
+    zip(chords, chords[1:])]
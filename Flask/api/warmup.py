@@ -0,0 +1,120 @@
+'''
+This module exports functions for warming up the analysis engine before a server forks its workers.
+
+Warming up fills the lookup caches used by the analysis functions for every supported key and runs a
+progression through every analysis stage. The objects created are then moved into the garbage
+collector's permanent generation, so that collections in each worker don't write to the memory
+pages shared with the parent process.
+
+Running this module directly prints a report of the engine's start-up time and memory usage:
+    python -m api.warmup
+'''
+
+import gc
+import json
+import time
+
+_IMPORT_START = time.perf_counter()
+
+#pylint: disable=wrong-import-position
+from . import music_funcs
+from .metrics import reset_metrics
+from .music_info import MAJOR_KEY_NUMERALS, MAJOR_MIXTURE_NUMERALS, MINOR_KEY_NUMERALS, MINOR_MIXTURE_NUMERALS
+from .music_info import NOTE_INDICES, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS
+from .music_info import get_chord_relation_for_key, get_note_accidental_in_key, get_note_names_for_key
+from .set_classes import get_mask_set_class
+
+_IMPORT_TIME = time.perf_counter() - _IMPORT_START
+
+#I - V6/5/V - V - viio4/3 - I6 - IV - Ger+6 - V7 - I, written in C and analyzed relative to each key
+_WARM_UP_PROGRESSION = [
+    'C3,G3,E4,C5', 'F#2,A3,D4,C5', 'G2,B3,D4,G4', 'D3,F3,Ab3,B3', 'E3,G3,C4,C5', 'F3,A3,C4,F4',
+    'Ab2,C4,Eb4,F#4', 'G2,B3,D4,F4', 'C3,G3,E4,C5'
+]
+
+
+def get_memory_usage():
+    '''
+    Returns the resident memory used by this process in kB, split into the memory shared with
+    other processes and the memory private to this process where the platform reports it.
+    '''
+
+    memory_usage = {'rss_kb': None, 'shared_kb': None, 'private_kb': None}
+
+    try:
+        with open('/proc/self/smaps_rollup') as smaps_file:
+            smaps = {}
+
+            for line in smaps_file:
+                fields = line.split()
+
+                if len(fields) == 3 and fields[2] == 'kB':
+                    smaps[fields[0].rstrip(':')] = int(fields[1])
+
+        memory_usage['rss_kb'] = smaps.get('Rss')
+        memory_usage['shared_kb'] = smaps.get('Shared_Clean', 0) + smaps.get('Shared_Dirty', 0)
+        memory_usage['private_kb'] = smaps.get('Private_Clean', 0) + smaps.get('Private_Dirty', 0)
+
+    except OSError:
+
+        #Fall back to the peak resident memory on platforms without /proc
+        try:
+            import resource
+            memory_usage['rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        except ImportError:
+            pass
+
+    return memory_usage
+
+
+def warm_up(freeze=True):
+    '''
+    Fills the analysis engine's lookup caches and optionally freezes the objects created so far.
+
+    Parameters:
+        freeze (bool): Whether or not to move all objects into the garbage collector's permanent generation
+
+    Return:
+        warm_up_report (dict): The time taken to import and warm up the engine and the memory used after
+    '''
+
+    start_time = time.perf_counter()
+    all_numerals = MAJOR_KEY_NUMERALS + MAJOR_MIXTURE_NUMERALS + MINOR_KEY_NUMERALS + MINOR_MIXTURE_NUMERALS
+
+    for key in SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS:
+        get_note_names_for_key(key)
+
+        for note_name in NOTE_INDICES:
+            get_note_accidental_in_key(note_name, key)
+
+        for numeral in all_numerals:
+            get_chord_relation_for_key(key, numeral)
+
+        music_funcs.generate_progression(_WARM_UP_PROGRESSION, key, False)
+
+    #The set class tables are built for every pitch-class mask on their first lookup
+    get_mask_set_class(0)
+
+    #Validation doesn't depend on cached tables, so it's only run once to load its code paths
+    music_funcs.generate_progression(_WARM_UP_PROGRESSION, 'C', True)
+
+    #Workers forked after warming up shouldn't report the warm-up analyses in their metrics
+    reset_metrics()
+
+    warm_up_time = time.perf_counter() - start_time
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    return {
+        'import_ms': round(_IMPORT_TIME * 1000, 3),
+        'warm_up_ms': round(warm_up_time * 1000, 3),
+        'frozen_objects': gc.get_freeze_count(),
+        'memory': get_memory_usage()
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(warm_up(), indent=4))
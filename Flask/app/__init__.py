@@ -1,7 +1,41 @@
 from flask import Flask 
 from config import Config
 
-app = Flask(__name__)
-app.config.from_object(Config)
 
-from app import routes
\ No newline at end of file
+def create_app(config_class=Config):
+    '''
+    Creates and configures the Flask app.
+
+    The analysis engine is only imported once an analysis route is requested, unless the app is 
+    configured to warm it up when created.
+    '''
+
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+
+    from .analysis import analysis_blueprint
+    from .pages import pages_blueprint
+
+    app.register_blueprint(pages_blueprint)
+    app.register_blueprint(analysis_blueprint)
+
+    #The profiler is only added when enabled, so that analysis isn't wrapped otherwise
+    if app.config['PROFILE_DIR']:
+        from .profiling import init_profiler
+
+        init_profiler(app)
+
+    #The trace module doesn't import the rest of the engine, so enabling it keeps start-up fast
+    if app.config['ANALYSIS_TRACE']:
+        from api import trace
+
+        trace.set_enabled(True, app.config['ANALYSIS_TRACE_BUFFER_SIZE'])
+
+    #Fill and freeze the analysis engine's lookup tables so they stay shared between forked workers
+    if app.config['ANALYSIS_WARM_UP']:
+        from api.warmup import warm_up
+
+        app.config['WARM_UP_REPORT'] = warm_up()
+        app.logger.info('Analysis engine warmed up: %s', app.config['WARM_UP_REPORT'])
+
+    return app
@@ -0,0 +1,301 @@
+'''
+This module holds the blueprint for the app's chord progression analysis routes.
+
+The analysis engine is imported when one of these routes is first requested rather than when the
+app is created, so that starting the app and serving its pages stays fast.
+'''
+
+import io
+import json
+import os
+
+from flask import Blueprint, Response, current_app, request, session, stream_with_context
+from .responses import encode_response, WebSocketClosedResponse
+
+analysis_blueprint = Blueprint('analysis', __name__)
+
+
+def get_progression_store():
+    '''Returns the store of progressions created by each client session, creating it on first use.'''
+
+    if 'progression_store' not in current_app.extensions:
+        from api.progression_store import ProgressionStore
+
+        current_app.extensions.setdefault('progression_store', ProgressionStore())
+
+    return current_app.extensions['progression_store']
+
+
+#Note: Routes must precede the function they are related to
+@analysis_blueprint.route('/analysis', methods=['POST',])
+def analysis():
+    from api import music_funcs
+    from .forms import ProgressionBuilderForm
+
+    form = ProgressionBuilderForm(request.form)
+    chords = form.chords.data
+    key_signature = form.key.data
+    time_signature = form.time.data
+    display_format = form.display_options.data or 'piano'
+    analyze_satb = form.analyze_satb.data
+
+    #Modulations and respelling aren't offered by the page, which analyzes progressions through '/progression',
+    #so they're only requested by clients posting to '/analysis' directly
+    track_modulations = request.form.get('track_modulations', '0') == '1'
+    respell_chords = request.form.get('respell_chords', '0') == '1'
+
+    profiler = current_app.extensions.get('analysis_profiler')
+    profile_name = None
+    trace_id = None
+
+    if current_app.config['ANALYSIS_TRACE']:
+        from api import trace
+
+        trace_id = trace.start_trace()
+
+    try:
+        if profiler is not None and profiler.should_profile(request):
+            progression_info, profile_name = profiler.profile(music_funcs.generate_progression,
+            (chords, key_signature, analyze_satb, track_modulations, respell_chords), key_signature,
+            len([chord for chord in chords if chord]))
+
+        else:
+            progression_info = music_funcs.generate_progression(chords, key_signature, analyze_satb, track_modulations,
+            respell_chords)
+
+    #End the trace even if analysis fails, so the worker's later events aren't recorded under it
+    finally:
+        if trace_id is not None:
+            trace.end_trace()
+
+    response = encode_response({'chords': progression_info, 'time': time_signature, 'key': key_signature, 
+    'displayForm': display_format})
+
+    if profile_name is not None:
+        from .profiling import PROFILE_NAME_HEADER
+
+        response.headers[PROFILE_NAME_HEADER] = profile_name
+
+    if trace_id is not None:
+        response.headers['X-Trace-Id'] = str(trace_id)
+
+    return response
+
+@analysis_blueprint.route('/analysis/keys', methods=['POST',])
+def analysis_keys():
+    from api import music_funcs
+    from .forms import ProgressionBuilderForm
+
+    form = ProgressionBuilderForm(request.form)
+
+    #The keys are passed as a comma-separated list of key signatures, or left out to use every supported key
+    keys = [key.strip() for key in request.form.get('keys', '').split(',') if key.strip()]
+    key_analysis = music_funcs.generate_progression_keys(form.chords.data, keys)
+
+    if 'error' in key_analysis:
+        return encode_response(key_analysis, 400)
+
+    return encode_response(key_analysis)
+
+@analysis_blueprint.route('/analysis/repairs', methods=['POST',])
+def analysis_repairs():
+    from api import music_funcs
+    from .forms import ProgressionBuilderForm
+
+    form = ProgressionBuilderForm(request.form)
+    repairs = music_funcs.generate_repairs(form.chords.data, form.key.data, current_app.config['REPAIR_TIME_BUDGET'])
+
+    if 'error' in repairs:
+        return encode_response(repairs, 400)
+
+    return encode_response(repairs)
+
+@analysis_blueprint.route('/analysis/realize', methods=['POST',])
+def analysis_realize():
+    from api import music_funcs
+
+    #The numerals or figured bass are passed as comma-separated lists, i.e. 'I, V7, I' or 'C3, G2 7, C3'
+    numerals = [numeral.strip() for numeral in request.form.get('numerals', '').split(',') if numeral.strip()]
+    figured_bass = [bass.strip() for bass in request.form.get('figured_bass', '').split(',') if bass.strip()]
+    progression_info = music_funcs.generate_realization(numerals, request.form.get('key') or 'C', figured_bass)
+
+    if 'error' in progression_info:
+        return encode_response(progression_info, 400)
+
+    return encode_response(progression_info)
+
+@analysis_blueprint.route('/progression', methods=['POST',])
+def create_progression():
+    from .forms import ProgressionBuilderForm
+
+    form = ProgressionBuilderForm(request.form)
+    chords = form.chords.data
+    key_signature = form.key.data
+    time_signature = form.time.data
+    display_format = form.display_options.data or 'piano'
+    analyze_satb = form.analyze_satb.data
+
+    progression_store = get_progression_store()
+    progression_store.remove(session.get('progression_id'))
+    progression_id, progression_session = progression_store.create(chords, key_signature, analyze_satb)
+    session['progression_id'] = progression_id
+
+    return encode_response({'progression': progression_session.get_state(), 'time': time_signature, 
+    'key': key_signature, 'displayForm': display_format})
+
+@analysis_blueprint.route('/progression', methods=['PATCH',])
+def update_progression():
+
+    progression_session = get_progression_store().get(session.get('progression_id'))
+
+    if progression_session is None:
+        return encode_response({'error': 'PROGRESSION_NOT_FOUND'}, 404)
+
+    updates = request.get_json(silent=True) or {}
+    chord_updates = {}
+
+    #Chord slots are sent as a mapping of slot indices to chord strings
+    for slot, chord_string in (updates.get('chords') or {}).items():
+
+        if str(slot).isdigit():
+            chord_updates[int(slot)] = str(chord_string)
+
+    key_signature = str(updates['key']) if updates.get('key') else None
+    analyze_satb = bool(updates['analyze_satb']) if 'analyze_satb' in updates else None
+
+    with progression_session.lock:
+        progression_update = progression_session.update(chord_updates, key_signature, analyze_satb)
+
+    return encode_response({'progression': progression_update})
+
+@analysis_blueprint.route('/import/csv', methods=['POST',])
+def import_csv():
+    from api import music_funcs
+    from api.csv_import import CSVProgressionReader
+
+    csv_upload = request.files.get('file')
+
+    if csv_upload is None:
+        return encode_response({'error': 'FILE_NOT_FOUND'}, 400)
+
+    analyze_satb = request.form.get('analyze_satb', '0') == '1'
+    default_key = request.form.get('key') or None
+
+    #The upload is decoded as it's read so that large files are never held in memory
+    csv_file = io.TextIOWrapper(csv_upload.stream, encoding='utf-8-sig', newline='')
+    reader = CSVProgressionReader(csv_file, default_key=default_key)
+
+    #Each progression's analysis is streamed as a line of JSON, followed by a summary of the import
+    def generate_lines():
+        for imported_progression in reader:
+            yield json.dumps({
+                'row': imported_progression.row_number,
+                'metadata': imported_progression.metadata,
+                'key': imported_progression.progression.key,
+                **music_funcs.analyze_progression(imported_progression.progression, analyze_satb)
+            }) + '\n'
+
+        yield json.dumps({'summary': {'num_rows': reader.num_rows, 'num_errors': reader.num_errors, 
+        'errors': reader.errors}}) + '\n'
+
+    return Response(stream_with_context(generate_lines()), mimetype='application/x-ndjson')
+
+@analysis_blueprint.route('/import/musicxml', methods=['POST',])
+def import_musicxml():
+    from api import musicxml
+
+    xml_upload = request.files.get('file')
+
+    if xml_upload is None:
+        return encode_response({'error': 'FILE_NOT_FOUND'}, 400)
+
+    analyze_satb = request.form.get('analyze_satb', '0') == '1'
+
+    try:
+        progression_info = musicxml.import_musicxml(xml_upload.stream, request.form.get('key'), analyze_satb)
+
+    except (ValueError, SyntaxError):
+        return encode_response({'error': 'INVALID_MUSICXML'}, 400)
+
+    return encode_response({'chords': progression_info, 'key': progression_info['key']})
+
+@analysis_blueprint.route('/export/musicxml', methods=['POST',])
+def export_musicxml():
+    from api import music_funcs, musicxml
+    from .forms import ProgressionBuilderForm
+
+    form = ProgressionBuilderForm(request.form)
+    progression = music_funcs.create_progression(form.chords.data, form.key.data)
+
+    if progression is None:
+        return encode_response({'error': 'NO_VALID_CHORDS'}, 400)
+
+    #The score is written as it's sent so that long progressions aren't held in memory as a document
+    musicxml_stream = stream_with_context(musicxml.iter_musicxml(progression, form.analyze_satb.data))
+
+    return Response(musicxml_stream, mimetype=musicxml.MUSICXML_MIMETYPE,
+    headers={'Content-Disposition': 'attachment; filename=progression.musicxml'})
+
+@analysis_blueprint.route('/live')
+def live_analysis():
+
+    try:
+        from simple_websocket import ConnectionClosed, Server as WebSocketServer
+
+    except ImportError:
+        WebSocketServer = None
+
+    if WebSocketServer is None or request.headers.get('Upgrade', '').lower() != 'websocket':
+        return encode_response({'error': 'WEBSOCKET_UNAVAILABLE'}, 400)
+
+    from api.live_analysis import LiveAnalysisChannel
+
+    web_socket = WebSocketServer(request.environ)
+    channel = LiveAnalysisChannel(lambda message: web_socket.send(json.dumps(message)))
+
+    try:
+        while True:
+            message = web_socket.receive()
+
+            try:
+                channel.receive(json.loads(message))
+
+            except ValueError:
+                channel.receive(None)
+
+    except ConnectionClosed:
+        pass
+
+    finally:
+        channel.close()
+
+    return WebSocketClosedResponse(web_socket)
+
+@analysis_blueprint.route('/metrics')
+def metrics():
+    from api.metrics import format_metrics
+
+    #The metrics are those of this worker process only, so each worker should be scraped separately
+    return Response(format_metrics(), mimetype='text/plain; version=0.0.4')
+
+@analysis_blueprint.route('/trace/<int:trace_id>')
+def analysis_trace(trace_id):
+
+    if not current_app.config['ANALYSIS_TRACE']:
+        return encode_response({'error': 'TRACE_DISABLED'}, 404)
+
+    from api.trace import get_trace
+
+    #Traces are held by this worker process only, and older events are dropped once the buffer is full
+    return encode_response({'trace_id': trace_id, 'events': get_trace(trace_id)})
+
+@analysis_blueprint.route('/worker_stats')
+def worker_stats():
+
+    if not current_app.config['WORKER_STATS']:
+        return encode_response({'error': 'WORKER_STATS_DISABLED'}, 404)
+
+    from api.warmup import get_memory_usage
+
+    return encode_response({'pid': os.getpid(), 'warm_up': current_app.config.get('WARM_UP_REPORT'), 
+    'memory': get_memory_usage()})
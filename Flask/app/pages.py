@@ -0,0 +1,31 @@
+'''
+This module holds the blueprint for the app's pages and health check.
+
+None of these routes use the analysis engine, so it isn't imported when they're requested.
+'''
+
+from flask import Blueprint, jsonify, render_template
+
+pages_blueprint = Blueprint('pages', __name__)
+
+#Note: Routes must precede the function they are related to
+@pages_blueprint.route('/')
+@pages_blueprint.route('/index', methods=['GET', 'POST'])
+
+def index():
+    from .forms import ProgressionBuilderForm
+
+    form = ProgressionBuilderForm()
+    return render_template('index.html', form=form)
+
+@pages_blueprint.route('/how_to')
+def how_to():
+    return render_template('howTo.html')
+
+@pages_blueprint.route('/satb_rules')
+def satb_rules():
+    return render_template('satbRules.html')
+
+@pages_blueprint.route('/health')
+def health():
+    return jsonify({'status': 'ok'})
@@ -0,0 +1,169 @@
+'''
+This module exports the opt-in profiler for the analysis of '/analysis' requests.
+
+The profiler is only created when the app is configured with a profile directory and at least one
+way of choosing requests: every request, a sampling rate, or a token sent in the request's profiling
+header. Otherwise nothing is imported or wrapped, so analysis runs exactly as it would without it.
+
+Each profile is saved in the directory both as pstats data, for 'python -m pstats' or snakeviz, and
+as collapsed stacks that can be passed to flamegraph.pl or speedscope. Profiles are named after the
+time they were taken, the number of chords analyzed and the key, and only the newest are kept.
+'''
+
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+#The header a request sends with the configured token to be profiled
+PROFILE_HEADER = 'X-Profile'
+
+#The header a profiled request's response names its profile in
+PROFILE_NAME_HEADER = 'X-Profile-Name'
+
+#Held while a request is profiled, as only one profiler can be active in a process from Python 3.12
+_profile_lock = threading.Lock()
+
+
+def get_collapsed_stacks(stats):
+    '''
+    Returns the collapsed stacks for the passed pstats data, one 'caller;callee microseconds' line per stack.
+
+    As cProfile only records the time spent between each caller and callee, the time of a function
+    called from more than one place is split between its stacks in proportion to each caller's share.
+    '''
+
+    def get_frame_name(function):
+        file_name, line_number, function_name = function
+
+        return re.sub(r'[;\s]', '_', f'{function_name}({os.path.basename(file_name)}:{line_number})')
+
+    callees = {}
+
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, []).append((function, caller_stats[2], caller_stats[3]))
+
+    stack_lines = {}
+
+    def add_stacks(function, stack, own_time, cumulative_time):
+        stack = stack + (get_frame_name(function),)
+        function_stats = stats.stats[function]
+
+        #Scale this function's callees by the share of its time spent in this stack
+        scale = cumulative_time / function_stats[3] if function_stats[3] else 0
+        stack_lines[';'.join(stack)] = stack_lines.get(';'.join(stack), 0) + own_time
+
+        #Stacks too short to be written are skipped along with their callees
+        for callee, callee_own_time, callee_cumulative_time in callees.get(function, []):
+            if get_frame_name(callee) not in stack and callee_cumulative_time * scale >= 5e-7:
+                add_stacks(callee, stack, callee_own_time * scale, callee_cumulative_time * scale)
+
+    for function, (_, _, own_time, cumulative_time, callers) in stats.stats.items():
+        if not any(caller in stats.stats for caller in callers):
+            add_stacks(function, (), own_time, cumulative_time)
+
+    return [f'{stack} {round(stack_time * 1e6)}' for stack, stack_time in sorted(stack_lines.items())
+    if round(stack_time * 1e6) > 0]
+
+
+class AnalysisProfiler:
+    '''
+    Class profiling the analysis of chosen requests and saving the profiles to a directory.
+
+    Attributes:
+        profile_dir (str): The directory the profiles are saved in
+        profile_all (bool): Whether every request is profiled
+        sample_rate (float): The share of requests to profile at random
+        token (str): The value of the profiling header that chooses a request, or None
+        max_profiles (int): The number of profiles kept, removing the oldest ones first
+    '''
+
+    def __init__(self, profile_dir, profile_all=False, sample_rate=0.0, token=None, max_profiles=100):
+        self.profile_dir = profile_dir
+        self.profile_all = profile_all
+        self.sample_rate = sample_rate
+        self.token = token
+        self.max_profiles = max_profiles
+
+        os.makedirs(profile_dir, exist_ok=True)
+
+    def should_profile(self, request):
+        '''Returns whether the passed request is chosen to be profiled.'''
+
+        if self.profile_all or (self.sample_rate and random.random() < self.sample_rate):
+            return True
+
+        header_token = request.headers.get(PROFILE_HEADER)
+
+        return bool(self.token and header_token and hmac.compare_digest(header_token, self.token))
+
+    def profile(self, function, args, key, num_chords):
+        '''
+        Calls the passed function with a profiler and saves its profile, or calls it without one if another
+        request is already being profiled.
+
+        Parameters:
+            function (function): The function to profile, i.e. generate_progression
+            args (tuple): The arguments to call the function with
+            key (str): The key the progression is analyzed in, to tag the profile with
+            num_chords (int): The number of chords analyzed, to tag the profile with
+
+        Return:
+            (result, profile_name): The function's result and the name its profile was saved under, or None
+        '''
+
+        if not _profile_lock.acquire(blocking=False):
+            return (function(*args), None)
+
+        try:
+            profiler = cProfile.Profile()
+            result = profiler.runcall(function, *args)
+
+        finally:
+            _profile_lock.release()
+
+        #The profile's name sorts by time, i.e. 20240101-120000-000001-8chords-F#-1234
+        profile_time = time.time()
+        profile_name = (time.strftime('%Y%m%d-%H%M%S', time.localtime(profile_time)) + f'-{int(profile_time % 1 * 1e6):06d}'
+        f"-{num_chords}chords-{re.sub(r'[^A-Za-z0-9#]', '_', key or 'none')}-{os.getpid()}")
+        profile_path = os.path.join(self.profile_dir, profile_name)
+
+        profiler.dump_stats(profile_path + '.prof')
+
+        with open(profile_path + '.collapsed', 'w', encoding='utf-8') as collapsed_file:
+            collapsed_file.write('\n'.join(get_collapsed_stacks(pstats.Stats(profiler))) + '\n')
+
+        self.remove_old_profiles()
+
+        return (result, profile_name)
+
+    def remove_old_profiles(self):
+        '''Removes the oldest profiles beyond the number kept.'''
+
+        profile_names = sorted({os.path.splitext(file_name)[0] for file_name in os.listdir(self.profile_dir)
+        if file_name.endswith(('.prof', '.collapsed'))})
+
+        for profile_name in profile_names[:max(0, len(profile_names) - self.max_profiles)]:
+            for extension in ('.prof', '.collapsed'):
+
+                #Another worker may have already removed the profile
+                try:
+                    os.remove(os.path.join(self.profile_dir, profile_name + extension))
+
+                except FileNotFoundError:
+                    pass
+
+
+def init_profiler(app):
+    '''Adds an analysis profiler to the passed app's extensions if its configuration enables one.'''
+
+    config = app.config
+
+    if config['PROFILE_DIR'] and (config['PROFILE_ALL'] or config['PROFILE_SAMPLE_RATE'] > 0 or config['PROFILE_TOKEN']):
+        app.extensions['analysis_profiler'] = AnalysisProfiler(config['PROFILE_DIR'], config['PROFILE_ALL'],
+        config['PROFILE_SAMPLE_RATE'], config['PROFILE_TOKEN'], config['PROFILE_MAX_PROFILES'])
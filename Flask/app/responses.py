@@ -0,0 +1,78 @@
+'''
+This module exports the helpers for encoding the app's analysis results into a response.
+
+JSON is returned by default, encoded with orjson when it's installed. Clients that prefer
+MessagePack can request it with the header 'Accept: application/msgpack' if msgpack is installed.
+'''
+
+from flask import Response, jsonify, request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def get_response_mimetype():
+    '''Returns the response format to use for the current request based on its Accept header.'''
+
+    response_mimetype = JSON_MIMETYPE
+
+    if msgpack is not None:
+        best_match = request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE])
+
+        if best_match == MSGPACK_MIMETYPE:
+            response_mimetype = MSGPACK_MIMETYPE
+
+    return response_mimetype
+
+
+def encode_response(payload, status=200):
+    '''Returns a response for the passed payload in the format negotiated with the client.'''
+
+    response_mimetype = get_response_mimetype()
+
+    if response_mimetype == MSGPACK_MIMETYPE:
+        response = Response(msgpack.packb(payload, use_bin_type=True), status=status, mimetype=MSGPACK_MIMETYPE)
+
+    elif orjson is not None:
+        response = Response(orjson.dumps(payload), status=status, mimetype=JSON_MIMETYPE)
+
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+
+    response.vary.add('Accept')
+
+    return response
+
+
+class WebSocketClosedResponse(Response):
+    '''
+    Response returned once a WebSocket connection has closed.
+
+    The connection's socket was taken over from the server, so the response ends the request
+    without writing anything to it in the way expected by the server in use.
+    '''
+
+    def __init__(self, web_socket):
+        super().__init__()
+        self.web_socket = web_socket
+
+    def __call__(self, environ, start_response):
+
+        if self.web_socket.mode == 'gunicorn':
+            raise StopIteration()
+
+        if self.web_socket.mode == 'werkzeug':
+            raise ConnectionError()
+
+        return []
@@ -583,33 +583,303 @@ function getSATBVoices(chords, timeSignature) {
 }
 
 
-//Callback function to respond to the user submitting a chord progression for analysis
-$('#form-submit').click(function(e) {
-    e.preventDefault();
+/* The progression last sent to the server, so that only the chord slots that changed are sent for analysis.
+ *     slots - The chord strings entered for each chord slot
+ *     key - The key signature selected for the progression
+ *     analyzeSATB - Whether or not the progression is analyzed for SATB errors
+ *     chords - The chord information returned for each chord slot, or null if the slot's chord was invalid
+ *     errors - The SATB error messages returned for each chord, or null if the progression isn't analyzed
+*/
+let progressionState = null;
+
+
+/* Function: getFormProgression
+ * Description: This function returns the chord slots and options currently entered in the builder form.
+*/
+function getFormProgression() {
+
+    let form = document.getElementById('chord-builder-form');
+    let slots = [];
+
+    for (let chordInput of form.querySelectorAll("input[name^='chords-']")) {
+        slots[parseInt(chordInput.name.split('-')[1])] = chordInput.value;
+    }
+
+    //Chord inputs can only be added in order, but fill any gaps to match the slots sent by the form
+    for (let i = 0; i < slots.length; i++) {
+        slots[i] = slots[i] || '';
+    }
+
+    return {
+        slots: slots,
+        key: form.elements['key'].value,
+        time: form.elements['time'].value,
+        displayForm: form.querySelector("input[name='display_options']:checked").value,
+        analyzeSATB: form.elements['analyze_satb'].checked
+    };
+}
+
+
+/* Function: applyProgressionUpdate
+ * Description: This function merges the chords and errors returned by the server into the saved progression.
+ *
+ * Parameters:
+ *     update - The changed chord slots and SATB errors returned for the progression
+*/
+function applyProgressionUpdate(update) {
+
+    for (let chordUpdate of update.chords) {
+        progressionState.chords[chordUpdate.slot] = chordUpdate.chord;
+    }
+
+    progressionState.chords.length = update.num_slots;
+
+    if (update.satb_errors === null) {
+        progressionState.errors = null;
+    }
+
+    else {
+        progressionState.errors = progressionState.errors || [];
+
+        for (let errorUpdate of update.satb_errors) {
+            progressionState.errors[errorUpdate.index] = errorUpdate.messages;
+        }
+
+        progressionState.errors.length = update.num_chords;
+    }
+}
+
+
+/* Function: drawProgression
+ * Description: This function draws the saved progression and displays its SATB errors if it was analyzed.
+ *
+ * Parameters:
+ *     time - The time signature the chord progression is written for
+ *     drawMode - Controls how the notes of each chord will appear on the stave
+ *     quiet - If true, the user isn't alerted when there are no valid chords to draw
+*/
+function drawProgression(time, drawMode, quiet = false) {
+
+    let chords = progressionState.chords.filter(chord => chord);
+
+    if (chords.length == 0) {
+
+        if (!quiet) {
+            window.alert('No valid chords were provided.\nExpected format: note-name/octave, ...');
+        }
+
+        return;
+    }
+
+    buildStave(progressionState.key, chords, time, drawMode);
 
+    if (progressionState.errors !== null) {
+        displaySATBErrors([].concat(...progressionState.errors));
+    }
+}
+
+
+/* Function: createProgression
+ * Description: This function sends the full builder form to the server to create and analyze a new progression.
+*/
+function createProgression() {
+
+    let formProgression = getFormProgression();
     let formData = new FormData(document.getElementById('chord-builder-form'));
 
     $.ajax({
-        url: '/analysis',
+        url: '/progression',
         type: 'POST',
         data: formData,
         processData: false,
         contentType: false,
 
         success: function(data) {
-            
-            //If the chord progression information was returned successfully, build the Stave svg
-            if (!data.chords.error) {
-                buildStave(data.key, data.chords.chords, data.time, data.displayForm);
-                
-                if (data.chords.satb_errors) {
-                    displaySATBErrors(data.chords.satb_errors);
-                }
-            }
+            progressionState = {
+                slots: formProgression.slots,
+                key: data.key,
+                analyzeSATB: formProgression.analyzeSATB,
+                chords: [],
+                errors: null
+            };
+
+            applyProgressionUpdate(data.progression);
+            drawProgression(data.time, data.displayForm);
+        }
+    });
+}
+
 
-            else if (data.chords.error === 'NO_VALID_CHORDS') {
-                window.alert('No valid chords were provided.\nExpected format: note-name/octave, ...');
+/* Function: updateProgression
+ * Description: This function sends only the chord slots and options changed since the last request
+ * to the server, and merges the re-analyzed chords into the saved progression.
+*/
+function updateProgression() {
+
+    let formProgression = getFormProgression();
+    let updates = {chords: {}};
+
+    formProgression.slots.forEach(function (chordString, i) {
+        if (chordString !== progressionState.slots[i]) {
+            updates.chords[i] = chordString;
+        }
+    });
+
+    if (formProgression.key !== progressionState.key) {
+        updates.key = formProgression.key;
+    }
+
+    if (formProgression.analyzeSATB !== progressionState.analyzeSATB) {
+        updates.analyze_satb = formProgression.analyzeSATB;
+    }
+
+    $.ajax({
+        url: '/progression',
+        type: 'PATCH',
+        data: JSON.stringify(updates),
+        contentType: 'application/json',
+
+        success: function(data) {
+            progressionState.slots = formProgression.slots;
+            progressionState.key = formProgression.key;
+            progressionState.analyzeSATB = formProgression.analyzeSATB;
+
+            applyProgressionUpdate(data.progression);
+            drawProgression(formProgression.time, formProgression.displayForm);
+        },
+
+        //The server no longer holds the progression, so send the full form again
+        error: function(xhr) {
+            if (xhr.status === 404) {
+                createProgression();
             }
         }
-    });   
-});
\ No newline at end of file
+    });
+}
+
+
+/* Function: openLiveAnalysis
+ * Description: This function opens a WebSocket connection for analyzing the progression as it's typed.
+ * If the server doesn't support the connection, progressions are only analyzed when the form is submitted.
+*/
+function openLiveAnalysis() {
+
+    if (!('WebSocket' in window)) {
+        return;
+    }
+
+    let protocol = (window.location.protocol === 'https:') ? 'wss://' : 'ws://';
+    let socket = new WebSocket(protocol + window.location.host + '/live');
+
+    socket.onopen = function() {
+        let formProgression = getFormProgression();
+
+        liveSocket = socket;
+        progressionState = {
+            slots: formProgression.slots,
+            key: formProgression.key,
+            analyzeSATB: formProgression.analyzeSATB,
+            chords: [],
+            errors: null
+        };
+
+        socket.send(JSON.stringify({
+            type: 'create', 
+            chords: formProgression.slots, 
+            key: formProgression.key, 
+            analyze_satb: formProgression.analyzeSATB
+        }));
+    };
+
+    socket.onmessage = function(event) {
+        let message = JSON.parse(event.data);
+
+        if (message.type === 'progression') {
+            let formProgression = getFormProgression();
+
+            applyProgressionUpdate(message.progression);
+            drawProgression(formProgression.time, formProgression.displayForm, true);
+        }
+    };
+
+    //Fall back to analyzing the progression when the form is submitted
+    socket.onclose = function() {
+
+        if (liveSocket === socket) {
+            liveSocket = null;
+            progressionState = null;
+        }
+    };
+}
+
+
+/* Function: sendLiveEdit
+ * Description: This function sends the chord slots and options changed in the form over the live connection.
+*/
+function sendLiveEdit() {
+
+    let formProgression = getFormProgression();
+    let edit = {type: 'edit', chords: {}};
+    let changed = false;
+
+    formProgression.slots.forEach(function (chordString, i) {
+        if (chordString !== progressionState.slots[i]) {
+            edit.chords[i] = chordString;
+            changed = true;
+        }
+    });
+
+    if (formProgression.key !== progressionState.key) {
+        edit.key = formProgression.key;
+        changed = true;
+    }
+
+    if (formProgression.analyzeSATB !== progressionState.analyzeSATB) {
+        edit.analyze_satb = formProgression.analyzeSATB;
+        changed = true;
+    }
+
+    if (changed) {
+        progressionState.slots = formProgression.slots;
+        progressionState.key = formProgression.key;
+        progressionState.analyzeSATB = formProgression.analyzeSATB;
+
+        liveSocket.send(JSON.stringify(edit));
+    }
+}
+
+
+//The live analysis connection, or null if the progression is only analyzed when the form is submitted
+let liveSocket = null;
+
+openLiveAnalysis();
+
+
+//Callback function to send the user's edits for live analysis as they type
+$('#chord-builder-form').on('input change', function() {
+
+    if (liveSocket !== null) {
+        sendLiveEdit();
+    }
+});
+
+
+//Callback function to respond to the user submitting a chord progression for analysis
+$('#form-submit').click(function(e) {
+    e.preventDefault();
+
+    if (liveSocket !== null) {
+        let formProgression = getFormProgression();
+
+        sendLiveEdit();
+        drawProgression(formProgression.time, formProgression.displayForm);
+    }
+
+    else if (progressionState === null) {
+        createProgression();
+    }
+
+    else {
+        updateProgression();
+    }
+});
@@ -0,0 +1,279 @@
+'''
+Micro-benchmarks for the analysis engine's hot paths, compared against committed baselines.
+
+Each benchmark is run on seeded synthetic progressions of 8, 24, 1,000 and 100,000 chords, and
+its time per chord is compared with the baseline recorded for the same benchmark and size. As
+timings depend on the machine, every result is scaled by a calibration loop timed on both the
+baseline's machine and this one before it's compared.
+
+Run the benchmarks from within the Flask sub-directory:
+    python -m benchmarks.bench_analysis
+    python -m benchmarks.bench_analysis --sizes 8,24 --threshold 0.5
+    python -m benchmarks.bench_analysis --update-baselines
+
+The command exits with status 1 if any benchmark is slower than its baseline by more than the
+threshold, i.e. 0.25 for 25% slower.
+'''
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from api.chord import Chord, ChordFactory
+from api.chord_progression import ChordProgression
+from api.key_analysis import analyze_all_keys
+from api.key_detection import detect_key
+from api.key_tracking import track_keys
+from api.music_funcs import generate_progression
+from api.music_info import MAJOR_KEY_NOTES, NOTE_INDICES, get_note_accidental_in_key, identify_chord_numeral_for_key
+from api.note import NoteFactory
+from api.progression_patterns import find_patterns
+from api.realization import realize_numerals
+from api.respelling import respell_chords
+from api.set_classes import get_set_classes
+from api.satb_validator import validate_progression
+from api.transposition import transpose_chord_strings
+from api.voice_leading import get_progression_voice_leading
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+BENCHMARK_SIZES = (8, 24, 1000, 100000)
+
+#The key the synthetic progressions are written and analyzed in
+BENCHMARK_KEY = 'C'
+
+#The shortest time each repeat of a benchmark is run for, and the number of repeats
+_MIN_REPEAT_TIME = 0.02
+_NUM_REPEATS = 5
+
+
+def generate_chords(size, key=BENCHMARK_KEY, seed=0):
+    '''
+    Returns a seeded list of chord strings made up of diatonic triads voiced for four voices.
+
+    Parameters:
+        size (int): The number of chords
+        key (str): The major key to take the chords from
+        seed (int): The seed for the random number generator
+
+    Return:
+        chords (list): The chord strings, i.e. 'C3,G3,E4,C5'
+    '''
+
+    rng = random.Random(seed)
+    key_notes = MAJOR_KEY_NOTES[key]
+    chords = []
+
+    for _ in range(size):
+        degree = rng.randrange(7)
+        chord_tones = [key_notes[(degree + offset) % 7] for offset in (0, 2, 4)]
+
+        #The bass takes the root, and the upper voices take each chord tone in a random order
+        voices = [(chord_tones[0], rng.choice((2, 3)))]
+        rng.shuffle(chord_tones)
+        octave = 3
+
+        for note_name in chord_tones:
+            previous_name, previous_octave = voices[-1]
+            octave = max(octave, previous_octave)
+
+            if NOTE_INDICES[note_name] + octave * 12 <= NOTE_INDICES[previous_name] + previous_octave * 12:
+                octave += 1
+
+            voices.append((note_name, octave))
+
+        chords.append(','.join(f'{note_name}{octave}' for note_name, octave in voices))
+
+    return chords
+
+
+def time_benchmark(function, num_items):
+    '''
+    Returns the fastest time per item in seconds over repeated runs of the passed function.
+
+    Fast functions are called several times in each repeat, so that every repeat takes long
+    enough to be timed accurately.
+    '''
+
+    num_calls = 1
+
+    while True:
+        times = []
+
+        for _ in range(_NUM_REPEATS):
+            start_time = time.perf_counter()
+
+            for _ in range(num_calls):
+                function()
+
+            times.append(time.perf_counter() - start_time)
+
+            if times[0] < _MIN_REPEAT_TIME:
+                break
+
+        if times[0] >= _MIN_REPEAT_TIME:
+            return min(times) / (num_calls * num_items)
+
+        num_calls *= max(2, int(_MIN_REPEAT_TIME / max(times[0], 1e-6)) + 1)
+
+
+def calibrate():
+    '''Returns the time taken by a fixed pure Python workload, used to compare timings across machines.'''
+
+    def workload():
+        table = {}
+
+        for i in range(200000):
+            table[i % 997] = table.get(i % 997, 0) + len(str(i))
+
+    return time_benchmark(workload, 1)
+
+
+def get_benchmarks(size):
+    '''Returns the benchmark functions for the passed size, each with the number of items it handles.'''
+
+    note_factory = NoteFactory()
+    chord_factory = ChordFactory()
+
+    chord_strings = generate_chords(size)
+    note_strings = [note_string for chord_string in chord_strings for note_string in chord_string.split(',')]
+    chords = [chord_factory.create_chord(chord_string) for chord_string in chord_strings]
+    chord_notes = [list(chord.notes) for chord in chords]
+    chord_infos = [{'root': chord.get_root_name(), 'quality': chord.quality, 'position': chord.position}
+    for chord in chords]
+    note_names = [note.name for chord in chords for note in chord.notes]
+    chord_numerals = ChordProgression(chords, BENCHMARK_KEY).get_progression_chord_numerals()
+
+    #Realizing is timed for a phrase of at most 32 chords, as it's only used for phrases
+    numerals = ChordProgression(chords[0:32], BENCHMARK_KEY).get_progression_chord_numerals()
+
+    return {
+        'parse_note': (lambda: [note_factory.parse_note(note_string) for note_string in note_strings], size),
+        'create_chord': (lambda: [chord_factory.create_chord(chord_string) for chord_string in chord_strings], size),
+        'identify_chord': (lambda: [Chord(list(notes)) for notes in chord_notes], size),
+        'identify_chord_numeral_for_key': (lambda: [identify_chord_numeral_for_key(BENCHMARK_KEY, chord_info)
+        for chord_info in chord_infos], size),
+        'get_note_accidental_in_key': (lambda: [get_note_accidental_in_key(note_name, BENCHMARK_KEY)
+        for note_name in note_names], size),
+        'validate_progression': (lambda: validate_progression(chords, BENCHMARK_KEY), size),
+        'generate_progression': (lambda: generate_progression(chord_strings, BENCHMARK_KEY, True), size),
+        'analyze_numerals': (lambda: ChordProgression(chords, BENCHMARK_KEY).get_progression_chord_numerals(), size),
+        'detect_key': (lambda: detect_key(chords), size),
+        'track_keys': (lambda: track_keys(chords, BENCHMARK_KEY), size),
+        'analyze_all_keys': (lambda: analyze_all_keys(chords), size),
+        'transpose_chord_strings': (lambda: transpose_chord_strings(chord_strings, BENCHMARK_KEY, 'Eb'), size),
+        'respell_chords': (lambda: respell_chords(chords, 'E'), size),
+        'voice_leading': (lambda: get_progression_voice_leading(chords), size),
+        'find_patterns': (lambda: find_patterns(chord_numerals), size),
+        'get_set_classes': (lambda: get_set_classes(chords), size),
+        'realize_numerals': (lambda: realize_numerals(numerals, BENCHMARK_KEY), len(numerals))
+    }
+
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, names=None):
+    '''
+    Runs the benchmarks at each of the passed sizes.
+
+    Parameters:
+        sizes (tuple): The numbers of chords to run each benchmark with
+        names (list): The names of the benchmarks to run, or None to run all of them
+
+    Return:
+        results (dict): The calibration time and the time per chord for each benchmark and size
+    '''
+
+    results = {'calibration': calibrate(), 'benchmarks': {}}
+
+    for size in sizes:
+        for name, (function, num_items) in get_benchmarks(size).items():
+
+            if names is None or name in names:
+                results['benchmarks'].setdefault(name, {})[str(size)] = time_benchmark(function, num_items)
+
+    #Calibrate again afterwards, so that the machine slowing down during the run is accounted for
+    results['calibration'] = (results['calibration'] + calibrate()) / 2
+
+    return results
+
+
+def compare_results(results, baselines, threshold=0.25):
+    '''
+    Compares the passed results with the baselines, scaled by their calibration times.
+
+    Return:
+        comparisons (list): A (name, size, time, baseline_time, ratio, is_regression) tuple for each
+            result with a baseline, where the ratio is the result's time over the scaled baseline
+    '''
+
+    scale = results['calibration'] / baselines['calibration']
+    comparisons = []
+
+    for name, size_results in results['benchmarks'].items():
+        for size, result_time in size_results.items():
+            baseline_time = baselines['benchmarks'].get(name, {}).get(size)
+
+            if baseline_time is not None:
+                ratio = result_time / (baseline_time * scale)
+                comparisons.append((name, int(size), result_time, baseline_time, ratio, ratio > 1 + threshold))
+
+    return comparisons
+
+
+def main(args=None):
+    '''Runs the benchmark command line with the passed arguments or those of the process.'''
+
+    parser = argparse.ArgumentParser(description='Benchmark the analysis engine against its baselines.')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in BENCHMARK_SIZES),
+    help='Comma separated progression sizes in chords')
+    parser.add_argument('--benchmarks', help='Comma separated benchmark names, all by default')
+    parser.add_argument('--threshold', type=float, default=0.25, help='The slowdown allowed before failing')
+    parser.add_argument('--baselines', default=BASELINES_PATH, help='The baselines file')
+    parser.add_argument('--update-baselines', action='store_true', help='Save the results as the new baselines')
+    options = parser.parse_args(args)
+
+    sizes = [int(size) for size in options.sizes.split(',')]
+    names = options.benchmarks.split(',') if options.benchmarks else None
+    results = run_benchmarks(sizes, names)
+
+    if options.update_baselines:
+        baselines = {'calibration': results['calibration'], 'benchmarks': {}}
+        scale = 1
+
+        #Keep the baselines of any benchmarks and sizes that weren't run as they are, scaling the results to
+        #the baselines' calibration instead, so that only the benchmarks run are changed in the file
+        if os.path.exists(options.baselines):
+            with open(options.baselines, encoding='utf-8') as baselines_file:
+                baselines = json.load(baselines_file)
+
+            scale = baselines['calibration'] / results['calibration']
+
+        for name, size_results in results['benchmarks'].items():
+            baselines['benchmarks'].setdefault(name, {}).update({size: result_time * scale
+            for size, result_time in size_results.items()})
+
+        with open(options.baselines, 'w', encoding='utf-8') as baselines_file:
+            json.dump(baselines, baselines_file, indent=4, sort_keys=True)
+            baselines_file.write('\n')
+
+        print(f'Saved baselines to {options.baselines}')
+        return 0
+
+    with open(options.baselines, encoding='utf-8') as baselines_file:
+        baselines = json.load(baselines_file)
+
+    comparisons = compare_results(results, baselines, options.threshold)
+
+    print(f"{'benchmark':<32}{'chords':>8}{'us/chord':>12}{'baseline':>12}{'ratio':>8}")
+
+    for name, size, result_time, baseline_time, ratio, is_regression in comparisons:
+        print(f"{name:<32}{size:>8}{result_time * 1e6:>12.2f}{baseline_time * 1e6:>12.2f}{ratio:>8.2f}"
+        f"{'  REGRESSION' if is_regression else ''}")
+
+    return 1 if any(comparison[5] for comparison in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,435 @@
+'''
+Load test for the app's /analysis route, driving a real server on localhost.
+
+The app is started with the Flask development server, or with gunicorn when it's installed and
+requested, unless the url of a running server is passed. Requests are drawn from a seeded mix of
+short and long progressions, with and without SATB analysis, and are sent either by a fixed number
+of concurrent clients or at a fixed arrival rate. Latencies for the fixed arrival rate are measured
+from each request's scheduled time, so that a slow server isn't hidden by requests sent late.
+
+The throughput, latency percentiles, error rate, and the CPU time and resident memory of each
+server process are printed and saved as JSON for comparing runs:
+    python -m benchmarks.load_test --concurrency 8 --duration 30 --output results.json
+    python -m benchmarks.load_test --rate 200 --duration 30 --server gunicorn --workers 4
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --mix short:1,long:1 --satb-ratio 0
+'''
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from .synthetic import iter_progressions
+
+_FLASK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#The number of chords in each kind of progression, the longest allowed by the form being 24
+PAYLOAD_SIZES = {'short': 4, 'long': 24}
+
+
+def create_payloads(mix, satb_ratio, num_payloads=256, seed=0):
+    '''
+    Returns a seeded list of /analysis form payloads drawn from the passed mix.
+
+    Parameters:
+        mix (dict): The relative weight of each payload size in PAYLOAD_SIZES, i.e. {'short': 3, 'long': 1}
+        satb_ratio (float): The share of payloads that request SATB analysis
+        num_payloads (int): The number of payloads to draw
+        seed (int): The seed for the random number generator
+
+    Return:
+        payloads (list): The (label, encoded_form) tuple for each payload, i.e. ('long+satb', 'chords-0=...')
+    '''
+
+    rng = random.Random(seed)
+    progressions = {size_name: iter_progressions(seed, min_chords=size, max_chords=size)
+    for size_name, size in PAYLOAD_SIZES.items()}
+    payloads = []
+
+    for _ in range(num_payloads):
+        size_name = rng.choices(list(mix), weights=list(mix.values()))[0]
+        analyze_satb = rng.random() < satb_ratio
+        progression = next(progressions[size_name])
+
+        form = {f'chords-{i}': chord for i, chord in enumerate(progression.chords)}
+        form.update({'key': progression.key, 'time': '4/4', 'display_options': 'piano'})
+
+        if analyze_satb:
+            form['analyze_satb'] = 'y'
+
+        payloads.append((size_name + ('+satb' if analyze_satb else ''), urlencode(form)))
+
+    return payloads
+
+
+def get_percentile(sorted_values, percentile):
+    '''Returns the nearest-rank percentile of the passed sorted values, or None if there are none.'''
+
+    if not sorted_values:
+        return None
+
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+
+    return sorted_values[int(rank) - 1]
+
+
+def summarize_latencies(latencies):
+    '''Returns the count, mean, p50, p95, p99 and maximum of the passed latencies in milliseconds.'''
+
+    sorted_latencies = sorted(latencies)
+
+    return {
+        'count': len(sorted_latencies),
+        'mean_ms': round(sum(sorted_latencies) / len(sorted_latencies) * 1000, 3) if sorted_latencies else None,
+        **{f'p{percentile}_ms': round(get_percentile(sorted_latencies, percentile) * 1000, 3) if sorted_latencies
+        else None for percentile in (50, 95, 99)},
+        'max_ms': round(sorted_latencies[-1] * 1000, 3) if sorted_latencies else None
+    }
+
+
+def get_process_tree(pid):
+    '''Returns the passed process id and those of all of its descendants.'''
+
+    pids = [pid]
+
+    for parent_pid in pids:
+        try:
+            for task_id in os.listdir(f'/proc/{parent_pid}/task'):
+                with open(f'/proc/{parent_pid}/task/{task_id}/children') as children_file:
+                    pids.extend(int(child_pid) for child_pid in children_file.read().split())
+
+        except OSError:
+            continue
+
+    return pids
+
+
+def get_process_usage(pid):
+    '''Returns the CPU time in seconds and resident memory in kB used by the passed process, or None.'''
+
+    try:
+        with open(f'/proc/{pid}/stat') as stat_file:
+            #Fields after the command name, which may hold spaces, start with the process state
+            stat_fields = stat_file.read().rsplit(')', 1)[1].split()
+
+        with open(f'/proc/{pid}/status') as status_file:
+            rss_kb = next((int(line.split()[1]) for line in status_file if line.startswith('VmRSS:')), None)
+
+    except OSError:
+        return None
+
+    cpu_ticks = int(stat_fields[11]) + int(stat_fields[12])
+
+    return {'cpu_s': cpu_ticks / os.sysconf('SC_CLK_TCK'), 'rss_kb': rss_kb}
+
+
+class AppServer:
+    '''
+    Class starting the app on a free localhost port in a separate process.
+
+    Attributes:
+        server (str): 'flask' for the development server or 'gunicorn'
+        workers (int): The number of gunicorn worker processes
+        port (int): The port the server listens on
+        process (Popen): The server's process
+    '''
+
+    def __init__(self, server='flask', workers=1):
+        self.server = server
+        self.workers = workers
+        self.port = None
+        self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}'
+
+    def start(self, timeout=30):
+        '''Starts the server and waits until its health check responds.'''
+
+        with socket.socket() as free_socket:
+            free_socket.bind(('127.0.0.1', 0))
+            self.port = free_socket.getsockname()[1]
+
+        if self.server == 'gunicorn':
+            command = [sys.executable, '-m', 'gunicorn', '--workers', str(self.workers), '--bind',
+            f'127.0.0.1:{self.port}', 'main:app']
+
+        else:
+            command = [sys.executable, '-c', 'from app import create_app; '
+            f'create_app().run(host="127.0.0.1", port={self.port}, threaded=True, use_reloader=False)']
+
+        #The server's output is discarded, as writing it would slow down the requests being measured
+        self.process = subprocess.Popen(command, cwd=_FLASK_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'The {self.server} server exited with status {self.process.returncode}.')
+
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=1)
+                connection.request('GET', '/health')
+
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    return
+
+            except OSError:
+                time.sleep(0.1)
+
+        self.stop()
+        raise RuntimeError(f'The {self.server} server didn\'t start within {timeout} seconds.')
+
+    def stop(self):
+        '''Stops the server.'''
+
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+            try:
+                self.process.wait(10)
+
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class LoadTest:
+    '''
+    Class sending /analysis requests to a server and recording their results.
+
+    Attributes:
+        url (str): The server's base url
+        payloads (list): The (label, encoded_form) payloads sent in turn
+        timeout (float): The seconds to wait for each response
+        results (list): The (label, latency, status) tuple of each request, where status is None on connection errors
+    '''
+
+    def __init__(self, url, payloads, timeout=30):
+        self.url = urlsplit(url)
+        self.payloads = payloads
+        self.timeout = timeout
+        self.results = []
+
+        self._lock = threading.Lock()
+        self._connections = threading.local()
+        self._next_payload = 0
+
+    def __get_payload(self):
+        '''Returns the next payload in turn.'''
+
+        with self._lock:
+            payload = self.payloads[self._next_payload % len(self.payloads)]
+            self._next_payload += 1
+
+        return payload
+
+    def send_request(self, start_time=None):
+        '''Sends the next payload on this thread's connection, timing it from the passed start time or now.'''
+
+        label, body = self.__get_payload()
+        start_time = start_time or time.perf_counter()
+        status = None
+
+        #Each thread keeps its connection open between requests
+        connection = getattr(self._connections, 'connection', None)
+
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=self.timeout)
+                self._connections.connection = connection
+
+            connection.request('POST', self.url.path.rstrip('/') + '/analysis', body,
+            {'Content-Type': 'application/x-www-form-urlencoded'})
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._connections.connection = None
+
+        with self._lock:
+            self.results.append((label, time.perf_counter() - start_time, status))
+
+    def run_concurrency(self, concurrency, duration=None, num_requests=None):
+        '''Sends requests from the passed number of clients, each sending its next request once answered.'''
+
+        deadline = time.perf_counter() + duration if duration else None
+        remaining = [num_requests] if num_requests else None
+
+        def run_client():
+            while deadline is None or time.perf_counter() < deadline:
+                if remaining is not None:
+                    with self._lock:
+                        if remaining[0] <= 0:
+                            break
+                        remaining[0] -= 1
+
+                self.send_request()
+
+        clients = [threading.Thread(target=run_client) for _ in range(concurrency)]
+
+        for client in clients:
+            client.start()
+
+        for client in clients:
+            client.join()
+
+    def run_rate(self, rate, duration=None, num_requests=None, max_clients=64):
+        '''Sends requests at the passed rate per second, regardless of how quickly they're answered.'''
+
+        num_requests = num_requests or int(rate * duration)
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_clients) as executor:
+            for i in range(num_requests):
+                scheduled_time = start_time + i / rate
+                time.sleep(max(0, scheduled_time - time.perf_counter()))
+                executor.submit(self.send_request, scheduled_time)
+
+
+def run_load_test(url=None, server='flask', workers=1, concurrency=4, rate=None, duration=10, num_requests=None,
+mix=None, satb_ratio=0.5, seed=0):
+    '''
+    Runs a load test against the passed url, or against a server started for the test.
+
+    Parameters:
+        url (str): The url of a running server, or None to start one
+        server (str): The server to start, 'flask' or 'gunicorn'
+        workers (int): The number of worker processes for gunicorn
+        concurrency (int): The number of concurrent clients, when no rate is passed
+        rate (float): The requests sent per second, or None to send them from concurrent clients
+        duration (float): The seconds to send requests for
+        num_requests (int): The number of requests to send instead of sending them for a duration
+        mix (dict): The relative weight of each payload size, i.e. {'short': 3, 'long': 1}
+        satb_ratio (float): The share of requests asking for SATB analysis
+        seed (int): The seed used to draw the payloads
+
+    Return:
+        report (dict): The test's configuration, overall and per payload results, and server usage
+    '''
+
+    mix = mix or {'short': 3, 'long': 1}
+    payloads = create_payloads(mix, satb_ratio, seed=seed)
+    app_server = AppServer(server, workers) if url is None else None
+
+    if app_server is not None:
+        app_server.start()
+        url = app_server.url
+
+    try:
+        server_pids = get_process_tree(app_server.process.pid) if app_server is not None else []
+        usage_before = {pid: get_process_usage(pid) for pid in server_pids}
+
+        load_test = LoadTest(url, payloads)
+
+        #Send one request of each payload first, so that the engine is loaded before timing starts
+        for _ in range(len(payloads)):
+            load_test.send_request()
+
+        load_test.results = []
+        start_time = time.perf_counter()
+
+        if rate:
+            load_test.run_rate(rate, duration, num_requests)
+
+        else:
+            load_test.run_concurrency(concurrency, duration if not num_requests else None, num_requests)
+
+        elapsed_time = time.perf_counter() - start_time
+        usage_after = {pid: get_process_usage(pid) for pid in get_process_tree(server_pids[0])} if server_pids else {}
+
+    finally:
+        if app_server is not None:
+            app_server.stop()
+
+    results = load_test.results
+    report = {
+        'config': {'url': url if app_server is None else None, 'server': server if app_server else 'external',
+        'workers': workers, 'concurrency': None if rate else concurrency, 'rate': rate, 'duration': duration,
+        'num_requests': num_requests, 'mix': mix, 'satb_ratio': satb_ratio, 'seed': seed},
+        'elapsed_s': round(elapsed_time, 3),
+        'throughput_rps': round(len(results) / elapsed_time, 3),
+        'error_rate': round(sum(1 for result in results if result[2] != 200) / max(len(results), 1), 6),
+        'latency': summarize_latencies([result[1] for result in results if result[2] == 200]),
+        'payloads': {},
+        'server_processes': []
+    }
+
+    for label in sorted({result[0] for result in results}):
+        label_results = [result for result in results if result[0] == label]
+        report['payloads'][label] = {
+            'error_rate': round(sum(1 for result in label_results if result[2] != 200) / len(label_results), 6),
+            'latency': summarize_latencies([result[1] for result in label_results if result[2] == 200])
+        }
+
+    for pid, usage in usage_after.items():
+        if usage is not None:
+            cpu_before = (usage_before.get(pid) or {'cpu_s': 0})['cpu_s']
+            report['server_processes'].append({'pid': pid, 'cpu_s': round(usage['cpu_s'] - cpu_before, 3),
+            'cpu_utilization': round((usage['cpu_s'] - cpu_before) / elapsed_time, 3), 'rss_kb': usage['rss_kb']})
+
+    return report
+
+
+def main(args=None):
+    '''Runs the load test command line with the passed arguments or those of the process.'''
+
+    parser = argparse.ArgumentParser(description='Load test the /analysis route.')
+    parser.add_argument('--url', help='The url of a running server, otherwise one is started')
+    parser.add_argument('--server', choices=('flask', 'gunicorn'), default='flask', help='The server to start')
+    parser.add_argument('--workers', type=int, default=1, help='The number of gunicorn worker processes')
+    parser.add_argument('--concurrency', type=int, default=4, help='The number of concurrent clients')
+    parser.add_argument('--rate', type=float, help='Send requests at a fixed rate per second instead')
+    parser.add_argument('--duration', type=float, default=10, help='The seconds to send requests for')
+    parser.add_argument('--requests', type=int, help='The number of requests to send instead of a duration')
+    parser.add_argument('--mix', default='short:3,long:1', help='Relative weights of short and long progressions')
+    parser.add_argument('--satb-ratio', type=float, default=0.5, help='The share of requests asking for SATB analysis')
+    parser.add_argument('--seed', type=int, default=0, help='The seed used to draw the payloads')
+    parser.add_argument('--output', help='The JSON file to save the results to')
+    options = parser.parse_args(args)
+
+    mix = {name: float(weight) for name, weight in (item.split(':') for item in options.mix.split(','))}
+
+    if any(name not in PAYLOAD_SIZES for name in mix):
+        parser.error(f'Payload mix names must be one of: {", ".join(PAYLOAD_SIZES)}')
+
+    report = run_load_test(options.url, options.server, options.workers, options.concurrency, options.rate,
+    options.duration, options.requests, mix, options.satb_ratio, options.seed)
+
+    print(f"{report['throughput_rps']} requests/s, {report['error_rate'] * 100:.2f}% errors, "
+    f"p50 {report['latency']['p50_ms']} ms, p95 {report['latency']['p95_ms']} ms, p99 {report['latency']['p99_ms']} ms")
+
+    for label, label_report in report['payloads'].items():
+        print(f"  {label:<12} p50 {label_report['latency']['p50_ms']} ms, p99 {label_report['latency']['p99_ms']} ms, "
+        f"{label_report['error_rate'] * 100:.2f}% errors")
+
+    for process in report['server_processes']:
+        print(f"  pid {process['pid']}: {process['cpu_s']} s CPU ({process['cpu_utilization'] * 100:.0f}%), "
+        f"{process['rss_kb']} kB RSS")
+
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=4)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,457 @@
+'''
+Seeded synthetic progressions for benchmarks and stress tests.
+
+Progressions are drawn lazily from a stream, so any number of chords can be drawn without holding
+more than one progression in memory:
+    progressions = iter_progressions(seed=1, error_rate=0.2)
+    chords = islice(chain.from_iterable(progression.chords for progression in progressions), 1000000)
+
+Each progression's key is drawn from the supported keys, and its chords from the key's diatonic and
+modal mixture numerals, along with applied dominants followed by the chord they resolve to. Chords
+are voiced for four voices within the validator's voice ranges and spacing, without doubled leading
+tones or sevenths, without parallel 5ths or 8ves from the chord before and resolving the chord
+before's leading tone and seventh as the validator checks them. When an error rate is passed, that
+share of chords deliberately breaks a range, spacing or parallel movement rule, and the rules broken
+are returned with the progression.
+'''
+
+import random
+import re
+from collections import namedtuple
+from functools import lru_cache
+from itertools import permutations, product
+
+from api.chord import Chord
+from api.music_info import (MAJOR_KEY_NOTES, MAJOR_KEY_NUMERALS, MAJOR_MIXTURE_NUMERALS, MINOR_KEY_NUMERALS,
+MINOR_MIXTURE_NUMERALS, NOTE_INDICES, NUMERAL_STRINGS, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS,
+get_chord_for_intervals, get_chord_relation_for_key, get_leading_tone_in_key, get_note_name_for_degree,
+identify_applied_numeral, identify_chord_numeral_for_key)
+from api.note import Note
+from api.satb_validator import _VALIDATION_SETTINGS, validate_progression_steps
+
+SyntheticProgression = namedtuple('SyntheticProgression', ['key', 'numerals', 'chords', 'broken_rules'])
+SyntheticProgression.__doc__ = '''
+A synthetic progression, with its chord strings and the numerals they were drawn from.
+
+The broken rules are (chord_index, error_code) tuples for each rule a chord was voiced to break,
+with chords indexed from 0, i.e. (3, 'ERR_SA_DISTANCE').
+'''
+
+#The semitones above the root of each chord tone, for each chord quality
+QUALITY_INTERVALS = {
+    '': (0, 4, 7),
+    'm': (0, 3, 7),
+    'o': (0, 3, 6),
+    '+': (0, 4, 8),
+    '7': (0, 4, 7, 10),
+    'maj7': (0, 4, 7, 11),
+    'm7': (0, 3, 7, 10),
+    'ø': (0, 3, 6, 10),
+    'o7': (0, 3, 6, 9)
+}
+
+#The applied chords drawn, and the numerals of the chords they can be applied to in each mode
+APPLIED_NUMERALS = ('V', 'V7', 'viio', 'viio7')
+MAJOR_APPLIED_TARGETS = ('ii', 'iii', 'IV', 'V', 'vi')
+MINOR_APPLIED_TARGETS = ('III', 'iv', 'v', 'VI', 'VII')
+
+#The chance of each inversion for triads and seventh chords, favouring root position and first inversion
+_TRIAD_POSITION_WEIGHTS = (0.6, 0.35, 0.05)
+_SEVENTH_POSITION_WEIGHTS = (0.55, 0.2, 0.15, 0.1)
+
+#The number of times a chord is drawn again when it can't be voiced before the progression is dropped
+_MAX_ATTEMPTS = 20
+
+_NUMERAL_PATTERN = re.compile(r'^(b|#)?(I{1,3}|IV|VI{0,2}|i{1,3}|iv|vi{0,2})(o7|ø|o|\+|M7|m7|7)?$')
+_NOTE_LETTERS = 'CDEFGAB'
+_ACCIDENTALS = ('bb', 'b', '', '#', 'x')
+
+
+#### PRIVATE METHODS ####
+def __spell_note(name, letter_steps, semitones):
+    '''
+    Returns the note the passed number of letters and semitones above the passed note, i.e. a major
+    third (2, 4) above Eb is G, or None if it would need more than a double sharp or flat.
+    '''
+
+    letter = _NOTE_LETTERS[(_NOTE_LETTERS.index(name[0]) + letter_steps) % 7]
+    accidental_index = (NOTE_INDICES[name] + semitones - NOTE_INDICES[letter] + 6) % 12 - 6 + 2
+
+    return letter + _ACCIDENTALS[accidental_index] if 0 <= accidental_index < len(_ACCIDENTALS) else None
+
+
+def __parse_numeral(numeral):
+    '''Returns the accidental, scale degree (1-7) and chord quality of the passed numeral, i.e. bVI7 = ('b', 6, '7').'''
+
+    accidental, roman, suffix = _NUMERAL_PATTERN.match(numeral).groups()
+    is_minor = roman.islower()
+
+    if suffix == 'M7':
+        quality = 'maj7'
+
+    elif suffix == '7':
+        quality = 'm7' if is_minor else '7'
+
+    elif suffix:
+        quality = suffix
+
+    else:
+        quality = 'm' if is_minor else ''
+
+    return (accidental, NUMERAL_STRINGS.index(roman.upper()) + 1, quality)
+
+
+def __get_chord_tones(key, numeral):
+    '''
+    Returns the note names of the passed numeral's chord in the passed key from its root upwards,
+    with its quality, or None if the chord can't be spelled or analyzed.
+    '''
+
+    accidental, degree, quality = __parse_numeral(numeral)
+
+    #Diminished chords on the seventh degree are built on the leading tone, even in minor keys
+    if degree == 7 and quality in ('o', 'ø', 'o7'):
+        root = get_leading_tone_in_key(key)
+
+    else:
+        root = get_note_name_for_degree(key, degree)
+
+    if accidental:
+        root = __spell_note(root, 0, -1 if accidental == 'b' else 1)
+
+    #Chords are only rooted on notes the engine has key tables for, as it looks up keys on chord roots
+    if root not in MAJOR_KEY_NOTES:
+        return None
+
+    chord_tones = tuple(__spell_note(root, letter_steps, semitones)
+    for letter_steps, semitones in zip((0, 2, 4, 6), QUALITY_INTERVALS[quality]))
+
+    return (chord_tones, quality) if None not in chord_tones else None
+
+
+@lru_cache(maxsize=1024)
+def __get_numerals(key):
+    '''Returns the key's diatonic and modal mixture numerals whose chords the engine identifies as such.'''
+
+    is_major = key[0].isupper()
+    numerals = []
+
+    for key_numerals in ((MAJOR_KEY_NUMERALS, MAJOR_MIXTURE_NUMERALS) if is_major else
+    (MINOR_KEY_NUMERALS, MINOR_MIXTURE_NUMERALS)):
+        recognized_numerals = []
+
+        for numeral in key_numerals:
+            chord = __get_chord_tones(key, numeral)
+
+            if chord is not None:
+                identified_numeral = identify_chord_numeral_for_key(key, {'root': chord[0][0], 'quality': chord[1],
+                'position': 0})
+
+                if get_chord_relation_for_key(key, identified_numeral) in ('diatonic', 'mixture'):
+                    recognized_numerals.append(numeral)
+
+        numerals.append(tuple(recognized_numerals))
+
+    return tuple(numerals)
+
+
+def __get_upper_tones(chord_tones, bass_tone, leading_tone):
+    '''
+    Returns the note names of the upper three voices for the passed chord tones and bass.
+
+    Triads double their root, or their third when the root is the leading tone.
+    '''
+
+    upper_tones = list(chord_tones)
+
+    if len(chord_tones) == 3:
+        upper_tones.append(chord_tones[0] if chord_tones[0] != leading_tone else chord_tones[1])
+
+    upper_tones.remove(bass_tone)
+
+    return tuple(upper_tones)
+
+
+@lru_cache(maxsize=4096)
+def __get_chord(key, numeral):
+    '''
+    Returns the note names from the root upwards, quality and leading tone of the passed numeral's
+    chord in the passed key, or None if it can't be spelled or identified by the engine.
+
+    Applied numerals, i.e. V7/ii, are spelled in the key of the chord they're applied to.
+    '''
+
+    chord_key = key
+
+    if '/' in numeral:
+        numeral, target_numeral = numeral.split('/')
+        target_chord = __get_chord_tones(key, target_numeral)
+
+        if target_chord is None:
+            return None
+
+        chord_key = target_chord[0][0] if target_chord[1] == '' else target_chord[0][0].lower()
+
+    chord = __get_chord_tones(chord_key, numeral)
+
+    if chord is None:
+        return None
+
+    #Applied chords are only kept if the engine identifies them as applied to their target
+    if chord_key != key and not identify_applied_numeral(target_chord[0][0], target_chord[1],
+    {'root': chord[0][0], 'quality': chord[1], 'position': 0}):
+        return None
+
+    return chord + (get_leading_tone_in_key(chord_key),)
+
+
+@lru_cache(maxsize=8192)
+def __get_voicings(bass_tone, upper_tones, root, quality, position):
+    '''
+    Returns every voicing of the passed bass and upper tones within the voice ranges and spacing that
+    the engine identifies as the passed chord, as tuples of note names, values and indices from the bass upwards.
+    '''
+
+    voice_ranges = _VALIDATION_SETTINGS['voice_range']
+    max_distances = _VALIDATION_SETTINGS['max_distance']
+
+    def get_values(name, voice_index):
+        low, high = voice_ranges[voice_index]
+        index = NOTE_INDICES[name]
+
+        return [value for value in range(low, high + 1) if value % 12 == index]
+
+    voicings = []
+
+    for upper_order in sorted(set(permutations(upper_tones))):
+        names = (bass_tone,) + upper_order
+
+        for values in product(get_values(bass_tone, 0), *(get_values(name, i + 1) for i, name in enumerate(upper_order))):
+
+            if (values[0] < values[1] < values[2] < values[3] and values[3] - values[2] <= max_distances[0]
+            and values[2] - values[1] <= max_distances[1] and values[1] - values[0] <= max_distances[2]):
+                unique_notes = []
+
+                #Identify the voicing from the intervals between its distinct notes, as the engine does
+                for name, value in zip(names, values):
+                    if name not in (unique_name for unique_name, _ in unique_notes):
+                        unique_notes.append((name, value))
+
+                interval_string = ''.join(str((unique_notes[i + 1][1] - unique_notes[i][1]) % 12)
+                for i in range(len(unique_notes) - 1))
+                chord_info = get_chord_for_intervals(interval_string)
+
+                if (chord_info['quality'] == quality and chord_info['position'] == position
+                and unique_notes[chord_info['root_index']][0] == root):
+                    voicings.append((names, values, tuple(NOTE_INDICES[name] for name in names)))
+
+    return tuple(voicings)
+
+
+def __get_parallels(prev_indices, curr_indices):
+    '''Returns the error codes for each pair of voices forming a 5th or an 8ve in both chords, as checked by the validator.'''
+
+    parallel_errors = []
+
+    for i in range(3):
+        for j in range(i + 1, 4):
+            prev_interval = (prev_indices[j] - prev_indices[i]) % 12
+
+            if prev_interval in (0, 7) and prev_interval == (curr_indices[j] - curr_indices[i]) % 12:
+                parallel_errors.append('ERR_PARALLEL_5TH' if prev_interval == 7 else 'ERR_PARALLEL_8TH')
+
+    return parallel_errors
+
+
+@lru_cache(maxsize=8192)
+def __create_chord(names, values):
+    '''Returns the chord of the passed note names and values from the bass upwards.'''
+
+    return Chord([Note(name, (value - NOTE_INDICES[name]) // 12, value, NOTE_INDICES[name])
+    for name, value in zip(names, values)])
+
+
+def __resolves_tendency_tones(key, prev_voicings, names, values):
+    '''
+    Returns whether the passed voicing resolves the leading tone and seventh of the previous voicing,
+    and of the voicing before it, as the validator checks them. The key a chord's tendency tones resolve
+    in depends on whether the chord after it is applied, so the previous chord's resolution is checked again.
+    '''
+
+    chords = [__create_chord(*voicing[0:2]) for voicing in prev_voicings if voicing is not None]
+    chords.append(__create_chord(names, values))
+
+    return not any(error['type'] == 'resolution' for chord_errors in validate_progression_steps(chords, key, 1,
+    len(chords), False) for error in chord_errors)
+
+
+def __draw_numerals(rng, key, mixture_rate, applied_rate):
+    '''Draws the next numeral in the passed key, or an applied numeral followed by the numeral it's applied to.'''
+
+    diatonic_numerals, mixture_numerals = __get_numerals(key)
+    choice = rng.random()
+
+    if choice < applied_rate:
+        target_numeral = rng.choice(MAJOR_APPLIED_TARGETS if key[0].isupper() else MINOR_APPLIED_TARGETS)
+
+        return (f'{rng.choice(APPLIED_NUMERALS)}/{target_numeral}', target_numeral)
+
+    elif choice < applied_rate + mixture_rate:
+        return (rng.choice(mixture_numerals),)
+
+    return (rng.choice(diatonic_numerals),)
+
+
+def __draw_voicing(rng, key, chord, prev_voicings, break_rule):
+    '''
+    Draws a voicing for the passed chord that leads smoothly from the previous voicing and resolves
+    its tendency tones, and returns it with the error codes of any rule it was voiced to break, or
+    None if there isn't one. The previous voicings are the last two drawn, or None where there aren't any.
+    '''
+
+    prev_voicing = prev_voicings[1]
+
+    chord_tones, quality, leading_tone = chord
+    position_weights = _TRIAD_POSITION_WEIGHTS if len(chord_tones) == 3 else _SEVENTH_POSITION_WEIGHTS
+    position = rng.choices(range(len(chord_tones)), weights=position_weights)[0]
+    bass_tone = chord_tones[position]
+
+    voicings = __get_voicings(bass_tone, __get_upper_tones(chord_tones, bass_tone, leading_tone), chord_tones[0],
+    quality, position)
+    broken_rules = []
+
+    if prev_voicing is not None:
+        parallels = [__get_parallels(prev_voicing[2], indices) for _, _, indices in voicings]
+        is_breaking = break_rule == 'parallel' and any(parallels)
+
+        voicings = [voicing + (voicing_parallels,) for voicing, voicing_parallels in zip(voicings, parallels)
+        if bool(voicing_parallels) == is_breaking]
+
+        if not voicings:
+            return None
+
+        #Prefer the voicings moving the upper voices the least, drawing between those that are close
+        costs = [sum(abs(value - prev_value) for value, prev_value in zip(values[1:], prev_voicing[1][1:]))
+        + rng.random() * 4 for _, values, _, _ in voicings]
+        voicings = [voicing for _, voicing in sorted(zip(costs, voicings), key=lambda cost_voicing: cost_voicing[0])]
+
+        #The closest voicing resolving the previous chord's leading tone and seventh is used
+        voicing = next((voicing for voicing in voicings if __resolves_tendency_tones(key, prev_voicings,
+        *voicing[0:2])), None)
+
+        if voicing is None:
+            return None
+
+        names, values, indices, parallel_errors = voicing
+        broken_rules.extend(parallel_errors)
+
+    elif voicings:
+        names, values, indices = rng.choice(voicings)
+
+    else:
+        return None
+
+    values = list(values)
+
+    if break_rule == 'spacing':
+        values[3] += 12
+        broken_rules.append('ERR_SA_DISTANCE')
+
+    elif break_rule == 'range':
+        values[0] -= (values[0] - _VALIDATION_SETTINGS['voice_range'][0][0]) // 12 * 12 + 12
+        broken_rules.append('ERR_VOICE_LOW')
+
+    if values[3] > _VALIDATION_SETTINGS['voice_range'][3][1]:
+        broken_rules.append('ERR_VOICE_HIGH')
+
+    if values[1] - values[0] > _VALIDATION_SETTINGS['max_distance'][2]:
+        broken_rules.append('ERR_TB_DISTANCE')
+
+    return ((names, tuple(values), indices), broken_rules)
+
+
+def __draw_progression(rng, key, num_chords, mixture_rate, applied_rate, error_rate):
+    '''Draws a progression in the passed key, or returns None if its chords can't be voiced after several attempts.'''
+
+    numerals = []
+    chords = []
+    broken_rules = []
+    prev_voicings = (None, None)
+    num_attempts = 0
+
+    while len(chords) < num_chords:
+        if num_attempts == _MAX_ATTEMPTS:
+            return None
+
+        num_attempts += 1
+
+        #Progressions open on the tonic
+        drawn_numerals = __draw_numerals(rng, key, mixture_rate, applied_rate) if chords else (__get_numerals(key)[0][0],)
+        drawn_chords = []
+        voicings = prev_voicings
+
+        if len(chords) + len(drawn_numerals) > num_chords:
+            continue
+
+        #Draw the numerals' chords again if any of them can't be voiced
+        for numeral in drawn_numerals:
+            chord = __get_chord(key, numeral)
+            break_rule = rng.choice(('range', 'spacing', 'parallel')) if rng.random() < error_rate else None
+            drawn_voicing = __draw_voicing(rng, key, chord, voicings, break_rule) if chord is not None else None
+
+            if drawn_voicing is None:
+                break
+
+            voicing, chord_errors = drawn_voicing
+            voicings = (voicings[1], voicing)
+            drawn_chords.append((numeral, voicing, chord_errors))
+
+        else:
+            for numeral, (names, values, _), chord_errors in drawn_chords:
+                broken_rules.extend((len(chords), error_code) for error_code in chord_errors)
+                numerals.append(numeral)
+
+                #The octave of each note is taken from its value, as the validator measures voices by value
+                chords.append(','.join(f'{name}{(value - NOTE_INDICES[name]) // 12}' for name, value in zip(names, values)))
+
+            prev_voicings = voicings
+            num_attempts = 0
+
+    return SyntheticProgression(key, tuple(numerals), tuple(chords), tuple(broken_rules))
+
+
+#### PUBLIC METHODS ####
+def iter_progressions(seed=0, num_progressions=None, min_chords=4, max_chords=16, keys=None, mixture_rate=0.1,
+applied_rate=0.1, error_rate=0.0):
+    '''
+    Yields seeded synthetic progressions, one at a time.
+
+    Parameters:
+        seed (int): The seed for the random number generator
+        num_progressions (int): The number of progressions to yield, or None to yield them endlessly
+        min_chords (int): The fewest chords in a progression
+        max_chords (int): The most chords in a progression
+        keys (tuple): The keys to draw from, all supported major and minor keys by default
+        mixture_rate (float): The share of chords drawn from the key's modal mixture numerals
+        applied_rate (float): The share of chords drawn as applied dominants
+        error_rate (float): The share of chords voiced to break a range, spacing or parallel movement rule
+
+    Return:
+        progressions (generator): The SyntheticProgression for each progression
+    '''
+
+    if min_chords < 1 or max_chords < min_chords:
+        raise ValueError(f'Invalid number of chords: {min_chords} to {max_chords}')
+
+    rng = random.Random(seed)
+    keys = keys or SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS
+    num_yielded = 0
+
+    while num_progressions is None or num_yielded < num_progressions:
+        progression = __draw_progression(rng, rng.choice(keys), rng.randint(min_chords, max_chords), mixture_rate,
+        applied_rate, error_rate)
+
+        #Progressions with a chord that can't be spelled or voiced are drawn again
+        if progression is not None:
+            num_yielded += 1
+            yield progression
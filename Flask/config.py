@@ -1,4 +1,27 @@
 import os
 
 class Config(object):
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'placeholder-string'
\ No newline at end of file
+    SECRET_KEY = os.environ.get('SECRET_KEY') or 'placeholder-string'
+
+    #Warm up the analysis engine when the app is created, before a pre-forking server forks its workers.
+    #Otherwise, the engine is only imported once an analysis route is requested.
+    ANALYSIS_WARM_UP = os.environ.get('ANALYSIS_WARM_UP', '0') == '1'
+
+    #Report each worker's pid, warm-up and memory usage from '/worker_stats'. The route is off by default.
+    WORKER_STATS = os.environ.get('WORKER_STATS', '0') == '1'
+
+    #Profile the analysis of every request, a sampled share of requests, or requests sending the token in their
+    #'X-Profile' header, saving the newest profiles to the directory. Profiling is off unless the directory is set.
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')
+    PROFILE_ALL = os.environ.get('PROFILE_ALL', '0') == '1'
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+    PROFILE_MAX_PROFILES = int(os.environ.get('PROFILE_MAX_PROFILES', '100'))
+
+    #Record the analysis engine's decisions for each chord of '/analysis' requests in a bounded ring buffer, so that
+    #a request's trace can be dumped from '/trace/<id>' using the id in its 'X-Trace-Id' header. Tracing is off by default.
+    ANALYSIS_TRACE = os.environ.get('ANALYSIS_TRACE', '0') == '1'
+    ANALYSIS_TRACE_BUFFER_SIZE = int(os.environ.get('ANALYSIS_TRACE_BUFFER_SIZE', '10000'))
+
+    #The seconds a '/analysis/repairs' request may spend searching for the repairs of its progression's SATB errors
+    REPAIR_TIME_BUDGET = float(os.environ.get('REPAIR_TIME_BUDGET', '0.5'))
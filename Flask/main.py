@@ -1 +1,17 @@
-from app import app
\ No newline at end of file
+'''
+Entry point for the web app, which is run with 'flask run'.
+
+Running this file directly starts the corpus analysis command line instead, see api/corpus.py:
+    python main.py corpus/ --output results/
+'''
+
+if __name__ == '__main__':
+    import sys
+    from api.corpus import main
+
+    sys.exit(main())
+
+else:
+    from app import create_app
+
+    app = create_app()
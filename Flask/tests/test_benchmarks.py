@@ -0,0 +1,68 @@
+"""Contains the TestBenchmarks class for testing the benchmark suite and optionally checking for regressions."""
+
+import json
+import os
+
+from api.chord import ChordFactory
+from benchmarks.bench_analysis import BASELINES_PATH, compare_results, generate_chords, main, run_benchmarks
+
+class TestBenchmarks:
+    """Test functions for the benchmark suite's synthetic data, timing and baseline comparisons."""
+
+    def test_generate_chords(self):
+        """Test that synthetic chords are seeded and valid four voice chords."""
+
+        chords = generate_chords(100, seed=3)
+
+        assert chords == generate_chords(100, seed=3)
+        assert chords != generate_chords(100, seed=4)
+
+        for chord_string in chords:
+            chord = ChordFactory().create_chord(chord_string)
+
+            assert len(chord.notes) == 4
+            assert chord.quality != 'unknown'
+            assert [note.value for note in chord.notes] == sorted(note.value for note in chord.notes)
+
+    def test_compare_results(self):
+        """Test that results are scaled by their calibration times before being compared with the baselines."""
+
+        baselines = {'calibration': 1.0, 'benchmarks': {'create_chord': {'8': 1.0, '24': 1.0}}}
+        results = {'calibration': 2.0, 'benchmarks': {'create_chord': {'8': 2.2, '24': 3.0}, 'parse_note': {'8': 1.0}}}
+
+        comparisons = compare_results(results, baselines, 0.25)
+
+        assert [(name, size, is_regression) for name, size, _, _, _, is_regression in comparisons] == [
+            ('create_chord', 8, False), ('create_chord', 24, True)]
+
+    def test_update_baselines(self, tmp_path):
+        """Test that updating the baselines only changes the benchmarks that were run."""
+
+        baselines_path = tmp_path / 'baselines.json'
+        baselines_path.write_text(json.dumps({'calibration': 1.0, 'benchmarks': {'create_chord': {'8': 1.0, '24': 1.0},
+        'parse_note': {'24': 1.0}}}))
+
+        assert main(['--sizes', '8', '--benchmarks', 'parse_note', '--baselines', str(baselines_path),
+        '--update-baselines']) == 0
+
+        updated_baselines = json.loads(baselines_path.read_text())
+
+        assert updated_baselines['calibration'] == 1.0
+        assert updated_baselines['benchmarks']['create_chord'] == {'8': 1.0, '24': 1.0}
+        assert updated_baselines['benchmarks']['parse_note']['24'] == 1.0
+        assert updated_baselines['benchmarks']['parse_note']['8'] > 0
+
+    def test_baselines(self):
+        """Test that every benchmark has a committed baseline, and check for regressions when a threshold is set."""
+
+        results = run_benchmarks((8,))
+
+        with open(BASELINES_PATH) as baselines_file:
+            baselines = json.load(baselines_file)
+
+        comparisons = compare_results(results, baselines, float(os.environ.get('BENCHMARK_THRESHOLD', 'inf')))
+
+        assert len(comparisons) == len(results['benchmarks'])
+
+        #Fail on slower benchmarks when a threshold is set, i.e. on a dedicated benchmark machine
+        assert not [comparison for comparison in comparisons if comparison[5]]
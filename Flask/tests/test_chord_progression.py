@@ -1,6 +1,7 @@
 """Contains the TestChordProgression class for testing the ChordProgression class."""
 
 from api.chord_progression import ChordProgression
+from api.music_info import get_chord_relation_for_key
 
 class TestChordProgressions:
     """Test functions for ChordProgression functionality."""
@@ -311,3 +312,23 @@ class TestChordProgressions:
 
         self.validate_satb_errors(lt_double_expected, lt_double_errors, 'spelling')
         self.validate_satb_errors(seventh_double_expected, seventh_double_errors, 'spelling')
+
+    def test_six_four_relations(self):
+        """Test that second inversion triads have the relation of their root position numeral."""
+
+        for numeral in ['I6/4', 'V6/4', 'ii6/4']:
+            assert get_chord_relation_for_key('C', numeral) == 'diatonic'
+
+        assert get_chord_relation_for_key('a', 'i6/4') == 'diatonic'
+        assert get_chord_relation_for_key('c', 'I6/4') == 'mixture'
+        assert get_chord_relation_for_key('C', 'bII6/4') == 'chromatic'
+
+        #I - ii6 - I6/4 - V - I - V6/4 - I6
+        six_four_prog = self.create_progression(['C3,G3,E4,C5','F3,A3,D4,D5','G2,G3,C4,E5','G2,G3,B3,D5','C3,G3,E4,C5',
+        'D3,G3,B3,G4','E3,G3,C4,G4'], 'C')
+
+        six_four_numerals = six_four_prog.get_progression_chord_numerals(True)
+        six_four_errors = six_four_prog.validate_progression()
+
+        self.validate_chord_numerals(['I', 'ii6', 'I6/4', 'V', 'I', 'V6/4', 'I6'], six_four_numerals)
+        self.validate_satb_errors([], six_four_errors, 'spelling')
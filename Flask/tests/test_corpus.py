@@ -0,0 +1,190 @@
+"""Contains the TestCorpus class for testing the corpus analysis command line."""
+
+import csv
+import json
+import os
+
+import pytest
+
+from api.corpus import CHECKPOINT_FILE, main, run_corpus_analysis
+from api.music_funcs import create_progression
+from api.musicxml import write_musicxml
+
+class TestCorpus:
+    """Test functions for corpus analysis across input formats, output chunks and checkpoints."""
+
+    #I - V - I
+    test_chords = ['C3,G3,E4,C5', 'G2,B3,D4,G4', 'C3,G3,E4,C5']
+
+    ## HELPER METHODS ##
+
+    def create_corpus(self, corpus_dir):
+        """Helper method to write a corpus with a CSV, JSON Lines, MusicXML and MIDI file to the passed directory."""
+
+        with open(corpus_dir / 'progressions.csv', 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['title', 'key', 'chords'])
+            writer.writerow(['Cadence', 'C', ';'.join(self.test_chords)])
+            writer.writerow(['Bad key', 'H', ';'.join(self.test_chords)])
+
+        with open(corpus_dir / 'progressions.jsonl', 'w') as json_file:
+            json_file.write(json.dumps({'chords': self.test_chords, 'key': 'G', 'composer': 'Test'}) + '\n')
+            json_file.write(json.dumps({'chords': ['X4'], 'key': 'C'}) + '\n')
+
+        (corpus_dir / 'nested').mkdir()
+        write_musicxml(create_progression(self.test_chords, 'C'), corpus_dir / 'nested' / 'score.musicxml')
+
+        #A C major triad held for one beat
+        track = b'\x00\x90\x3c\x50\x00\x40\x50\x00\x43\x50\x83\x60\x80\x3c\x00\x00\x40\x00\x00\x43\x00\x00\xff\x2f\x00'
+        midi_data = b'MThd\x00\x00\x00\x06\x00\x00\x00\x01\x01\xe0MTrk' + len(track).to_bytes(4, 'big') + track
+        (corpus_dir / 'triad.mid').write_bytes(midi_data)
+
+    def read_output(self, output_dir):
+        """Helper method to read the rows of every output chunk in order."""
+
+        rows = []
+
+        for chunk_name in sorted(name for name in os.listdir(output_dir) if name.startswith('chunk-')):
+            with open(output_dir / chunk_name, newline='') as chunk_file:
+                rows.extend(csv.DictReader(chunk_file))
+
+        return rows
+
+    ## TEST METHODS ##
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_analysis(self, tmp_path, workers):
+        """Test that every progression's chords or errors are written, in the same order for any number of workers."""
+
+        self.create_corpus(tmp_path)
+        output_dir = tmp_path / 'output'
+
+        checkpoint = run_corpus_analysis([str(tmp_path)], str(output_dir), workers, batch_size=2, chunk_rows=4,
+        output_format='csv', progress_file=None)
+
+        rows = self.read_output(output_dir)
+
+        assert checkpoint['finished']
+        assert checkpoint['num_progressions'] == 6
+        assert checkpoint['num_rows'] == 10 and checkpoint['num_errors'] == 2
+        assert checkpoint['num_chunks'] == len([name for name in os.listdir(output_dir) if name.startswith('chunk-')])
+
+        csv_rows = [row for row in rows if row['source'].endswith('.csv')]
+
+        assert [row['numeral'] for row in csv_rows] == ['I', 'V', 'I', '']
+        assert [row['error'] for row in csv_rows] == ['', '', '', 'INVALID_KEY']
+        assert [bool(row['voice_leading']) for row in csv_rows] == [False, True, True, False]
+        assert json.loads(csv_rows[1]['voice_leading'])['total_motion'] >= 0
+        assert [row['set_class'] for row in csv_rows] == ['3-11', '3-11', '3-11', '']
+        assert [row['numeral'] for row in rows if row['source'].endswith('.jsonl')] == ['IV', 'I', 'IV', '']
+        assert [row['numeral'] for row in rows if row['source'].endswith('.musicxml')] == ['I', 'V', 'I']
+        assert [row['name'] for row in rows if row['source'].endswith('.mid')] == ['C']
+
+        assert json.loads(csv_rows[0]['metadata']) == {'title': 'Cadence'}
+        assert 'Parallel 8ves' in csv_rows[0]['satb_errors']
+
+    def test_resume(self, tmp_path):
+        """Test that a resumed job skips the batches already written and produces the same output."""
+
+        self.create_corpus(tmp_path)
+        output_dir = tmp_path / 'output'
+
+        run_corpus_analysis([str(tmp_path)], str(output_dir), 1, batch_size=1, chunk_rows=1, output_format='csv',
+        progress_file=None)
+        expected_rows = self.read_output(output_dir)
+
+        #Interrupt the job after its first two chunks
+        with open(output_dir / CHECKPOINT_FILE) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        for chunk_index in range(2, checkpoint['num_chunks']):
+            os.remove(output_dir / f'chunk-{chunk_index:05d}.csv')
+
+        checkpoint.update({'completed_batches': 2, 'num_chunks': 2, 'num_progressions': 2, 'finished': False})
+
+        with open(output_dir / CHECKPOINT_FILE, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+
+        with pytest.raises(ValueError):
+            run_corpus_analysis([str(tmp_path)], str(output_dir), 1, batch_size=1, chunk_rows=1, output_format='csv')
+
+        checkpoint = run_corpus_analysis([str(tmp_path)], str(output_dir), 1, batch_size=1, chunk_rows=1,
+        output_format='csv', resume=True, progress_file=None)
+
+        assert checkpoint['num_progressions'] == 6
+        assert self.read_output(output_dir) == expected_rows
+
+    def test_command_line(self, tmp_path):
+        """Test running the command line with a file list."""
+
+        self.create_corpus(tmp_path)
+        file_list = tmp_path / 'files.txt'
+        file_list.write_text(str(tmp_path / 'progressions.csv') + '\n')
+
+        assert main(['--file-list', str(file_list), '--output', str(tmp_path / 'output'), '--workers', '1',
+        '--format', 'csv', '--no-validate']) == 0
+
+        rows = self.read_output(tmp_path / 'output')
+
+        assert len(rows) == 4
+        assert all(row['satb_errors'] == '' for row in rows)
+
+    def test_transpose(self, tmp_path):
+        """Test that every progression is transposed to the passed key before it's analyzed."""
+
+        self.create_corpus(tmp_path)
+        output_dir = tmp_path / 'output'
+
+        run_corpus_analysis([str(tmp_path)], str(output_dir), 1, output_format='csv', progress_file=None,
+        transpose_key='Eb')
+
+        rows = [row for row in self.read_output(output_dir) if not row['error']]
+
+        assert {row['key'] for row in rows} == {'Eb'}
+        assert [row['chord'] for row in rows if row['source'].endswith('.csv')][0] == 'Eb3,Bb3,G4,Eb5'
+        assert [row['numeral'] for row in rows if row['source'].endswith('.jsonl')] == ['IV', 'I', 'IV']
+
+    def test_rows(self, tmp_path):
+        """Test that inverted chords aren't applied, that errors are on the chords they name, and bad keys are rows."""
+
+        chords = ['C3,G3,E4,C5', 'B2,D4,F4,G4', 'C3,G3,E4,C5', 'D3,G3,B3,F4', 'C3,G3,E4,C5', 'F3,G3,B3,D4',
+        'E3,G3,C4,C5', 'G2,G3,C4,E4', 'G2,G3,B3,D4', 'C3,G3,E4,C5']
+
+        with open(tmp_path / 'progressions.jsonl', 'w') as json_file:
+            json_file.write(json.dumps({'chords': chords, 'key': 'C'}) + '\n')
+            json_file.write(json.dumps({'chords': chords, 'key': 5}) + '\n')
+            json_file.write(json.dumps({'chords': chords, 'key': ['C']}) + '\n')
+
+        run_corpus_analysis([str(tmp_path / 'progressions.jsonl')], str(tmp_path / 'output'), 1, output_format='csv',
+        progress_file=None)
+
+        rows = self.read_output(tmp_path / 'output')
+
+        assert [row['numeral'] for row in rows[0:10]] == ['I', 'V6/5', 'I', 'V4/3', 'I', 'V4/2', 'I6', 'I6/4', 'V',
+        'I']
+        assert 'applied' not in [row['relation'] for row in rows[0:10]]
+        assert rows[7]['relation'] == 'diatonic'
+
+        #The V4/3's unresolved seventh and leading tone are found while checking the I after it
+        assert [bool(row['satb_errors']) for row in rows[0:10]] == [False, False, False, True, False, False, False,
+        True, True, False]
+        assert 'Unresolved' in rows[3]['satb_errors'] and 'Parallel 8ves' in rows[7]['satb_errors']
+        assert 'Unresolved' in rows[8]['satb_errors']
+
+        assert [row['error'] for row in rows[10:]] == ['INVALID_KEY', 'INVALID_KEY']
+
+    def test_failed_analysis(self, tmp_path):
+        """Test that a progression the engine fails to analyze is written as an error row without stopping the job."""
+
+        with open(tmp_path / 'progressions.jsonl', 'w') as json_file:
+            json_file.write(json.dumps({'chords': ['Ab3,B2,Ab4,Ab5'], 'key': 'F'}) + '\n')
+            json_file.write(json.dumps({'chords': ['F3,C4,A4,F5'], 'key': 'F'}) + '\n')
+
+        checkpoint = run_corpus_analysis([str(tmp_path / 'progressions.jsonl')], str(tmp_path / 'output'), 1,
+        output_format='csv', progress_file=None)
+
+        rows = self.read_output(tmp_path / 'output')
+
+        assert checkpoint['finished']
+        assert rows[0]['error'].startswith('IndexError')
+        assert [row['numeral'] for row in rows[1:]] == ['I']
@@ -0,0 +1,134 @@
+"""Contains the TestCSVImport class for testing progressions streamed from CSV files."""
+
+import io
+
+from api import music_funcs
+from api.csv_import import CSVProgressionReader, read_progressions_csv
+
+class TestCSVImport:
+    """Test functions for CSVProgressionReader row layouts, chunking and row errors."""
+
+    #I - IV - V - I
+    test_chords = ['C3,G3,E4,C5', 'F3,C4,A4,F5', 'G3,D4,B4,G5', 'C3,G3,E4,C5']
+
+    ## HELPER METHODS ##
+
+    def read_progressions(self, csv_text, **reader_options):
+        """Helper method to read all of the progressions from the passed CSV text, returning them with the reader."""
+
+        reader = CSVProgressionReader(io.StringIO(csv_text, newline=''), **reader_options)
+
+        return list(reader), reader
+
+    def get_numerals(self, imported_progression):
+        """Helper method to return the numerals of an imported progression's analysis."""
+
+        analysis = music_funcs.analyze_progression(imported_progression.progression, False)
+
+        return [chord['numeral'] for chord in analysis['chords']]
+
+    ## TEST METHODS ##
+
+    def test_progression_rows(self):
+        """Test reading rows that each hold a full progression, with their keys and metadata."""
+
+        csv_text = 'title,key,chords\n' + \
+            f'Cadence,C,"{";".join(self.test_chords)}"\n' + \
+            'Minor,Am,"A2,E3,C4,A4;E2,B3,G#4,E5"\n'
+
+        progressions, reader = self.read_progressions(csv_text)
+
+        assert len(progressions) == 2
+        assert reader.num_rows == 2 and reader.num_errors == 0
+
+        assert self.get_numerals(progressions[0]) == ['I', 'IV', 'V', 'I']
+        assert progressions[0].metadata == {'title': 'Cadence'}
+        assert progressions[0].row_number == 2
+
+        assert progressions[1].progression.key == 'a'
+        assert self.get_numerals(progressions[1]) == ['i', 'V']
+
+    def test_chord_rows(self):
+        """Test that consecutive single chord rows are grouped into progressions across chunks."""
+
+        rows = [f'1,C,"{chord}"' for chord in self.test_chords] + [f'2,G,"{chord}"' for chord in self.test_chords[0:2]]
+        csv_text = 'progression,key,chord\n' + '\n'.join(rows) + '\n'
+
+        progressions, reader = self.read_progressions(csv_text, chunk_size=3)
+
+        assert [len(progression.progression.chords) for progression in progressions] == [4, 2]
+        assert [progression.row_number for progression in progressions] == [2, 6]
+        assert self.get_numerals(progressions[0]) == ['I', 'IV', 'V', 'I']
+        assert self.get_numerals(progressions[1]) == ['IV', 'bVII']
+        assert reader.num_rows == 6
+
+    def test_max_chords(self):
+        """Test that progressions with more chords than the limit are split into consecutive progressions."""
+
+        csv_text = 'title,key,chords\n' + f'Cadence,C,"{";".join(self.test_chords[0:3])}"\n'
+        progressions, reader = self.read_progressions(csv_text, max_chords=2)
+
+        assert [len(progression.progression.chords) for progression in progressions] == [2, 1]
+        assert [progression.metadata for progression in progressions] == [{'title': 'Cadence'}] * 2
+        assert self.get_numerals(progressions[0]) == ['I', 'IV'] and self.get_numerals(progressions[1]) == ['V']
+        assert reader.errors == []
+
+        rows = [f'1,C,"{chord}"' for chord in self.test_chords[0:3]]
+        progressions, reader = self.read_progressions('progression,key,chord\n' + '\n'.join(rows) + '\n', max_chords=2)
+
+        assert [len(progression.progression.chords) for progression in progressions] == [2, 1]
+
+    def test_detected_keys(self):
+        """Test that progressions without a key are analyzed in the key detected from their chords, unless there's a default."""
+
+        minor_chords = ['A2,E3,C4,A4', 'D3,A3,F4,D5', 'E2,B3,G#4,E5', 'A2,E3,C4,A4']
+        csv_text = 'key,chords\n' + f',"{";".join(minor_chords)}"\n' + f'G,"{";".join(self.test_chords)}"\n'
+
+        progressions, _ = self.read_progressions(csv_text)
+
+        assert [progression.progression.key for progression in progressions] == ['a', 'G']
+        assert self.get_numerals(progressions[0]) == ['i', 'iv', 'V', 'i']
+
+        progressions, _ = self.read_progressions(csv_text, default_key='C')
+
+        assert progressions[0].progression.key == 'C'
+
+        csv_text = 'progression,chord\n' + ''.join(f'1,"{chord}"\n' for chord in minor_chords)
+        progressions, _ = self.read_progressions(csv_text, chunk_size=2)
+
+        assert progressions[0].progression.key == 'a'
+
+    def test_row_errors(self):
+        """Test that invalid rows are reported without stopping the import."""
+
+        csv_text = 'key,chords\n' + \
+            'C,"C3,G3,E4,C5;X4,Y4"\n' + \
+            'H,"C3,G3,E4,C5"\n' + \
+            'C,"Q4"\n' + \
+            f'G,"{self.test_chords[2]}"\n'
+
+        progressions, reader = self.read_progressions(csv_text, max_errors=2)
+
+        assert [progression.row_number for progression in progressions] == [2, 5]
+        assert reader.num_errors == 4
+        assert reader.errors == [{'row': 2, 'error': 'INVALID_CHORD', 'value': 'X4,Y4'},
+        {'row': 3, 'error': 'INVALID_KEY', 'value': 'H'}]
+
+    def test_missing_chord_column(self):
+        """Test that a file without a chord column is reported as an error."""
+
+        progressions, reader = self.read_progressions('key,title\nC,Cadence\n')
+
+        assert progressions == []
+        assert reader.errors == [{'row': 1, 'error': 'MISSING_CHORD_COLUMN', 'value': ''}]
+
+    def test_read_file(self, tmp_path):
+        """Test reading progressions from a file path."""
+
+        csv_path = tmp_path / 'progressions.csv'
+        csv_path.write_text('chord\n' + '\n'.join(f'"{chord}"' for chord in self.test_chords) + '\n', encoding='utf-8-sig')
+
+        progressions = list(read_progressions_csv(str(csv_path)))
+
+        assert len(progressions) == 1
+        assert self.get_numerals(progressions[0]) == ['I', 'IV', 'V', 'I']
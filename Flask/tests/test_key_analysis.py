@@ -0,0 +1,90 @@
+"""Contains the TestKeyAnalysis class for testing the analysis of a progression in every key at once."""
+
+import pytest
+
+from api import music_funcs
+from api.chord import ChordFactory
+from api.chord_progression import ChordProgression
+from api.key_analysis import ANALYZED_KEYS, analyze_all_keys
+
+class TestKeyAnalysis:
+    """Test functions for the batched analysis matching the analysis in each key, and its '/analysis/keys' route."""
+
+    #I - V7/IV - IV - It+6 - V - N6 - viio7/V - V - I, with the tonic repeated to share its analysis
+    test_chords = ['C3,G3,E4,C5', 'C3,Bb3,E4,G4', 'F3,A3,F4,C5', 'Ab2,C4,F#4,C5', 'G2,B3,D4,B4', 'F3,Ab3,Db4,F4',
+    'F#3,C4,Eb4,A4', 'G2,B3,D4,G4', 'C3,G3,E4,C5', 'C3,G3,E4,C5']
+
+    ## HELPER METHODS ##
+
+    def create_chords(self):
+        """Helper method to create the test chords."""
+
+        return [ChordFactory().create_chord(chord_string) for chord_string in self.test_chords]
+
+    ## TEST METHODS ##
+
+    def test_matches_each_key(self):
+        """Test that every key's numerals and accidentals match analyzing the progression in that key alone."""
+
+        chords = self.create_chords()
+        key_analysis = analyze_all_keys(chords)
+
+        assert list(key_analysis['keys']) == list(ANALYZED_KEYS)
+        assert key_analysis['names'] == ChordProgression(chords).get_progression_chord_names(True)
+
+        for key in ANALYZED_KEYS:
+            progression = ChordProgression(chords, key)
+
+            assert key_analysis['keys'][key]['numerals'] == progression.get_progression_chord_numerals()
+            assert key_analysis['keys'][key]['accidentals'] == progression.get_progression_chord_accidentals()
+
+        assert analyze_all_keys(chords, ('C',), False, False)['keys']['C']['numerals'] == \
+            ChordProgression(chords, 'C').get_progression_chord_numerals(False, False)
+
+    def test_relations(self):
+        """Test that each chord's relation to each key is returned, with applied chords marked as applied."""
+
+        key_analysis = analyze_all_keys(self.create_chords(), ('C', 'c', 'F'))
+
+        assert key_analysis['keys']['C']['numerals'][0:6] == ['I', 'V7/IV', 'IV', 'It+6', 'V', 'N6']
+        assert key_analysis['keys']['C']['relations'][0:5] == ['diatonic', 'applied', 'diatonic', 'chromatic',
+        'diatonic']
+        assert key_analysis['keys']['c']['relations'][0:3] == ['mixture', 'applied', 'mixture']
+        assert key_analysis['keys']['F']['numerals'][0:3] == ['V', 'V7', 'I']
+        assert key_analysis['keys']['F']['relations'][0:3] == ['diatonic', 'diatonic', 'diatonic']
+
+        #Inverted chords only have an inversion string after their last slash
+        chords = [ChordFactory().create_chord(chord_string) for chord_string in ('C3,G3,E4,C5', 'B2,D4,F4,G4',
+        'C3,G3,E4,C5', 'D3,G3,B3,F4', 'C3,G3,E4,C5', 'F3,G3,B3,D4', 'E3,G3,C4,C5', 'G3,C4,E4,C5')]
+        key_analysis = analyze_all_keys(chords, ('C',))
+
+        assert key_analysis['keys']['C']['numerals'] == ['I', 'V6/5', 'I', 'V4/3', 'I', 'V4/2', 'I6', 'I6/4']
+        assert key_analysis['keys']['C']['relations'] == ['diatonic'] * 8
+
+    def test_music_funcs(self):
+        """Test that chord strings are analyzed in the passed key signatures, and invalid input is reported."""
+
+        key_analysis = music_funcs.generate_progression_keys(self.test_chords, ['G', 'Em'])
+
+        assert list(key_analysis['keys']) == ['G', 'e']
+        assert key_analysis['keys']['G']['numerals'][2] == 'bVII'
+        assert len(music_funcs.generate_progression_keys(self.test_chords)['keys']) == len(ANALYZED_KEYS)
+        assert music_funcs.generate_progression_keys(self.test_chords, ['H']) == {'error': 'INVALID_KEY'}
+        assert music_funcs.generate_progression_keys(['X4,Y4'], ['C']) == {'error': 'NO_VALID_CHORDS'}
+
+    def test_keys_route(self):
+        """Test that the '/analysis/keys' route analyzes the posted chords in the posted keys."""
+
+        pytest.importorskip('flask')
+        pytest.importorskip('flask_wtf')
+
+        from app import create_app
+
+        client = create_app().test_client()
+        form = {f'chords-{i}': chord for i, chord in enumerate(self.test_chords)}
+
+        response = client.post('/analysis/keys', data={**form, 'keys': 'C, Am'})
+
+        assert response.status_code == 200
+        assert list(response.get_json()['keys']) == ['C', 'a']
+        assert client.post('/analysis/keys', data={**form, 'keys': 'Z'}).status_code == 400
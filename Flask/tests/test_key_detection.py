@@ -0,0 +1,82 @@
+"""Contains the TestKeyDetection class for testing the key detected for progressions imported without one."""
+
+import pytest
+
+from api.chord import ChordFactory
+from api.key_detection import detect_key, rank_keys
+from api.music_info import MAJOR_KEY_NOTES, MINOR_KEY_NOTES, NOTE_INDICES, SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS
+
+class TestKeyDetection:
+    """Test functions for ranking keys by a progression's notes and telling enharmonic keys apart."""
+
+    ## HELPER METHODS ##
+
+    def create_cadence(self, key):
+        """Helper method to return a i/I - iv/IV - V - i/I cadence in the passed key as chord strings."""
+
+        major_key = key[0].upper() + key[1:]
+        key_notes = MAJOR_KEY_NOTES[major_key] if key[0].isupper() else MINOR_KEY_NOTES[major_key]
+        tonic, subdominant = (key_notes[0], key_notes[2], key_notes[4]), (key_notes[3], key_notes[5], key_notes[0])
+
+        #The dominant uses the raised leading tone in minor keys
+        dominant = (key_notes[4], MAJOR_KEY_NOTES[major_key][6], key_notes[1])
+
+        def voice(chord_tones):
+            octave = 3
+            note_strings = []
+
+            for note_name in chord_tones + chord_tones[0:1]:
+                if note_strings and NOTE_INDICES[note_name] + octave * 12 <= NOTE_INDICES[note_strings[-1][0:-1]] + \
+                int(note_strings[-1][-1]) * 12:
+                    octave += 1
+
+                note_strings.append(f'{note_name}{octave}')
+
+            return ','.join(note_strings)
+
+        return [voice(tonic), voice(subdominant), voice(dominant), voice(tonic)]
+
+    ## TEST METHODS ##
+
+    def test_cadences(self):
+        """Test that a cadence in each supported key is detected in that key, spelled as written."""
+
+        for key in SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS:
+            assert detect_key(self.create_cadence(key)) == key
+
+    def test_ranking(self):
+        """Test that every key is ranked by correlation, with confidences summing to 1."""
+
+        key_estimates = rank_keys(self.create_cadence('G'))
+
+        assert len(key_estimates) == 24 and len({key_estimate.key for key_estimate in key_estimates}) == 24
+        assert key_estimates[0].key == 'G' and key_estimates[0].confidence > 0.9
+        assert [key_estimate.correlation for key_estimate in key_estimates] == \
+            sorted((key_estimate.correlation for key_estimate in key_estimates), reverse=True)
+        assert sum(key_estimate.confidence for key_estimate in key_estimates) == pytest.approx(1)
+        assert -1 <= key_estimates[-1].correlation < key_estimates[0].correlation <= 1
+
+    def test_chord_formats(self):
+        """Test that chords, note values and durations are accepted, and unspelled notes use the fewest accidentals."""
+
+        chord_strings = self.create_cadence('Db')
+        chords = [ChordFactory().create_chord(chord_string) for chord_string in chord_strings]
+        midi_notes = [[note.value + 12 for note in chord.notes] for chord in chords]
+
+        assert detect_key(chords) == 'Db'
+        assert detect_key(midi_notes) == 'Db'
+        assert detect_key([[note_value + 2 for note_value in chord] for chord in midi_notes]) == 'Eb'
+
+        #The C# cadence is spelled differently, but made up of the same pitch classes
+        assert detect_key(self.create_cadence('C#')) == 'C#'
+        assert [key_estimate.key for key_estimate in rank_keys(midi_notes)][0] == 'Db'
+
+        #A long chord outweighs the others
+        assert detect_key(['A2,E3,C4,A4', 'C3,G3,E4,C5'], [8, 1]) == 'a'
+
+    def test_no_notes(self):
+        """Test that the default is returned when there are no notes to detect a key from."""
+
+        assert rank_keys([]) == []
+        assert detect_key([], default='C') == 'C'
+        assert detect_key(['X4,Y4', ''], default='g') == 'g'
@@ -0,0 +1,89 @@
+"""Contains the TestKeyTracking class for testing the modulations found between a progression's local keys."""
+
+import pytest
+
+from api import music_funcs
+from api.key_tracking import TRACKED_KEYS, KeySegment, get_key_fitness, get_local_keys, track_keys
+
+class TestKeyTracking:
+    """Test functions for the chords x keys fitness, the Viterbi key segments and their pivot chords."""
+
+    #The chords of C major and G major used to build progressions, voiced for four voices
+    test_chords = {'C': 'C3,G3,E4,C5', 'F': 'F3,C4,A4,F5', 'G': 'G2,D4,B4,G4', 'Am': 'A2,E3,C4,A4', 'D7': 'D3,A3,F#4,C5',
+    'Em': 'E3,G3,B3,E4', 'D': 'D3,A3,F#4,D5', 'Bm': 'B2,F#3,D4,B4', 'G7': 'G2,B3,F4,G4'}
+
+    #I - IV - V - I in C, then vi as the pivot into G, cadencing in G before returning to C
+    modulation = ['C', 'F', 'G', 'C', 'Am', 'D7', 'G', 'Em', 'Am', 'D7', 'G', 'C', 'D', 'G', 'Bm', 'Em', 'Am', 'D7', 'G',
+    'G7', 'C', 'F', 'G7', 'C']
+
+    ## HELPER METHODS ##
+
+    def create_progression(self, chord_names, key='C'):
+        """Helper method to create a progression from the names of the test chords."""
+
+        return music_funcs.create_progression([self.test_chords[chord_name] for chord_name in chord_names], key)
+
+    ## TEST METHODS ##
+
+    def test_key_fitness(self):
+        """Test that each chord's costs favour keys it's the tonic or dominant of, and penalize chromatic chords."""
+
+        fitness = get_key_fitness(self.create_progression(['C', 'G7', 'Am']).chords)
+        costs = [dict(zip(TRACKED_KEYS, chord_costs)) for chord_costs in fitness]
+
+        assert len(fitness) == 3 and all(len(chord_costs) == len(TRACKED_KEYS) for chord_costs in fitness)
+        assert costs[0]['C'] < costs[0]['F'] < costs[0]['c'] < costs[0]['D']
+        assert costs[1]['C'] == costs[1]['c'] < costs[1]['G']
+        assert costs[2]['a'] < costs[2]['C'] < costs[2]['c']
+
+    def test_modulation(self):
+        """Test that a modulation to the dominant and back is found with its pivot chords."""
+
+        key_segments = track_keys(self.create_progression(self.modulation).chords, 'C')
+
+        assert key_segments == [KeySegment('C', 0, 4, None), KeySegment('G', 4, 19, 4), KeySegment('C', 19, 24, 18)]
+        assert get_local_keys(key_segments) == ['C'] * 4 + ['G'] * 15 + ['C'] * 5
+
+        #A high enough modulation cost keeps the whole progression in its key
+        assert track_keys(self.create_progression(self.modulation).chords, 'C', 100) == [KeySegment('C', 0, 24, None)]
+
+    def test_tonicization(self):
+        """Test that applied chords tonicizing a chord don't modulate, and the starting key is chosen without one."""
+
+        assert track_keys(self.create_progression(['C', 'D7', 'G', 'C']).chords, 'C') == [KeySegment('C', 0, 4, None)]
+        assert track_keys(self.create_progression(['Am', 'D7', 'G', 'C', 'G7', 'C']).chords) == \
+            [KeySegment('C', 0, 6, None)]
+        assert track_keys([]) == []
+
+    def test_local_analysis(self):
+        """Test that numerals, accidentals and validation use each chord's local key when modulations are tracked."""
+
+        chords = [self.test_chords[chord_name] for chord_name in self.modulation]
+        progression_info = music_funcs.generate_progression(chords, 'C', True, True)
+        numerals = [chord['numeral'] for chord in progression_info['chords']]
+
+        assert progression_info['key_segments'][1] == {'key': 'G', 'start': 4, 'stop': 19, 'pivot': 4}
+        assert numerals[4:7] == ['ii', 'V7', 'I'] and numerals[19:21] == ['V7', 'I']
+        assert progression_info['chords'][5]['accidentals'] == ['', '', '', '']
+
+        progression_info = music_funcs.generate_progression(chords, 'C', True)
+
+        assert 'key_segments' not in progression_info
+        assert [chord['numeral'] for chord in progression_info['chords']][4:7] == ['vi', 'V7/V', 'V']
+
+    def test_analysis_route(self):
+        """Test that '/analysis' requests only track modulations when their 'track_modulations' field is '1'."""
+
+        pytest.importorskip('flask')
+        pytest.importorskip('flask_wtf')
+
+        from app import create_app
+        from config import Config
+
+        client = create_app(type('TestConfig', (Config,), {'WTF_CSRF_ENABLED': False})).test_client()
+        form = {'key': 'C', 'time': '4/4', **{f'chords-{i}': self.test_chords[chord_name]
+        for i, chord_name in enumerate(self.modulation)}}
+
+        assert 'key_segments' not in client.post('/analysis', data=form).get_json()['chords']
+        assert len(client.post('/analysis', data={**form, 'track_modulations': '1'}).get_json()['chords'][
+            'key_segments']) == 3
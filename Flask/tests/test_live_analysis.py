@@ -0,0 +1,105 @@
+"""Contains the TestLiveAnalysis class for testing the live analysis channel with a local client."""
+
+import queue
+
+from api.live_analysis import LiveAnalysisChannel
+
+class TestLiveAnalysis:
+    """Test functions for LiveAnalysisChannel message handling and edit debouncing."""
+
+    #I - IV - V - I
+    test_chords = ['C3,G3,E4,C5', 'F3,C4,A4,F5', 'G3,D4,B4,G5', 'C3,G3,E4,C5']
+
+    def create_channel(self, debounce_delay=0.01):
+        """Helper function to create a channel whose sent messages are collected in a queue."""
+
+        sent_messages = queue.Queue()
+        test_channel = LiveAnalysisChannel(sent_messages.put, debounce_delay)
+
+        return test_channel, sent_messages
+
+    def test_create_and_edit(self):
+        """Test that creating a progression sends its full analysis and edits send only changed chords."""
+
+        test_channel, sent_messages = self.create_channel()
+
+        test_channel.receive({'type': 'create', 'chords': self.test_chords, 'key': 'C', 'analyze_satb': True})
+        message = sent_messages.get(timeout=1)
+
+        assert message['type'] == 'progression'
+        assert [chord_update['chord']['numeral'] for chord_update in message['progression']['chords']] == ['I', 'IV', 'V', 'I']
+        assert len(message['progression']['satb_errors']) == 4
+
+        test_channel.receive({'type': 'edit', 'chords': {'2': 'G2,D4,B4,G4'}})
+        message = sent_messages.get(timeout=1)
+
+        assert [chord_update['slot'] for chord_update in message['progression']['chords']] == [1, 2, 3]
+        assert message['progression']['chords'][1]['chord']['notes'] == ['g/2', 'd/4', 'g/4', 'b/4']
+        assert message['progression']['chords'][2]['chord']['voice_leading']['motion'][0] == 5
+
+        test_channel.close()
+
+    def test_debounced_edits(self):
+        """Test that a burst of edits is analyzed together and sent as one message."""
+
+        test_channel, sent_messages = self.create_channel(debounce_delay=0.2)
+
+        test_channel.receive({'type': 'create', 'chords': self.test_chords, 'key': 'C', 'analyze_satb': False})
+        sent_messages.get(timeout=1)
+
+        #Typing a chord one note at a time
+        for chord_string in ['A', 'A2', 'A2,', 'A2,E3,C4', 'A2,E3,C4,A4']:
+            test_channel.receive({'type': 'edit', 'chords': {'1': chord_string}})
+
+        message = sent_messages.get(timeout=1)
+
+        assert [chord_update['chord']['name'] for chord_update in message['progression']['chords']] == ['C', 'Am', 'G']
+        assert message['progression']['satb_errors'] is None
+        assert sent_messages.empty()
+
+        test_channel.close()
+
+    def test_invalid_messages(self):
+        """Test the errors sent for invalid messages or edits before a progression is created."""
+
+        test_channel, sent_messages = self.create_channel()
+
+        test_channel.receive({'type': 'edit', 'chords': {'0': 'C4,E4,G4'}})
+        assert sent_messages.get(timeout=1) == {'type': 'error', 'error': 'PROGRESSION_NOT_FOUND'}
+
+        test_channel.receive(['create'])
+        assert sent_messages.get(timeout=1) == {'type': 'error', 'error': 'INVALID_MESSAGE'}
+
+        test_channel.receive({'type': 'create', 'chords': self.test_chords, 'key': 'C'})
+        sent_messages.get(timeout=1)
+
+        test_channel.receive({'type': 'edit', 'chords': ['C3,E3,G3']})
+        assert sent_messages.get(timeout=1) == {'type': 'error', 'error': 'INVALID_MESSAGE'}
+
+        test_channel.close()
+
+    def test_invalid_keys(self):
+        """Test that an invalid key is reported without stopping the analysis of later edits."""
+
+        test_channel, sent_messages = self.create_channel()
+
+        test_channel.receive({'type': 'create', 'chords': self.test_chords, 'key': 'Zz'})
+        assert sent_messages.get(timeout=1) == {'type': 'error', 'error': 'INVALID_KEY'}
+        assert test_channel.progression_session is None
+
+        test_channel.receive({'type': 'create', 'chords': self.test_chords, 'key': 'C'})
+        sent_messages.get(timeout=1)
+
+        test_channel.receive({'type': 'edit', 'chords': {'0': 'A2,E3,C4,A4'}, 'key': 'Zz'})
+        assert sent_messages.get(timeout=1) == {'type': 'error', 'error': 'INVALID_KEY'}
+
+        test_channel.receive({'type': 'edit', 'chords': {'1': 'A2,E3,C4,A4'}, 'key': 'Am'})
+        message = sent_messages.get(timeout=1)
+
+        assert message['type'] == 'progression'
+        numerals = [chord_update['chord']['numeral'] for chord_update in message['progression']['chords']]
+
+        assert numerals[0:2] == ['III', 'i']
+        assert test_channel._worker.is_alive()
+
+        test_channel.close()
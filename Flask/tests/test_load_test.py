@@ -0,0 +1,49 @@
+"""Contains the TestLoadTest class for testing the /analysis load test."""
+
+import json
+import os
+
+from benchmarks.load_test import create_payloads, get_percentile, main
+
+class TestLoadTest:
+    """Test functions for the load test's payloads, statistics and a short run against the development server."""
+
+    def test_create_payloads(self):
+        """Test that payloads are seeded and follow the passed mix."""
+
+        payloads = create_payloads({'short': 1, 'long': 0}, 0, 16, seed=2)
+
+        assert payloads == create_payloads({'short': 1, 'long': 0}, 0, 16, seed=2)
+        assert {label for label, _ in payloads} == {'short'}
+        assert all('chords-3=' in body and 'chords-4=' not in body for _, body in payloads)
+
+        assert {label for label, _ in create_payloads({'long': 1}, 1, 16)} == {'long+satb'}
+
+    def test_get_percentile(self):
+        """Test nearest rank percentiles."""
+
+        values = list(range(1, 101))
+
+        assert get_percentile(values, 50) == 50
+        assert get_percentile(values, 99) == 99
+        assert get_percentile([7], 95) == 7
+        assert get_percentile([], 50) is None
+
+    def test_run(self, tmp_path):
+        """Test a short run against a started development server, saving its results."""
+
+        output_path = tmp_path / 'results.json'
+
+        assert main(['--requests', '40', '--concurrency', '2', '--mix', 'short:1,long:1', '--output',
+        str(output_path)]) == 0
+
+        with open(output_path) as output_file:
+            report = json.load(output_file)
+
+        assert report['latency']['count'] == 40
+        assert report['error_rate'] == 0
+        assert report['latency']['p50_ms'] <= report['latency']['p99_ms'] <= report['latency']['max_ms']
+        assert set(report['payloads']) <= {'short', 'long', 'short+satb', 'long+satb'}
+
+        if os.path.isdir('/proc'):
+            assert report['server_processes'] and report['server_processes'][0]['rss_kb'] > 0
@@ -0,0 +1,82 @@
+"""Contains the TestMetrics class for testing the analysis engine's hot path metrics."""
+
+import threading
+
+from api import metrics
+from api.metrics import collect_metrics, format_metrics
+from api.music_funcs import generate_progression
+
+class TestMetrics:
+    """Test functions for recording stage and rule timings, error counts and cache statistics across threads."""
+
+    #I - V - I, with parallel 8ves between the first two chords
+    test_chords = ['C3,G3,E4,C5', 'G2,B3,D4,G4', 'C3,G3,E4,C5']
+
+    ## TEST METHODS ##
+
+    def test_stages_and_errors(self):
+        """Test that each analysis stage is timed and each error code is counted."""
+
+        before = collect_metrics()
+        generate_progression(self.test_chords, 'C', True)
+        generate_progression(self.test_chords, 'C', False)
+        after = collect_metrics()
+
+        def get_change(counter_key):
+            return after.get(counter_key, 0) - before.get(counter_key, 0)
+
+        for stage_name in ('parse', 'identify', 'names', 'numerals', 'accidentals', 'voice_leading',
+        'patterns'):
+            assert get_change(('stage_count', stage_name)) == 2
+            assert get_change(('stage_seconds', stage_name)) > 0
+
+        assert get_change(('stage_count', 'validate')) == 1 and get_change(('stage_count', 'errors')) == 1
+        assert get_change(('stage_count', 'format')) == 2
+        assert get_change(('error_count', 'ERR_PARALLEL_8TH')) >= 1
+
+        assert after[('cache_hits', 'get_chord_relation_for_key')] + after[('cache_misses',
+        'get_chord_relation_for_key')] > 0
+
+    def test_sampled_rules(self, monkeypatch):
+        """Test that the rules are timed on one in every sample interval of validations."""
+
+        monkeypatch.setattr(metrics, 'RULE_SAMPLE_INTERVAL', 1)
+        before = collect_metrics().get(('rule_count', 'voice_range'), 0)
+        generate_progression(self.test_chords, 'C', True)
+
+        assert collect_metrics()[('rule_count', 'voice_range')] - before == 3
+        assert collect_metrics()[('rule_seconds', 'voice_movement')] > 0
+
+    def test_threads(self):
+        """Test that the counts recorded by separate threads are summed, including for threads that have finished."""
+
+        before = collect_metrics().get(('stage_count', 'parse'), 0)
+
+        def analyze():
+            for _ in range(10):
+                generate_progression(self.test_chords, 'C', True)
+
+        threads = [threading.Thread(target=analyze) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert collect_metrics()[('stage_count', 'parse')] - before == 40
+
+        del threads
+        assert collect_metrics()[('stage_count', 'parse')] - before == 40
+
+    def test_format(self):
+        """Test the Prometheus text format of the metrics."""
+
+        text = format_metrics({('stage_seconds', 'parse'): 0.25, ('stage_count', 'parse'): 4,
+        ('error_count', 'ERR_DOUBLED_LT'): 2, ('cache_hits', 'get_note_names_for_key'): 10})
+
+        assert '# TYPE analysis_stage_seconds summary' in text
+        assert 'analysis_stage_seconds_sum{stage="parse"} 0.25\n' in text
+        assert 'analysis_stage_seconds_count{stage="parse"} 4\n' in text
+        assert 'analysis_errors_total{code="ERR_DOUBLED_LT"} 2\n' in text
+        assert 'analysis_cache_hits_total{cache="get_note_names_for_key"} 10\n' in text
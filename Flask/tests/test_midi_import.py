@@ -0,0 +1,141 @@
+"""Contains the TestMidiImport class for testing chord progressions read from MIDI file data."""
+
+import pytest
+
+from api.midi_import import create_midi_progression, get_chord_slices, read_midi
+from api.music_info import get_note_names_for_key
+
+class TestMidiImport:
+    """Test functions for MIDI event parsing, chord slicing and note spelling."""
+
+    #I - IV - V - I in C as MIDI note numbers, one beat each
+    test_chords = [(48, 55, 64, 72), (53, 60, 69, 77), (43, 59, 62, 67), (48, 55, 64, 72)]
+
+    ## HELPER METHODS ##
+
+    def encode_variable_length(self, value):
+        """Helper method to encode a MIDI variable-length quantity."""
+
+        encoded = [value & 0x7F]
+        value >>= 7
+
+        while value:
+            encoded.insert(0, (value & 0x7F) | 0x80)
+            value >>= 7
+
+        return bytes(encoded)
+
+    def create_midi_data(self, tracks, ticks_per_beat=480):
+        """Helper method to create MIDI file data from a list of tracks of (delta_ticks, event_bytes) tuples."""
+
+        midi_data = b'MThd' + (6).to_bytes(4, 'big') + (1).to_bytes(2, 'big') + len(tracks).to_bytes(2, 'big') + \
+            ticks_per_beat.to_bytes(2, 'big')
+
+        for track in tracks:
+            track_data = b''.join(self.encode_variable_length(delta_ticks) + event for delta_ticks, event in track)
+            track_data += b'\x00\xff\x2f\x00'
+            midi_data += b'MTrk' + len(track_data).to_bytes(4, 'big') + track_data
+
+        return midi_data
+
+    def create_chord_track(self, chords, channel=0, ticks_per_chord=480):
+        """Helper method to create a track playing each of the passed chords in turn using running status."""
+
+        track = []
+
+        for chord in chords:
+            track.append((0, bytes([0x90 | channel, chord[0], 80])))
+            track.extend((0, bytes([midi_note, 80])) for midi_note in chord[1:])
+
+            #Velocity 0 note ons end the notes
+            track.append((ticks_per_chord, bytes([chord[0], 0])))
+            track.extend((0, bytes([midi_note, 0])) for midi_note in chord[1:])
+
+        return track
+
+    ## TEST METHODS ##
+
+    def test_progression(self):
+        """Test that a progression's chords are read and analyzed in the file's key signature."""
+
+        #Key signature of 0 sharps or flats in a major key
+        key_track = [(0, b'\xff\x59\x02\x00\x00')]
+        test_progression = create_midi_progression(self.create_midi_data([key_track, self.create_chord_track(self.test_chords)]))
+
+        assert test_progression.key == 'C'
+        assert test_progression.get_progression_chord_numerals() == ['I', 'IV', 'V', 'I']
+        assert [str(note) for note in test_progression.chords[2].notes] == ['G2', 'B3', 'D4', 'G4']
+
+    def test_spelling(self):
+        """Test that notes are spelled for the file's key signature or the declared key."""
+
+        #Key signature of 3 flats in a minor key, with a vii°7 - i progression
+        key_track = [(0, b'\xff\x59\x02\xfd\x01')]
+        midi_data = self.create_midi_data([key_track, self.create_chord_track([(47, 56, 62, 65), (48, 55, 63, 72)])])
+
+        test_progression = create_midi_progression(midi_data)
+
+        assert test_progression.key == 'c'
+        assert [str(note) for note in test_progression.chords[0].notes] == ['B2', 'Ab3', 'D4', 'F4']
+        assert test_progression.get_progression_chord_numerals() == ['viio7', 'i']
+
+        test_progression = create_midi_progression(midi_data, 'E')
+
+        assert test_progression.key == 'E'
+
+        #The key's D# is respelled as the minor third of the C minor chord
+        assert [str(note) for note in test_progression.chords[1].notes] == ['C3', 'G3', 'Eb4', 'C5']
+
+    def test_detected_key(self):
+        """Test that files without a key signature are spelled and analyzed in the key detected from their notes."""
+
+        #i - iv - V - i in E minor
+        midi_data = self.create_midi_data([self.create_chord_track([(40, 55, 64, 71), (45, 57, 64, 72), (47, 54, 63, 71),
+        (40, 55, 64, 71)])])
+
+        test_progression = create_midi_progression(midi_data)
+
+        assert test_progression.key == 'e'
+        assert [str(note) for note in test_progression.chords[2].notes] == ['B2', 'F#3', 'D#4', 'B4']
+        assert test_progression.get_progression_chord_numerals() == ['i', 'iv', 'V', 'i']
+
+    def test_chord_slices(self):
+        """Test that notes held across chords and overlapping tracks are grouped into slices."""
+
+        #A held bass note under two chords in another track, and a drum hit that is ignored
+        bass_track = [(0, b'\x91\x24\x50'), (960, b'\x81\x24\x00')]
+        upper_track = self.create_chord_track([(55, 64, 72), (57, 65, 72)])
+        drum_track = [(0, b'\x99\x24\x50'), (10, b'\x89\x24\x00')]
+
+        midi_file = read_midi(self.create_midi_data([bass_track, upper_track, drum_track]))
+
+        assert get_chord_slices(midi_file) == [(0, 480, (36, 55, 64, 72)), (480, 960, (36, 57, 65, 72))]
+
+    def test_short_slices(self):
+        """Test that slices shorter than the minimum duration are skipped and repeated slices are merged."""
+
+        #A chord played with its top note arriving slightly late, then repeated
+        track = [(0, b'\x90\x30\x50'), (0, b'\x37\x50'), (0, b'\x40\x50'), (10, b'\x48\x50'),
+        (470, b'\x48\x00'), (0, b'\x48\x50'), (480, b'\x30\x00'), (0, b'\x37\x00'), (0, b'\x40\x00'), (0, b'\x48\x00')]
+
+        midi_file = read_midi(self.create_midi_data([track]))
+
+        assert get_chord_slices(midi_file) == [(10, 960, (48, 55, 64, 72))]
+        assert len(get_chord_slices(midi_file, 0)) == 2
+
+    def test_invalid_data(self):
+        """Test that invalid or truncated MIDI data raises a ValueError."""
+
+        midi_data = self.create_midi_data([self.create_chord_track(self.test_chords)])
+
+        with pytest.raises(ValueError):
+            read_midi(b'RIFF' + midi_data[4:])
+
+        with pytest.raises(ValueError):
+            read_midi(midi_data[:-20])
+
+    def test_note_names_for_key(self):
+        """Test the spelling of each note index for major and minor keys."""
+
+        assert get_note_names_for_key('C') == ('C', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B')
+        assert get_note_names_for_key('f#') == ('B#', 'C#', 'D', 'D#', 'E', 'E#', 'F#', 'G', 'G#', 'A', 'A#', 'B')
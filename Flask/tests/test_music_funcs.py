@@ -0,0 +1,47 @@
+"""Contains the TestMusicFuncs class for testing the records returned by the music_funcs API."""
+
+from api import music_funcs
+from api.chord import ChordFactory
+from api.serializer import format_chord_keys
+
+class TestMusicFuncs:
+    """Test functions for the generate_progression API function and its chord records."""
+
+    def test_chord_keys(self):
+        """Test that chord notes are converted to VexFlow keys in the chord's sorted note order."""
+
+        test_factory = ChordFactory()
+
+        assert format_chord_keys(test_factory.create_chord('C4,E4,G4')) == ['c/4', 'e/4', 'g/4']
+        assert format_chord_keys(test_factory.create_chord('F#3,A3,D4,C#5')) == ['f#/3', 'a/3', 'd/4', 'c#/5']
+        assert format_chord_keys(test_factory.create_chord('Bbb6,Eb7,Gb7')) == ['bbb/6', 'eb/7', 'gb/7']
+        assert format_chord_keys(test_factory.create_chord('Gx0,B0,D#1')) == ['gx/0', 'b/0', 'd#/1']
+
+    def test_progression_records(self):
+        """Test the chord records returned for a progression with and without validation."""
+
+        progression_info = music_funcs.generate_progression(['G2,B3,D4,G4', 'D3,A3,F#4,C5', 'G2,B3,D4,B4'], 'G')
+
+        assert progression_info['chords'] == [
+            {'name': 'G', 'numeral': 'I', 'notes': ['g/2', 'b/3', 'd/4', 'g/4'], 'accidentals': ['', '', '', ''],
+            'voice_leading': None},
+            {'name': 'D7', 'numeral': 'V7', 'notes': ['d/3', 'a/3', 'f#/4', 'c/5'], 'accidentals': ['', '', '', ''],
+            'voice_leading': {'motion': [7, -2, 4, 5], 'total_motion': 18, 'max_motion': 7, 'common_tones': 0,
+            'contrary_motion': 3, 'similar_motion': 3}},
+            {'name': 'G', 'numeral': 'I', 'notes': ['g/2', 'b/3', 'd/4', 'b/4'], 'accidentals': ['', '', '', ''],
+            'voice_leading': {'motion': [-7, 2, -4, -1], 'total_motion': 14, 'max_motion': 7, 'common_tones': 0,
+            'contrary_motion': 3, 'similar_motion': 3}},
+        ]
+        assert progression_info['satb_errors'] == []
+
+        progression_info = music_funcs.generate_progression(['C4,E4,G4', 'invalid'], 'Am', False)
+
+        assert len(progression_info['chords']) == 1
+        assert progression_info['chords'][0]['numeral'] == 'III'
+        assert 'satb_errors' not in progression_info
+
+    def test_no_valid_chords(self):
+        """Test the error returned when none of the chords passed are valid."""
+
+        assert music_funcs.generate_progression([], 'C') == {'error': 'NO_VALID_CHORDS'}
+        assert music_funcs.generate_progression(['C4,E4', 'X4,Y4,Z4'], 'C') == {'error': 'NO_VALID_CHORDS'}
@@ -0,0 +1,124 @@
+"""Contains the TestMusicXML class for testing MusicXML import and export of chord progressions."""
+
+import io
+
+import pytest
+
+from api.music_funcs import create_progression
+from api.musicxml import import_musicxml, iter_musicxml, read_musicxml_chords
+
+class TestMusicXML:
+    """Test functions for reading chords from MusicXML scores and writing analyzed progressions."""
+
+    #I - V6/5/V - V - I
+    test_chords = ['C3,G3,E4,C5', 'F#2,A3,D4,C5', 'G2,B3,D4,G4', 'C3,G3,E4,C5']
+
+    ## HELPER METHODS ##
+
+    def create_note(self, step, octave, duration, alter=0, is_chord=False, extra=''):
+        """Helper method to create a MusicXML note element."""
+
+        alter_element = f'<alter>{alter}</alter>' if alter else ''
+        chord_element = '<chord/>' if is_chord else ''
+
+        return f'<note>{chord_element}{extra}<pitch><step>{step}</step>{alter_element}<octave>{octave}</octave></pitch>' + \
+            f'<duration>{duration}</duration></note>'
+
+    def create_score(self, parts, fifths=0, mode='major'):
+        """Helper method to create a partwise score from a list of parts, each a list of measure contents."""
+
+        score = '<?xml version="1.0" encoding="UTF-8"?><score-partwise version="4.0"><part-list/>'
+
+        for part_index, measures in enumerate(parts):
+            score += f'<part id="P{part_index+1}">'
+
+            for measure_index, measure in enumerate(measures):
+                attributes = f'<attributes><divisions>2</divisions><key><fifths>{fifths}</fifths><mode>{mode}</mode></key>' + \
+                    '</attributes>' if measure_index == 0 else ''
+                score += f'<measure number="{measure_index+1}">{attributes}{measure}</measure>'
+
+            score += '</part>'
+
+        return io.StringIO(score + '</score-partwise>')
+
+    ## TEST METHODS ##
+
+    def test_read_chords(self):
+        """Test that notes across parts, voices and chord elements are grouped into chords."""
+
+        #Upper voices as chords in one part with a grace note, and a bass line in a second voice of another part
+        upper_part = [
+            self.create_note('E', 4, 4) + self.create_note('G', 4, 4, is_chord=True) +
+            self.create_note('C', 5, 4, is_chord=True) +
+            self.create_note('D', 5, 1, extra='<grace/>') + self.create_note('D', 4, 4) +
+            self.create_note('B', 4, 4, is_chord=True)
+        ]
+        lower_part = [
+            '<forward><duration>8</duration></forward><backup><duration>8</duration></backup>' +
+            self.create_note('C', 3, 2) + self.create_note('A', 2, 2) + self.create_note('G', 2, 4)
+        ]
+
+        chords, key = read_musicxml_chords(self.create_score([upper_part, lower_part]))
+
+        assert chords == ['C3,E4,G4,C5', 'A2,E4,G4,C5', 'G2,D4,B4']
+        assert key == 'C'
+
+    def test_read_key_and_spelling(self):
+        """Test that a minor key signature and altered notes are read."""
+
+        measure = self.create_note('F', 3, 8, alter=1) + self.create_note('A', 3, 8, is_chord=True) + \
+            self.create_note('C', 4, 8, is_chord=True) + self.create_note('E', 4, 8, alter=-1, is_chord=True)
+
+        chords, key = read_musicxml_chords(self.create_score([[measure]], -3, 'minor'))
+
+        assert chords == ['F#3,A3,C4,Eb4']
+        assert key == 'c'
+
+    def test_decimal_durations(self):
+        """Test that decimal durations are read, and that notes with microtonal alters are skipped."""
+
+        measure = self.create_note('C', 4, 2.5) + self.create_note('E', 4, 2.5, is_chord=True) + \
+            self.create_note('G', 4, 2.5, is_chord=True) + self.create_note('D', 4, 1.5) + \
+            self.create_note('F', 4, 1.5, is_chord=True) + self.create_note('A', 4, 1.5, is_chord=True) + \
+            self.create_note('B', 3, 4) + self.create_note('D', 4, 4, is_chord=True) + \
+            self.create_note('G', 4, 4, is_chord=True) + self.create_note('F', 4, 4, alter=0.5, is_chord=True)
+
+        chords, _ = read_musicxml_chords(self.create_score([[measure]]))
+
+        assert chords == ['C4,E4,G4', 'D4,F4,A4', 'B3,D4,G4']
+
+    def test_export_and_import(self):
+        """Test that an exported progression is read back with the same analysis."""
+
+        test_progression = create_progression(self.test_chords, 'G')
+        musicxml = ''.join(iter_musicxml(test_progression))
+
+        assert '<fifths>1</fifths>' in musicxml
+        assert '<text>V6/5</text>' in musicxml
+        assert musicxml.count('<measure ') == 4
+
+        progression_info = import_musicxml(io.StringIO(musicxml), validate=False)
+
+        assert progression_info['key'] == 'G'
+        assert [chord['numeral'] for chord in progression_info['chords']] == ['IV', 'V6/5', 'I', 'IV']
+
+    def test_export_satb_errors(self):
+        """Test that SATB errors are written as comments in the measure of the chord they were found in."""
+
+        #Parallel 5ths and 8ves between I and ii
+        test_progression = create_progression(['C3,G3,E4,C5', 'D3,A3,F4,D5'], 'C')
+        measures = ''.join(iter_musicxml(test_progression)).split('<measure ')
+
+        assert '<!--' not in measures[1]
+        assert '<!-- Parallel 5ths between chords 1 and 2' in measures[2]
+
+        assert '<!--' not in ''.join(iter_musicxml(test_progression, validate=False))
+
+    def test_invalid_scores(self):
+        """Test that timewise or malformed scores raise errors."""
+
+        with pytest.raises(ValueError):
+            read_musicxml_chords(io.StringIO('<score-timewise version="4.0"></score-timewise>'))
+
+        with pytest.raises(SyntaxError):
+            read_musicxml_chords(io.StringIO('<score-partwise><part>'))
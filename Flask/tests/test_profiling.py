@@ -0,0 +1,111 @@
+"""Contains the TestProfiling class for testing the opt-in profiler for '/analysis' requests."""
+
+import cProfile
+import os
+import pstats
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_wtf')
+
+from app import create_app
+from app.profiling import PROFILE_HEADER, PROFILE_NAME_HEADER, AnalysisProfiler, get_collapsed_stacks
+from config import Config
+
+class TestProfiling:
+    """Test functions for choosing requests to profile and the profiles saved for them."""
+
+    #I - V - I
+    test_form = {'key': 'C', 'time': '4/4', 'chords-0': 'C3,G3,E4,C5', 'chords-1': 'G2,B3,D4,G4', 'chords-2': 'C3,G3,E4,C5'}
+
+    ## HELPER METHODS ##
+
+    def create_client(self, **config):
+        """Helper method to create a test client for an app with the passed configuration."""
+
+        config_class = type('TestConfig', (Config,), {'PROFILE_DIR': None, 'PROFILE_ALL': False,
+        'PROFILE_SAMPLE_RATE': 0.0, 'PROFILE_TOKEN': None, **config})
+        app = create_app(config_class)
+
+        return (app, app.test_client())
+
+    ## TEST METHODS ##
+
+    def test_disabled(self, tmp_path):
+        """Test that no profiler is added without a directory and a way of choosing requests."""
+
+        for config in ({}, {'PROFILE_DIR': str(tmp_path)}, {'PROFILE_ALL': True, 'PROFILE_TOKEN': 'secret'}):
+            app, client = self.create_client(**config)
+
+            assert 'analysis_profiler' not in app.extensions
+
+            response = client.post('/analysis', data=self.test_form, headers={PROFILE_HEADER: 'secret'})
+
+            assert response.status_code == 200
+            assert PROFILE_NAME_HEADER not in response.headers
+
+        assert os.listdir(tmp_path) == []
+
+    def test_header_token(self, tmp_path):
+        """Test that requests are only profiled when they send the configured token."""
+
+        _, client = self.create_client(PROFILE_DIR=str(tmp_path), PROFILE_TOKEN='secret')
+
+        assert PROFILE_NAME_HEADER not in client.post('/analysis', data=self.test_form).headers
+        assert PROFILE_NAME_HEADER not in client.post('/analysis', data=self.test_form,
+        headers={PROFILE_HEADER: 'wrong'}).headers
+
+        response = client.post('/analysis', data=self.test_form, headers={PROFILE_HEADER: 'secret'})
+        profile_name = response.headers[PROFILE_NAME_HEADER]
+
+        assert response.get_json()['chords']['chords'][1]['numeral'] == 'V'
+        assert profile_name.endswith(f'-3chords-C-{os.getpid()}')
+        assert sorted(os.listdir(tmp_path)) == [profile_name + '.collapsed', profile_name + '.prof']
+
+        stats = pstats.Stats(str(tmp_path / (profile_name + '.prof')))
+
+        assert any(function_name == 'generate_progression' for _, _, function_name in stats.stats)
+
+        with open(tmp_path / (profile_name + '.collapsed')) as collapsed_file:
+            assert any('generate_progression(music_funcs.py' in line for line in collapsed_file)
+
+    def test_rotation(self, tmp_path):
+        """Test that only the newest profiles are kept when every request is profiled."""
+
+        _, client = self.create_client(PROFILE_DIR=str(tmp_path), PROFILE_ALL=True, PROFILE_MAX_PROFILES=2)
+
+        profile_names = [client.post('/analysis', data=self.test_form).headers[PROFILE_NAME_HEADER] for _ in range(4)]
+
+        assert sorted(os.listdir(tmp_path)) == sorted(f'{profile_name}{extension}' for profile_name in profile_names[2:]
+        for extension in ('.collapsed', '.prof'))
+
+    def test_concurrent_profiles(self, tmp_path):
+        """Test that a request arriving while another is profiled is analyzed without being profiled."""
+
+        profiler = AnalysisProfiler(str(tmp_path))
+
+        def analyze():
+            return profiler.profile(sum, ([1, 2],), 'C', 2)
+
+        (result, nested_profile_name), profile_name = profiler.profile(analyze, (), 'C', 2)
+
+        assert result == 3 and nested_profile_name is None
+        assert sorted(os.listdir(tmp_path)) == [profile_name + '.collapsed', profile_name + '.prof']
+        assert profiler.profile(sum, ([1, 2],), 'C', 2)[1] is not None
+
+    def test_collapsed_stacks(self):
+        """Test that collapsed stacks nest callees under their callers with their time in microseconds."""
+
+        def inner():
+            return sum(range(200000))
+
+        def outer():
+            return inner() + inner()
+
+        profiler = cProfile.Profile()
+        profiler.runcall(outer)
+        stacks = dict(line.rsplit(' ', 1) for line in get_collapsed_stacks(pstats.Stats(profiler)))
+
+        assert any(stack.startswith('outer(') and ';inner(' in stack for stack in stacks)
+        assert all(int(stack_time) > 0 for stack_time in stacks.values())
@@ -0,0 +1,84 @@
+"""Contains the TestProgressionPatterns class for testing the detection of cadences and schemata in numerals."""
+
+from api import music_funcs
+from api.progression_patterns import PATTERN_LIBRARY, PatternAutomaton, PatternMatch, find_patterns
+
+class TestProgressionPatterns:
+    """Test functions for matching the pattern library, wildcards and custom patterns in one pass over the numerals."""
+
+    ## HELPER METHODS ##
+
+    def get_names(self, numerals, kind=None):
+        """Helper method to return the names of the patterns matched in the passed numerals, of the passed kind."""
+
+        return [pattern_match.name for pattern_match in find_patterns(numerals)
+        if kind is None or pattern_match.kind == kind]
+
+    ## TEST METHODS ##
+
+    def test_cadences(self):
+        """Test that each kind of cadence is found where the progression's numerals end it."""
+
+        assert self.get_names(['I', 'IV', 'V7', 'I'], 'cadence') == ['PAC']
+        assert self.get_names(['i', 'iv', 'V6/5', 'i'], 'cadence') == ['IAC']
+        assert self.get_names(['I', 'viio6', 'I'], 'cadence') == ['IAC']
+        assert self.get_names(['I', 'IV', 'V'], 'cadence') == ['half']
+        assert self.get_names(['I', 'V7', 'vi'], 'cadence') == ['deceptive']
+        assert self.get_names(['I', 'IV', 'I'], 'cadence') == ['plagal']
+
+        #A half cadence only ends the progression
+        assert self.get_names(['I', 'V', 'IV'], 'cadence') == []
+
+    def test_schemata(self):
+        """Test that schemata are found with their chord spans, overlapping any other matches."""
+
+        assert find_patterns(['I', 'ii6', 'I6/4', 'V7', 'I']) == [PatternMatch('cadential 6/4', 'schema', 2, 4),
+        PatternMatch('PAC', 'cadence', 3, 5)]
+        assert find_patterns(['I', 'ii6/5', 'V', 'I']) == [PatternMatch('PAC', 'cadence', 2, 4),
+        PatternMatch('ii-V-I', 'schema', 1, 4)]
+        assert self.get_names(['I', 'V', 'vi', 'iii', 'IV', 'I', 'IV', 'V'], 'schema') == ['Pachelbel']
+        assert self.get_names(['i', 'N6', 'V7', 'i'], 'schema') == ['Neapolitan']
+
+    def test_wildcards(self):
+        """Test that wildcards match any inversion or applied numeral, and only applied numerals match applied ones."""
+
+        pattern_automaton = PatternAutomaton((('inverted V', 'test', 'V*'), ('applied V', 'test', 'V*/*'),
+        ('to ii', 'test', '*/ii'), ('V7 to any', 'test', 'V7/*'), ('any', 'test', '* *'), ('end', 'test', 'I $')))
+
+        assert [pattern_match.name for pattern_match in pattern_automaton.find_matches(['V4/3', 'I'])] == \
+            ['inverted V', 'any', 'end']
+        assert [pattern_match.name for pattern_match in pattern_automaton.find_matches(['V6/5/ii'])] == \
+            ['applied V', 'to ii']
+        assert [pattern_match.name for pattern_match in pattern_automaton.find_matches(['V7/IV', 'IV'])] == \
+            ['applied V', 'V7 to any', 'any']
+        assert pattern_automaton.find_matches(['viio7/V', 'I6/4']) == [PatternMatch('any', 'test', 0, 2)]
+
+    def test_single_pass(self):
+        """Test that many patterns are matched together, and that repeated numerals only use the moves already built."""
+
+        numerals = ['I', 'vi', 'ii6', 'I6/4', 'V7', 'I', 'IV', 'V6/5/V', 'V', 'I']
+        extra_patterns = tuple((f'extra {i}', 'test', f'I vi IV {i % 7 + 1}') for i in range(0, 300))
+        pattern_automaton = PatternAutomaton(PATTERN_LIBRARY + extra_patterns)
+
+        assert pattern_automaton.find_matches(numerals) == find_patterns(numerals)
+
+        num_states = len(pattern_automaton.transitions)
+        num_moves = sum(len(transitions) for transitions in pattern_automaton.transitions)
+
+        #Reading the numerals again only builds the moves between the repeats and to the end
+        assert len(pattern_automaton.find_matches(numerals * 100)) == 100 * len(find_patterns(numerals))
+        assert len(pattern_automaton.transitions) == num_states
+        assert sum(len(transitions) for transitions in pattern_automaton.transitions) <= num_moves + 2
+
+    def test_analysis(self):
+        """Test that the analysis returns its patterns, with authentic cadences without the tonic above as imperfect."""
+
+        chords = ['C3,G3,E4,C5', 'F3,A3,D4,A4', 'G2,G3,D4,B4', 'C3,G3,E4,C5']
+        progression_info = music_funcs.generate_progression(chords, 'C')
+
+        assert progression_info['patterns'] == [{'name': 'PAC', 'kind': 'cadence', 'start': 2, 'stop': 4},
+        {'name': 'ii-V-I', 'kind': 'schema', 'start': 1, 'stop': 4}]
+
+        progression_info = music_funcs.generate_progression(chords[0:3] + ['C3,G3,C4,E4'], 'C')
+
+        assert progression_info['patterns'][0]['name'] == 'IAC'
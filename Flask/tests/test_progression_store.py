@@ -0,0 +1,148 @@
+"""Contains the TestProgressionStore class for testing progression sessions and their delta updates."""
+
+from api import music_funcs
+from api.progression_store import ProgressionSession, ProgressionStore
+
+class TestProgressionStore:
+    """Test functions for ProgressionSession updates and ProgressionStore eviction."""
+
+    #I - V4/3 - viiø4/3 - I6 - bVI - iv - iio6/5 - V - I
+    test_chords = ['E2,B3,E4,G#4', 'F#2,B3,D#4,A4', 'A2,C#4,F#4,D#5', 'G#2,B3,G#4,E5', 'C3,G3,E4,C5',
+    'A2,A3,E4,C5', 'A2,C4,F#4,E5', 'B2,B3,F#4,D#5', 'E2,B3,G#4,E5']
+
+    ## HELPER METHODS ##
+
+    def apply_update(self, state, update):
+        """Helper method to merge a session's update into a client-side copy of its state."""
+
+        for chord_update in update['chords']:
+            while chord_update['slot'] >= len(state['slots']):
+                state['slots'].append(None)
+
+            state['slots'][chord_update['slot']] = chord_update['chord']
+
+        if update['satb_errors'] is None:
+            state['errors'] = None
+
+        else:
+            if state['errors'] is None:
+                state['errors'] = []
+
+            for error_update in update['satb_errors']:
+                while error_update['index'] >= len(state['errors']):
+                    state['errors'].append([])
+
+                state['errors'][error_update['index']] = error_update['messages']
+
+            del state['errors'][update['num_chords']:]
+
+    def compare_with_full_analysis(self, state, chords, key, validate):
+        """Helper method to compare a client-side state with the full analysis of the same progression."""
+
+        progression_info = music_funcs.generate_progression(chords, key, validate)
+        expected_chords = progression_info.get('chords', [])
+
+        assert [chord for chord in state['slots'] if chord is not None] == expected_chords
+
+        if validate:
+            assert [message for messages in state['errors'] for message in messages] == progression_info.get('satb_errors', [])
+
+        else:
+            assert state['errors'] is None
+
+
+    def test_slot_updates(self):
+        """Test that updating chord slots returns only the changed results and matches a full analysis."""
+
+        chords = list(self.test_chords)
+        test_session = ProgressionSession(chords, 'E', True)
+
+        state = {'slots': [], 'errors': None}
+        self.apply_update(state, test_session.get_state())
+        self.compare_with_full_analysis(state, chords, 'E', True)
+
+        #Replace a chord with one causing parallel 5ths and octaves
+        chords[4] = 'B2,F#3,D#4,B4'
+        update = test_session.update({4: chords[4]})
+
+        assert len(update['chords']) <= 3
+        assert len(update['satb_errors']) <= 3
+        self.apply_update(state, update)
+        self.compare_with_full_analysis(state, chords, 'E', True)
+
+        #Invalidate a chord, shifting the position of the chords following it
+        chords[2] = 'X4,E4'
+        self.apply_update(state, test_session.update({2: chords[2]}))
+        self.compare_with_full_analysis(state, chords, 'E', True)
+
+        #Add a chord in a new slot and fix the invalid chord
+        chords[2] = 'A2,C#4,F#4,D#5'
+        chords.append('B2,B3,F#4,D#5')
+        self.apply_update(state, test_session.update({2: chords[2], 9: chords[9]}))
+        self.compare_with_full_analysis(state, chords, 'E', True)
+
+    def test_key_and_validation_updates(self):
+        """Test that changing the key or validation option updates the full progression."""
+
+        chords = list(self.test_chords)
+        test_session = ProgressionSession(chords, 'E', False)
+
+        state = {'slots': [], 'errors': None}
+        self.apply_update(state, test_session.get_state())
+        self.compare_with_full_analysis(state, chords, 'E', False)
+
+        self.apply_update(state, test_session.update(validate=True))
+        self.compare_with_full_analysis(state, chords, 'E', True)
+
+        chords[0] = 'E2,B3,E4,G4'
+        self.apply_update(state, test_session.update({0: chords[0]}, 'Em'))
+        self.compare_with_full_analysis(state, chords, 'Em', True)
+
+        self.apply_update(state, test_session.update(validate=False))
+        self.compare_with_full_analysis(state, chords, 'Em', False)
+
+    def test_cancelled_updates(self):
+        """Test that cancelled updates return nothing and leave their chords to be analyzed by the next update."""
+
+        chords = list(self.test_chords)
+        test_session = ProgressionSession(chords, 'E', True)
+
+        state = {'slots': [], 'errors': None}
+        self.apply_update(state, test_session.get_state())
+
+        #Cancel one update before its chords are identified, and the next before they're validated
+        chords[2] = 'X4,E4'
+        assert test_session.update({2: chords[2]}, cancelled=lambda: True) is None
+
+        checks = iter([False, True])
+        chords[4] = 'B2,F#3,D#4,B4'
+        assert test_session.update({4: chords[4]}, validate=True, cancelled=lambda: next(checks)) is None
+
+        update = test_session.update({8: chords[8]}, cancelled=lambda: False)
+
+        assert {chord_update['slot'] for chord_update in update['chords']} >= {2, 4}
+        self.apply_update(state, update)
+        self.compare_with_full_analysis(state, chords, 'E', True)
+
+    def test_store_eviction(self):
+        """Test that the store evicts its least recently used and idle sessions."""
+
+        test_store = ProgressionStore(max_sessions=2, idle_timeout=60)
+
+        first_id, _ = test_store.create(self.test_chords, 'E')
+        second_id, _ = test_store.create(self.test_chords, 'E')
+
+        assert test_store.get(first_id) is not None
+
+        third_id, _ = test_store.create(self.test_chords, 'E')
+
+        assert len(test_store) == 2
+        assert test_store.get(second_id) is None
+        assert test_store.get(first_id) is not None
+
+        test_store.get(third_id).last_used -= 120
+        test_store.get(first_id).last_used -= 120
+
+        assert test_store.get(third_id) is None
+        assert test_store.get(first_id) is None
+        assert len(test_store) == 0
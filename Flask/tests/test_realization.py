@@ -0,0 +1,100 @@
+"""Contains the TestRealization class for testing the realization of numerals and figured bass as SATB voicings."""
+
+import pytest
+
+from api import music_funcs
+from api.chord_progression import ChordProgression
+from api.metrics import collect_metrics
+from api.realization import realize_figured_bass, realize_numerals
+from api.satb_validator import validate_progression
+
+class TestRealization:
+    """Test functions for the voicings found by the beam search following the SATB rules, and its route."""
+
+    #Phrases with diatonic, applied and chromatic numerals, and the key they're in
+    test_phrases = [(['I', 'IV', 'V7', 'I'], 'C'), (['I', 'vi', 'ii6', 'V', 'I'], 'Eb'), (['i', 'iv', 'V', 'i'], 'a'),
+    (['I', 'V6/5/V', 'V', 'I'], 'C'), (['I', 'N6', 'V7', 'I'], 'C'), (['i', 'iio6', 'V4/3', 'i6'], 'f#')]
+
+    ## TEST METHODS ##
+
+    def test_numerals(self):
+        """Test that numerals are realized with four voices, without breaking any rules, as the numerals passed."""
+
+        for numerals, key in self.test_phrases:
+            chords = realize_numerals(numerals, key)
+
+            assert all(len(chord) == 4 for chord in chords)
+            assert validate_progression(chords, key) == []
+            assert ChordProgression(chords, key).get_progression_chord_numerals() == numerals
+
+    def test_voice_leading(self):
+        """Test that the realization with the least voice leading is found, keeping common tones."""
+
+        chords = realize_numerals(['I', 'IV', 'I'], 'C')
+
+        #The common tone C is held in the same voice between I and IV, and the upper voices move by step at most
+        held_voices = [i for i in range(0, 4) if chords[0].notes[i].value == chords[1].notes[i].value]
+
+        assert held_voices and all(chords[0].notes[i].name == 'C' for i in held_voices)
+        assert all(abs(note.value - next_note.value) <= 2 for chord, next_chord in zip(chords, chords[1:])
+        for note, next_note in zip(chord.notes[1:], next_chord.notes[1:]))
+
+    def test_figured_bass(self):
+        """Test that figured bass keeps its bass notes, spelling its figures by the key or their accidentals."""
+
+        chords = realize_figured_bass([('C3', ''), ('D3', '4/3'), ('E3', '6'), ('F3', ''), ('G2', '7'), ('C3', '')],
+        'C')
+
+        assert [chord.notes[0].value for chord in chords] == [36, 38, 40, 41, 31, 36]
+        assert ChordProgression(chords, 'C').get_progression_chord_numerals() == ['I', 'V4/3', 'I6', 'IV', 'V7', 'I']
+        assert validate_progression(chords, 'C') == []
+
+        chords = realize_figured_bass([('A2', ''), ('E2', '#'), ('A2', '')], 'a')
+
+        assert 'G#' in chords[1].get_note_names()
+        assert ChordProgression(chords, 'a').get_progression_chord_numerals() == ['i', 'V', 'i']
+
+    def test_invalid_input(self):
+        """Test that unknown numerals, unsupported keys and unreadable figures are reported, and not recorded."""
+
+        before = collect_metrics()
+
+        for numerals, key in ((['I', 'Q7'], 'C'), (['I', 'V/H'], 'C'), (['I'], 'H')):
+            with pytest.raises(ValueError):
+                realize_numerals(numerals, key)
+
+        with pytest.raises(ValueError):
+            realize_figured_bass([('C3', '9/8')], 'C')
+
+        #The voicings tried while searching aren't counted in the engine's error metrics
+        realize_numerals(['I', 'V', 'I'], 'G')
+
+        assert collect_metrics().get(('error_count', 'ERR_PARALLEL_8TH'), 0) == \
+            before.get(('error_count', 'ERR_PARALLEL_8TH'), 0)
+
+    def test_music_funcs(self):
+        """Test that realized progressions are analyzed and returned with their chord strings."""
+
+        progression_info = music_funcs.generate_realization(['i', 'V7', 'i'], 'Am')
+
+        assert [chord['numeral'] for chord in progression_info['chords']] == ['i', 'V7', 'i']
+        assert progression_info['satb_errors'] == []
+        assert len(progression_info['chord_strings'][0].split(',')) == 4
+
+        assert music_funcs.generate_realization(None, 'C', ['C3', 'G2 7', 'C3'])['chord_strings'][1].startswith('G2,')
+        assert music_funcs.generate_realization(['I', 'Q'], 'C') == {'error': 'INVALID_REALIZATION'}
+        assert music_funcs.generate_realization(['I'], 'H') == {'error': 'INVALID_KEY'}
+
+    def test_realize_route(self):
+        """Test that the '/analysis/realize' route realizes the posted numerals."""
+
+        pytest.importorskip('flask')
+
+        from app import create_app
+
+        client = create_app().test_client()
+        response = client.post('/analysis/realize', data={'numerals': 'I, IV, V, I', 'key': 'G'})
+
+        assert response.status_code == 200
+        assert len(response.get_json()['chord_strings']) == 4
+        assert client.post('/analysis/realize', data={'numerals': 'I, Z'}).status_code == 400
@@ -0,0 +1,109 @@
+"""Contains the TestRepair class for testing the repairs suggested for a progression's SATB errors."""
+
+import pytest
+
+from api import music_funcs
+from api.note import NoteFactory
+from api.repair import suggest_repairs
+from api.satb_validator import validate_progression
+
+class TestRepair:
+    """Test functions for the smallest voice moves clearing each error without adding any others."""
+
+    #I - V - I with parallel 5ths and 8ves into and out of V
+    parallel_chords = ['C3,G3,E4,C5', 'G2,D4,B4,G5', 'C3,G3,E4,C5']
+
+    #I - V - I with V's leading tone doubled, and left unresolved in the tenor
+    doubled_chords = ['C3,G3,E4,C5', 'G2,B3,B4,D5', 'C3,G3,E4,C5']
+
+    ## HELPER METHODS ##
+
+    def apply_changes(self, chords, changes):
+        """Helper method to return the chord strings with each change's voice set to its note."""
+
+        chord_notes = [chord.split(',') for chord in chords]
+
+        for change in changes:
+            chord_notes[change['chord_index'] - 1][change['voice_index']] = change['note']
+
+        return [','.join(notes) for notes in chord_notes]
+
+    def get_error_keys(self, chords, key='C'):
+        """Helper method to return the code and details of each error found in the chord strings."""
+
+        progression = music_funcs.create_progression(chords, key)
+
+        return {(error['code'], str(error['details'])) for error in validate_progression(progression.chords, key)}
+
+    ## TEST METHODS ##
+
+    def test_repairs(self):
+        """Test that each suggestion clears its error without adding errors anywhere in the progression."""
+
+        for chords in (self.parallel_chords, self.doubled_chords):
+            errors = self.get_error_keys(chords)
+            repairs = suggest_repairs(music_funcs.create_progression(chords, 'C').chords, 'C')
+
+            assert {(repair['error']['code'], str(repair['error']['details'])) for repair in repairs} == errors
+
+            for repair in repairs:
+                assert repair['suggestions']
+
+                for suggestion in repair['suggestions']:
+                    repaired_errors = self.get_error_keys(self.apply_changes(chords, suggestion['changes']))
+
+                    assert (repair['error']['code'], str(repair['error']['details'])) not in repaired_errors
+                    assert repaired_errors < errors
+
+    def test_ranking(self):
+        """Test that single notes are moved before pairs, by the fewest semitones, keeping the bass's note name."""
+
+        repairs = suggest_repairs(music_funcs.create_progression(self.parallel_chords, 'C').chords, 'C')
+
+        for repair in repairs:
+            edits = [(len(suggestion['changes']), suggestion['semitones']) for suggestion in repair['suggestions']]
+
+            assert edits == sorted(edits) and len(edits) <= 3
+
+            for suggestion in repair['suggestions']:
+                for change in suggestion['changes']:
+                    chord_notes = self.parallel_chords[change['chord_index'] - 1].split(',')
+
+                    #Notes are only moved to another of the chord's notes, and the bass only by octaves
+                    assert NoteFactory().parse_note(change['note'])[0] in [note[0:-1] for note in chord_notes]
+
+                    if change['voice_index'] == 0:
+                        assert change['note'][0:-1] == chord_notes[0][0:-1]
+
+        assert repairs[0]['suggestions'][0] == {'changes': [{'chord_index': 1, 'voice_index': 1, 'note': 'E3'}],
+        'semitones': 3}
+
+    def test_budget(self):
+        """Test that errors are still returned when the time budget is spent, and unrepairable errors have none."""
+
+        chords = music_funcs.create_progression(self.parallel_chords, 'C').chords
+        repairs = suggest_repairs(chords, 'C', time_budget=0)
+
+        assert len(repairs) == len(validate_progression(chords, 'C'))
+        assert all(repair['suggestions'] == [] for repair in repairs)
+
+        repairs = suggest_repairs(music_funcs.create_progression(['C3,G3,E4,C5', 'G2,D4,B4'], 'C').chords, 'C')
+
+        assert [repair['error']['code'] for repair in repairs] == ['ERR_NUM_VOICES']
+        assert repairs[0]['suggestions'] == []
+
+    def test_repairs_route(self):
+        """Test that the '/analysis/repairs' route returns each error's message and repairs."""
+
+        pytest.importorskip('flask')
+        pytest.importorskip('flask_wtf')
+
+        from app import create_app
+
+        client = create_app().test_client()
+        form = {f'chords-{i}': chord for i, chord in enumerate(self.doubled_chords)}
+        response = client.post('/analysis/repairs', data={**form, 'key': 'C'})
+
+        assert response.status_code == 200
+        assert response.get_json()['repairs'][0]['message'] == 'Chord 2 has a doubled leading tone.'
+        assert client.post('/analysis/repairs', data={'key': 'C'}).status_code == 400
@@ -0,0 +1,76 @@
+"""Contains the TestRespelling class for testing the enharmonic respelling of chords for their key."""
+
+import pytest
+
+from api import music_funcs
+from api.chord import ChordFactory
+from api.respelling import respell_chord, respell_chords
+
+class TestRespelling:
+    """Test functions for respelling chords' notes as the chords they're identified as, with the fewest accidentals."""
+
+    ## HELPER METHODS ##
+
+    def respell(self, chord_string, key):
+        """Helper method to return the note strings of the passed chord respelled in the passed key."""
+
+        return [str(note) for note in respell_chord(ChordFactory().create_chord(chord_string), key).notes]
+
+    ## TEST METHODS ##
+
+    def test_awkward_spellings(self):
+        """Test that notes spelled awkwardly for the key or the chord are respelled."""
+
+        assert self.respell('G2,B3,D4,Gb4', 'G') == ['G2', 'B3', 'D4', 'F#4']
+        assert self.respell('Cb3,Eb3,Gb4', 'C') == ['D#3', 'B3', 'F#4']
+        assert self.respell('Db3,Fb3,Abb3,Cbb4', 'C') == ['C#3', 'E3', 'G3', 'Bb4']
+        assert self.respell('E3,Ab3,B3', 'E') == ['E3', 'G#3', 'B3']
+        assert self.respell('C3,D#3,G3', 'C') == ['C3', 'Eb3', 'G3']
+
+    def test_kept_spellings(self):
+        """Test that chords already spelled as well as any other spelling, like augmented sixths, are unchanged."""
+
+        chord_factory = ChordFactory()
+
+        for chord_string, key in (('C3,G3,E4,C5', 'C'), ('B2,F3,Ab3,D4', 'c'), ('E3,G#3,B3', 'a')):
+            chord = chord_factory.create_chord(chord_string)
+
+            assert respell_chord(chord, key) is chord
+
+        assert self.respell('Ab2,C4,F#4,C5', 'C') == ['Ab2', 'C4', 'F#4', 'C5']
+        assert self.respell('Ab2,C4,Gb4,C5', 'C') == ['Ab2', 'C4', 'Gb4', 'C5']
+
+    def test_identification(self):
+        """Test that enharmonic duplicates are unified, so the respelled chord is identified."""
+
+        chord = ChordFactory().create_chord('C3,B#3,E4,G4')
+        respelled_chord = respell_chords([chord], 'C')[0]
+
+        assert chord.quality == 'unknown'
+        assert [str(note) for note in respelled_chord.notes] == ['C3', 'C3', 'E4', 'G4']
+        assert respelled_chord.get_name() == 'C'
+
+    def test_progression(self):
+        """Test that progressions are only respelled when asked, and respelled chords are analyzed in the key."""
+
+        chords = ['G2,B3,D4,Gb4', 'C3,G3,E4,C5']
+
+        assert music_funcs.create_progression(chords, 'G').chords[0].get_name() == 'Gmaj7'
+        assert str(music_funcs.create_progression(chords, 'G').chords[0].notes[3]) == 'Gb4'
+        assert str(music_funcs.create_progression(chords, 'G', True).chords[0].notes[3]) == 'F#4'
+
+    def test_analysis_route(self):
+        """Test that '/analysis' requests only respell their chords when their 'respell_chords' field is '1'."""
+
+        pytest.importorskip('flask')
+        pytest.importorskip('flask_wtf')
+
+        from app import create_app
+        from config import Config
+
+        client = create_app(type('TestConfig', (Config,), {'WTF_CSRF_ENABLED': False})).test_client()
+        form = {'key': 'G', 'time': '4/4', 'chords-0': 'G2,B3,D4,Gb4', 'chords-1': 'C3,G3,E4,C5'}
+
+        assert client.post('/analysis', data=form).get_json()['chords']['chords'][0]['notes'][3] == 'gb/4'
+        assert client.post('/analysis', data={**form, 'respell_chords': '1'}).get_json()['chords']['chords'][0][
+            'notes'][3] == 'f#/4'
@@ -0,0 +1,86 @@
+"""Contains the TestSetClasses class for testing the pitch-class set classes of chords."""
+
+from collections import Counter
+
+from api.chord import ChordFactory
+from api.set_classes import (_FORTE_SET_CLASSES, _PITCH_CLASS_DIGITS, count_set_classes, get_forte_number,
+get_mask_set_class, get_set_classes)
+
+class TestSetClasses:
+    """Test functions for the normal form, prime form, Forte number, interval vector and Z-partner of chords."""
+
+    ## HELPER METHODS ##
+
+    def get_mask(self, pitch_classes):
+        """Helper method to return the 12-bit mask of the passed pitch classes."""
+
+        return sum(1 << pitch_class for pitch_class in set(pitch_classes))
+
+    ## TEST METHODS ##
+
+    def test_chords(self):
+        """Test the set class of chords, whether or not they're identified, ignoring octaves and doublings."""
+
+        chord_factory = ChordFactory()
+
+        assert chord_factory.create_chord('C3,G3,E4,C5').get_set_class() == {'normal_form': [0, 4, 7],
+        'prime_form': [0, 3, 7], 'forte_number': '3-11', 'interval_vector': [0, 0, 1, 1, 1, 0], 'z_partner': None}
+
+        chord = chord_factory.create_chord('B3,C4,D4,E4')
+
+        assert chord.quality == 'unknown'
+        assert chord.get_set_class() == {'normal_form': [11, 0, 2, 4], 'prime_form': [0, 1, 3, 5],
+        'forte_number': '4-11', 'interval_vector': [1, 2, 1, 1, 1, 0], 'z_partner': None}
+
+        assert chord_factory.create_chord('C4,E4,F#4,C#5').get_set_class()['z_partner'] == '4-Z29'
+        assert chord_factory.create_chord('Dbb4,Fb4,Abb4').get_set_class()['forte_number'] == '3-11'
+
+    def test_tables(self):
+        """Test that every mask is in one of the 224 set classes, numbered with Forte's numbers and Rahn's forms."""
+
+        set_classes = {}
+
+        for mask in range(0, 4096):
+            set_class = get_mask_set_class(mask)
+            set_classes.setdefault(set_class['forte_number'], set()).add(tuple(set_class['prime_form']))
+
+            assert len(set_class['normal_form']) == bin(mask).count('1')
+            assert self.get_mask(set_class['normal_form']) == mask
+
+        #Each Forte number has a single prime form
+        assert len(set_classes) == 224 and all(len(prime_forms) == 1 for prime_forms in set_classes.values())
+        assert Counter(forte_number.partition('-')[0] for forte_number in set_classes) == Counter({'0': 1,
+        '1': 1, '2': 6, '3': 12, '4': 29, '5': 38, '6': 50, '7': 38, '8': 29, '9': 12, '10': 6, '11': 1, '12': 1})
+
+        assert get_mask_set_class(self.get_mask([0, 1, 3, 7, 8]))['prime_form'] == [0, 1, 5, 6, 8]
+        assert get_mask_set_class(self.get_mask([0, 1, 3, 6, 8, 9]))['prime_form'] == [0, 2, 3, 6, 7, 9]
+
+        #The table lists each set class by its Rahn prime form
+        for forte_number, pitch_class_string in _FORTE_SET_CLASSES:
+            pitch_classes = [_PITCH_CLASS_DIGITS.index(digit) for digit in pitch_class_string]
+            assert get_mask_set_class(self.get_mask(pitch_classes))['prime_form'] == pitch_classes, forte_number
+        assert get_mask_set_class(self.get_mask([0, 2, 4, 5, 7, 9, 11]))['forte_number'] == '7-35'
+        assert get_mask_set_class(self.get_mask([0, 1, 3, 4, 6, 7, 9, 10]))['forte_number'] == '8-28'
+
+    def test_z_partners(self):
+        """Test that Z-related set classes share their interval vector, and hexachords are Z-related to complements."""
+
+        for mask in range(0, 4096):
+            set_class = get_mask_set_class(mask)
+
+            assert (set_class['z_partner'] is not None) == ('Z' in set_class['forte_number'])
+
+            if bin(mask).count('1') == 6:
+                complement_number = get_mask_set_class(0xFFF ^ mask)['forte_number']
+
+                assert complement_number in (set_class['forte_number'], set_class['z_partner'])
+
+    def test_bulk(self):
+        """Test that set classes are found for lists of chords and counted across a corpus."""
+
+        chord_factory = ChordFactory()
+        chords = [chord_factory.create_chord(chord) for chord in ('C3,G3,E4,C5', 'G2,B3,D4,F4', 'A2,C4,E4,A4')]
+
+        assert [set_class['forte_number'] for set_class in get_set_classes(chords)] == ['3-11', '4-27', '3-11']
+        assert [get_forte_number(chord) for chord in chords] == ['3-11', '4-27', '3-11']
+        assert count_set_classes([chords, chords[0:1]]) == Counter({'3-11': 3, '4-27': 1})
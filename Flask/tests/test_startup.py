@@ -0,0 +1,71 @@
+"""Contains the TestStartup class for checking the modules imported when the app starts, using -X importtime."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_wtf')
+
+_FLASK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#The analysis engine's modules, which must only be imported once an analysis route is requested
+_ENGINE_MODULES = ('api.chord', 'api.chord_progression', 'api.music_funcs', 'api.music_info', 'api.satb_validator')
+
+class TestStartup:
+    """Test functions for the app's start-up imports."""
+
+    def get_import_times(self, requests):
+        """
+        Helper function to create the app in a new interpreter, request each of the passed urls,
+        and return the cumulative import time in microseconds for each module imported along with
+        the total import time.
+        """
+
+        script = '\n'.join([
+            'from app import create_app',
+            'client = create_app().test_client()',
+            *[f'assert client.{method}({url!r}, data={data!r}).status_code == 200' for method, url, data in requests]
+        ])
+
+        environment = dict(os.environ, ANALYSIS_WARM_UP='0')
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], cwd=_FLASK_DIR, env=environment,
+        capture_output=True, text=True, check=True)
+
+        import_times = {}
+        total_time = 0
+
+        #Lines are formatted as: 'import time: self [us] | cumulative | imported package'
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                self_time, cumulative, module_name = line.split('|')
+
+                if cumulative.strip().isdigit():
+                    import_times[module_name.strip()] = int(cumulative)
+                    total_time += int(self_time.split(':')[1])
+
+        return (import_times, total_time)
+
+    def test_static_pages(self):
+        """Test that starting the app and serving its pages, health check and metrics doesn't import the analysis engine."""
+
+        import_times, total_time = self.get_import_times([('get', '/how_to', None), ('get', '/satb_rules', None),
+        ('get', '/health', None), ('get', '/metrics', None)])
+
+        for module_name in _ENGINE_MODULES + ('flask_wtf',):
+            assert module_name not in import_times
+
+        #Fail if the app's imports exceed a start-up budget when one is set, i.e. for cold-start deployments
+        if budget := os.environ.get('STARTUP_IMPORT_BUDGET_MS'):
+            assert total_time / 1000 <= float(budget)
+
+    def test_analysis_route(self):
+        """Test that the analysis engine is imported once an analysis route is requested."""
+
+        import_times, _ = self.get_import_times([('get', '/', None),
+        ('post', '/analysis', {'chords-0': 'C3,G3,E4,C5', 'key': 'C', 'time': '4/4'})])
+
+        for module_name in _ENGINE_MODULES:
+            assert module_name in import_times
@@ -0,0 +1,73 @@
+"""Contains the TestSynthetic class for testing the synthetic progression generator."""
+
+import types
+from itertools import chain, islice
+
+import pytest
+
+from api.chord import ChordFactory
+from api.music_info import SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS
+from api.satb_validator import validate_progression_steps
+from benchmarks.synthetic import iter_progressions
+
+class TestSynthetic:
+    """Test functions for drawing seeded progressions with valid and deliberately broken voicings."""
+
+    ## HELPER METHODS ##
+
+    def get_rule_errors(self, progression):
+        """Helper method to return the validator's errors for a progression."""
+
+        chords = [ChordFactory().create_chord(chord_string) for chord_string in progression.chords]
+
+        assert all(chord.quality != 'unknown' for chord in chords)
+
+        return {(chord_index, error['code']) for chord_index, chord_errors in
+        enumerate(validate_progression_steps(chords, progression.key)) for error in chord_errors}
+
+    ## TEST METHODS ##
+
+    def test_seeded_stream(self):
+        """Test that progressions are drawn lazily, and the same ones are drawn for the same seed."""
+
+        progressions = iter_progressions(seed=7)
+
+        assert isinstance(progressions, types.GeneratorType)
+
+        first_progressions = list(islice(progressions, 50))
+
+        assert first_progressions == list(iter_progressions(seed=7, num_progressions=50))
+        assert first_progressions != list(iter_progressions(seed=8, num_progressions=50))
+        assert len(list(islice(chain.from_iterable(progression.chords for progression in progressions), 5000))) == 5000
+
+    def test_progressions(self):
+        """Test that progressions are drawn across keys and chord kinds, within the passed lengths."""
+
+        progressions = list(iter_progressions(seed=1, num_progressions=300, min_chords=3, max_chords=6))
+        numerals = [numeral for progression in progressions for numeral in progression.numerals]
+
+        assert {progression.key for progression in progressions} == set(SUPPORTED_MAJOR_KEYS + SUPPORTED_MINOR_KEYS)
+        assert all(3 <= len(progression.chords) == len(progression.numerals) <= 6 for progression in progressions)
+        assert all(progression.numerals[0] in ('I', 'i') for progression in progressions)
+        assert any('/' in numeral for numeral in numerals) and any('b' in numeral for numeral in numerals)
+
+        with pytest.raises(ValueError):
+            next(iter_progressions(min_chords=5, max_chords=4))
+
+    def test_valid_voicings(self):
+        """Test that voicings break none of the validator's range, spacing, doubling, movement or resolution rules."""
+
+        for progression in iter_progressions(seed=2, num_progressions=200):
+            assert progression.broken_rules == ()
+            assert self.get_rule_errors(progression) == set()
+
+    def test_broken_rules(self):
+        """Test that the rules chords were voiced to break are the ones found by the validator."""
+
+        progressions = list(iter_progressions(seed=3, num_progressions=200, error_rate=0.3))
+        broken_codes = {error_code for progression in progressions for _, error_code in progression.broken_rules}
+
+        assert {'ERR_VOICE_LOW', 'ERR_SA_DISTANCE', 'ERR_PARALLEL_8TH'} <= broken_codes
+
+        for progression in progressions:
+            assert self.get_rule_errors(progression) == set(progression.broken_rules)
@@ -0,0 +1,105 @@
+"""Contains the TestTrace class for testing the analysis engine's trace facility and its '/trace' route."""
+
+import threading
+
+import pytest
+
+from api import trace
+from api.chord import ChordFactory
+from api.satb_validator import validate_progression
+
+class TestTrace:
+    """Test functions for recording, bounding and dumping the validator's trace events."""
+
+    #I - V7/IV - IV - V - I, with the leading tone doubled in the V chord
+    test_chords = ['C3,G3,E4,C5', 'C3,Bb3,E4,G4', 'F3,A3,F4,C5', 'G2,B3,D4,B4', 'C3,G3,E4,C5']
+
+    ## HELPER METHODS ##
+
+    @pytest.fixture(autouse=True)
+    def reset_trace(self):
+        """Helper method to disable tracing and clear its buffer after each test."""
+
+        yield
+        trace.set_enabled(False, trace.TRACE_BUFFER_SIZE)
+        trace.end_trace()
+
+    def validate(self):
+        """Helper method to validate the test progression in C and return its errors."""
+
+        return validate_progression([ChordFactory().create_chord(chord) for chord in self.test_chords], 'C')
+
+    ## TEST METHODS ##
+
+    def test_disabled(self):
+        """Test that nothing is recorded while tracing is disabled."""
+
+        trace.set_enabled(False, 100)
+        trace_id = trace.start_trace()
+        self.validate()
+
+        assert trace.get_trace(trace_id) == []
+
+    def test_chord_events(self):
+        """Test that each chord's relation, local key and rules broken are recorded under the current trace."""
+
+        trace.set_enabled(True, 100)
+        trace_id = trace.start_trace()
+        errors = self.validate()
+        events = trace.get_trace(trace_id)
+
+        assert [event['event'] for event in events] == ['validate'] + ['chord'] * 5
+        assert [event['chord_index'] for event in events[1:]] == [1, 2, 3, 4, 5]
+        assert [event['relation'] for event in events[1:]] == ['diatonic', 'applied', 'diatonic', 'diatonic', 'diatonic']
+        assert [event['local_key'] for event in events[1:]] == ['C', 'F', 'C', 'C', 'C']
+        assert 'ERR_DOUBLED_LT' in events[4]['rules']
+        assert sorted(code for event in events[1:] for code in event['rules']) == sorted(error['code'] for error in errors)
+
+        #Events recorded after the trace ends aren't added to it
+        trace.end_trace()
+        self.validate()
+
+        assert len(trace.get_trace(trace_id)) == 6
+
+    def test_ring_buffer(self):
+        """Test that the buffer only keeps the newest events, and each thread records under its own trace."""
+
+        trace.set_enabled(True, 8)
+        trace_ids = {}
+
+        def run_trace(name):
+            trace_ids[name] = trace.start_trace()
+            self.validate()
+
+        for name in ('first', 'second'):
+            thread = threading.Thread(target=run_trace, args=(name,))
+            thread.start()
+            thread.join()
+
+        assert trace_ids['first'] != trace_ids['second']
+        assert len(trace.get_trace(trace_ids['first'])) == 2
+        assert len(trace.get_trace(trace_ids['second'])) == 6
+
+    def test_trace_route(self):
+        """Test that an '/analysis' request's trace can be dumped by the id in its response, only when enabled."""
+
+        pytest.importorskip('flask')
+        pytest.importorskip('flask_wtf')
+
+        from app import create_app
+        from config import Config
+
+        form = {'key': 'C', 'time': '4/4', 'analyze_satb': 'y',
+        **{f'chords-{i}': chord for i, chord in enumerate(self.test_chords)}}
+
+        client = create_app(type('TestConfig', (Config,), {'ANALYSIS_TRACE': False})).test_client()
+        response = client.post('/analysis', data=form)
+
+        assert 'X-Trace-Id' not in response.headers
+        assert client.get('/trace/1').status_code == 404
+
+        client = create_app(type('TestConfig', (Config,), {'ANALYSIS_TRACE': True})).test_client()
+        response = client.post('/analysis', data=form)
+        trace_info = client.get(f"/trace/{response.headers['X-Trace-Id']}").get_json()
+
+        assert [event['relation'] for event in trace_info['events'] if event['event'] == 'chord'][1] == 'applied'
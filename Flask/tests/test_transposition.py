@@ -0,0 +1,105 @@
+"""Contains the TestTransposition class for testing the transposition of progressions between keys."""
+
+import pytest
+
+from api import music_funcs
+from api.chord_progression import ChordProgression
+from api.music_info import SUPPORTED_MAJOR_KEYS, SUPPORTED_MINOR_KEYS
+from api.satb_validator import _VALIDATION_SETTINGS
+from api.transposition import transpose_chord_strings, transpose_chords, transpose_corpus
+
+class TestTransposition:
+    """Test functions for spelling transposed notes by their degree and keeping the voices in range."""
+
+    #I - IV - V7/IV - viio7/V - V - I in C
+    major_chords = ['C3,G3,E4,C5', 'F3,A3,F4,C5', 'C3,Bb3,E4,G4', 'F#3,C4,Eb4,A4', 'G2,B3,D4,G4', 'C3,G3,E4,C5']
+
+    #i - iv - V - VI - i in a
+    minor_chords = ['A2,E3,C4,A4', 'D3,F3,D4,A4', 'E2,G#3,B3,E4', 'F2,C4,F4,A4', 'A2,E3,C4,A4']
+
+    ## HELPER METHODS ##
+
+    def get_voices(self, progression):
+        """Helper method to return the note strings of each of the progression's chords."""
+
+        return [[str(note) for note in chord.notes] for chord in progression.chords]
+
+    ## TEST METHODS ##
+
+    def test_numerals_preserved(self):
+        """Test that transposing to any key of the same mode keeps every chord's numeral."""
+
+        major_progression = music_funcs.create_progression(self.major_chords, 'C')
+        minor_progression = music_funcs.create_progression(self.minor_chords, 'a')
+
+        for key in SUPPORTED_MAJOR_KEYS:
+            assert major_progression.transpose(key).get_progression_chord_numerals() == \
+                major_progression.get_progression_chord_numerals()
+
+        for key in SUPPORTED_MINOR_KEYS:
+            assert minor_progression.transpose(key).get_progression_chord_numerals() == \
+                minor_progression.get_progression_chord_numerals()
+
+    def test_spelling(self):
+        """Test that notes keep their degree and alteration, using doubled accidentals where needed."""
+
+        progression = music_funcs.create_progression(self.major_chords, 'C')
+
+        assert self.get_voices(progression.transpose('G'))[3] == ['C#3', 'G3', 'Bb3', 'E4']
+        assert self.get_voices(progression.transpose('C#'))[3] == ['Fx3', 'C#4', 'E4', 'A#4']
+        assert self.get_voices(progression.transpose('Cb'))[2] == ['Cb2', 'Bbb3', 'Eb4', 'Gb4']
+        assert progression.transpose('Eb').key == 'Eb' and progression.key == 'C'
+
+        #The leading tone stays the leading tone between modes, while the 3rd and 6th follow the mode
+        assert music_funcs.create_progression(self.minor_chords, 'a').transpose('C').get_progression_chord_numerals() \
+            == ['I', 'IV', 'V', 'vi', 'I']
+        assert progression.transpose('a').get_progression_chord_numerals()[0:2] == ['i', 'iv']
+
+    def test_mode_changes(self):
+        """Test that chromatic notes keep their interval above the tonic when transposing between modes."""
+
+        #i and bVI borrowed in C, and I with a raised 3rd and a raised 6th in c
+        assert transpose_chord_strings(['C3,Eb3,G3', 'Ab2,C4,Eb4'], 'C', 'c') == ['C3,Eb3,G3', 'Ab2,C4,Eb4']
+        assert transpose_chord_strings(['C3,E3,G3', 'A2,C4,F#4'], 'c', 'C') == ['C3,E3,G3', 'A2,C4,F#4']
+        assert transpose_chord_strings(['F#3,C4,Eb4,A4'], 'C', 'a') == ['D#3,A3,C4,F4']
+
+    def test_voice_ranges(self):
+        """Test that the progression is moved by octaves to keep its voices in range, with the same voice leading."""
+
+        voice_ranges = _VALIDATION_SETTINGS['voice_range']
+        progression = music_funcs.create_progression(self.major_chords, 'C')
+
+        for key in SUPPORTED_MAJOR_KEYS:
+            transposed_progression = progression.transpose(key)
+
+            for chord, transposed_chord in zip(progression.chords, transposed_progression.chords):
+                assert all(low <= note.value <= high for note, (low, high) in zip(transposed_chord.notes,
+                voice_ranges))
+                assert [note.value - chord.notes[0].value for note in chord.notes] == \
+                    [note.value - transposed_chord.notes[0].value for note in transposed_chord.notes]
+
+    def test_chord_strings(self):
+        """Test that chord strings are transposed like chords, in bulk across a corpus."""
+
+        chords = music_funcs.create_progression(self.major_chords, 'C').chords
+        transposed_strings = transpose_chord_strings(self.major_chords + ['X4,Y4'], 'C', 'D')
+
+        assert transposed_strings[0:-1] == [','.join(str(note) for note in chord.notes)
+        for chord in transpose_chords(chords, 'C', 'D')]
+        assert transposed_strings[-1] == 'X4,Y4'
+
+        transposed_corpus = list(transpose_corpus([(self.major_chords, 'C'), (self.minor_chords, 'a')], 'f'))
+
+        assert [key for _, key in transposed_corpus] == ['f', 'f']
+        assert transposed_corpus[1][0][2] == 'C3,E4,G4,C5'
+
+    def test_invalid_keys(self):
+        """Test that progressions without a key, or keys that aren't supported, can't be transposed."""
+
+        progression = music_funcs.create_progression(self.major_chords, 'C')
+
+        with pytest.raises(ValueError):
+            ChordProgression(progression.chords).transpose('G')
+
+        with pytest.raises(ValueError):
+            progression.transpose('H')
@@ -0,0 +1,59 @@
+"""Contains the TestVoiceLeading class for testing the voice-leading metrics between consecutive chords."""
+
+from itertools import permutations
+
+from api.chord import ChordFactory
+from api.voice_leading import get_progression_voice_leading, get_voice_leading
+
+class TestVoiceLeading:
+    """Test functions for the motion of each voice between chords, with and without the same number of notes."""
+
+    ## HELPER METHODS ##
+
+    def get_metrics(self, chord_string, next_chord_string):
+        """Helper method to return the voice-leading metrics between the passed chord strings."""
+
+        chord_factory = ChordFactory()
+        chord = chord_factory.create_chord(chord_string)
+
+        return get_voice_leading(chord, chord_factory.create_chord(next_chord_string))
+
+    ## TEST METHODS ##
+
+    def test_same_voices(self):
+        """Test that chords with the same number of notes move voice by voice, from the bass up."""
+
+        assert self.get_metrics('C3,G3,E4,C5', 'G2,G3,D4,B4') == {'motion': [-5, 0, -2, -1], 'total_motion': 8,
+        'max_motion': 5, 'common_tones': 1, 'contrary_motion': 0, 'similar_motion': 3}
+
+        assert self.get_metrics('C3,E4,G4,C5', 'F3,C4,A4,C5') == {'motion': [5, -4, 2, 0], 'total_motion': 11,
+        'max_motion': 5, 'common_tones': 1, 'contrary_motion': 2, 'similar_motion': 1}
+
+    def test_different_voices(self):
+        """Test that the smaller chord's notes are assigned with the least motion, and other notes to the nearest."""
+
+        assert self.get_metrics('C4,E4,G4', 'B3,D4,F4,G4')['motion'] == [-1, 2, 1, 0]
+        assert self.get_metrics('B3,D4,F4,G4', 'C4,E4,G4')['motion'] == [1, -2, -1, 0]
+
+        #The assigned notes move the least of any assignment of the smaller chord's notes
+        values = [48, 52, 55]
+        next_values = [47, 50, 53, 55, 59]
+        least_motion = min(sum(abs(next_values[j] - value) for j, value in zip(assignment, values))
+        for assignment in permutations(range(0, 5), 3))
+
+        motion = self.get_metrics('C3,E3,G3', 'B2,D3,F3,G3,B3')['motion']
+
+        assert len(motion) == 5
+        assert sum(sorted(map(abs, motion))[0:3]) <= least_motion
+
+    def test_transposition(self):
+        """Test that the metrics are the same for chord pairs transposed to any key, and for progressions."""
+
+        assert self.get_metrics('C4,E4,G4', 'B3,D4,F4,G4') == self.get_metrics('Eb2,G2,Bb2', 'D2,F2,Ab2,Bb2')
+
+        chord_factory = ChordFactory()
+        chords = [chord_factory.create_chord(chord) for chord in ('C3,G3,E4,C5', 'G2,G3,D4,B4', 'C3,G3,E4,C5')]
+        voice_leading = get_progression_voice_leading(chords)
+
+        assert voice_leading[0] is None and voice_leading[2]['motion'] == [5, 0, 2, 1]
+        assert get_progression_voice_leading([]) == []
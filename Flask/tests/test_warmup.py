@@ -0,0 +1,73 @@
+"""Contains the TestWarmUp class for testing the analysis engine's warm-up and read-only lookup tables."""
+
+from types import MappingProxyType
+
+import pytest
+
+from api import music_funcs, music_info
+from api.metrics import collect_metrics
+from api.warmup import warm_up
+
+class TestWarmUp:
+    """Test functions for warming up the analysis engine."""
+
+    def test_warm_up_fills_caches(self):
+        """Test that warming up fills the lookup caches for every supported key."""
+
+        music_info.get_note_accidental_in_key.cache_clear()
+        music_info.get_chord_relation_for_key.cache_clear()
+
+        warm_up_report = warm_up(freeze=False)
+
+        num_keys = len(music_info.SUPPORTED_MAJOR_KEYS) + len(music_info.SUPPORTED_MINOR_KEYS)
+
+        assert music_info.get_note_accidental_in_key.cache_info().currsize == num_keys * len(music_info.NOTE_INDICES)
+        assert music_info.get_chord_relation_for_key.cache_info().currsize > 0
+        assert warm_up_report['warm_up_ms'] > 0
+
+    def test_warm_up_metrics(self):
+        """Test that the analyses run while warming up aren't reported in the metrics."""
+
+        music_funcs.generate_progression(['C3,G3,E4,C5', 'C3,G3,E4,C5'], 'C', True)
+        warm_up(freeze=False)
+
+        metric_names = {metric_name for metric_name, _ in collect_metrics()}
+
+        assert not metric_names & {'stage_seconds', 'stage_count', 'rule_seconds', 'error_count'}
+        assert 'cache_hits' in metric_names
+
+    def test_read_only_tables(self):
+        """Test that lookup tables can't be written to, including by looking up unknown values."""
+
+        with pytest.raises(TypeError):
+            music_info.MAJOR_KEY_NOTES['C'] = ()
+
+        with pytest.raises(TypeError):
+            music_info.INTERVAL_STRINGS['4']['quality'] = 'm'
+
+        #Values shared by every worker are read-only too
+        for table in vars(music_info).values():
+            if isinstance(table, MappingProxyType):
+                assert not [value for value in table.values() if isinstance(value, (dict, list, set))]
+
+        num_interval_strings = len(music_info.INTERVAL_STRINGS)
+
+        assert music_info.get_chord_for_intervals('111')['quality'] == 'unknown'
+        assert len(music_info.INTERVAL_STRINGS) == num_interval_strings
+
+    def test_worker_stats_route(self):
+        """Test that the '/worker_stats' route only reports the worker's pid and memory usage when enabled."""
+
+        pytest.importorskip('flask')
+        pytest.importorskip('flask_wtf')
+
+        from app import create_app
+        from config import Config
+
+        client = create_app(Config).test_client()
+
+        assert client.get('/worker_stats').status_code == 404
+
+        client = create_app(type('TestConfig', (Config,), {'WORKER_STATS': True})).test_client()
+
+        assert 'pid' in client.get('/worker_stats').get_json()